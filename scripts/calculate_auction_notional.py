@@ -11,18 +11,23 @@ This script:
 
 import pandas as pd
 import os
+import sys
 import json
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.parquet_loader import read_parquet_file
+
 parquet_dir = 'data/parquet'
 results = []
 
 for f in os.listdir(parquet_dir):
     if f.endswith('.parquet'):
         security = f.replace('.parquet', '')
-        df = pd.read_parquet(os.path.join(parquet_dir, f))
+        # Decodes canonical files (int64 tick prices with --price-scale)
+        df = read_parquet_file(os.path.join(parquet_dir, f))
         
         # Filter for trades between 14:55 and 15:00
-        auction_trades = df[(df['type'] == 'TRADE') & 
+        auction_trades = df[(df['type'].astype(str).str.upper() == 'TRADE') & 
                            (df['timestamp'].dt.time >= pd.Timestamp('14:55:00').time()) &
                            (df['timestamp'].dt.time < pd.Timestamp('15:00:00').time())].copy()
         
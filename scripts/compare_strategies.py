@@ -7,6 +7,7 @@ Usage:
     python scripts/compare_strategies.py  # Compare v1 vs v2
     python scripts/compare_strategies.py v1_baseline v2_price_follow_qty_cooldown
     python scripts/compare_strategies.py --all --output comparison_report.csv
+    python scripts/compare_strategies.py --all --output-dir output/results  # result store
 """
 import argparse
 import os
@@ -16,25 +17,38 @@ from pathlib import Path
 import pandas as pd
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-def load_strategy_results(strategy_name: str, output_dir: str = 'output') -> Dict:
+from src.result_store import ResultStore, is_result_store
+
+
+def load_strategy_results(strategy_name: str, output_dir: str = 'output',
+                          scenario: str = 'default') -> Dict:
     """Load results for a strategy.
     
     Args:
         strategy_name: Strategy identifier
-        output_dir: Base output directory
+        output_dir: Base output directory, or the root of a result store
+                    (only the store manifest is read)
+        scenario: Scenario to load from a result store
         
     Returns:
         Dictionary with strategy metrics
     """
-    strategy_path = os.path.join(output_dir, strategy_name)
-    summary_path = os.path.join(strategy_path, 'backtest_summary.csv')
-    
-    if not os.path.exists(summary_path):
-        print(f"Warning: No results found for {strategy_name} at {summary_path}")
-        return None
-    
-    summary_df = pd.read_csv(summary_path)
+    if is_result_store(output_dir):
+        summary_df = ResultStore(output_dir).summary(strategy_name, scenario)
+        if len(summary_df) == 0:
+            print(f"Warning: No results found for {strategy_name}/{scenario} in {output_dir}")
+            return None
+    else:
+        strategy_path = os.path.join(output_dir, strategy_name)
+        summary_path = os.path.join(strategy_path, 'backtest_summary.csv')
+        
+        if not os.path.exists(summary_path):
+            print(f"Warning: No results found for {strategy_name} at {summary_path}")
+            return None
+        
+        summary_df = pd.read_csv(summary_path)
     
     # Aggregate metrics
     metrics = {
@@ -59,12 +73,14 @@ def load_strategy_results(strategy_name: str, output_dir: str = 'output') -> Dic
     return metrics
 
 
-def compare_strategies(strategy_names: List[str], output_dir: str = 'output') -> pd.DataFrame:
+def compare_strategies(strategy_names: List[str], output_dir: str = 'output',
+                       scenario: str = 'default') -> pd.DataFrame:
     """Compare multiple strategies.
     
     Args:
         strategy_names: List of strategy identifiers
-        output_dir: Base output directory
+        output_dir: Base output directory or result store root
+        scenario: Scenario to compare (result store only)
         
     Returns:
         DataFrame with comparison metrics
@@ -72,7 +88,7 @@ def compare_strategies(strategy_names: List[str], output_dir: str = 'output') ->
     results = []
     
     for strategy in strategy_names:
-        metrics = load_strategy_results(strategy, output_dir)
+        metrics = load_strategy_results(strategy, output_dir, scenario)
         if metrics:
             results.append(metrics)
     
@@ -151,13 +167,15 @@ def find_all_strategies(output_dir: str = 'output') -> List[str]:
     """Find all strategies with results in output directory.
     
     Args:
-        output_dir: Base output directory
+        output_dir: Base output directory or result store root
         
     Returns:
         List of strategy names
     """
     if not os.path.exists(output_dir):
         return []
+    if is_result_store(output_dir):
+        return ResultStore(output_dir).strategies()
     
     strategies = []
     for item in os.listdir(output_dir):
@@ -188,7 +206,13 @@ def main():
         '--output-dir',
         type=str,
         default='output',
-        help='Base output directory (default: output)'
+        help='Base output directory or result store root (default: output)'
+    )
+    parser.add_argument(
+        '--scenario',
+        type=str,
+        default='default',
+        help='Scenario to compare when --output-dir is a result store (default: default)'
     )
     parser.add_argument(
         '--output',
@@ -231,7 +255,7 @@ def main():
     print(f"{'='*80}\n")
     
     # Load and compare
-    comparison_df = compare_strategies(strategies, args.output_dir)
+    comparison_df = compare_strategies(strategies, args.output_dir, args.scenario)
     
     if comparison_df is None or len(comparison_df) == 0:
         print("No data to compare")
@@ -30,6 +30,8 @@ from src.strategies.v2_price_follow_qty_cooldown.handler import create_v2_price_
 from src.strategies.v2_1_stop_loss.handler import create_v2_1_stop_loss_handler
 from src.strategies.v3_liquidity_monitor.handler import create_v3_liquidity_monitor_handler
 from src.parquet_utils import ensure_parquet_data
+from src.parallel_backtest import run_parallel_sweep_parquet
+from src.result_transport import trades_to_frame
 
 
 class AdvancedMetricsCalculator:
@@ -184,7 +186,7 @@ def compute_per_security_metrics(results: dict, interval_sec: int, strategy: str
         volume = sum(t['fill_price'] * t['fill_qty'] for t in trades)
         
         # Time series analysis
-        trades_df = pd.DataFrame(trades)
+        trades_df = trades_to_frame(trades)
         trades_df['timestamp'] = pd.to_datetime(trades_df['timestamp'])
         trades_df = trades_df.sort_values('timestamp')
         trades_df['cumulative_pnl'] = trades_df['realized_pnl'].cumsum()
@@ -252,14 +254,14 @@ def compute_comprehensive_metrics(results: dict, interval_sec: int, strategy: st
             total_trades += len(trades)
             total_pnl += data.get('pnl', 0.0)
             
-            for trade in trades:
-                trade['security'] = security
-                all_trades.append(trade)
-                total_volume += trade['fill_price'] * trade['fill_qty']
+            frame = trades_to_frame(trades)
+            frame['security'] = security
+            all_trades.append(frame)
+            total_volume += (frame['fill_price'] * frame['fill_qty']).sum()
     
     # Create trade time series for advanced metrics
     if all_trades:
-        trades_df = pd.DataFrame(all_trades)
+        trades_df = pd.concat(all_trades, ignore_index=True)
         trades_df['timestamp'] = pd.to_datetime(trades_df['timestamp'])
         trades_df = trades_df.sort_values('timestamp')
         
@@ -441,6 +443,59 @@ def run_single_backtest_with_params(strategy: str, param_config: dict, base_conf
         return None
 
 
+# Strategies whose handlers have an event-kernel twin (single-pass sweeps).
+# V1 here uses src.mm_handler, which has no kernel.
+KERNEL_STRATEGY_NAMES = {
+    'v2': 'v2_price_follow_qty_cooldown',
+    'v2_1': 'v2_1_stop_loss',
+    'v3': 'v3_liquidity_monitor',
+}
+
+
+def create_param_config(sweep_param: str, param_value) -> dict:
+    """Parameter overrides for one sweep value."""
+    if sweep_param == 'interval':
+        return {'refill_interval_sec': param_value}
+    elif sweep_param == 'cooldown':
+        return {'min_cooldown_sec': param_value, 'refill_interval_sec': 60}  # Default interval
+    elif sweep_param == 'threshold':
+        return {'stop_loss_threshold_pct': param_value, 'refill_interval_sec': 60}  # Default interval
+    raise ValueError(f"Unknown sweep parameter: {sweep_param}")
+
+
+def run_single_pass_sweep(strategy: str, sweep_param: str, param_values: list,
+                          base_config: dict, parquet_dir: str, max_sheets: int = None) -> dict:
+    """Run all sweep values of a strategy in one pass over each security.
+    
+    Args:
+        strategy: 'v2', 'v2_1', or 'v3'
+        sweep_param: 'interval', 'cooldown', or 'threshold'
+        param_values: Values to evaluate
+        base_config: Base configuration
+        parquet_dir: Directory containing Parquet files
+        max_sheets: Max securities to process
+        
+    Returns:
+        Dict mapping param_value -> backtest results dictionary
+    """
+    configs = []
+    for param_value in param_values:
+        param_config = create_param_config(sweep_param, param_value)
+        config = {}
+        for security, sec_config in base_config.items():
+            config[security] = sec_config.copy()
+            config[security].update(param_config)
+        configs.append(config)
+    
+    scenario_results = run_parallel_sweep_parquet(
+        parquet_dir=parquet_dir,
+        strategy_name=KERNEL_STRATEGY_NAMES[strategy],
+        configs=configs,
+        max_files=max_sheets
+    )
+    return dict(zip(param_values, scenario_results))
+
+
 def run_single_backtest(strategy: str, interval_sec: int, base_config: dict, 
                        data_path: str, max_sheets: int = None, 
                        chunk_size: int = 100000, sheet_names_filter: list = None) -> dict:
@@ -542,14 +597,14 @@ def plot_cumulative_pnl_by_strategy(all_results: dict, output_dir: Path, strateg
             all_trades = []
             for security, data in results.items():
                 trades = data.get('trades', [])
-                for trade in trades:
-                    all_trades.append(trade)
+                if len(trades) > 0:
+                    all_trades.append(trades_to_frame(trades))
             
             if not all_trades:
                 continue
             
             # Create time series
-            trades_df = pd.DataFrame(all_trades)
+            trades_df = pd.concat(all_trades, ignore_index=True)
             trades_df['timestamp'] = pd.to_datetime(trades_df['timestamp'])
             trades_df = trades_df.sort_values('timestamp')
             trades_df['cumulative_pnl'] = trades_df['realized_pnl'].cumsum()
@@ -593,7 +648,7 @@ def plot_pnl_by_security(all_results: dict, output_dir: Path):
             if not trades:
                 continue
             
-            trades_df = pd.DataFrame(trades)
+            trades_df = trades_to_frame(trades)
             trades_df['timestamp'] = pd.to_datetime(trades_df['timestamp'])
             trades_df = trades_df.sort_values('timestamp')
             trades_df['cumulative_pnl'] = trades_df['realized_pnl'].cumsum()
@@ -970,6 +1025,9 @@ Examples:
                            help='Continue from checkpoint, only run incomplete configurations (default)')
     parser.add_argument('--skip-existing', action='store_true',
                        help='Skip strategies that already have results in checkpoint (useful for adding new strategies)')
+    parser.add_argument('--single-pass', action='store_true',
+                       help='Evaluate all sweep values of a strategy in one data pass per security '
+                            '(Parquet data; V2, V2.1 and V3)')
     
     args = parser.parse_args()
     
@@ -1122,6 +1180,25 @@ Examples:
     all_results = {}
     
     for strategy in args.strategies:
+        # Single pass: evaluate every pending value of this strategy at once
+        precomputed = {}
+        pending_values = [v for v in sweep_values if (strategy, v) not in completed]
+        if (args.single_pass and use_parquet and not args.sheet_names
+                and strategy in KERNEL_STRATEGY_NAMES and pending_values):
+            print(f"\n[SINGLE PASS] {format_strategy_name(strategy)}: {len(pending_values)} values")
+            try:
+                precomputed = run_single_pass_sweep(
+                    strategy=strategy,
+                    sweep_param=args.sweep_param,
+                    param_values=pending_values,
+                    base_config=configs[strategy],
+                    parquet_dir=parquet_dir,
+                    max_sheets=args.max_sheets
+                )
+            except Exception as e:
+                print(f"[ERROR] Single-pass sweep failed, running values one by one: {e}")
+                precomputed = {}
+        
         for param_value in sweep_values:
             # Skip if already completed
             if (strategy, param_value) in completed:
@@ -1135,23 +1212,21 @@ Examples:
             
             try:
                 # Create config with parameter
-                if args.sweep_param == 'interval':
-                    param_config = {'refill_interval_sec': param_value}
-                elif args.sweep_param == 'cooldown':
-                    param_config = {'min_cooldown_sec': param_value, 'refill_interval_sec': 60}  # Default interval
-                elif args.sweep_param == 'threshold':
-                    param_config = {'stop_loss_threshold_pct': param_value, 'refill_interval_sec': 60}  # Default interval
+                param_config = create_param_config(args.sweep_param, param_value)
                 
-                # Run backtest
-                results = run_single_backtest_with_params(
-                    strategy=strategy,
-                    param_config=param_config,
-                    base_config=configs[strategy],
-                    data_path=args.data,
-                    max_sheets=args.max_sheets,
-                    chunk_size=args.chunk_size,
-                    sheet_names_filter=args.sheet_names
-                )
+                # Run backtest (unless the single pass already did)
+                if param_value in precomputed:
+                    results = precomputed[param_value]
+                else:
+                    results = run_single_backtest_with_params(
+                        strategy=strategy,
+                        param_config=param_config,
+                        base_config=configs[strategy],
+                        data_path=args.data,
+                        max_sheets=args.max_sheets,
+                        chunk_size=args.chunk_size,
+                        sheet_names_filter=args.sheet_names
+                    )
                 
                 if results is not None:
                     # Store results for plotting
@@ -1181,7 +1256,7 @@ Examples:
                         trades = data.get('trades', [])
                         if len(trades) > 0:
                             # Save trade-level data
-                            trades_df = pd.DataFrame(trades)
+                            trades_df = trades_to_frame(trades)
                             # Round PNL and position values to integers
                             if 'realized_pnl' in trades_df.columns:
                                 trades_df['realized_pnl'] = trades_df['realized_pnl'].round(0).astype(int)
@@ -29,7 +29,8 @@ import time
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import pandas as pd
+from src.parquet_utils import convert_excel_to_parquet as convert_excel_to_parquet_parallel
+from src.tick_schema import TICK_SCHEMA_VERSION
 
 
 def convert_excel_to_parquet(
@@ -37,16 +38,27 @@ def convert_excel_to_parquet(
     output_dir: str,
     max_sheets: int = None,
     compression: str = 'snappy',
-    header_row: int = 3
+    header_row: int = 3,
+    price_scale: int = None,
+    max_workers: int = None,
+    resume: bool = True
 ):
     """Convert Excel sheets to per-security Parquet files.
     
+    Files are written with the canonical tick schema (src/tick_schema.py).
+    Sheets are streamed with openpyxl read-only mode and converted in
+    parallel worker processes; a manifest in output_dir lets an interrupted
+    run resume with the remaining sheets.
+    
     Args:
         excel_path: Path to TickData.xlsx
         output_dir: Output directory for Parquet files
         max_sheets: Limit number of sheets (for testing)
         compression: Parquet compression ('snappy', 'gzip', or 'none')
         header_row: Excel header row (1-based)
+        price_scale: Store prices as int64 ticks of 1/price_scale (default: float64)
+        max_workers: Parallel worker processes (default: CPU count)
+        resume: Skip sheets already recorded in the conversion manifest
     """
     print("="*80)
     print("EXCEL TO PARQUET CONVERSION")
@@ -55,6 +67,10 @@ def convert_excel_to_parquet(
     print(f"Output dir:  {output_dir}")
     print(f"Compression: {compression}")
     print(f"Header row:  {header_row}")
+    print(f"Workers:     {max_workers or 'auto'}")
+    print(f"Resume:      {resume}")
+    print(f"Schema:      canonical v{TICK_SCHEMA_VERSION}"
+          + (f" (prices scaled x{price_scale})" if price_scale else ""))
     print("="*80)
     print()
     
@@ -62,111 +78,30 @@ def convert_excel_to_parquet(
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Load Excel file
-    print("Loading Excel file...")
     start_time = time.time()
     
+    # Parallel, resumable conversion (one worker process per sheet)
     try:
-        xls = pd.ExcelFile(excel_path)
-        load_time = time.time() - start_time
-        print(f"  [OK] Loaded in {load_time:.1f}s")
-        print(f"  Found {len(xls.sheet_names)} sheets")
-        print()
+        summary = convert_excel_to_parquet_parallel(
+            excel_path,
+            output_dir,
+            max_sheets=max_sheets,
+            max_workers=max_workers,
+            header_row=header_row,
+            compression=compression,
+            price_scale=price_scale,
+            resume=resume
+        )
     except Exception as e:
         print(f"  [X] Error loading Excel: {e}")
         return False
     
-    # Process sheets
-    sheet_names = xls.sheet_names[:max_sheets] if max_sheets else xls.sheet_names
-    
-    print(f"Converting {len(sheet_names)} sheets...")
-    print()
-    
-    converted = 0
-    failed = 0
-    total_rows = 0
-    
-    for i, sheet_name in enumerate(sheet_names, 1):
-        print(f"[{i}/{len(sheet_names)}] {sheet_name}")
-        
-        try:
-            # Read sheet
-            df = pd.read_excel(excel_path, sheet_name=sheet_name, header=header_row-1)
-            
-            # Normalize column names
-            df.columns = [str(c).strip().lower() if c is not None else f'col_{i}' 
-                         for i, c in enumerate(df.columns)]
-            
-            # Combine date and time if separate
-            if 'date' in df.columns and 'time' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['date'].astype(str) + ' ' + 
-                                                 df['time'].astype(str), errors='coerce')
-                df.drop(['date', 'time'], axis=1, inplace=True)
-            elif 'dates' in df.columns:
-                df.rename(columns={'dates': 'timestamp'}, inplace=True)
-                df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-            
-            # Ensure timestamp is datetime
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-            
-            # Normalize column names to standard format
-            column_mapping = {
-                'type': 'type',
-                'types': 'type',
-                'price': 'price',
-                'prices': 'price',
-                'volume': 'volume',
-                'size': 'volume',
-                'qty': 'volume'
-            }
-            
-            for old_col, new_col in column_mapping.items():
-                if old_col in df.columns:
-                    df.rename(columns={old_col: new_col}, inplace=True)
-            
-            # Ensure required columns exist
-            required_cols = ['timestamp', 'type', 'price', 'volume']
-            missing = [col for col in required_cols if col not in df.columns]
-            
-            if missing:
-                print(f"  [X] Missing columns: {missing}")
-                failed += 1
-                continue
-            
-            # Select only required columns (reduce file size)
-            df = df[required_cols]
-            
-            # Drop rows with missing values
-            initial_rows = len(df)
-            df.dropna(subset=['timestamp', 'price'], inplace=True)
-            dropped = initial_rows - len(df)
-            
-            # Extract security name
-            security = sheet_name.replace(' UH Equity', '').replace(' DH Equity', '')
-            
-            # Write Parquet file
-            parquet_file = output_path / f"{security.lower()}.parquet"
-            
-            df.to_parquet(
-                parquet_file,
-                compression=compression,
-                index=False,
-                engine='pyarrow'
-            )
-            
-            file_size_mb = parquet_file.stat().st_size / (1024 * 1024)
-            
-            print(f"  [OK] {security}: {len(df):,} rows -> {parquet_file.name} ({file_size_mb:.1f} MB)")
-            if dropped > 0:
-                print(f"    (Dropped {dropped:,} rows with missing data)")
-            
-            converted += 1
-            total_rows += len(df)
-            
-        except Exception as e:
-            print(f"  [X] Error: {e}")
-            failed += 1
+    converted = len(summary['converted']) + len(summary['skipped'])
+    failed = len(summary['failed'])
+    total_rows = summary['rows']
+    sheet_count = converted + failed
+    if summary['dropped'] > 0:
+        print(f"  (Dropped {summary['dropped']:,} rows with missing data)")
     
     # Summary
     total_time = time.time() - start_time
@@ -176,7 +111,8 @@ def convert_excel_to_parquet(
     print("CONVERSION COMPLETE")
     print("="*80)
     print(f"Time:      {total_time:.1f}s ({total_time/60:.1f} minutes)")
-    print(f"Converted: {converted}/{len(sheet_names)} sheets")
+    print(f"Converted: {converted}/{sheet_count} sheets"
+          + (f" ({len(summary['skipped'])} resumed)" if summary['skipped'] else ""))
     if failed > 0:
         print(f"Failed:    {failed} sheets")
     print(f"Total rows: {total_rows:,}")
@@ -220,6 +156,9 @@ Examples:
   
   # Use different compression
   python scripts/convert_excel_to_parquet.py --compression gzip
+  
+  # 4 worker processes; rerunning after an interruption resumes
+  python scripts/convert_excel_to_parquet.py --workers 4
         """
     )
     
@@ -234,6 +173,12 @@ Examples:
                        help='Parquet compression algorithm (default: snappy)')
     parser.add_argument('--header-row', type=int, default=3,
                        help='Excel header row, 1-based (default: 3)')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                       help='Parallel worker processes (default: CPU count)')
+    parser.add_argument('--no-resume', action='store_true',
+                       help='Reconvert all sheets, ignoring the conversion manifest')
+    parser.add_argument('--price-scale', type=int, default=None,
+                       help='Store prices as int64 ticks (e.g. 1000 = 0.001 ticks); default float64')
     
     args = parser.parse_args()
     
@@ -256,7 +201,10 @@ Examples:
         output_dir=args.output,
         max_sheets=args.max_sheets,
         compression=args.compression,
-        header_row=args.header_row
+        header_row=args.header_row,
+        price_scale=args.price_scale,
+        max_workers=args.workers,
+        resume=not args.no_resume
     )
     
     sys.exit(0 if success else 1)
@@ -24,6 +24,12 @@ Usage:
     
     # Full production run
     python scripts/fast_sweep.py --intervals 10 30 60 120 300 600
+    
+    # One data pass per security for all intervals of a strategy
+    python scripts/fast_sweep.py --single-pass --intervals 10 30 60 120 300 600
+    
+    # Keep workers and data resident across all scenarios
+    python scripts/fast_sweep.py --warm-pool --intervals 10 30 60 120 300 600
 """
 import argparse
 import json
@@ -42,7 +48,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from src.config_loader import load_strategy_config
 from src.parquet_utils import ensure_parquet_data
-from src.parallel_backtest import run_parallel_backtest_parquet
+from src.parallel_backtest import run_parallel_backtest_parquet, run_parallel_sweep_parquet
+from src.result_transport import trades_to_frame
+from src.warm_pool import WarmWorkerPool
+from src.event_kernel import get_kernel_strategy_name
 
 
 # =============================================================================
@@ -69,7 +78,7 @@ def calculate_metrics(trades: list) -> dict:
             'win_rate': 0, 'profit_factor': 0, 'avg_pnl_per_trade': 0
         }
     
-    df = pd.DataFrame(trades)
+    df = trades_to_frame(trades)
     
     # Basic metrics
     total_trades = len(df)
@@ -154,6 +163,15 @@ def get_handler_info(strategy: str) -> tuple:
     return None, None
 
 
+def create_interval_config(base_config: dict, interval_sec: int) -> dict:
+    """Copy a strategy config with refill_interval_sec set for every security."""
+    config = {}
+    for security, sec_config in base_config.items():
+        config[security] = sec_config.copy()
+        config[security]['refill_interval_sec'] = interval_sec
+    return config
+
+
 def run_single_scenario(
     strategy: str,
     interval_sec: int,
@@ -163,18 +181,25 @@ def run_single_scenario(
     chunk_size: int,
     workers: int,
     output_dir: str,
-    collect_trades: bool = False
+    collect_trades: bool = False,
+    results: dict = None,
+    elapsed_offset: float = 0.0,
+    pool: WarmWorkerPool = None
 ) -> dict:
-    """Run a single sweep scenario using parallel backtest for securities."""
+    """Run a single sweep scenario using parallel backtest for securities.
+    
+    Args:
+        results: Per-security results already computed by a single-pass sweep
+                 (the backtest is skipped and only metrics/outputs are built)
+        elapsed_offset: Share of the single-pass run time charged to this scenario
+        pool: Warm worker pool to dispatch the scenario to (data stays
+              resident between scenarios) instead of a fresh process pool
+    """
     
     scenario_id = f"{strategy}_{interval_sec}s"
-    start_time = time.time()
+    start_time = time.time() - elapsed_offset
     
-    # Modify config with interval
-    config = {}
-    for security, sec_config in base_config.items():
-        config[security] = sec_config.copy()
-        config[security]['refill_interval_sec'] = interval_sec
+    config = create_interval_config(base_config, interval_sec)
     
     # Get handler info
     handler_module, handler_function = get_handler_info(strategy)
@@ -182,18 +207,22 @@ def run_single_scenario(
         return {'scenario_id': scenario_id, 'error': f'Unknown strategy: {strategy}'}
     
     try:
-        # Use the existing parallel backtest infrastructure
-        results = run_parallel_backtest_parquet(
-            parquet_dir=parquet_dir,
-            handler_module=handler_module,
-            handler_function=handler_function,
-            config=config,
-            max_files=max_sheets,
-            chunk_size=chunk_size,
-            max_workers=workers,
-            output_dir=None,  # Don't write CSVs for each security
-            write_csv=False
-        )
+        if results is None and pool is not None:
+            results = pool.run_scenario(handler_module, handler_function, config,
+                                        chunk_size=chunk_size)
+        elif results is None:
+            # Use the existing parallel backtest infrastructure
+            results = run_parallel_backtest_parquet(
+                parquet_dir=parquet_dir,
+                handler_module=handler_module,
+                handler_function=handler_function,
+                config=config,
+                max_files=max_sheets,
+                chunk_size=chunk_size,
+                max_workers=workers,
+                output_dir=None,  # Don't write CSVs for each security
+                write_csv=False
+            )
         
         # Aggregate all trades
         all_trades = []
@@ -242,7 +271,7 @@ def run_single_scenario(
         if collect_trades and per_security_trades:
             for security, trades in per_security_trades.items():
                 if trades:
-                    trades_df = pd.DataFrame(trades)
+                    trades_df = trades_to_frame(trades)
                     trades_df.to_csv(scenario_output_dir / f'{security}_trades.csv', index=False)
         
         result = {
@@ -315,7 +344,7 @@ def plot_cumulative_pnl_by_strategy(all_results: dict, output_dir: Path):
             if not trades:
                 continue
             
-            df = pd.DataFrame(trades)
+            df = trades_to_frame(trades)
             if 'realized_pnl' not in df.columns:
                 continue
             
@@ -368,7 +397,7 @@ def plot_pnl_by_security(all_results: dict, output_dir: Path):
             if not trades:
                 continue
             
-            df = pd.DataFrame(trades)
+            df = trades_to_frame(trades)
             if 'pnl' not in df.columns:
                 continue
             
@@ -601,12 +630,18 @@ def run_sweep(
     max_sheets: int = None,
     chunk_size: int = 100000,
     workers: int = None,
-    collect_trades: bool = True
+    collect_trades: bool = True,
+    single_pass: bool = False,
+    warm_pool: bool = False
 ) -> pd.DataFrame:
     """Run parameter sweep across strategies and intervals.
     
     Args:
         collect_trades: If True, collect trades for plotting (uses more memory)
+        single_pass: Evaluate all intervals of a strategy in one pass over each
+                     security's data (event kernel; identical trades)
+        warm_pool: Keep one worker pool with all data resident for the whole
+                   sweep and dispatch each scenario to it (src/warm_pool.py)
     """
     
     if workers is None:
@@ -624,6 +659,8 @@ def run_sweep(
     print(f"Max sheets: {max_sheets or 'All'}")
     print(f"Output: {output_dir}")
     print(f"Collect trades for plots: {collect_trades}")
+    print(f"Single pass per strategy: {single_pass}")
+    print(f"Warm worker pool: {warm_pool}")
     print("=" * 80)
     
     # Load configs
@@ -634,37 +671,66 @@ def run_sweep(
     total_scenarios = len(strategies) * len(intervals)
     completed = 0
     
-    for strategy in strategies:
-        base_config = v1_config if strategy == 'v1' else v2_config
+    # One pool for every scenario: data is loaded once, workers stay up
+    pool = None
+    if warm_pool:
+        pool = WarmWorkerPool(parquet_dir, max_workers=workers, max_files=max_sheets)
+    
+    try:
+        for strategy in strategies:
+            base_config = v1_config if strategy == 'v1' else v2_config
+        
+            # Single pass: all intervals of this strategy share one data pass
+            pass_results = [None] * len(intervals)
+            pass_elapsed = 0.0
+            handler_module, _ = get_handler_info(strategy)
+            kernel_name = get_kernel_strategy_name(handler_module) if handler_module else None
+            if single_pass and kernel_name:
+                print(f"\nSingle pass: {strategy} x {len(intervals)} intervals...")
+                pass_start = time.time()
+                pass_results = run_parallel_sweep_parquet(
+                    parquet_dir=parquet_dir,
+                    strategy_name=kernel_name,
+                    configs=[create_interval_config(base_config, i) for i in intervals],
+                    max_workers=workers,
+                    max_files=max_sheets
+                )
+                pass_elapsed = (time.time() - pass_start) / len(intervals)
         
-        for interval in intervals:
-            completed += 1
-            scenario_id = f"{strategy}_{interval}s"
+            for interval, precomputed in zip(intervals, pass_results):
+                completed += 1
+                scenario_id = f"{strategy}_{interval}s"
             
-            print(f"\n[{completed}/{total_scenarios}] Running {scenario_id}...")
+                print(f"\n[{completed}/{total_scenarios}] Running {scenario_id}...")
             
-            result = run_single_scenario(
-                strategy=strategy,
-                interval_sec=interval,
-                base_config=base_config,
-                parquet_dir=parquet_dir,
-                max_sheets=max_sheets,
-                chunk_size=chunk_size,
-                workers=workers,
-                output_dir=output_dir,
-                collect_trades=collect_trades
-            )
+                result = run_single_scenario(
+                    strategy=strategy,
+                    interval_sec=interval,
+                    base_config=base_config,
+                    parquet_dir=parquet_dir,
+                    max_sheets=max_sheets,
+                    chunk_size=chunk_size,
+                    workers=workers,
+                    output_dir=output_dir,
+                    collect_trades=collect_trades,
+                    results=precomputed,
+                    elapsed_offset=pass_elapsed,
+                    pool=pool
+                )
             
-            if 'error' in result:
-                print(f"  [X] Error: {result['error']}")
-            else:
-                metrics = result.get('metrics', {})
-                print(f"  [OK] {result['total_trades']:,} trades, "
-                      f"P&L: {metrics.get('total_pnl', 0):,.0f}, "
-                      f"Sharpe: {metrics.get('sharpe_ratio', 0):.2f}, "
-                      f"in {result['elapsed']:.1f}s")
+                if 'error' in result:
+                    print(f"  [X] Error: {result['error']}")
+                else:
+                    metrics = result.get('metrics', {})
+                    print(f"  [OK] {result['total_trades']:,} trades, "
+                          f"P&L: {metrics.get('total_pnl', 0):,.0f}, "
+                          f"Sharpe: {metrics.get('sharpe_ratio', 0):.2f}, "
+                          f"in {result['elapsed']:.1f}s")
             
-            all_results[scenario_id] = result
+                all_results[scenario_id] = result
+    finally:
+        if pool is not None:
+            pool.close()
     
     total_elapsed = time.time() - start_time
     
@@ -794,6 +860,10 @@ def main():
                        help='Workers for parallel processing')
     parser.add_argument('--no-plots', action='store_true',
                        help='Skip plot generation (faster, less memory)')
+    parser.add_argument('--single-pass', action='store_true',
+                       help='Run all intervals of a strategy in one data pass per security')
+    parser.add_argument('--warm-pool', action='store_true',
+                       help='Reuse one worker pool with all data resident across scenarios')
     
     args = parser.parse_args()
     
@@ -821,7 +891,9 @@ def main():
         max_sheets=args.max_sheets,
         chunk_size=args.chunk_size,
         workers=args.workers,
-        collect_trades=not args.no_plots
+        collect_trades=not args.no_plots,
+        single_pass=args.single_pass,
+        warm_pool=args.warm_pool
     )
     
     return results_df
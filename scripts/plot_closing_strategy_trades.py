@@ -11,6 +11,10 @@ For each security, generates a continuous chart showing:
 - Exit buy: green star
 - Exit sell: red star
 - Alternating day shading for visual separation
+
+Strategy trades are read from per-security ``{security}_trades.csv`` files
+or from a result store scenario directory
+(``<store>/strategy=closing_strategy/scenario=<scenario>``).
 """
 
 import os
@@ -28,18 +32,43 @@ sys.path.insert(0, PROJECT_ROOT)
 
 def load_raw_trades(parquet_path: str) -> pd.DataFrame:
     """Load raw trade data from parquet file."""
-    df = pd.read_parquet(parquet_path)
+    from src.parquet_loader import read_parquet_file
+
+    df = read_parquet_file(parquet_path)
     # Filter to TRADE events only and trading hours (10:00-15:00)
-    trades = df[df['type'] == 'TRADE'].copy()
+    trades = df[df['type'].astype(str).str.upper() == 'TRADE'].copy()
     trades['timestamp'] = pd.to_datetime(trades['timestamp'])
     trades = trades[(trades['timestamp'].dt.hour >= 10) & 
                     (trades['timestamp'].dt.hour < 15)]
     return trades
 
 
+def find_trade_files(trades_dir: str) -> dict:
+    """Strategy trade files keyed by security.
+
+    A result store scenario directory yields its Parquet partitions,
+    any other directory its {security}_trades.csv files.
+    """
+    from src.result_store import scenario_partitions
+
+    files = {security: str(path) for security, path in scenario_partitions(trades_dir).items()}
+    if files:
+        return files
+    return {f.replace('_trades.csv', ''): os.path.join(trades_dir, f)
+            for f in sorted(os.listdir(trades_dir))
+            if f.endswith('_trades.csv') and not f.startswith('backtest')}
+
+
+def read_trades_file(trades_path: str) -> pd.DataFrame:
+    """Read a strategy trade file (CSV or Parquet partition)."""
+    if trades_path.endswith('.parquet'):
+        return pd.read_parquet(trades_path)
+    return pd.read_csv(trades_path)
+
+
 def load_strategy_trades(trades_csv_path: str) -> pd.DataFrame:
-    """Load strategy trades from CSV."""
-    df = pd.read_csv(trades_csv_path)
+    """Load strategy trades from CSV (or a result store Parquet partition)."""
+    df = read_trades_file(trades_csv_path)
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     # Calculate cumulative P&L
     df = df.sort_values('timestamp')
@@ -219,24 +248,22 @@ def generate_summary_plot(trades_dir: str, output_dir: str, config: dict = None)
     all_trades = []
     security_pnl = {}
     
-    for f in os.listdir(trades_dir):
-        if f.endswith('_trades.csv') and not f.startswith('backtest'):
-            security = f.replace('_trades.csv', '')
-            trades_path = os.path.join(trades_dir, f)
-            
-            try:
-                df = pd.read_csv(trades_path)
-                if len(df) == 0:
-                    continue
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df['security'] = security
-                all_trades.append(df)
-                
-                # Calculate final P&L for this security
-                security_pnl[security] = df['realized_pnl'].sum()
-            except Exception as e:
-                print(f"  ⚠ Error loading {f}: {e}")
+    for security, trades_path in find_trade_files(trades_dir).items():
+        f = os.path.basename(trades_path)
+        
+        try:
+            df = read_trades_file(trades_path)
+            if len(df) == 0:
                 continue
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df['security'] = security
+            all_trades.append(df)
+            
+            # Calculate final P&L for this security
+            security_pnl[security] = df['realized_pnl'].sum()
+        except Exception as e:
+            print(f"  ⚠ Error loading {f}: {e}")
+            continue
     
     if not all_trades:
         print("  No trades to generate summary plot")
@@ -492,7 +519,8 @@ def generate_all_plots(
     
     Args:
         parquet_dir: Directory with parquet files
-        trades_dir: Directory with strategy trade CSVs
+        trades_dir: Directory with strategy trade CSVs (or a result store
+                    scenario directory)
         output_dir: Output directory for plots
         securities: List of securities to plot (None = all)
         config: Strategy configuration dict for parameter display
@@ -500,22 +528,20 @@ def generate_all_plots(
     os.makedirs(output_dir, exist_ok=True)
     
     # Get list of securities to plot
+    trade_files = find_trade_files(trades_dir)
     if securities is None:
-        securities = []
-        for f in os.listdir(trades_dir):
-            if f.endswith('_trades.csv'):
-                securities.append(f.replace('_trades.csv', ''))
+        securities = list(trade_files)
     
     print(f"Generating plots for {len(securities)} securities...")
     
     for security in securities:
         parquet_path = os.path.join(parquet_dir, f'{security}.parquet')
-        trades_path = os.path.join(trades_dir, f'{security}_trades.csv')
+        trades_path = trade_files.get(security)
         
         if not os.path.exists(parquet_path):
             print(f"  ⚠ {security}: No parquet file found")
             continue
-        if not os.path.exists(trades_path):
+        if trades_path is None:
             print(f"  ⚠ {security}: No trades file found")
             continue
         
@@ -554,7 +580,7 @@ def main():
     parser.add_argument(
         '--trades-dir',
         default='output/closing_strategy',
-        help='Directory with strategy trade CSVs'
+        help='Directory with strategy trade CSVs or result store scenario directory'
     )
     parser.add_argument(
         '--output-dir',
@@ -10,6 +10,7 @@ import matplotlib.pyplot as plt
 from src.market_making_backtest import MarketMakingBacktest
 from src.mm_handler import create_mm_handler
 from src.config_loader import load_strategy_config
+from src.result_transport import trades_to_frame
 
 OUTPUT_DIR = Path('output')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -52,7 +53,7 @@ def main():
         sys.exit(0)
 
     # Build DataFrame from trades
-    trade_df = pd.DataFrame(trades)
+    trade_df = trades_to_frame(trades)
     trade_df = trade_df.sort_values('timestamp').reset_index(drop=True)
     # Ensure timestamp is datetime
     trade_df['timestamp'] = pd.to_datetime(trade_df['timestamp'])
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+Run a Closing Strategy Parameter Grid
+
+Evaluates the full cartesian product of the given parameter values for
+every security. Each worker receives one security (as a file path, not a
+pickled DataFrame), loads it once and evaluates all grid points locally
+with the vectorized engine (see src/closing_strategy/grid.py).
+
+Usage:
+    # Spread x VWAP period grid
+    python scripts/run_closing_grid.py --spread 0.3 0.5 0.7 --vwap-period 15 30 45 60
+
+    # Grid from a JSON file ({"spread_vwap_pct": [0.3, 0.5], ...})
+    python scripts/run_closing_grid.py --grid configs/closing_grid.json
+
+    # Trend filter thresholds and fits, 4 workers, mapped tick cache
+    python scripts/run_closing_grid.py --trend-threshold-sell 5 10 20 --trend-mode ols ewm \\
+        --workers 4 --tick-cache
+
+Output:
+    output/closing_grid/grid_results.parquet   # One row per (security, grid point)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.closing_strategy.grid import expand_grid, run_closing_grid
+
+
+# CLI flag -> grid parameter
+GRID_FLAGS = {
+    'spread': 'spread_vwap_pct',
+    'vwap_period': 'vwap_preclose_period_min',
+    'stop_loss': 'stop_loss_threshold_pct',
+    'trend_filter_sell': 'trend_filter_sell_enabled',
+    'trend_threshold_sell': 'trend_filter_sell_threshold_bps_hr',
+    'trend_filter_buy': 'trend_filter_buy_enabled',
+    'trend_threshold_buy': 'trend_filter_buy_threshold_bps_hr',
+    'trend_mode': 'trend_filter_mode',
+    'trend_halflife': 'trend_filter_halflife_min',
+    'trend_window': 'trend_filter_window_min',
+    'auction_fill_pct': 'auction_fill_pct',
+}
+
+
+def parse_bool(value: str) -> bool:
+    """Parse on/off style flag values."""
+    value = value.lower()
+    if value in ('1', 'true', 'yes', 'on'):
+        return True
+    if value in ('0', 'false', 'no', 'off'):
+        return False
+    raise argparse.ArgumentTypeError(f"Expected true/false, got {value!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run a Closing Strategy Parameter Grid',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python scripts/run_closing_grid.py --spread 0.3 0.5 --vwap-period 15 30
+    python scripts/run_closing_grid.py --grid configs/closing_grid.json --max-sheets 5
+        """
+    )
+
+    parser.add_argument('--parquet-dir', default='data/parquet',
+                        help='Directory with Parquet files (default: data/parquet)')
+    parser.add_argument('--config', default='configs/closing_strategy_config.json',
+                        help='Base config JSON (default: configs/closing_strategy_config.json)')
+    parser.add_argument('--exchange-mapping', default='data/Exchange_mapping.json',
+                        help='Path to exchange mapping JSON (default: data/Exchange_mapping.json)')
+    parser.add_argument('--output', default='output/closing_grid/grid_results.parquet',
+                        help='Results Parquet file (default: output/closing_grid/grid_results.parquet)')
+    parser.add_argument('--grid',
+                        help='JSON file mapping grid parameters to value lists (merged with the flags below)')
+    parser.add_argument('--spread', type=float, nargs='+', help='spread_vwap_pct values')
+    parser.add_argument('--vwap-period', type=float, nargs='+', help='vwap_preclose_period_min values')
+    parser.add_argument('--stop-loss', type=float, nargs='+', help='stop_loss_threshold_pct values')
+    parser.add_argument('--trend-filter-sell', type=parse_bool, nargs='+',
+                        help='trend_filter_sell_enabled values (true/false)')
+    parser.add_argument('--trend-threshold-sell', type=float, nargs='+',
+                        help='trend_filter_sell_threshold_bps_hr values')
+    parser.add_argument('--trend-filter-buy', type=parse_bool, nargs='+',
+                        help='trend_filter_buy_enabled values (true/false)')
+    parser.add_argument('--trend-threshold-buy', type=float, nargs='+',
+                        help='trend_filter_buy_threshold_bps_hr values')
+    parser.add_argument('--trend-mode', choices=['ols', 'ewm', 'rolling'], nargs='+',
+                        help='trend_filter_mode values')
+    parser.add_argument('--trend-halflife', type=float, nargs='+',
+                        help='trend_filter_halflife_min values (ewm)')
+    parser.add_argument('--trend-window', type=float, nargs='+',
+                        help='trend_filter_window_min values (rolling)')
+    parser.add_argument('--auction-fill-pct', type=float, nargs='+',
+                        help='Max fill as percentage of auction volume (default: 10.0)')
+    parser.add_argument('--max-sheets', type=int, help='Limit number of securities to process')
+    parser.add_argument('--workers', type=int,
+                        help='Number of parallel workers (default: CPU count)')
+    parser.add_argument('--tick-cache', action='store_true',
+                        help='Workers map the sorted Arrow cache (parquet-dir/.tick_cache)')
+    parser.add_argument('--exact-vwap', action='store_true',
+                        help='Row-order VWAP sums per period instead of the prefix-sum cache')
+
+    args = parser.parse_args()
+
+    # Resolve paths
+    for name in ('parquet_dir', 'config', 'exchange_mapping', 'output'):
+        path = getattr(args, name)
+        if not os.path.isabs(path):
+            setattr(args, name, os.path.join(PROJECT_ROOT, path))
+
+    grid = {}
+    if args.grid:
+        with open(args.grid, 'r') as f:
+            grid.update(json.load(f))
+    for flag, param in GRID_FLAGS.items():
+        values = getattr(args, flag)
+        if values is not None:
+            # Whole minutes stay integers in the results table
+            if param == 'vwap_preclose_period_min':
+                values = [int(v) if float(v).is_integer() else v for v in values]
+            grid[param] = values
+    if not grid:
+        parser.error('No grid given (use --grid or at least one value flag)')
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    exchange_mapping = {}
+    if os.path.exists(args.exchange_mapping):
+        with open(args.exchange_mapping, 'r') as f:
+            exchange_mapping = json.load(f)
+    else:
+        print(f"Warning: Exchange mapping file not found at {args.exchange_mapping}")
+
+    print("=" * 60)
+    print("CLOSING STRATEGY GRID")
+    print("=" * 60)
+    for param, values in grid.items():
+        print(f"  {param}: {values}")
+    print(f"Grid points: {len(expand_grid(grid))}")
+
+    start_time = time.time()
+    results = run_closing_grid(
+        parquet_dir=args.parquet_dir,
+        config=config,
+        grid=grid,
+        exchange_mapping=exchange_mapping,
+        max_securities=args.max_sheets,
+        workers=args.workers,
+        tick_cache=args.tick_cache,
+        exact_vwap=args.exact_vwap,
+        output_path=args.output,
+    )
+
+    # Best point per security and best uniform point
+    params = [p for p in grid if p in results.columns]
+    print("\n" + "=" * 60)
+    print("BEST GRID POINT PER SECURITY (by P&L)")
+    print("=" * 60)
+    for security, sec_df in results.groupby('security'):
+        best = sec_df.loc[sec_df['pnl'].idxmax()]
+        values = ', '.join(f"{p}={best[p]}" for p in params)
+        print(f"  {security}: {best['pnl']:,.2f} AED ({values})")
+
+    totals = results.groupby('point')['pnl'].sum()
+    best_point = results[results['point'] == totals.idxmax()].iloc[0]
+    values = ', '.join(f"{p}={best_point[p]}" for p in params)
+    print(f"\nBest UNIFORM point: {values} -> Total P&L: {totals.max():,.2f} AED")
+    print(f"Processing time: {time.time() - start_time:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
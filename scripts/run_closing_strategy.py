@@ -31,11 +31,29 @@ Usage:
     
     # Custom trend filter threshold (bps/hour)
     python scripts/run_closing_strategy.py --trend-threshold 15.0
+    
+    # Exponentially weighted trend fit (30 min half-life)
+    python scripts/run_closing_strategy.py --trend-mode ewm --trend-halflife 30
+    
+    # Reuse the memory-mapped Arrow cache across runs
+    python scripts/run_closing_strategy.py --tick-cache
+    
+    # Workers inherit preloaded data (fork; memory-mapped cache elsewhere)
+    python scripts/run_closing_strategy.py --preload
+    
+    # Vectorized per-day engine (same trades, no per-tick loop)
+    python scripts/run_closing_strategy.py --vectorized
+    
+    # Typed Parquet results in a result store (CSV optional)
+    python scripts/run_closing_strategy.py --result-store output/results --scenario spread_0.5 --no-csv
 
 Output:
     output/closing_strategy/
     ├── {security}_trades.csv    # Per-security trade log
     └── backtest_summary.csv     # Aggregate metrics
+
+    With --result-store, trades are also written to
+    <store>/strategy=closing_strategy/scenario=<scenario>/ (see src/result_store.py)
 """
 
 import argparse
@@ -54,10 +72,16 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.closing_strategy.strategy import ClosingStrategy
 from src.closing_strategy.handler import process_security_closing_strategy
+from src.closing_strategy.preload import get_resident_data, release_resident, start_resident_pool
+from src.closing_strategy.vectorized import process_security_closing_vectorized
+from src.parquet_loader import read_parquet_file
+from src.result_store import ResultStore
+from src.result_transport import trades_to_frame
+from src.tick_cache import build_tick_cache, open_tick_cache
 
 
-def load_parquet_data(parquet_dir: str, max_sheets: int = None) -> dict:
-    """Load data from Parquet files."""
+def list_parquet_files(parquet_dir: str, max_sheets: int = None) -> list:
+    """Per-security Parquet files of a directory (first max_sheets)."""
     parquet_path = Path(parquet_dir)
     if not parquet_path.exists():
         raise FileNotFoundError(
@@ -71,11 +95,27 @@ def load_parquet_data(parquet_dir: str, max_sheets: int = None) -> dict:
     
     if max_sheets:
         parquet_files = parquet_files[:max_sheets]
+    return parquet_files
+
+
+def load_parquet_data(parquet_dir: str, max_sheets: int = None, tick_cache: bool = False) -> dict:
+    """Load data from Parquet files.
+    
+    With tick_cache, the sorted data is prepared once in the memory-mapped
+    Arrow cache (src/tick_cache.py) and the returned values are cache file
+    paths; each worker maps the file instead of receiving a pickled copy.
+    """
+    parquet_files = list_parquet_files(parquet_dir, max_sheets)
     
     data = {}
     for pf in parquet_files:
         security = pf.stem.upper()
-        df = pd.read_parquet(pf)
+        if tick_cache:
+            data[security] = str(build_tick_cache(pf, layout='sorted'))
+            continue
+        
+        # Decodes canonical files (int64 tick prices with --price-scale)
+        df = read_parquet_file(pf)
         
         # Ensure timestamp column
         if 'timestamp' not in df.columns and 'Timestamp' in df.columns:
@@ -118,9 +158,15 @@ def load_exchange_mapping(mapping_path: str) -> dict:
 
 def process_security_wrapper(args):
     """Wrapper for parallel processing."""
-    security, df, config, exchange_mapping, auction_fill_pct = args
+    security, df, config, exchange_mapping, auction_fill_pct, vectorized = args
     try:
-        result = process_security_closing_strategy(security, df, config, exchange_mapping, auction_fill_pct)
+        if df is None:
+            # Preloaded: inherited from the parent or mapped from the cache
+            df = get_resident_data(security)
+        elif isinstance(df, str):
+            df = open_tick_cache(df)
+        process = process_security_closing_vectorized if vectorized else process_security_closing_strategy
+        result = process(security, df, config, exchange_mapping, auction_fill_pct)
         return result
     except Exception as e:
         return {
@@ -149,6 +195,15 @@ def run_closing_strategy_backtest(
     trend_filter_sell_threshold: float = None,
     trend_filter_buy_enabled: bool = False,
     trend_filter_buy_threshold: float = None,
+    tick_cache: bool = False,
+    result_store: str = None,
+    scenario: str = 'default',
+    write_csv: bool = True,
+    vectorized: bool = False,
+    trend_mode: str = None,
+    trend_halflife_min: float = None,
+    trend_window_min: float = None,
+    preload: bool = False,
 ):
     """
     Run closing strategy backtest.
@@ -169,6 +224,17 @@ def run_closing_strategy_backtest(
         trend_filter_sell_threshold: Override trend_filter_sell_threshold_bps_hr
         trend_filter_buy_enabled: Enable trend filter for BUY entries (default False)
         trend_filter_buy_threshold: Override trend_filter_buy_threshold_bps_hr
+        tick_cache: Share data with workers through the memory-mapped Arrow cache
+        result_store: Also write results to this partitioned Parquet result store
+        scenario: Scenario partition in the result store
+        write_csv: Write the per-security trade CSVs
+        vectorized: Use the vectorized per-day engine (src/closing_strategy/vectorized.py)
+        trend_mode: Override trend_filter_mode (ols, ewm or rolling)
+        trend_halflife_min: Override trend_filter_halflife_min (ewm)
+        trend_window_min: Override trend_filter_window_min (rolling)
+        preload: Load all data in the parent before forking the workers, so
+                 tasks carry only the security name and config (memory-mapped
+                 tick cache where fork is unavailable; src/closing_strategy/preload.py)
     """
     print("=" * 60)
     print("CLOSING STRATEGY BACKTEST")
@@ -207,23 +273,40 @@ def run_closing_strategy_backtest(
     for security in config:
         config[security]['trend_filter_sell_enabled'] = trend_filter_sell_enabled
         config[security]['trend_filter_buy_enabled'] = trend_filter_buy_enabled
-    
-    # Load data
+        if trend_mode is not None:
+            config[security]['trend_filter_mode'] = trend_mode
+        if trend_halflife_min is not None:
+            config[security]['trend_filter_halflife_min'] = trend_halflife_min
+        if trend_window_min is not None:
+            config[security]['trend_filter_window_min'] = trend_window_min
+    
+    # Load data (preload: made resident when the pool starts)
     print(f"\nLoading data from {parquet_dir}...")
-    data = load_parquet_data(parquet_dir, max_sheets)
+    if preload:
+        parquet_files = list_parquet_files(parquet_dir, max_sheets)
+        data = {pf.stem.upper(): None for pf in parquet_files}
+    else:
+        data = load_parquet_data(parquet_dir, max_sheets, tick_cache=tick_cache)
     print(f"Loaded {len(data)} securities")
     
-    # Prepare tasks (include exchange_mapping and auction_fill_pct)
-    tasks = [(security, df, config, exchange_mapping, auction_fill_pct) for security, df in data.items()]
+    # Prepare tasks (include exchange_mapping, auction_fill_pct and engine);
+    # each task carries only its own security's config
+    tasks = [(security, df, {security: config.get(security, {})}, exchange_mapping,
+              auction_fill_pct, vectorized)
+             for security, df in data.items()]
     
     # Process in parallel
     if workers is None:
         workers = min(os.cpu_count() or 4, len(tasks))
     
-    print(f"\nProcessing with {workers} workers...")
+    print(f"\nProcessing with {workers} workers ({'vectorized' if vectorized else 'tick'} engine)...")
     results = []
     
-    with ProcessPoolExecutor(max_workers=workers) as executor:
+    if preload:
+        executor = start_resident_pool(parquet_files, max_workers=workers)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    with executor:
         futures = {executor.submit(process_security_wrapper, task): task[0] 
                    for task in tasks}
         
@@ -241,6 +324,7 @@ def run_closing_strategy_backtest(
                           f"P&L: {result.get('pnl', 0):,.2f} AED")
             except Exception as e:
                 print(f"  ❌ {security}: {e}")
+    release_resident()
     
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
@@ -251,21 +335,9 @@ def run_closing_strategy_backtest(
         security = result['security']
         trades = result.get('trades', [])
         
-        if trades:
-            # Convert trades to DataFrame
-            trade_records = []
-            for t in trades:
-                trade_records.append({
-                    'timestamp': t.timestamp,
-                    'side': t.side,
-                    'price': t.price,
-                    'quantity': t.quantity,
-                    'realized_pnl': t.realized_pnl,
-                    'trade_type': t.trade_type,
-                    'vwap_reference': t.vwap_reference,
-                })
-            
-            trades_df = pd.DataFrame(trade_records)
+        if trades and write_csv:
+            # Columnar trade ledger -> DataFrame (no per-trade records)
+            trades_df = trades_to_frame(trades)
             trades_df['security'] = security
             
             # Save per-security
@@ -274,6 +346,17 @@ def run_closing_strategy_backtest(
             
             all_trades.append(trades_df)
     
+    # Save typed results to the result store
+    trades_dir = output_dir
+    if result_store:
+        store = ResultStore(result_store)
+        trades_dir = str(store.write_scenario(
+            'closing_strategy', scenario,
+            {result['security']: result for result in results},
+            params=config
+        ))
+        print(f"Result store partition: {trades_dir}")
+    
     # Save summary
     summary_records = []
     for result in results:
@@ -348,7 +431,7 @@ def run_closing_strategy_backtest(
         plots_dir = os.path.join(output_dir, 'plots')
         generate_all_plots(
             parquet_dir=parquet_dir,
-            trades_dir=output_dir,
+            trades_dir=trades_dir,
             output_dir=plots_dir,
             config=config  # Pass config for parameter display
         )
@@ -448,6 +531,51 @@ Examples:
         type=float,
         help='BUY trend filter threshold in bps/hour (default: 10.0). BUY entries skipped when downtrend < -threshold.'
     )
+    parser.add_argument(
+        '--trend-mode',
+        choices=['ols', 'ewm', 'rolling'],
+        help='Trend slope fit (default: ols over the whole day; see src/closing_strategy/trend.py)'
+    )
+    parser.add_argument(
+        '--trend-halflife',
+        type=float,
+        help='ewm trend fit: weight half-life in minutes (default: 60)'
+    )
+    parser.add_argument(
+        '--trend-window',
+        type=float,
+        help='rolling trend fit: window in minutes (default: 60)'
+    )
+    parser.add_argument(
+        '--tick-cache',
+        action='store_true',
+        help='Share sorted data with workers via the memory-mapped Arrow cache (parquet-dir/.tick_cache)'
+    )
+    parser.add_argument(
+        '--preload',
+        action='store_true',
+        help='Preload data in the parent and fork the workers (tasks carry no data; '
+             'memory-mapped tick cache where fork is unavailable)'
+    )
+    parser.add_argument(
+        '--result-store',
+        help='Also write results to this partitioned Parquet result store (e.g., output/results)'
+    )
+    parser.add_argument(
+        '--scenario',
+        default='default',
+        help='Scenario partition in the result store (default: default)'
+    )
+    parser.add_argument(
+        '--no-csv',
+        action='store_true',
+        help='Skip the per-security trade CSVs (use with --result-store)'
+    )
+    parser.add_argument(
+        '--vectorized',
+        action='store_true',
+        help='Use the vectorized per-day engine (same trades as the tick loop, much faster)'
+    )
     
     args = parser.parse_args()
     
@@ -460,6 +588,8 @@ Examples:
         args.output_dir = os.path.join(PROJECT_ROOT, args.output_dir)
     if not os.path.isabs(args.exchange_mapping):
         args.exchange_mapping = os.path.join(PROJECT_ROOT, args.exchange_mapping)
+    if args.result_store and not os.path.isabs(args.result_store):
+        args.result_store = os.path.join(PROJECT_ROOT, args.result_store)
     
     run_closing_strategy_backtest(
         parquet_dir=args.parquet_dir,
@@ -477,6 +607,15 @@ Examples:
         trend_filter_sell_threshold=args.trend_threshold_sell,
         trend_filter_buy_enabled=args.trend_filter_buy,
         trend_filter_buy_threshold=args.trend_threshold_buy,
+        tick_cache=args.tick_cache,
+        result_store=args.result_store,
+        scenario=args.scenario,
+        write_csv=not args.no_csv,
+        vectorized=args.vectorized,
+        trend_mode=args.trend_mode,
+        trend_halflife_min=args.trend_halflife,
+        trend_window_min=args.trend_window,
+        preload=args.preload,
     )
 
 
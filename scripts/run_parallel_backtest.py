@@ -175,6 +175,10 @@ Examples:
   # Benchmark comparison (sequential vs parallel)
   python scripts/run_parallel_backtest.py --strategy v1_baseline --benchmark
   
+  # Typed Parquet results instead of CSV
+  python scripts/run_parallel_backtest.py --strategy v1_baseline \\
+      --result-store output/results --scenario baseline --no-csv
+  
   # Custom config and output directory
   python scripts/run_parallel_backtest.py --strategy v2_price_follow_qty_cooldown \\
       --config configs/v2_price_follow_qty_cooldown_config.json \\
@@ -200,6 +204,30 @@ Examples:
                        help='Run benchmark comparison vs sequential version')
     parser.add_argument('--only-trades', action='store_true',
                        help='Filter to trade events only (faster but may affect some strategies)')
+    parser.add_argument('--engine', choices=['handler', 'kernel'], default='handler',
+                       help='Parquet engine: chunked handlers or columnar event kernel (default: handler)')
+    parser.add_argument('--max-memory-mb', type=float, default=None,
+                       help='Stream Parquet record batches under this per-worker memory ceiling')
+    parser.add_argument('--prefetch', action='store_true',
+                       help='Prefetch the next Parquet record batch on a background thread')
+    parser.add_argument('--tick-cache', action='store_true',
+                       help='Read Parquet data through the memory-mapped Arrow cache (data/parquet/.tick_cache)')
+    parser.add_argument('--result-transport', choices=['pickle', 'arrow'], default='pickle',
+                       help='Return worker trades pickled or as Arrow IPC file handles (default: pickle)')
+    parser.add_argument('--schedule', choices=['lpt', 'name'], default='lpt',
+                       help='Submit securities longest-first from recorded runtimes (lpt) or by name (default: lpt)')
+    parser.add_argument('--day-shards', action='store_true',
+                       help='Split the most expensive securities into parallel day shards (kernel engine only)')
+    parser.add_argument('--book-depth', choices=['top', 'sorted', 'full'], default='top',
+                       help='Order book for the handler engine: top of book, sorted levels or tick-grid depth (default: top)')
+    parser.add_argument('--result-store',
+                       help='Also write results to this partitioned Parquet result store (e.g., output/results)')
+    parser.add_argument('--scenario', default='default',
+                       help='Scenario partition in the result store (default: default)')
+    parser.add_argument('--no-csv', action='store_true',
+                       help='Skip the per-security CSV files (use with --result-store)')
+    parser.add_argument('--trade-sink-dir',
+                       help='Spill fills to Parquet part files under a new run subdirectory of this directory (handler engine)')
     
     args = parser.parse_args()
     
@@ -275,7 +303,18 @@ Examples:
             max_files=args.max_sheets,
             chunk_size=args.chunk_size,
             output_dir=output_dir,
-            write_csv=True
+            write_csv=not args.no_csv,
+            engine=args.engine,
+            max_memory_mb=args.max_memory_mb,
+            prefetch=args.prefetch,
+            tick_cache=args.tick_cache,
+            result_transport=args.result_transport,
+            schedule=args.schedule,
+            day_shards=args.day_shards,
+            book_depth=args.book_depth,
+            result_store=args.result_store,
+            scenario=args.scenario,
+            trade_sink_dir=args.trade_sink_dir
         )
     else:
         results = run_parallel_backtest(
@@ -289,7 +328,9 @@ Examples:
             header_row=3,
             only_trades=args.only_trades,
             output_dir=output_dir,
-            write_csv=True
+            write_csv=not args.no_csv,
+            result_store=args.result_store,
+            scenario=args.scenario
         )
     
     # Print final summary
@@ -327,9 +368,13 @@ Examples:
     print(f"\n{'TOTAL':12s}: {total_trades:6,} trades, P&L: {total_pnl:12,.0f}")
     print("="*80)
     
-    print(f"\n[OK] Results saved to: {output_dir}/")
-    print(f"  - backtest_summary.csv")
-    print(f"  - {{security}}_trades_timeseries.csv (per security)")
+    if not args.no_csv:
+        print(f"\n[OK] Results saved to: {output_dir}/")
+        print(f"  - backtest_summary.csv")
+        print(f"  - {{security}}_trades_timeseries.csv (per security)")
+    if args.result_store:
+        print(f"\n[OK] Result store: {args.result_store}/ "
+              f"(strategy={args.strategy}, scenario={args.scenario})")
 
 
 if __name__ == '__main__':
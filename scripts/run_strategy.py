@@ -22,6 +22,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from src.market_making_backtest import MarketMakingBacktest
 from src.config_loader import load_strategy_config
 from src.parquet_utils import ensure_parquet_data
+from src.result_transport import trades_to_frame
 
 
 def import_strategy_handler(strategy_name: str):
@@ -71,7 +72,7 @@ def save_results(results: dict, strategy_name: str, output_dir: str):
     # Save per-security trade timeseries
     for security, data in results.items():
         if 'trades' in data and len(data['trades']) > 0:
-            trades_df = pd.DataFrame(data['trades'])
+            trades_df = trades_to_frame(data['trades'])
             csv_path = os.path.join(strategy_output, f"{security}_trades_timeseries.csv")
             trades_df.to_csv(csv_path, index=False)
             print(f"Saved: {csv_path}")
@@ -2,6 +2,10 @@
 """
 Sweep VWAP parameters per security to find optimal values.
 Can sweep spread_vwap_pct or vwap_preclose_period_min.
+
+The sweep is a one-parameter grid for src/closing_strategy/grid.py: one
+task per security, which loads the data once in the worker and evaluates
+every value there (period values from the prefix-sum VWAP cache).
 """
 
 import sys
@@ -9,32 +13,12 @@ import os
 import json
 import pandas as pd
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.closing_strategy.handler import process_security_closing_strategy
-
-
-def load_parquet_data(parquet_dir: str) -> dict:
-    """Load data from Parquet files."""
-    parquet_path = Path(parquet_dir)
-    parquet_files = list(parquet_path.glob("*.parquet"))
-    
-    data = {}
-    for pf in parquet_files:
-        security = pf.stem.upper()
-        df = pd.read_parquet(pf)
-        
-        # Normalize column names
-        col_map = {'Timestamp': 'timestamp', 'Type': 'type', 'Price': 'price', 'Volume': 'volume'}
-        df = df.rename(columns={k: v for k, v in col_map.items() if k in df.columns})
-        df = df.sort_values('timestamp').reset_index(drop=True)
-        data[security] = df
-    
-    return data
+from src.closing_strategy.grid import run_closing_grid
 
 
 def load_exchange_mapping(mapping_path: str) -> dict:
@@ -45,45 +29,6 @@ def load_exchange_mapping(mapping_path: str) -> dict:
     return {}
 
 
-def run_single_security_param(args):
-    """Run backtest for a single security with specific parameters."""
-    security, param_name, param_value, sec_config, df, exchange_mapping, auction_fill_pct = args
-    
-    # Create config with this parameter value
-    config = {security: sec_config.copy()}
-    config[security][param_name] = param_value
-    
-    try:
-        result = process_security_closing_strategy(
-            security, df, config, exchange_mapping, auction_fill_pct
-        )
-        
-        summary = result.get('summary', {})
-        return {
-            'security': security,
-            'param_value': param_value,
-            'pnl': result.get('pnl', 0),
-            'trades': summary.get('total_trades', 0),
-            'auction_entries': summary.get('auction_entries', 0),
-            'vwap_exits': summary.get('vwap_exits', 0),
-            'stop_losses': summary.get('stop_losses', 0),
-            'eod_flattens': summary.get('eod_flattens', 0),
-        }
-    except Exception as e:
-        print(f"  Error {security} @ {param_value}: {e}")
-    
-    return {
-        'security': security,
-        'param_value': param_value,
-        'pnl': 0,
-        'trades': 0,
-        'auction_entries': 0,
-        'vwap_exits': 0,
-        'stop_losses': 0,
-        'eod_flattens': 0,
-    }
-
-
 def main():
     # Configuration - VWAP PRE-CLOSE PERIOD SWEEP
     param_name = 'vwap_preclose_period_min'
@@ -95,6 +40,8 @@ def main():
     exchange_mapping_path = Path("configs/exchange_mapping.json")
     output_dir = Path("output/vwap_period_sweep_1m_cap")
     auction_fill_pct = 10.0
+    use_tick_cache = True  # Workers map shared Arrow cache files instead of reading Parquet
+    workers = None  # Default: CPU count (at most one per security)
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
@@ -105,12 +52,13 @@ def main():
     # Load exchange mapping
     exchange_mapping = load_exchange_mapping(str(exchange_mapping_path))
     
-    # Load all data once
-    print("Loading data...")
-    all_data = load_parquet_data(str(data_dir))
-    
     securities = list(base_config.keys())
     
+    # Grid: the swept parameter (plus the fixed spread when sweeping the period)
+    grid = {param_name: param_values}
+    if param_name == 'vwap_preclose_period_min':
+        grid['spread_vwap_pct'] = [fixed_spread]
+    
     print("=" * 70)
     print(f"VWAP PARAMETER SWEEP: {param_name}")
     print("=" * 70)
@@ -121,40 +69,23 @@ def main():
     print(f"Total runs: {len(securities) * len(param_values)}")
     print()
     
-    # Build task list - pass actual dataframes
-    tasks = []
-    for security in securities:
-        if security in all_data:
-            sec_config = base_config[security].copy()
-            # Apply fixed spread if sweeping period
-            if param_name == 'vwap_preclose_period_min':
-                sec_config['spread_vwap_pct'] = fixed_spread
-            
-            for param_value in param_values:
-                tasks.append((
-                    security, 
-                    param_name,
-                    param_value, 
-                    sec_config,
-                    all_data[security],
-                    exchange_mapping,
-                    auction_fill_pct
-                ))
-    
-    # Run all combinations in parallel
-    results = []
+    # Run all combinations in parallel (one task per security)
     print("Running sweep...")
+    df = run_closing_grid(
+        str(data_dir), base_config, grid,
+        exchange_mapping=exchange_mapping,
+        securities=securities,
+        workers=workers,
+        auction_fill_pct=auction_fill_pct,
+        tick_cache=use_tick_cache,
+        output_path=str(output_dir / "sweep_all_results.parquet"),
+    )
+    df['param_value'] = df[param_name].astype(object)  # Python scalars (JSON config below)
+    df['trades'] = df['total_trades']
+    securities = [s for s in securities if s in set(df['security'])]
+    
+    print(f"\nCompleted all {len(df)} runs")
     
-    with ProcessPoolExecutor(max_workers=8) as executor:
-        for i, result in enumerate(executor.map(run_single_security_param, tasks)):
-            results.append(result)
-            if (i + 1) % 10 == 0:
-                print(f"  Completed {i + 1}/{len(tasks)} runs...")
-    
-    print(f"\nCompleted all {len(tasks)} runs")
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(results)
     
     # Find optimal parameter per security
     print("\n" + "=" * 70)
@@ -247,7 +178,7 @@ def main():
               f"({(total_optimal / total_by_param[best_uniform] - 1) * 100:.1f}%)")
     
     print(f"\nResults saved to: {output_dir}")
-    print(f"  - sweep_all_results.csv (all {len(df)} runs)")
+    print(f"  - sweep_all_results.csv / .parquet (all {len(df)} runs)")
     print(f"  - optimal_per_security.csv (summary)")
     print(f"  - closing_strategy_config_optimal.json (optimized config)")
 
@@ -12,6 +12,11 @@ Usage:
     
     # Detailed comparison with full trade-by-trade analysis
     python scripts/validate_backtest_results.py output/ref output/test --detailed
+    
+    # Compare scenario partitions of a result store (typed Parquet)
+    python scripts/validate_backtest_results.py \
+        output/results/strategy=v1_baseline/scenario=ref \
+        output/results/strategy=v1_baseline/scenario=test
 """
 import argparse
 import sys
@@ -22,6 +27,11 @@ import numpy as np
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from src.result_store import scenario_partitions
+
+# Trade columns the comparison needs
+REQUIRED_COLUMNS = ['timestamp', 'side', 'fill_price', 'fill_qty', 'realized_pnl', 'position', 'pnl']
+
 
 class BacktestValidator:
     """Validates backtest results across different implementations."""
@@ -43,11 +53,48 @@ class BacktestValidator:
             'details': []
         }
     
+    @staticmethod
+    def find_trade_files(dir_path: Path) -> dict:
+        """Trade files of an output directory, keyed by lower-case security.
+        
+        A result store scenario directory (strategy=<s>/scenario=<sc>) yields
+        its Parquet partitions; any other directory its
+        *_trades_timeseries.csv files.
+        """
+        files = scenario_partitions(dir_path)
+        if files:
+            return {security.lower(): path for security, path in files.items()}
+        return {f.stem.replace('_trades_timeseries', ''): f
+                for f in dir_path.glob('*_trades_timeseries.csv')}
+    
+    @staticmethod
+    def read_trades(file_path: Path) -> pd.DataFrame:
+        """Read a trade file (Parquet partitions: only the compared columns).
+        
+        CSV files hold P&L and position rounded to integers, so comparing a
+        Parquet partition against a CSV directory needs --tolerance-pnl 1.
+        """
+        if file_path.suffix == '.parquet':
+            import pyarrow.parquet as pq
+            names = pq.ParquetFile(file_path).schema_arrow.names
+            df = pd.read_parquet(file_path, columns=[c for c in names if c.lower() in REQUIRED_COLUMNS])
+        else:
+            df = pd.read_csv(file_path)
+        # Timestamps are text in CSV and typed in Parquet
+        for col in df.columns:
+            if col.lower().strip() == 'timestamp':
+                df[col] = pd.to_datetime(df[col])
+                if file_path.suffix == '.parquet':
+                    # Same tie order as the CSV writer (trades_csv_frame)
+                    df = df.sort_values(col).reset_index(drop=True)
+        return df
+    
     def compare_directories(self, dir1: str, dir2: str, securities=None, detailed=False):
         """Compare all securities between two output directories.
         
         Args:
-            dir1: First directory (reference)
+            dir1: First directory (reference): CSV output directory or
+                  result store scenario directory
             dir2: Second directory (test)
             securities: Optional list of securities to compare
             detailed: If True, perform trade-by-trade comparison
@@ -63,11 +110,9 @@ class BacktestValidator:
             print(f"❌ ERROR: Directory not found: {dir2}")
             return False
         
-        # Find all trade CSV files
-        csv_files_1 = {f.stem.replace('_trades_timeseries', ''): f 
-                      for f in dir1_path.glob('*_trades_timeseries.csv')}
-        csv_files_2 = {f.stem.replace('_trades_timeseries', ''): f 
-                      for f in dir2_path.glob('*_trades_timeseries.csv')}
+        # Find all trade files (CSV or result store partitions)
+        csv_files_1 = self.find_trade_files(dir1_path)
+        csv_files_2 = self.find_trade_files(dir2_path)
         
         # Filter to requested securities
         if securities:
@@ -146,8 +191,8 @@ class BacktestValidator:
         
         try:
             # Read both files
-            df1 = pd.read_csv(file1)
-            df2 = pd.read_csv(file2)
+            df1 = self.read_trades(file1)
+            df2 = self.read_trades(file2)
             
             result['trade_count_ref'] = len(df1)
             result['trade_count_test'] = len(df2)
@@ -168,9 +213,7 @@ class BacktestValidator:
             df2.columns = [c.lower().strip() for c in df2.columns]
             
             # Check 2: Required columns present
-            required_cols = ['timestamp', 'side', 'fill_price', 'fill_qty', 'realized_pnl', 'position', 'pnl']
-            
-            for col in required_cols:
+            for col in REQUIRED_COLUMNS:
                 if col not in df1.columns or col not in df2.columns:
                     result['issues'].append(f"Missing column: {col}")
                     result['status'] = 'FAILED'
@@ -320,8 +363,8 @@ Examples:
         """
     )
     
-    parser.add_argument('dir1', help='Reference output directory')
-    parser.add_argument('dir2', help='Test output directory')
+    parser.add_argument('dir1', help='Reference output directory (CSV or result store scenario)')
+    parser.add_argument('dir2', help='Test output directory (CSV or result store scenario)')
     parser.add_argument('--securities', nargs='+', default=None,
                        help='Specific securities to compare (default: all)')
     parser.add_argument('--detailed', action='store_true',
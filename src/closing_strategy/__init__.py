@@ -9,5 +9,9 @@ A closing auction arbitrage strategy that:
 
 from .strategy import ClosingStrategy
 from .handler import create_closing_strategy_handler
+from .vectorized import process_security_closing_vectorized
+from .vwap_cache import VwapPrefixCache
+from .grid import run_closing_grid
 
-__all__ = ['ClosingStrategy', 'create_closing_strategy_handler']
+__all__ = ['ClosingStrategy', 'create_closing_strategy_handler',
+           'process_security_closing_vectorized', 'VwapPrefixCache', 'run_closing_grid']
@@ -0,0 +1,294 @@
+"""
+Closing Strategy Parameter Grid
+
+Sweeps used to submit one task per (security, parameter value), each with
+its own pickled copy of the security's DataFrame. ``run_closing_grid``
+submits one task per security that carries only the parquet file path.
+The worker loads the ticks once, derives the daily features once and
+evaluates every grid point locally:
+
+    vwap_preclose_period_min   all periods answered by one VwapPrefixCache
+    trend_filter_mode / ...    one trend fit per distinct (mode, half-life, window)
+    everything else            only the per-day resolution of the vectorized engine
+
+The results are one tidy table, written as a single Parquet file: one row
+per (security, grid point), with the swept parameters as columns next to the
+summary metrics.
+
+Grid keys (each a list of values; the grid is their cartesian product):
+    spread_vwap_pct, vwap_preclose_period_min, stop_loss_threshold_pct,
+    trend_filter_sell_enabled, trend_filter_sell_threshold_bps_hr,
+    trend_filter_buy_enabled, trend_filter_buy_threshold_bps_hr,
+    trend_filter_mode, trend_filter_halflife_min, trend_filter_window_min,
+    auction_fill_pct
+
+Parameters that are not swept come from each security's config (or the
+ClosingStrategy defaults).
+
+Usage:
+    from src.closing_strategy.grid import run_closing_grid
+
+    results = run_closing_grid('data/parquet', config,
+                               {'spread_vwap_pct': [0.3, 0.5],
+                                'vwap_preclose_period_min': [15, 30]},
+                               output_path='output/closing_grid.parquet')
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from src.closing_strategy.strategy import ClosingStrategy, vwap_window_start
+from src.closing_strategy.trend import trend_accumulator_from_config
+from src.closing_strategy.vectorized import (
+    compute_daily_features, compute_trend_slopes, compute_vwaps, process_security_closing_vectorized
+)
+from src.closing_strategy.vwap_cache import VwapPrefixCache
+from src.work_scheduler import RuntimeStats, schedule_lpt
+
+
+GRID_PARAMS = (
+    'spread_vwap_pct',
+    'vwap_preclose_period_min',
+    'stop_loss_threshold_pct',
+    'trend_filter_sell_enabled',
+    'trend_filter_sell_threshold_bps_hr',
+    'trend_filter_buy_enabled',
+    'trend_filter_buy_threshold_bps_hr',
+    'trend_filter_mode',
+    'trend_filter_halflife_min',
+    'trend_filter_window_min',
+    'auction_fill_pct',
+)
+
+# Summary metrics reported per grid point
+GRID_METRICS = (
+    'total_trades', 'auction_entries', 'buy_entries', 'sell_entries', 'vwap_exits',
+    'stop_losses', 'eod_flattens', 'filtered_sell_entries', 'filtered_buy_entries',
+)
+
+GRID_WORKLOAD = 'closing_grid'
+
+
+def expand_grid(grid: Dict[str, Sequence]) -> List[dict]:
+    """
+    Cartesian product of a parameter grid.
+
+    Args:
+        grid: Dict mapping GRID_PARAMS keys to lists of values (a scalar is
+              a single value)
+
+    Returns:
+        List of dicts, one per grid point, in itertools.product order
+
+    Raises:
+        ValueError: For unknown keys or empty value lists
+    """
+    unknown = sorted(set(grid) - set(GRID_PARAMS))
+    if unknown:
+        raise ValueError(f"Unknown grid parameters {unknown} (expected some of {GRID_PARAMS})")
+
+    keys = list(grid)
+    values = []
+    for key in keys:
+        vals = grid[key]
+        if isinstance(vals, (str, bytes)) or not hasattr(vals, '__iter__'):
+            vals = [vals]
+        if not vals:
+            raise ValueError(f"Grid parameter {key} has no values")
+        values.append(list(vals))
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def _trend_key(cfg: dict) -> tuple:
+    """Identity of a trend fit (ols ignores half-life and window)."""
+    mode = cfg['trend_filter_mode']
+    if mode == 'ewm':
+        return (mode, cfg['trend_filter_halflife_min'])
+    if mode == 'rolling':
+        return (mode, cfg['trend_filter_window_min'])
+    return (mode,)
+
+
+def run_security_grid(args) -> tuple:
+    """
+    Evaluate every grid point for one security (executed in a pool worker).
+
+    Args:
+        args: Tuple of (security, parquet_file, sec_config, exchange_mapping,
+              points, auction_fill_pct, tick_cache, exact_vwap). Data is read
+              from parquet_file here (or mapped from the sorted tick cache),
+              so nothing large is pickled
+
+    Returns:
+        Tuple of (security, rows, timing_info); rows holds one dict per point
+    """
+    (security, parquet_file, sec_config, exchange_mapping, points,
+     auction_fill_pct, tick_cache, exact_vwap) = args
+    start_time = time.time()
+
+    rows = []
+    load_error = None
+    try:
+        if tick_cache:
+            from src.tick_cache import load_cached_ticks
+            df = load_cached_ticks(parquet_file, layout='sorted')
+        else:
+            from src.tick_cache import read_sorted_ticks
+            df = read_sorted_ticks(parquet_file)
+        base = compute_daily_features(df)
+    except Exception as e:
+        print(f"  Error {security}: {e}")
+        load_error = str(e)
+        base = None
+        df = None
+
+    # Effective per-point configs (security config + point + defaults)
+    configs = []
+    for point in points:
+        cfg = dict(sec_config)
+        cfg.update({k: v for k, v in point.items() if k != 'auction_fill_pct'})
+        configs.append({security: cfg})
+    effective = [ClosingStrategy(config).get_config(security) for config in configs]
+
+    # Features shared by the points: VWAPs per period, slopes per trend fit
+    vwaps = {}
+    slopes = {}
+    if base is not None:
+        periods = sorted({cfg['vwap_preclose_period_min'] for cfg in effective})
+        if exact_vwap:
+            vwaps = {p: compute_vwaps(base, vwap_window_start(p, ClosingStrategy.PRECLOSE_END_TIME))
+                     for p in periods}
+        else:
+            table = VwapPrefixCache.from_features(base).preclose_vwaps(periods)
+            vwaps = {p: table[:, j] for j, p in enumerate(periods)}
+        for cfg in effective:
+            key = _trend_key(cfg)
+            if key not in slopes:
+                slopes[key] = base.trend_slope if key == ('ols',) else \
+                    compute_trend_slopes(base, trend_accumulator_from_config(cfg))
+
+    for i, (point, config, cfg) in enumerate(zip(points, configs, effective)):
+        row = {'security': security, 'point': i, **point, 'pnl': 0.0}
+        row.update({metric: 0 for metric in GRID_METRICS})
+        row.update({'final_position': 0, 'error': None})
+        if base is None:
+            row['error'] = load_error
+            rows.append(row)
+            continue
+        try:
+            features = base.with_vwap(vwaps[cfg['vwap_preclose_period_min']]) \
+                .with_trend_slope(slopes[_trend_key(cfg)])
+            result = process_security_closing_vectorized(
+                security, df, config, exchange_mapping,
+                point.get('auction_fill_pct', auction_fill_pct), features=features
+            )
+            summary = result.get('summary', {})
+            row['pnl'] = result.get('pnl', 0)
+            row.update({metric: summary.get(metric, 0) for metric in GRID_METRICS})
+            row['final_position'] = result.get('position', 0)
+        except Exception as e:
+            print(f"  Error {security} @ point {i}: {e}")
+            row['error'] = str(e)
+        rows.append(row)
+
+    timing_info = {
+        'elapsed': time.time() - start_time,
+        'rows': len(df) if df is not None else 0,
+        'points': len(points),
+    }
+    return (security, rows, timing_info)
+
+
+def run_closing_grid(
+    parquet_dir: str,
+    config: dict,
+    grid: Dict[str, Sequence],
+    exchange_mapping: dict = None,
+    securities: Optional[Sequence[str]] = None,
+    max_securities: Optional[int] = None,
+    workers: Optional[int] = None,
+    auction_fill_pct: float = 10.0,
+    tick_cache: bool = False,
+    exact_vwap: bool = False,
+    output_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Run a closing-strategy parameter grid, one worker task per security.
+
+    Args:
+        parquet_dir: Directory with per-security Parquet files
+        config: Base per-security strategy configuration
+        grid: Dict mapping GRID_PARAMS keys to lists of values
+        exchange_mapping: Dict mapping security names to exchange (ADX/DFM)
+        securities: Only these securities (default: every Parquet file)
+        max_securities: Limit number of securities
+        workers: Number of parallel workers (default: CPU count, at most one
+                 per security)
+        auction_fill_pct: Auction fill limit when auction_fill_pct is not swept
+        tick_cache: Workers map the sorted Arrow cache instead of reading Parquet
+        exact_vwap: Row-order VWAP sums per period instead of the prefix-sum
+                    cache (bit-identical to run_closing_strategy's trades)
+        output_path: Write the results table to this Parquet file
+
+    Returns:
+        DataFrame with one row per (security, grid point)
+    """
+    points = expand_grid(grid)
+    parquet_files = sorted(Path(parquet_dir).glob("*.parquet"))
+    if securities is not None:
+        wanted = {s.upper() for s in securities}
+        parquet_files = [pf for pf in parquet_files if pf.stem.upper() in wanted]
+    if max_securities:
+        parquet_files = parquet_files[:max_securities]
+    if not parquet_files:
+        raise FileNotFoundError(f"No Parquet files to run in {parquet_dir}")
+
+    # Largest securities first (every task evaluates the same points)
+    stats = RuntimeStats.load(parquet_dir)
+    parquet_files, _ = schedule_lpt(parquet_files, stats, GRID_WORKLOAD)
+
+    tasks = []
+    for pf in parquet_files:
+        security = pf.stem.upper()
+        tasks.append((security, str(pf), dict(config.get(security, {})), exchange_mapping or {},
+                      points, auction_fill_pct, tick_cache, exact_vwap))
+
+    if workers is None:
+        workers = min(os.cpu_count() or 4, len(tasks))
+
+    print(f"Grid: {len(points)} points x {len(tasks)} securities = "
+          f"{len(points) * len(tasks)} runs ({workers} workers)")
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_security_grid, task): task[0] for task in tasks}
+        for done, future in enumerate(as_completed(futures), 1):
+            security = futures[future]
+            try:
+                security, sec_rows, timing_info = future.result()
+            except Exception as e:
+                print(f"  ❌ {security}: {e}")
+                continue
+            rows.extend(sec_rows)
+            if timing_info['rows']:
+                # Cost per point, so runs with other grid sizes stay comparable
+                stats.record(GRID_WORKLOAD, security,
+                             timing_info['elapsed'] / max(1, timing_info['points']),
+                             timing_info['rows'])
+            best = max(sec_rows, key=lambda r: r['pnl'])
+            print(f"  ✓ {security} ({done}/{len(tasks)}): {len(sec_rows)} points in "
+                  f"{timing_info['elapsed']:.1f}s, best P&L: {best['pnl']:,.2f} AED")
+    stats.save()
+
+    results = pd.DataFrame(rows)
+    if output_path:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        results.to_parquet(output_path, index=False)
+        print(f"Grid results: {output_path} ({len(results)} rows)")
+    return results
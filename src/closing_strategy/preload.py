@@ -0,0 +1,107 @@
+"""
+Fork-Inherited Data for Closing Strategy Workers
+
+run_closing_strategy normally loads every security in the parent and pickles
+each DataFrame into its worker task: the data is held twice and serialising
+it takes seconds. With ``start_resident_pool`` the tasks carry only the
+security name and its config:
+
+    Linux (fork)   The parent loads every security into module-level state
+                   (_RESIDENT) before the workers are forked; workers inherit
+                   it and share the pages copy-on-write.
+    Elsewhere      The parent prepares the sorted Arrow tick cache
+                   (src/tick_cache.py) and hands workers the file paths
+                   (_SOURCE); each worker memory-maps a security on first use.
+
+This is the pattern of src/warm_pool.py, for the closing strategy's sorted
+data layout.
+
+Usage:
+    from src.closing_strategy.preload import get_resident_data, release_resident, start_resident_pool
+
+    with start_resident_pool(parquet_files, max_workers=8) as executor:
+        ...  # tasks call get_resident_data(security)
+    release_resident()
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.warm_pool import fork_available
+
+
+# Resident data of this process: security -> sorted DataFrame.
+# Filled in the parent before forking (inherited) or lazily from _SOURCE.
+_RESIDENT: Dict[str, pd.DataFrame] = {}
+
+# Where workers map data from without fork: security -> sorted tick cache file
+_SOURCE: Dict[str, str] = {}
+
+
+def _init_worker(sources: Dict[str, str]):
+    """Worker initializer: remember the cache file of each security."""
+    _SOURCE.update(sources)
+
+
+def get_resident_data(security: str) -> pd.DataFrame:
+    """
+    Sorted tick data of a security in this process.
+
+    Returns the inherited DataFrame when the parent preloaded it, otherwise
+    memory-maps the security's cache file (once per worker).
+
+    Raises:
+        KeyError: If the security was neither preloaded nor given a cache file
+    """
+    df = _RESIDENT.get(security)
+    if df is None:
+        from src.tick_cache import open_tick_cache
+        df = open_tick_cache(_SOURCE[security])
+        _RESIDENT[security] = df
+    return df
+
+
+def start_resident_pool(parquet_files: List[Path], max_workers: Optional[int] = None,
+                        preload: bool = True) -> ProcessPoolExecutor:
+    """
+    Make the securities' data resident and start the worker pool.
+
+    Args:
+        parquet_files: Per-security Parquet files (security = upper-case stem)
+        max_workers: Number of worker processes (default: CPU count)
+        preload: Load all data in the parent and fork (Linux only); otherwise
+                 workers memory-map the sorted tick cache
+
+    Returns:
+        ProcessPoolExecutor whose workers can call get_resident_data
+    """
+    start_time = time.time()
+    if preload and fork_available():
+        from src.tick_cache import read_sorted_ticks
+        for parquet_file in parquet_files:
+            security = Path(parquet_file).stem.upper()
+            if security not in _RESIDENT:
+                _RESIDENT[security] = read_sorted_ticks(parquet_file)
+        print(f"Preloaded {len(parquet_files)} securities in {time.time() - start_time:.1f}s "
+              f"(forked workers share the pages)")
+        return ProcessPoolExecutor(max_workers=max_workers,
+                                   mp_context=multiprocessing.get_context('fork'))
+
+    from src.tick_cache import build_tick_cache
+    sources = {Path(pf).stem.upper(): str(build_tick_cache(pf, layout='sorted'))
+               for pf in parquet_files}
+    print(f"Prepared {len(sources)} memory-mapped tick caches in {time.time() - start_time:.1f}s "
+          f"(workers map them on first use)")
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                               initargs=(sources,))
+
+
+def release_resident():
+    """Drop the resident data of this process."""
+    _RESIDENT.clear()
+    _SOURCE.clear()
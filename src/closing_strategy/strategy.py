@@ -17,9 +17,12 @@ import pandas as pd
 import json
 import os
 from datetime import datetime, time, timedelta
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, Optional, List
 from dataclasses import dataclass, field
 
+from src.closing_strategy.trend import TrendAccumulator, trend_accumulator_from_config
+from src.trade_ledger import TradeLedger
+
 
 @dataclass
 class AuctionOrder:
@@ -55,6 +58,33 @@ class Trade:
     vwap_reference: float
 
 
+# Column layout of the per-security TradeLedger (rows come back as Trade)
+CLOSING_TRADE_FIELDS = (
+    ('timestamp', 'timestamp'),
+    ('side', 'category'),
+    ('price', 'float'),
+    ('quantity', 'int'),
+    ('realized_pnl', 'float'),
+    ('trade_type', 'category'),
+    ('vwap_reference', 'float'),
+)
+
+
+def vwap_window_start(period_min: float, end: time = time(14, 45, 0)) -> time:
+    """
+    Start time of a VWAP window of period_min minutes ending at end.
+    
+    Args:
+        period_min: Window length in minutes
+        end: Window end (default: 14:45, when auction orders are placed)
+        
+    Returns:
+        Time of day the window starts
+    """
+    end_dt = datetime.combine(datetime.today(), end)
+    return (end_dt - timedelta(minutes=period_min)).time()
+
+
 class ClosingStrategy:
     """
     Closing Auction Arbitrage Strategy.
@@ -86,7 +116,10 @@ class ClosingStrategy:
                 "trend_filter_sell_enabled": True,     # Enable trend filter for SELL entries
                 "trend_filter_sell_threshold_bps_hr": 10.0,  # Skip SELL if uptrend > threshold
                 "trend_filter_buy_enabled": False,     # Enable trend filter for BUY entries
-                "trend_filter_buy_threshold_bps_hr": 10.0   # Skip BUY if downtrend < -threshold
+                "trend_filter_buy_threshold_bps_hr": 10.0,  # Skip BUY if downtrend < -threshold
+                "trend_filter_mode": "ols",            # Slope fit: ols, ewm or rolling (trend.py)
+                "trend_filter_halflife_min": 60.0,     # ewm: weight half-life in minutes
+                "trend_filter_window_min": 60.0        # rolling: window in minutes
             }
         }
         
@@ -101,7 +134,7 @@ class ClosingStrategy:
         self.vwap_data: Dict[str, Dict] = {}  # {security: {sum_pv: float, sum_v: int}}
         self.auction_orders: Dict[str, Dict[str, AuctionOrder]] = {}  # {security: {buy: order, sell: order}}
         self.exit_orders: Dict[str, ExitOrder] = {}  # {security: exit_order}
-        self.trades: Dict[str, List[Trade]] = {}  # {security: [trades]}
+        self.trades: Dict[str, TradeLedger] = {}  # {security: ledger of Trade rows}
         self.pnl: Dict[str, float] = {}  # {security: realized_pnl}
         self.position: Dict[str, int] = {}  # {security: position}
         self.entry_price: Dict[str, float] = {}  # {security: avg_entry_price}
@@ -120,7 +153,7 @@ class ClosingStrategy:
         self.auction_volume: Dict[str, int] = {}  # {security: total_auction_volume}
         
         # Trend tracking for entry filter
-        self.trend_data: Dict[str, List[Tuple[float, float]]] = {}  # {security: [(time_hours, price)]}
+        self.trend_data: Dict[str, TrendAccumulator] = {}  # {security: running regression moments}
         self.daily_trend_slope: Dict[str, float] = {}  # {security: slope_bps_per_hour}
         self.filtered_sell_entries: Dict[str, int] = {}  # {security: count of filtered SELL entries}
         self.filtered_buy_entries: Dict[str, int] = {}  # {security: count of filtered BUY entries}
@@ -128,7 +161,7 @@ class ClosingStrategy:
     def initialize_security(self, security: str):
         """Initialize state for a security."""
         if security not in self.trades:
-            self.trades[security] = []
+            self.trades[security] = TradeLedger(CLOSING_TRADE_FIELDS, row_type=Trade, capacity=16)
             self.pnl[security] = 0.0
             self.position[security] = 0
             self.entry_price[security] = 0.0
@@ -141,7 +174,7 @@ class ClosingStrategy:
             self.closing_price_processed[security] = False
             self.current_date[security] = None
             self.auction_volume[security] = 0
-            self.trend_data[security] = []
+            self.trend_data[security] = self.create_trend_accumulator(security)
             self.daily_trend_slope[security] = 0.0
             self.filtered_sell_entries[security] = 0
             self.filtered_buy_entries[security] = 0
@@ -158,8 +191,15 @@ class ClosingStrategy:
             'trend_filter_sell_threshold_bps_hr': cfg.get('trend_filter_sell_threshold_bps_hr', 10.0),
             'trend_filter_buy_enabled': cfg.get('trend_filter_buy_enabled', False),  # Filter BUY in downtrends (off by default)
             'trend_filter_buy_threshold_bps_hr': cfg.get('trend_filter_buy_threshold_bps_hr', 10.0),
+            'trend_filter_mode': cfg.get('trend_filter_mode', 'ols'),  # ols, ewm or rolling
+            'trend_filter_halflife_min': cfg.get('trend_filter_halflife_min', 60.0),
+            'trend_filter_window_min': cfg.get('trend_filter_window_min', 60.0),
         }
     
+    def create_trend_accumulator(self, security: str) -> TrendAccumulator:
+        """Empty trend accumulator configured for a security."""
+        return trend_accumulator_from_config(self.get_config(security))
+    
     def get_exchange(self, security: str) -> str:
         """Get exchange for a security from mapping. Defaults to ADX."""
         return self.exchange_mapping.get(security, 'ADX')
@@ -208,11 +248,7 @@ class ClosingStrategy:
     def get_vwap_start_time(self, security: str) -> time:
         """Get the start time for VWAP calculation period."""
         cfg = self.get_config(security)
-        period_min = cfg['vwap_preclose_period_min']
-        # VWAP period ends at 14:46, starts period_min before
-        end_dt = datetime.combine(datetime.today(), self.PRECLOSE_END_TIME)
-        start_dt = end_dt - timedelta(minutes=period_min)
-        return start_dt.time()
+        return vwap_window_start(cfg['vwap_preclose_period_min'], self.PRECLOSE_END_TIME)
     
     def is_in_vwap_period(self, security: str, timestamp: datetime) -> bool:
         """Check if timestamp is in VWAP calculation period."""
@@ -331,7 +367,7 @@ class ClosingStrategy:
         self.closing_price_processed[security] = False
         self.current_date[security] = new_date.date()
         self.auction_volume[security] = 0  # Reset auction volume for new day
-        self.trend_data[security] = []  # Reset trend data for new day
+        self.trend_data[security].reset()  # Reset trend data for new day
         self.daily_trend_slope[security] = 0.0
     
     def update_trend_data(self, security: str, timestamp: datetime, price: float):
@@ -348,48 +384,34 @@ class ClosingStrategy:
         hours_since_open = (t.hour - 10) + t.minute / 60.0 + t.second / 3600.0
         
         if security not in self.trend_data:
-            self.trend_data[security] = []
+            self.trend_data[security] = self.create_trend_accumulator(security)
         
-        self.trend_data[security].append((hours_since_open, price))
+        self.trend_data[security].add(hours_since_open, price)
     
     def calculate_trend_slope(self, security: str) -> float:
         """
         Calculate trend slope in basis points per hour using linear regression.
         
+        The regression moments are maintained incrementally by the
+        security's TrendAccumulator (ols, ewm or rolling, see trend.py).
+        
         Returns:
             Slope in bps/hour (positive = uptrend, negative = downtrend)
         """
-        data = self.trend_data.get(security, [])
-        if len(data) < 10:  # Need minimum data points
-            return 0.0
-        
-        # Simple linear regression
-        n = len(data)
-        sum_x = sum(d[0] for d in data)
-        sum_y = sum(d[1] for d in data)
-        sum_xy = sum(d[0] * d[1] for d in data)
-        sum_x2 = sum(d[0] ** 2 for d in data)
-        
-        denominator = n * sum_x2 - sum_x ** 2
-        if denominator == 0:
-            return 0.0
-        
-        # Slope in price units per hour
-        slope = (n * sum_xy - sum_x * sum_y) / denominator
-        
-        # Convert to basis points per hour (relative to mean price)
-        mean_price = sum_y / n
-        if mean_price == 0:
+        trend = self.trend_data.get(security)
+        if trend is None:
             return 0.0
-        
-        slope_bps_per_hour = (slope / mean_price) * 10000
-        
-        return slope_bps_per_hour
+        return trend.slope_bps_per_hour()
     
-    def should_filter_sell_entry(self, security: str) -> bool:
+    def should_filter_sell_entry(self, security: str, slope: Optional[float] = None) -> bool:
         """
         Check if SELL entry should be filtered based on trend.
         
+        Args:
+            security: Security symbol
+            slope: Precomputed daily trend slope in bps/hour (default:
+                   calculated from the day's trend data)
+        
         Returns True if:
         - trend_filter_sell_enabled is True
         - Daily trend slope exceeds trend_filter_sell_threshold_bps_hr (uptrend)
@@ -405,7 +427,8 @@ class ClosingStrategy:
         threshold = cfg.get('trend_filter_sell_threshold_bps_hr', 10.0)
         
         # Calculate current trend slope
-        slope = self.calculate_trend_slope(security)
+        if slope is None:
+            slope = self.calculate_trend_slope(security)
         self.daily_trend_slope[security] = slope
         
         # Filter if slope exceeds threshold (strong uptrend)
@@ -415,10 +438,15 @@ class ClosingStrategy:
         
         return False
     
-    def should_filter_buy_entry(self, security: str) -> bool:
+    def should_filter_buy_entry(self, security: str, slope: Optional[float] = None) -> bool:
         """
         Check if BUY entry should be filtered based on trend.
         
+        Args:
+            security: Security symbol
+            slope: Precomputed daily trend slope in bps/hour (default:
+                   calculated from the day's trend data)
+        
         Returns True if:
         - trend_filter_buy_enabled is True
         - Daily trend slope is below -trend_filter_buy_threshold_bps_hr (downtrend)
@@ -433,7 +461,8 @@ class ClosingStrategy:
         threshold = cfg.get('trend_filter_buy_threshold_bps_hr', 10.0)
         
         # Calculate current trend slope (may already be calculated)
-        slope = self.calculate_trend_slope(security)
+        if slope is None:
+            slope = self.calculate_trend_slope(security)
         self.daily_trend_slope[security] = slope
         
         # Filter if slope is below negative threshold (strong downtrend)
@@ -456,10 +485,15 @@ class ClosingStrategy:
             return data['sum_pv'] / data['sum_v']
         return None
     
-    def place_auction_orders(self, security: str, vwap: float, timestamp: datetime):
+    def place_auction_orders(self, security: str, vwap: float, timestamp: datetime,
+                             trend_slope: Optional[float] = None):
         """
         Place buy and sell orders for the closing auction.
         
+        trend_slope is the day's trend slope in bps/hour when it was
+        computed elsewhere (vectorized backtest); by default it is
+        calculated from the accumulated trend data.
+        
         Entry filtering based on trend (if trend_filter_enabled=True):
         - SELL filtered if trend > threshold (uptrend) 
         - BUY filtered if trend < -threshold (downtrend) AND trend_filter_sell_only=False
@@ -485,8 +519,8 @@ class ClosingStrategy:
         sell_price = self.round_to_tick(sell_price_raw, sell_tick_size)
         
         # Check if entries should be filtered based on trend
-        filter_sell = self.should_filter_sell_entry(security)
-        filter_buy = self.should_filter_buy_entry(security)
+        filter_sell = self.should_filter_sell_entry(security, trend_slope)
+        filter_buy = self.should_filter_buy_entry(security, trend_slope)
         
         # Place buy order (if not filtered)
         if quantity > 0 and not filter_buy:
@@ -766,21 +800,26 @@ class ClosingStrategy:
     
     def get_summary(self, security: str) -> dict:
         """Get summary statistics for a security."""
-        trades = self.trades.get(security, [])
+        trades = self.trades.get(security)
+        if trades is None:
+            trades = TradeLedger(CLOSING_TRADE_FIELDS, row_type=Trade)
+        trade_type = trades.column('trade_type')
+        side = trades.column('side')
         
         # Count buy vs sell entries
-        buy_entries = len([t for t in trades if t.trade_type == 'auction_entry' and t.side == 'buy'])
-        sell_entries = len([t for t in trades if t.trade_type == 'auction_entry' and t.side == 'sell'])
+        entries = trade_type == 'auction_entry'
+        buy_entries = int((entries & (side == 'buy')).sum())
+        sell_entries = int((entries & (side == 'sell')).sum())
         
         return {
             'security': security,
             'total_trades': len(trades),
-            'auction_entries': len([t for t in trades if t.trade_type == 'auction_entry']),
+            'auction_entries': int(entries.sum()),
             'buy_entries': buy_entries,
             'sell_entries': sell_entries,
-            'vwap_exits': len([t for t in trades if t.trade_type == 'vwap_exit']),
-            'stop_losses': len([t for t in trades if t.trade_type == 'stop_loss']),
-            'eod_flattens': len([t for t in trades if t.trade_type == 'eod_flatten']),
+            'vwap_exits': int((trade_type == 'vwap_exit').sum()),
+            'stop_losses': int((trade_type == 'stop_loss').sum()),
+            'eod_flattens': int((trade_type == 'eod_flatten').sum()),
             'filtered_sell_entries': self.filtered_sell_entries.get(security, 0),
             'filtered_buy_entries': self.filtered_buy_entries.get(security, 0),
             'realized_pnl': self.pnl.get(security, 0),
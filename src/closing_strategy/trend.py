@@ -0,0 +1,175 @@
+"""
+Trend Slope Accumulator
+
+The SELL/BUY entry trend filters regress the day's regular-hours trade
+prices on time (hours since 10:00) and compare the slope in bps/hour with
+trend_filter_*_threshold_bps_hr. ``TrendAccumulator`` keeps the regression
+moments (n, sum_x, sum_y, sum_xy, sum_x2) up to date trade by trade, so
+adding a trade and reading the slope are O(1) and no per-trade list grows.
+
+Modes (config key trend_filter_mode):
+    ols      All of the day's trades, equally weighted (default)
+    ewm      Exponentially weighted; a trade's weight halves every
+             trend_filter_halflife_min minutes
+    rolling  Only trades of the last trend_filter_window_min minutes
+             (ending at the latest trade); memory bounded by the window
+
+Usage:
+    from src.closing_strategy.trend import TrendAccumulator
+
+    trend = TrendAccumulator(mode='ewm', halflife_min=30)
+    trend.add(hours_since_open, price)
+    slope = trend.slope_bps_per_hour()
+"""
+
+from collections import deque
+
+
+TREND_MODES = ('ols', 'ewm', 'rolling')
+
+# Fewer regular-hours trades than this give a slope of 0.0 (no filtering)
+MIN_TREND_POINTS = 10
+
+
+def trend_slope_bps_per_hour(n: float, sum_x: float, sum_y: float,
+                             sum_xy: float, sum_x2: float) -> float:
+    """
+    Least-squares trend slope in basis points per hour from regression sums.
+
+    Args:
+        n: Number of (hours_since_open, price) points (total weight for
+           weighted sums)
+        sum_x, sum_y, sum_xy, sum_x2: Sums of x, y, x*y and x**2
+
+    Returns:
+        Slope in bps/hour relative to the mean price (0.0 for a degenerate fit)
+    """
+    denominator = n * sum_x2 - sum_x ** 2
+    if denominator == 0:
+        return 0.0
+
+    # Slope in price units per hour
+    slope = (n * sum_xy - sum_x * sum_y) / denominator
+
+    # Convert to basis points per hour (relative to mean price)
+    mean_price = sum_y / n
+    if mean_price == 0:
+        return 0.0
+
+    return (slope / mean_price) * 10000
+
+
+class TrendAccumulator:
+    """
+    Running regression moments of (hours_since_open, price) points.
+
+    Args:
+        mode: 'ols', 'ewm' or 'rolling' (see module docstring)
+        halflife_min: Weight half-life in minutes (ewm)
+        window_min: Window length in minutes (rolling)
+
+    Raises:
+        ValueError: Unknown mode or a non-positive half-life / window
+    """
+
+    __slots__ = ('mode', 'halflife_hours', 'window_hours', 'count', 'weight',
+                 'sum_x', 'sum_y', 'sum_xy', 'sum_x2', 'last_x', 'points')
+
+    def __init__(self, mode: str = 'ols', halflife_min: float = 60.0,
+                 window_min: float = 60.0):
+        if mode not in TREND_MODES:
+            raise ValueError(f"Unknown trend mode {mode!r} (expected one of {TREND_MODES})")
+        if not halflife_min > 0:
+            raise ValueError(f"halflife_min must be positive, got {halflife_min!r}")
+        if not window_min > 0:
+            raise ValueError(f"window_min must be positive, got {window_min!r}")
+        self.mode = mode
+        self.halflife_hours = halflife_min / 60.0
+        self.window_hours = window_min / 60.0
+        # (x, y) points inside the window (rolling mode only)
+        self.points = deque() if mode == 'rolling' else None
+        self.reset()
+
+    def reset(self):
+        """Forget all points (new trading day)."""
+        self.count = 0
+        self.weight = 0.0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.sum_xy = 0.0
+        self.sum_x2 = 0.0
+        self.last_x = None
+        if self.points is not None:
+            self.points.clear()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return f"TrendAccumulator({self.mode!r}, {self.count} points)"
+
+    def add(self, x: float, y: float):
+        """Add one trade: x = hours since 10:00, y = price."""
+        if self.mode == 'ewm':
+            if self.last_x is not None:
+                decay = 0.5 ** ((x - self.last_x) / self.halflife_hours)
+                self.weight *= decay
+                self.sum_x *= decay
+                self.sum_y *= decay
+                self.sum_xy *= decay
+                self.sum_x2 *= decay
+            self.weight += 1.0
+        elif self.mode == 'rolling':
+            self._evict(x - self.window_hours)
+            self.points.append((x, y))
+        self.last_x = x
+        self.count += 1
+        self.sum_x += x
+        self.sum_y += y
+        self.sum_xy += x * y
+        self.sum_x2 += x ** 2
+
+    def extend(self, xs, ys):
+        """Add several trades in order."""
+        for x, y in zip(xs, ys):
+            self.add(x, y)
+
+    def _evict(self, cutoff: float):
+        points = self.points
+        while points and points[0][0] <= cutoff:
+            x, y = points.popleft()
+            self.count -= 1
+            if not points:
+                self.sum_x = self.sum_y = self.sum_xy = self.sum_x2 = 0.0
+                continue
+            self.sum_x -= x
+            self.sum_y -= y
+            self.sum_xy -= x * y
+            self.sum_x2 -= x ** 2
+
+    def slope_bps_per_hour(self) -> float:
+        """
+        Trend slope in bps/hour of the accumulated points.
+
+        Returns:
+            Slope (positive = uptrend), 0.0 with fewer than MIN_TREND_POINTS
+        """
+        if self.count < MIN_TREND_POINTS:
+            return 0.0
+        n = self.weight if self.mode == 'ewm' else self.count
+        return trend_slope_bps_per_hour(n, self.sum_x, self.sum_y, self.sum_xy, self.sum_x2)
+
+
+def trend_accumulator_from_config(cfg: dict) -> TrendAccumulator:
+    """
+    Empty accumulator for a security's strategy config.
+
+    Args:
+        cfg: Per-security config (trend_filter_mode, trend_filter_halflife_min,
+             trend_filter_window_min; defaults ols / 60 / 60)
+    """
+    return TrendAccumulator(
+        mode=cfg.get('trend_filter_mode', 'ols'),
+        halflife_min=cfg.get('trend_filter_halflife_min', 60.0),
+        window_min=cfg.get('trend_filter_window_min', 60.0),
+    )
@@ -0,0 +1,419 @@
+"""
+Vectorized Closing Strategy Backtest
+
+The tick handler (handler.py) steps through every row of every day in
+Python, although the closing strategy only needs a few things per day:
+
+    vwap            pre-close VWAP over the configured window
+    trend_slope     regression slope of regular-hours trades (bps/hour)
+    best_bid/ask    quote path, to mark positions for the stop-loss
+    order_row       first row of the 14:45-14:55 order window
+    close_row       the closing print (first trade at/after 14:55)
+    auction_volume  traded volume at/after 14:55
+
+``compute_daily_features`` derives these for all days at once from NumPy
+arrays (day runs, per-day reductions over boolean masks, forward-filled
+quote paths). ``process_security_closing_vectorized`` then walks the days
+and hands only the rows that can produce a trade (stop-loss triggers,
+exit-order crossings, the closing print) to the ClosingStrategy methods,
+so the results match ``process_security_closing_strategy`` trade for trade.
+
+Float sums (VWAP, trend regression) are accumulated in row order with
+np.cumsum, as the tick loop does, so they are bit-identical.
+``compute_vwaps`` and ``compute_trend_slopes`` recompute one of them for
+another VWAP window or trend fit without re-deriving the tick arrays.
+
+Usage:
+    from src.closing_strategy.vectorized import process_security_closing_vectorized
+
+    result = process_security_closing_vectorized('EMAAR', df, config, exchange_mapping)
+"""
+
+from dataclasses import dataclass, replace
+from datetime import date, time, timedelta
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.closing_strategy.strategy import ClosingStrategy
+from src.closing_strategy.trend import MIN_TREND_POINTS, TrendAccumulator, trend_slope_bps_per_hour
+
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+_EPOCH = date(1970, 1, 1)
+
+# hours_since_open (and its square) per second of the day, computed with the
+# same Python float expressions as ClosingStrategy.update_trend_data /
+# TrendAccumulator.add (x ** 2 is not always bit-identical to x * x)
+_HOURS_TABLE = None
+
+
+def _hours_table():
+    global _HOURS_TABLE
+    if _HOURS_TABLE is None:
+        hours = [(s // 3600 - 10) + (s // 60 % 60) / 60.0 + (s % 60) / 3600.0
+                 for s in range(86_400)]
+        _HOURS_TABLE = (np.array(hours), np.array([x ** 2 for x in hours]))
+    return _HOURS_TABLE
+
+
+def time_of_day_ns(t: time) -> int:
+    """Nanoseconds since midnight of a time of day."""
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * NS_PER_SECOND + t.microsecond * 1000
+
+
+def _sequential_sum(values: np.ndarray) -> float:
+    # Row-order accumulation like the tick loop (np.sum sums pairwise)
+    return np.cumsum(values)[-1].item() if len(values) else 0.0
+
+
+def _quote_path(mask: np.ndarray, price: np.ndarray) -> np.ndarray:
+    """Last price among the masked rows up to each row (0.0 before the first)."""
+    rows = np.where(mask, np.arange(len(price)), -1)
+    np.maximum.accumulate(rows, out=rows)
+    return np.where(rows >= 0, price[rows], 0.0)
+
+
+def _event_mask(types: pd.Series, name: str) -> np.ndarray:
+    """Rows whose lower-cased event type equals name."""
+    codes, uniques = pd.factorize(types)
+    # Trailing False for missing types (code -1)
+    lookup = np.array([str(u).lower() == name for u in uniques] + [False])
+    return lookup[codes]
+
+
+@dataclass
+class ClosingFeatures:
+    """
+    Tick arrays and per-day features of one security.
+
+    Tick arrays (one entry per row):
+        stamps: Row timestamps (DatetimeIndex, trade timestamps)
+        tod: int64 nanoseconds since midnight
+        price, volume: float64 / int64
+        is_trade: Trade rows
+        best_bid, best_ask: Best quotes after each row (0.0 before the first)
+
+    Day arrays (one entry per trading day):
+        starts, ends: Row offsets of the day
+        dates: datetime.date of the day
+        vwap: Pre-close VWAP (nan without trades in the window)
+        trend_slope: Regular-hours trend slope in bps/hour
+        order_row: First row in the 14:45-14:55 order window (-1 if none)
+        close_row: Closing print, first trade at/after 14:55 (-1 if none)
+        auction_volume: Traded volume at/after 14:55
+    """
+    stamps: pd.DatetimeIndex
+    tod: np.ndarray
+    price: np.ndarray
+    volume: np.ndarray
+    is_trade: np.ndarray
+    best_bid: np.ndarray
+    best_ask: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    dates: List[date]
+    vwap: np.ndarray
+    trend_slope: np.ndarray
+    order_row: np.ndarray
+    close_row: np.ndarray
+    auction_volume: np.ndarray
+
+    @property
+    def n_days(self) -> int:
+        return len(self.starts)
+
+    def with_vwap(self, vwap: np.ndarray) -> 'ClosingFeatures':
+        """Copy with other per-day VWAPs (e.g. another window from VwapPrefixCache)."""
+        return replace(self, vwap=np.asarray(vwap, dtype=np.float64))
+
+    def with_trend_slope(self, trend_slope: np.ndarray) -> 'ClosingFeatures':
+        """Copy with other per-day trend slopes (e.g. another trend fit)."""
+        return replace(self, trend_slope=np.asarray(trend_slope, dtype=np.float64))
+
+
+def compute_daily_features(df: pd.DataFrame, vwap_start: Optional[time] = None,
+                           trend: Optional[TrendAccumulator] = None) -> ClosingFeatures:
+    """
+    Compute the closing strategy's tick arrays and per-day features.
+
+    Args:
+        df: Tick data (timestamp, type, price, volume), sorted by timestamp
+        vwap_start: Start of the pre-close VWAP window (ends at 14:45). None
+                    leaves vwap empty (nan), to be filled with with_vwap
+        trend: Accumulator defining the trend fit (default: ols). ewm and
+               rolling fits feed each day's trades through it
+
+    Returns:
+        ClosingFeatures
+
+    Raises:
+        ValueError: If the rows are not sorted by timestamp
+    """
+    timestamp_col = 'timestamp' if 'timestamp' in df.columns else 'Timestamp'
+    type_col = 'type' if 'type' in df.columns else 'Type'
+    price_col = 'price' if 'price' in df.columns else 'Price'
+    volume_col = 'volume' if 'volume' in df.columns else 'Volume'
+
+    stamps = pd.DatetimeIndex(df[timestamp_col])
+    if not stamps.is_monotonic_increasing:
+        raise ValueError("Vectorized closing backtest needs rows sorted by timestamp")
+
+    # Wall-clock nanoseconds (timestamp.date() / .time() are local)
+    local = stamps.tz_localize(None) if stamps.tz is not None else stamps
+    ns = local.as_unit('ns').asi8
+    day = ns // NS_PER_DAY
+    tod = ns - day * NS_PER_DAY
+    n = len(ns)
+
+    price = df[price_col].to_numpy(dtype=np.float64)
+    if volume_col in df.columns:
+        volume = df[volume_col].to_numpy().astype(np.int64)
+    else:
+        volume = np.zeros(n, dtype=np.int64)
+    is_trade = _event_mask(df[type_col], 'trade')
+    best_bid = _quote_path(_event_mask(df[type_col], 'bid') & (price > 0), price)
+    best_ask = _quote_path(_event_mask(df[type_col], 'ask') & (price > 0), price)
+
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]]) if n else np.empty(0, dtype=np.int64)
+    ends = np.r_[starts[1:], n].astype(np.int64)
+    dates = [_EPOCH + timedelta(days=int(d)) for d in day[starts]]
+
+    # Session windows (same boundaries as ClosingStrategy)
+    preclose_end = time_of_day_ns(ClosingStrategy.PRECLOSE_END_TIME)
+    auction_start = time_of_day_ns(ClosingStrategy.CLOSING_AUCTION_TIME)
+    in_order_window = (tod >= preclose_end) & (tod < auction_start)
+    in_auction = is_trade & (tod >= auction_start)
+
+    # First row / sum of each day's masked rows
+    rows = np.arange(n)
+    if n:
+        order_row = np.minimum.reduceat(np.where(in_order_window, rows, n), starts)
+        close_row = np.minimum.reduceat(np.where(in_auction, rows, n), starts)
+        auction_volume = np.add.reduceat(np.where(in_auction, volume, 0), starts)
+    else:
+        order_row = close_row = auction_volume = np.empty(0, dtype=np.int64)
+    order_row[order_row == n] = -1
+    close_row[close_row == n] = -1
+
+    features = ClosingFeatures(
+        stamps=stamps, tod=tod, price=price, volume=volume, is_trade=is_trade,
+        best_bid=best_bid, best_ask=best_ask, starts=starts, ends=ends, dates=dates,
+        vwap=np.full(len(starts), np.nan), trend_slope=np.zeros(len(starts)),
+        order_row=order_row, close_row=close_row, auction_volume=auction_volume,
+    )
+    if vwap_start is not None:
+        features.vwap = compute_vwaps(features, vwap_start)
+    features.trend_slope = compute_trend_slopes(features, trend)
+    return features
+
+
+def compute_vwaps(features: ClosingFeatures, vwap_start: time) -> np.ndarray:
+    """
+    Pre-close VWAP per day over trades in [vwap_start, 14:45).
+
+    Sums are accumulated in row order, as ClosingStrategy.update_vwap does,
+    so the values are bit-identical to the tick loop's.
+
+    Returns:
+        float64 array, one entry per day (nan without trades in the window)
+    """
+    tod, price, volume = features.tod, features.price, features.volume
+    in_vwap = features.is_trade & (tod >= time_of_day_ns(vwap_start)) & \
+        (tod < time_of_day_ns(ClosingStrategy.PRECLOSE_END_TIME)) & (volume > 0) & (price > 0)
+    pv = price * volume
+    vwap = np.full(features.n_days, np.nan)
+    for k, (s, e) in enumerate(zip(features.starts, features.ends)):
+        sel = in_vwap[s:e]
+        sum_v = int(volume[s:e][sel].sum())
+        if sum_v > 0:
+            vwap[k] = _sequential_sum(pv[s:e][sel]) / sum_v
+    return vwap
+
+
+def compute_trend_slopes(features: ClosingFeatures,
+                         trend: Optional[TrendAccumulator] = None) -> np.ndarray:
+    """
+    Regular-hours trend slope per day in bps/hour.
+
+    Args:
+        features: Tick arrays of the security
+        trend: Accumulator defining the fit (default: ols). ewm and rolling
+               fits feed each day's trades through it
+
+    Returns:
+        float64 array, one entry per day (0.0 with too few trades)
+    """
+    tod, price = features.tod, features.price
+    in_trend = features.is_trade & \
+        (tod >= time_of_day_ns(ClosingStrategy.TRADING_START_TIME)) & \
+        (tod < time_of_day_ns(ClosingStrategy.TRADING_END_TIME))
+    hours, hours_sq = _hours_table()
+    second = tod // NS_PER_SECOND
+    trend_slope = np.zeros(features.n_days)
+    for k, (s, e) in enumerate(zip(features.starts, features.ends)):
+        sel = in_trend[s:e]
+        x = hours[second[s:e][sel]]
+        y = price[s:e][sel]
+        if trend is not None and trend.mode != 'ols':
+            trend.reset()
+            trend.extend(x.tolist(), y.tolist())
+            trend_slope[k] = trend.slope_bps_per_hour()
+        elif len(y) >= MIN_TREND_POINTS:
+            # Regression sums accumulated in row order, like the tick loop
+            trend_slope[k] = trend_slope_bps_per_hour(
+                len(y), _sequential_sum(x), _sequential_sum(y),
+                _sequential_sum(x * y), _sequential_sum(hours_sq[second[s:e][sel]]))
+    return trend_slope
+
+
+def _stop_loss_rows(strategy: ClosingStrategy, security: str, features: ClosingFeatures,
+                    s: int, e: int, long: bool) -> np.ndarray:
+    """Rows of [s, e) where ClosingStrategy.check_stop_loss would trigger."""
+    tod = features.tod[s:e]
+    window = ((tod >= time_of_day_ns(ClosingStrategy.STOP_LOSS_START_TIME)) &
+              (tod < time_of_day_ns(ClosingStrategy.STOP_LOSS_END_TIME)))
+    entry_price = strategy.entry_price[security]
+    stop_loss_pct = strategy.get_config(security)['stop_loss_threshold_pct']
+    if long:
+        mark = features.best_bid[s:e]
+        unrealized_pnl_pct = ((mark - entry_price) / entry_price) * 100
+    else:
+        mark = features.best_ask[s:e]
+        unrealized_pnl_pct = ((entry_price - mark) / entry_price) * 100
+    return s + np.flatnonzero(window & (mark > 0) & (unrealized_pnl_pct < -stop_loss_pct))
+
+
+def _exit_rows(strategy: ClosingStrategy, security: str, features: ClosingFeatures,
+               s: int, e: int) -> np.ndarray:
+    """Regular-hours trade rows of [s, e) that cross the pending exit order."""
+    exit_order = strategy.exit_orders[security]
+    tod = features.tod[s:e]
+    price = features.price[s:e]
+    regular = ((tod >= time_of_day_ns(ClosingStrategy.TRADING_START_TIME)) &
+               (tod < time_of_day_ns(ClosingStrategy.TRADING_END_TIME)))
+    if exit_order.side == 'sell':
+        crossed = price >= exit_order.price
+    else:
+        crossed = price <= exit_order.price
+    return s + np.flatnonzero(features.is_trade[s:e] & regular &
+                              (features.volume[s:e] > 0) & crossed)
+
+
+def _resolve_regular_hours(strategy: ClosingStrategy, security: str,
+                           features: ClosingFeatures, k: int):
+    """
+    Stop-loss and exit-order fills of day k, in row order.
+
+    Only candidate rows are visited: the next stop-loss trigger for the
+    current position and the next row crossing the exit order. A stop-loss
+    on a row is checked before that row's exit fill, as in the tick loop.
+    """
+    s, e = int(features.starts[k]), int(features.ends[k])
+    day = features.dates[k]
+    exit_rows = np.empty(0, dtype=np.int64)
+    exit_order = strategy.exit_orders.get(security)
+    if exit_order is not None and day >= exit_order.target_date:
+        exit_rows = _exit_rows(strategy, security, features, s, e)
+
+    stop_rows = {}
+    row = s
+    fill = 0
+    while True:
+        next_fill = int(exit_rows[fill]) if (fill < len(exit_rows) and
+                                             security in strategy.exit_orders) else e
+        next_stop = e
+        position = strategy.position[security]
+        if position != 0 and strategy.entry_price[security] > 0:
+            long = position > 0
+            if long not in stop_rows:
+                stop_rows[long] = _stop_loss_rows(strategy, security, features, s, e, long)
+            candidates = stop_rows[long]
+            i = np.searchsorted(candidates, row)
+            if i < len(candidates):
+                next_stop = int(candidates[i])
+
+        if next_stop < e and next_stop <= next_fill:
+            strategy.best_bid[security] = float(features.best_bid[next_stop])
+            strategy.best_ask[security] = float(features.best_ask[next_stop])
+            if strategy.check_stop_loss(security, features.stamps[next_stop]):
+                break
+            row = next_stop + 1
+            continue
+        if next_fill >= e:
+            break
+
+        strategy.process_exit_order(security, float(features.price[next_fill]),
+                                    int(features.volume[next_fill]),
+                                    features.stamps[next_fill])
+        fill += 1
+        row = next_fill + 1
+
+
+def process_security_closing_vectorized(
+    security: str,
+    df: pd.DataFrame,
+    config: dict,
+    exchange_mapping: dict = None,
+    auction_fill_pct: float = 10.0,
+    features: Optional[ClosingFeatures] = None,
+) -> dict:
+    """
+    Vectorized equivalent of ``process_security_closing_strategy``.
+
+    Args:
+        security: Security symbol
+        df: Full DataFrame for this security, sorted by timestamp
+        config: Strategy configuration
+        exchange_mapping: Dict mapping security names to exchange (ADX/DFM)
+        auction_fill_pct: Maximum fill as percentage of auction volume (default 10%)
+        features: Precomputed features for this config's VWAP window
+                  (default: computed from df)
+
+    Returns:
+        Results dict with trades, P&L, etc. (same layout and trades as
+        process_security_closing_strategy)
+    """
+    strategy = ClosingStrategy(config=config, exchange_mapping=exchange_mapping,
+                               auction_fill_pct=auction_fill_pct)
+    strategy.initialize_security(security)
+    if features is None:
+        features = compute_daily_features(df, strategy.get_vwap_start_time(security),
+                                          trend=strategy.create_trend_accumulator(security))
+    last_date = features.dates[-1] if features.n_days else None
+
+    for k in range(features.n_days):
+        strategy.reset_daily_state(security, features.stamps[features.starts[k]])
+
+        # Stop-loss and next-day exits (10:00 - 14:45)
+        if strategy.position[security] != 0 or security in strategy.exit_orders:
+            _resolve_regular_hours(strategy, security, features, k)
+
+        # Auction orders at 14:45 (not on the last day or with a pending exit)
+        order_row = features.order_row[k]
+        vwap = features.vwap[k]
+        if (order_row >= 0 and features.dates[k] != last_date and
+                security not in strategy.exit_orders and vwap > 0):
+            strategy.place_auction_orders(security, float(vwap), features.stamps[order_row],
+                                          trend_slope=float(features.trend_slope[k]))
+            strategy.vwap_calculated[security] = True
+
+        # Closing print: auction fills, then flatten yesterday's leftover exit
+        close_row = features.close_row[k]
+        if close_row >= 0:
+            strategy.auction_volume[security] = int(features.auction_volume[k])
+            close_price = float(features.price[close_row])
+            close_timestamp = features.stamps[close_row]
+            strategy.process_closing_price(security, close_price, close_timestamp)
+            strategy.flatten_position_at_close(security, close_price, close_timestamp)
+
+    return {
+        'security': security,
+        'trades': strategy.trades[security],
+        'pnl': strategy.pnl.get(security, 0),
+        'position': strategy.position.get(security, 0),
+        'summary': strategy.get_summary(security),
+    }
@@ -0,0 +1,166 @@
+"""
+Prefix-Sum VWAP Cache
+
+``ClosingStrategy.update_vwap`` accumulates sum_pv / sum_v trade by trade,
+so every value of vwap_preclose_period_min in a sweep re-reads the day's
+trades. The cache stores, per trading day, the running sums of
+price x volume and volume over the VWAP-eligible trades (volume > 0,
+price > 0) together with their time of day:
+
+    keys     day_index * NS_PER_DAY + nanoseconds since midnight (sorted)
+    cum_pv   running sum of price * volume, restarting every day
+    cum_v    running sum of volume, restarting every day
+
+The VWAP of any window [start, end) of any day is then two binary searches
+and two subtractions, and a whole set of window lengths is answered for all
+days with one vectorised searchsorted.
+
+Differences of prefix sums round differently from the tick loop's running
+sums (relative differences of 1e-14, up to ~1e-11 for short windows late in
+busy days), so a VWAP that falls exactly on a tick-rounding boundary can
+round the other way. Use compute_daily_features' exact sums when results
+must match the tick engine bit for bit.
+
+Usage:
+    from src.closing_strategy.vectorized import compute_daily_features
+    from src.closing_strategy.vwap_cache import VwapPrefixCache
+
+    features = compute_daily_features(df)
+    cache = VwapPrefixCache.from_features(features)
+    vwaps = cache.preclose_vwaps([15, 30, 45, 60])   # (n_days, 4)
+    features_30 = features.with_vwap(vwaps[:, 1])
+"""
+
+from datetime import time
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from src.closing_strategy.strategy import ClosingStrategy, vwap_window_start
+from src.closing_strategy.vectorized import NS_PER_DAY, ClosingFeatures, time_of_day_ns
+
+
+class VwapPrefixCache:
+    """
+    Per-day prefix sums of price x volume and volume over eligible trades.
+
+    Args:
+        keys: Sorted int64 day_index * NS_PER_DAY + time of day per trade
+        cum_pv: Running price * volume per trade (restarting each day)
+        cum_v: Running volume per trade (restarting each day)
+        bounds: Offsets of each day's trades (length n_days + 1)
+    """
+
+    def __init__(self, keys: np.ndarray, cum_pv: np.ndarray, cum_v: np.ndarray,
+                 bounds: np.ndarray):
+        self.keys = keys
+        self.cum_pv = cum_pv
+        self.cum_v = cum_v
+        self.bounds = bounds
+
+    @classmethod
+    def from_features(cls, features: ClosingFeatures) -> 'VwapPrefixCache':
+        """Build the cache from a security's tick arrays."""
+        eligible = features.is_trade & (features.volume > 0) & (features.price > 0)
+        rows = np.flatnonzero(eligible)
+        if features.n_days:
+            counts = np.add.reduceat(eligible.astype(np.int64), features.starts)
+        else:
+            counts = np.empty(0, dtype=np.int64)
+        bounds = np.r_[0, np.cumsum(counts)].astype(np.int64)
+
+        day_index = np.repeat(np.arange(features.n_days, dtype=np.int64), counts)
+        keys = day_index * NS_PER_DAY + features.tod[rows]
+
+        volume = features.volume[rows]
+        pv = features.price[rows] * volume
+        cum_pv = np.empty(len(rows))
+        cum_v = np.empty(len(rows), dtype=np.int64)
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            np.cumsum(pv[lo:hi], out=cum_pv[lo:hi])
+            np.cumsum(volume[lo:hi], out=cum_v[lo:hi])
+        return cls(keys, cum_pv, cum_v, bounds)
+
+    @property
+    def n_days(self) -> int:
+        return len(self.bounds) - 1
+
+    def __repr__(self) -> str:
+        return f"VwapPrefixCache({self.n_days} days, {len(self.keys)} trades)"
+
+    def _prefix(self, cum: np.ndarray, j: np.ndarray, first: np.ndarray) -> np.ndarray:
+        # Sum of the day's trades before offset j (0 at the day's first trade)
+        if not len(cum):
+            return np.zeros(j.shape, dtype=cum.dtype)
+        return np.where(j > first, cum[np.maximum(j - 1, 0)], 0)
+
+    def window_sums(self, start: time, end: time) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sum of price x volume and of volume per day over trades in [start, end).
+
+        Returns:
+            (sum_pv float64, sum_v int64), one entry per day
+        """
+        sum_pv, sum_v = self._window_sums([start], end)
+        return sum_pv[:, 0], sum_v[:, 0]
+
+    def _window_sums(self, starts: Sequence[time], end: time):
+        day_base = np.arange(self.n_days, dtype=np.int64)[:, None] * NS_PER_DAY
+        start_ns = np.array([time_of_day_ns(s) for s in starts], dtype=np.int64)
+        lo = np.searchsorted(self.keys, day_base + start_ns[None, :])
+        hi = np.searchsorted(self.keys, day_base + time_of_day_ns(end))
+        hi = np.broadcast_to(hi, lo.shape)
+        first = self.bounds[:-1, None]
+        # A window starting after it ends is empty
+        lo = np.minimum(lo, hi)
+        sum_pv = self._prefix(self.cum_pv, hi, first) - self._prefix(self.cum_pv, lo, first)
+        sum_v = self._prefix(self.cum_v, hi, first) - self._prefix(self.cum_v, lo, first)
+        return sum_pv, sum_v
+
+    def vwap(self, start: time, end: time = ClosingStrategy.PRECLOSE_END_TIME) -> np.ndarray:
+        """
+        VWAP per day over trades in [start, end).
+
+        Returns:
+            float64 array, one entry per day (nan for days without trades)
+        """
+        return self.window_vwaps([start], end)[:, 0]
+
+    def window_vwaps(self, starts: Sequence[time],
+                     end: time = ClosingStrategy.PRECLOSE_END_TIME) -> np.ndarray:
+        """
+        VWAPs of several windows sharing an end, for all days in one pass.
+
+        Returns:
+            float64 array of shape (n_days, len(starts)), nan without trades
+        """
+        sum_pv, sum_v = self._window_sums(starts, end)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(sum_v > 0, sum_pv / sum_v, np.nan)
+
+    def preclose_vwaps(self, periods_min: Sequence[float]) -> np.ndarray:
+        """
+        Pre-close VWAPs (windows ending at 14:45) for several period lengths.
+
+        Args:
+            periods_min: vwap_preclose_period_min values
+
+        Returns:
+            float64 array of shape (n_days, len(periods_min))
+        """
+        starts: List[time] = [vwap_window_start(p, ClosingStrategy.PRECLOSE_END_TIME)
+                              for p in periods_min]
+        return self.window_vwaps(starts)
+
+    def day_vwap(self, day: int, start: time,
+                 end: time = ClosingStrategy.PRECLOSE_END_TIME) -> float:
+        """VWAP of one day's trades in [start, end) (nan without trades), O(log n)."""
+        base = day * NS_PER_DAY
+        first = self.bounds[day]
+        lo = int(np.searchsorted(self.keys, base + time_of_day_ns(start)))
+        hi = max(lo, int(np.searchsorted(self.keys, base + time_of_day_ns(end))))
+        sum_v = (self.cum_v[hi - 1] if hi > first else 0) - (self.cum_v[lo - 1] if lo > first else 0)
+        if sum_v <= 0:
+            return float('nan')
+        sum_pv = (self.cum_pv[hi - 1] if hi > first else 0.0) - (self.cum_pv[lo - 1] if lo > first else 0.0)
+        return float(sum_pv / sum_v)
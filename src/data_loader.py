@@ -13,6 +13,8 @@ from typing import Generator, Tuple, Optional
 import os
 import pandas as pd
 
+from src.tick_schema import is_canonical_frame
+
 try:
     from openpyxl import load_workbook
     _HAS_OPENPYXL = True
@@ -20,14 +22,60 @@ except Exception:
     _HAS_OPENPYXL = False
 
 
-def _normalize_row_values(row):
-    # Convert openpyxl row tuple to a plain list
-    return [None if v == '' else v for v in row]
+def _transpose_rows(rows: list, n_cols: int) -> list:
+    """Transpose buffered row tuples into one tuple of values per column.
+
+    openpyxl usually yields rows as wide as the header; shorter rows are
+    padded with None and extra cells are dropped, as the dict-based buffer did.
+    """
+    if any(len(r) != n_cols for r in rows):
+        pad = (None,) * n_cols
+        rows = [r[:n_cols] if len(r) >= n_cols else r + pad[:n_cols - len(r)] for r in rows]
+    return list(zip(*rows)) if rows else [()] * n_cols
+
+
+def _column_values(values: tuple) -> tuple:
+    # Empty cells may come back as '' - treat them as missing
+    if '' in values:
+        return tuple(None if v == '' else v for v in values)
+    return values
+
+
+def _rows_to_frame(rows: list, columns: list, only_trades: bool) -> pd.DataFrame:
+    """Build a chunk DataFrame column by column from buffered row tuples."""
+    cols = _transpose_rows(rows, len(columns))
+    df = pd.DataFrame({name: _column_values(values) for name, values in zip(columns, cols)},
+                      columns=columns)
+    if only_trades and 'Type' in df.columns:
+        df = df[df['Type'].astype(str).str.upper() == 'TRADE']
+    return df
+
+
+def _rows_to_record_batch(rows: list, columns: list, only_trades: bool):
+    """Build a pyarrow RecordBatch column by column from buffered row tuples."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    arrays = []
+    for values in _transpose_rows(rows, len(columns)):
+        values = _column_values(values)
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed cell types (e.g. numbers and text) - keep as strings
+            arrays.append(pa.array([None if v is None else str(v) for v in values],
+                                   type=pa.string()))
+    batch = pa.RecordBatch.from_arrays(arrays, names=columns)
+    if only_trades and 'Type' in columns:
+        type_col = batch.column(columns.index('Type')).cast(pa.string())
+        batch = batch.filter(pc.fill_null(pc.equal(pc.utf8_upper(type_col), 'TRADE'), False))
+    return batch
 
 
 def stream_sheets(file_path: str, header_row: int = 3, chunk_size: int = 100000,
                   max_sheets: Optional[int] = None, only_trades: bool = False, 
-                  sheet_names_filter: Optional[list] = None) -> Generator[Tuple[str, pd.DataFrame], None, None]:
+                  sheet_names_filter: Optional[list] = None,
+                  as_record_batches: bool = False) -> Generator[Tuple[str, pd.DataFrame], None, None]:
     """Stream each sheet in `file_path` and yield DataFrame chunks.
 
     Yields (sheet_name, chunk_df). chunk_df will have columns inferred from the header_row.
@@ -36,10 +84,17 @@ def stream_sheets(file_path: str, header_row: int = 3, chunk_size: int = 100000,
     - chunk_size controls how many rows are yielded per chunk.
     - only_trades: when True, filters rows where a 'Type' column equals 'TRADE' (case-insensitive).
     - sheet_names_filter: optional list of specific sheet names to process (e.g., ['ADNOCGAS UH Equity'])
+    - as_record_batches: yield pyarrow RecordBatch chunks instead of DataFrames
+      (openpyxl path; the pandas fallback converts its DataFrame chunks).
+
+    Rows are buffered as the tuples openpyxl returns and transposed into
+    per-column arrays once per chunk, so no per-row dict is built.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(file_path)
 
+    build_chunk = _rows_to_record_batch if as_record_batches else _rows_to_frame
+
     # Prefer openpyxl streaming reader for large files
     if _HAS_OPENPYXL:
         try:
@@ -75,24 +130,18 @@ def stream_sheets(file_path: str, header_row: int = 3, chunk_size: int = 100000,
                 columns = [str(c).strip() if c is not None else f'col_{i}' for i, c in enumerate(header)]
 
                 buffer = []
+                append = buffer.append
                 for row in it:
-                    vals = _normalize_row_values(row)
-                    row_dict = {columns[i] if i < len(columns) else f'col_{i}': vals[i] if i < len(vals) else None for i in range(len(columns))}
-                    buffer.append(row_dict)
+                    append(row)
 
                     if len(buffer) >= chunk_size:
-                        df = pd.DataFrame(buffer)
-                        if only_trades and 'Type' in df.columns:
-                            df = df[df['Type'].astype(str).str.upper() == 'TRADE']
-                        yield sheet_name, df
+                        yield sheet_name, build_chunk(buffer, columns, only_trades)
                         buffer = []
+                        append = buffer.append
 
                 # yield remainder
                 if buffer:
-                    df = pd.DataFrame(buffer)
-                    if only_trades and 'Type' in df.columns:
-                        df = df[df['Type'].astype(str).str.upper() == 'TRADE']
-                    yield sheet_name, df
+                    yield sheet_name, build_chunk(buffer, columns, only_trades)
 
             wb.close()
             return
@@ -120,61 +169,15 @@ def stream_sheets(file_path: str, header_row: int = 3, chunk_size: int = 100000,
         if only_trades and 'Type' in df_full.columns:
             df_full = df_full[df_full['Type'].astype(str).str.upper() == 'TRADE']
         if chunk_size and chunk_size > 0:
-            for start in range(0, len(df_full), chunk_size):
-                yield sheet, df_full.iloc[start:start + chunk_size].copy()
+            chunks = (df_full.iloc[start:start + chunk_size].copy()
+                      for start in range(0, len(df_full), chunk_size))
         else:
-            yield sheet, df_full
-
-    try:
-        wb = load_workbook(filename=file_path, read_only=True, data_only=True)
-        sheet_names = wb.sheetnames[:max_sheets] if max_sheets else wb.sheetnames
-
-        for sheet_name in sheet_names:
-            ws = wb[sheet_name]
-            it = ws.iter_rows(values_only=True)
-
-            # Advance to header row (1-based count)
-            header = None
-            for i in range(header_row - 1):
-                try:
-                    next(it)
-                except StopIteration:
-                    break
-
-            try:
-                header = next(it)
-            except StopIteration:
-                # empty sheet
-                continue
-
-            # Normalize header names
-            columns = [str(c).strip() if c is not None else f'col_{i}' for i, c in enumerate(header)]
-
-            buffer = []
-            rows_read = 0
-            for row in it:
-                rows_read += 1
-                vals = _normalize_row_values(row)
-                row_dict = {columns[i] if i < len(columns) else f'col_{i}': vals[i] if i < len(vals) else None for i in range(len(columns))}
-                buffer.append(row_dict)
-
-                if len(buffer) >= chunk_size:
-                    df = pd.DataFrame(buffer)
-                    if only_trades and 'Type' in df.columns:
-                        df = df[df['Type'].astype(str).str.upper() == 'TRADE']
-                    yield sheet_name, df
-                    buffer = []
-
-            # yield remainder
-            if buffer:
-                df = pd.DataFrame(buffer)
-                if only_trades and 'Type' in df.columns:
-                    df = df[df['Type'].astype(str).str.upper() == 'TRADE']
-                yield sheet_name, df
-
-        wb.close()
-    except Exception:
-        raise
+            chunks = [df_full]
+        for chunk in chunks:
+            if as_record_batches:
+                import pyarrow as pa
+                chunk = pa.RecordBatch.from_pandas(chunk, preserve_index=False)
+            yield sheet, chunk
 
 
 def preprocess_chunk_df(df: pd.DataFrame) -> pd.DataFrame:
@@ -182,10 +185,32 @@ def preprocess_chunk_df(df: pd.DataFrame) -> pd.DataFrame:
 
     Expected final columns: timestamp, type, price, volume
     Accepts common input names (Dates, Date, Type, Price, Size, Qty, Volume)
+    Rows with non-positive prices are dropped (see normalize_tick_df for the
+    normalisation alone). Frames read from canonical tick files
+    (src/tick_schema.py) are only filtered.
+    """
+    df = normalize_tick_df(df)
+    price = df['price'].to_numpy()
+    if len(price) and not (price > 0).all():
+        df = df[price > 0]
+    return df
+
+
+def normalize_tick_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Map column names and convert types, keeping non-positive prices.
+
+    Rows without timestamp/price are dropped. The closing strategy feeds
+    zero-price bid/ask rows to its order book, so canonical files are
+    written from this normalisation rather than preprocess_chunk_df.
+    Frames read from canonical tick files are returned as-is.
     """
     if df is None or df.empty:
         return pd.DataFrame(columns=['timestamp', 'type', 'price', 'volume'])
 
+    # Canonical tick files are already normalised
+    if is_canonical_frame(df):
+        return df
+
     # Normalize column keys
     df = df.rename(columns={c: c.strip() for c in df.columns})
     col_map = {}
@@ -218,7 +243,6 @@ def preprocess_chunk_df(df: pd.DataFrame) -> pd.DataFrame:
 
     # Drop rows without timestamp/price
     df = df.dropna(subset=['timestamp', 'price'])
-    df = df[df['price'] > 0]
 
     # Reorder columns
     return df[['timestamp', 'type', 'price', 'volume']]
@@ -0,0 +1,267 @@
+"""Day-sharded execution of one security's market-making backtest.
+
+Per-security parallelism leaves a single large, liquid name running on one
+core long after the others finish. The V1 / V2 / V2.1 / V3 strategies
+flatten at the end of every day, so little state crosses a day boundary:
+realized P&L, the refill/cooldown timers, the resting quotes and (rarely) an
+unflattened position. This module splits a security's trading days into
+contiguous shards and runs them in parallel on the event kernel.
+
+Each shard except the first starts by replaying the previous day from a
+fresh state (the warm-up). The strategy state at the end of that day almost
+never depends on where the replay started, so it is used as the shard's
+starting state. The shards are then reconciled in order:
+
+    1. The true state at the end of shard k-1 is compared with the warm-up
+       state of shard k on every carried field except P&L. Timers that have
+       expired by 10:00 of the shard's first day count as equal. If they
+       differ, shard k is re-run from the true state (sequentially), so the
+       result is always exact.
+    2. The cumulative ``pnl`` column of the trade ledger is rebuilt by adding
+       each trade's ``realized_pnl`` to the running total, the same additions
+       the sequential run makes, so the merged trades match it exactly.
+
+Usage:
+    from src.day_sharding import run_day_sharded_kernel
+
+    state = run_day_sharded_kernel('v2_1_stop_loss', 'EMAAR', events, config,
+                                   n_shards=4, max_workers=4)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from src.event_kernel import (
+    CARRY_FIELDS, EventArrays, _load_security_config, run_event_kernel,
+    run_event_kernel_sweep
+)
+from src.session_index import (
+    NS_PER_DAY, NS_PER_SECOND, TOD_CONTINUOUS_OPEN, SessionIndex, build_session_index
+)
+from src.trade_ledger import TradeLedger
+
+
+# Carried timer fields; only compared while they can still gate a quote
+_TIMER_FIELDS = ('last_refill_bid', 'last_refill_ask', 'last_fill_bid', 'last_fill_ask')
+
+
+def plan_day_shards(sessions: SessionIndex, n_shards: int) -> List[Tuple[int, int, int]]:
+    """Split a security's rows into day-aligned shards of similar size.
+
+    Sharding needs every day to be one contiguous block of rows in session
+    order; otherwise (or with fewer than two days) a single shard is returned.
+
+    Args:
+        sessions: SessionIndex of the security's event rows
+        n_shards: Requested number of shards
+
+    Returns:
+        List of (warmup_start, start, end) row offsets. Rows [start, end)
+        belong to the shard; [warmup_start, start) is the previous day
+        (empty for the first shard).
+    """
+    n_days = len(sessions)
+    if (n_shards <= 1 or n_days < 2 or not sessions.monotonic
+            or np.any(np.diff(sessions.days) <= 0)):
+        return [(0, 0, sessions.rows)]
+
+    day_starts = sessions.offsets[:, 0]
+    day_ends = sessions.offsets[:, 4]
+
+    # First day of each shard: where the cumulative row count passes k/n
+    targets = sessions.rows * np.arange(1, n_shards) / n_shards
+    cuts = np.searchsorted(day_ends, targets, side='left') + 1
+    cuts = sorted({int(c) for c in cuts if 0 < c < n_days})
+
+    first_days = [0] + cuts
+    last_days = cuts + [n_days]
+    shards = []
+    for first, last in zip(first_days, last_days):
+        start = 0 if first == 0 else int(day_starts[first])
+        end = sessions.rows if last == n_days else int(day_starts[last])
+        warmup_start = start if first == 0 else int(day_starts[first - 1])
+        shards.append((warmup_start, start, end))
+    return shards
+
+
+def run_day_shard(strategy_name: str, security: str, events: EventArrays,
+                  config: Optional[dict], shard: Tuple[int, int, int]) -> dict:
+    """Run one shard, starting from the state after its warm-up day.
+
+    Args:
+        strategy_name: Kernel strategy name (e.g. 'v1_baseline')
+        security: Security name used to look up its config
+        events: The security's full EventArrays (or any array sharing the
+                shard's row offsets)
+        config: Configuration dict
+        shard: (warmup_start, start, end) from plan_day_shards()
+
+    Returns:
+        Dict with 'state' (kernel state dict of the shard, P&L counted from 0),
+        'warm_state' (carried state after the warm-up, None for the first
+        shard) and 'resume_ns' (10:00 of the shard's first day)
+    """
+    warmup_start, start, end = shard
+    warm_state = None
+    start_states = None
+    if start > warmup_start:
+        warm = run_event_kernel(strategy_name, security, events.slice(warmup_start, start), config)
+        warm_state = warm['kernel_state']
+        start_states = [dict(warm_state, pnl=0.0)]
+
+    shard_events = events.slice(start, end)
+    state = run_event_kernel_sweep(strategy_name, security, shard_events, [config],
+                                   start_states=start_states)[0]
+    first_day = int(shard_events.timestamp[0] // NS_PER_DAY) if len(shard_events) else 0
+    return {
+        'state': state,
+        'warm_state': warm_state,
+        'resume_ns': first_day * NS_PER_DAY + TOD_CONTINUOUS_OPEN,
+    }
+
+
+def handoff_compatible(true_state: dict, warm_state: Optional[dict], resume_ns: int,
+                       interval: float) -> bool:
+    """Check whether a shard's assumed starting state is equivalent to the true one.
+
+    Args:
+        true_state: Carried state at the end of the previous shard
+        warm_state: Carried state the shard actually started from
+        resume_ns: Earliest timestamp a timer can be checked in the shard
+        interval: Refill/cooldown interval in seconds
+
+    Returns:
+        True if the shard's trades and decisions are the same from either state
+    """
+    if warm_state is None:
+        return False
+
+    def expired(ts):
+        return ts is None or (resume_ns - ts) / NS_PER_SECOND >= interval
+
+    for name in CARRY_FIELDS:
+        if name == 'pnl':
+            continue
+        ours, theirs = true_state[name], warm_state[name]
+        if ours == theirs:
+            continue
+        if name in _TIMER_FIELDS and expired(ours) and expired(theirs):
+            continue
+        if name == 'entry_price' and true_state['position'] == 0:
+            continue
+        return False
+    return True
+
+
+def reconcile_day_shards(strategy_name: str, security: str, config: Optional[dict],
+                         shard_results: List[dict],
+                         rerun: Callable[[int, dict], dict]) -> dict:
+    """Stitch shard results into the state of one sequential run.
+
+    Args:
+        strategy_name: Kernel strategy name
+        security: Security name
+        config: Configuration dict
+        shard_results: run_day_shard() results in shard order
+        rerun: Called as rerun(shard_index, start_state) for a shard whose
+               warm-up state does not match; returns the kernel state dict
+               of that shard run from start_state
+
+    Returns:
+        State dict equal to run_event_kernel() over all rows, plus
+        'shard_reruns' (number of shards that had to be re-run)
+    """
+    interval = _load_security_config(strategy_name, security, config)['refill_interval_sec']
+
+    merged = {'rows': 0, 'bid_count': 0, 'ask_count': 0, 'trade_count': 0, 'trades': TradeLedger(),
+              'last_price': None, 'closed_at_eod': False, 'market_dates': set()}
+    stop_loss_count = None
+    carry = None
+    pnl = 0.0
+    reruns = 0
+
+    for i, result in enumerate(shard_results):
+        state = result['state']
+        if i > 0 and not handoff_compatible(carry, result['warm_state'],
+                                            result['resume_ns'], interval):
+            state = rerun(i, dict(carry, pnl=0.0))
+            reruns += 1
+
+        # Rebuild cumulative P&L with the same additions as the sequential run
+        # (cumsum accumulates left to right, starting from the carried P&L)
+        trades = state['trades']
+        if len(trades):
+            running = np.cumsum(np.concatenate(([pnl], trades.column('realized_pnl'))))[1:]
+            trades.set_column('pnl', running)
+            pnl = float(running[-1])
+        carry = dict(state['kernel_state'], pnl=pnl)
+
+        for key in ('rows', 'bid_count', 'ask_count', 'trade_count'):
+            merged[key] += state[key]
+        merged['trades'].extend(state['trades'])
+        merged['market_dates'] |= state['market_dates']
+        merged['closed_at_eod'] = state['closed_at_eod']
+        if state['last_price'] is not None:
+            merged['last_price'] = state['last_price']
+        if 'stop_loss_triggered_count' in state:
+            stop_loss_count = (stop_loss_count or 0) + state['stop_loss_triggered_count']
+
+    position = carry['position']
+    total_pnl = pnl
+    if (strategy_name != 'v1_baseline' and merged['last_price'] is not None
+            and position != 0):
+        total_pnl = pnl + (merged['last_price'] - carry['entry_price']) * position
+
+    merged.update({
+        'position': position,
+        'pnl': total_pnl,
+        'strategy_dates': merged['trades'].dates(),
+        'pending_flatten': None,
+        'kernel_state': carry,
+        'shard_reruns': reruns,
+    })
+    if stop_loss_count is not None:
+        merged['stop_loss_triggered_count'] = stop_loss_count
+    return merged
+
+
+def run_day_sharded_kernel(strategy_name: str, security: str, events: EventArrays,
+                           config: Optional[dict] = None, n_shards: int = 2,
+                           max_workers: Optional[int] = None,
+                           sessions: Optional[SessionIndex] = None) -> dict:
+    """Run a security's backtest with its trading days processed in parallel.
+
+    Args:
+        strategy_name: Kernel strategy name (e.g. 'v3_liquidity_monitor')
+        security: Security name used to look up its config
+        events: EventArrays from build_event_arrays()
+        config: Configuration dict
+        n_shards: Number of day shards
+        max_workers: Worker processes (default: n_shards)
+        sessions: Optional SessionIndex for exactly these rows
+
+    Returns:
+        State dict equal to run_event_kernel(strategy_name, security, events, config)
+    """
+    if sessions is None or sessions.rows != len(events):
+        sessions = build_session_index(events.timestamp)
+    shards = plan_day_shards(sessions, n_shards)
+    if len(shards) == 1:
+        return run_event_kernel(strategy_name, security, events, config, sessions=sessions)
+
+    with ProcessPoolExecutor(max_workers=max_workers or len(shards)) as executor:
+        futures = [
+            executor.submit(run_day_shard, strategy_name, security,
+                            events.slice(warmup_start, end), config,
+                            (0, start - warmup_start, end - warmup_start))
+            for warmup_start, start, end in shards
+        ]
+        shard_results = [future.result() for future in futures]
+
+    def rerun(i, start_state):
+        _, start, end = shards[i]
+        return run_event_kernel_sweep(strategy_name, security, events.slice(start, end),
+                                      [config], start_states=[start_state])[0]
+
+    return reconcile_day_shards(strategy_name, security, config, shard_results, rerun)
@@ -0,0 +1,765 @@
+"""Columnar event-kernel engine for the market-making strategies.
+
+The chunk handlers (``create_v1_handler`` and friends) walk every chunk with
+``df.itertuples()``, build a dict per row for ``OrderBook.apply_update`` and
+call ``timestamp.date()`` / ``timestamp.time()`` on every event. This module
+converts a security's data ONCE into typed NumPy arrays and runs the
+V1 / V2 / V2.1 / V3 state machines over plain integers and floats instead.
+
+Only the top of book is tracked (``OrderBook.set_bid``/``set_ask`` keep a
+single level), session checks are integer comparisons on nanoseconds since
+midnight, and ``pd.Timestamp`` objects are only created for recorded fills.
+The returned state dict has the same shape and trade records as the handler
+state, so results are interchangeable with the existing engine.
+
+``run_event_kernel_sweep`` advances several strategy states (one per config)
+in a single pass: the book updates, day rollovers and session checks are
+done once per event and shared by all of them, so a parameter sweep costs
+one data pass plus the per-state work.
+
+Usage:
+    from src.event_kernel import build_event_arrays, run_event_kernel
+
+    events = build_event_arrays(df)
+    state = run_event_kernel('v1_baseline', 'ADNOCGAS', events, config)
+
+    # One pass, one state per refill interval
+    configs = [{**config, 'ADNOCGAS': {**config['ADNOCGAS'], 'refill_interval_sec': s}}
+               for s in (30, 60, 120)]
+    states = run_event_kernel_sweep('v1_baseline', 'ADNOCGAS', events, configs)
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.session_index import (
+    NS_PER_SECOND, NS_PER_DAY, TOD_CONTINUOUS_OPEN, TOD_SILENT_END,
+    TOD_CLOSING_AUCTION, TOD_EOD_CLOSE, SessionIndex, build_session_index
+)
+from src.trade_ledger import TradeLedger
+
+
+# Event codes stored in EventArrays.event
+EVENT_OTHER = 0
+EVENT_BID = 1
+EVENT_ASK = 2
+EVENT_TRADE = 3
+
+EVENT_CODES = {'bid': EVENT_BID, 'ask': EVENT_ASK, 'trade': EVENT_TRADE}
+
+_EPOCH_DATE = date(1970, 1, 1)
+
+# Strategy name -> (strategy module, strategy class)
+KERNEL_STRATEGIES = {
+    'v1_baseline': ('src.strategies.v1_baseline.strategy', 'V1BaselineStrategy'),
+    'v2_price_follow_qty_cooldown': ('src.strategies.v2_price_follow_qty_cooldown.strategy',
+                                     'V2PriceFollowQtyCooldownStrategy'),
+    'v2_1_stop_loss': ('src.strategies.v2_1_stop_loss.strategy', 'V21StopLossStrategy'),
+    'v3_liquidity_monitor': ('src.strategies.v3_liquidity_monitor.strategy',
+                             'V3LiquidityMonitorStrategy'),
+}
+
+
+@dataclass
+class EventArrays:
+    """Typed column arrays for one security's event stream."""
+    timestamp: np.ndarray  # int64 ns since epoch (naive local time)
+    event: np.ndarray      # uint8 event code (EVENT_*)
+    price: np.ndarray      # float64
+    volume: np.ndarray     # int64
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def slice(self, start: int, end: int) -> 'EventArrays':
+        """Rows [start, end) as EventArrays (views, no copy)."""
+        return EventArrays(timestamp=self.timestamp[start:end], event=self.event[start:end],
+                           price=self.price[start:end], volume=self.volume[start:end])
+
+
+def build_event_arrays(df: pd.DataFrame) -> EventArrays:
+    """Convert a raw tick DataFrame into EventArrays.
+
+    Applies the same normalisation as ``preprocess_chunk_df`` (column
+    mapping, type lower-casing, dropping rows without timestamp/price and
+    non-positive prices) so the kernel sees exactly the rows the handlers see.
+    Canonical tick frames skip the normalisation (only non-positive prices
+    are dropped) and use their categorical codes.
+
+    Args:
+        df: Raw tick DataFrame (e.g. straight from ``pd.read_parquet``)
+
+    Returns:
+        EventArrays in the original row order
+    """
+    from src.data_loader import preprocess_chunk_df
+    from src.tick_schema import EVENT_TYPES, is_canonical_frame
+
+    df = preprocess_chunk_df(df)
+
+    timestamp = df['timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    if is_canonical_frame(df):
+        # Canonical files: map categorical codes straight to event codes
+        categories = df['type'].cat.categories
+        lookup = np.array([EVENT_TYPES.index(c) for c in categories], dtype=np.uint8)
+        event = lookup[df['type'].cat.codes.to_numpy()]
+    else:
+        types = df['type'].to_numpy(dtype=object)
+        event = np.zeros(len(df), dtype=np.uint8)
+        for name, code in EVENT_CODES.items():
+            event[types == name] = code
+    price = df['price'].to_numpy(dtype=np.float64)
+    volume = df['volume'].fillna(0).to_numpy(dtype=np.int64)
+
+    return EventArrays(timestamp=timestamp, event=event, price=price, volume=volume)
+
+
+def get_kernel_strategy_name(handler_module: str) -> Optional[str]:
+    """Map a handler module path to a kernel strategy name.
+
+    Args:
+        handler_module: e.g. 'src.strategies.v1_baseline.handler'
+
+    Returns:
+        Strategy name if the kernel supports it, else None
+    """
+    parts = handler_module.split('.')
+    if len(parts) >= 2 and parts[-2] in KERNEL_STRATEGIES:
+        return parts[-2]
+    return None
+
+
+def _load_security_config(strategy_name: str, security: str, config: Optional[dict]) -> dict:
+    """Resolve a security's parameters through the strategy's own defaults."""
+    import importlib
+
+    module_name, class_name = KERNEL_STRATEGIES[strategy_name]
+    strategy_cls = getattr(importlib.import_module(module_name), class_name)
+    return strategy_cls(config=config or {}).get_config(security)
+
+
+# Kernel fields carried from one trading day to the next (see carry_state)
+CARRY_FIELDS = (
+    'position', 'entry_price', 'pnl',
+    'last_refill_bid', 'last_refill_ask', 'last_fill_bid', 'last_fill_ask',
+    'quote_bid', 'quote_ask',
+    'bid_order_price', 'bid_ahead', 'bid_remaining',
+    'ask_order_price', 'ask_ahead', 'ask_remaining',
+    'cost_basis', 'qty_filled', 'stop_loss_side', 'stop_loss_remaining',
+)
+
+
+class _MarketMakingKernel:
+    """Scalar state machine shared by the V1, V2, V2.1 and V3 handlers."""
+
+    __slots__ = (
+        'variant', 'quote_size_bid', 'quote_size_ask', 'refill_interval_sec',
+        'max_position', 'max_notional', 'threshold', 'stop_loss_threshold_pct',
+        'position', 'entry_price', 'pnl', 'trades',
+        'last_refill_bid', 'last_refill_ask', 'last_fill_bid', 'last_fill_ask',
+        'quote_bid', 'quote_ask',
+        'bid_order_price', 'bid_ahead', 'bid_remaining',
+        'ask_order_price', 'ask_ahead', 'ask_remaining',
+        'cost_basis', 'qty_filled', 'stop_loss_side', 'stop_loss_remaining',
+        'pending_flatten', 'stop_loss_count',
+    )
+
+    def __init__(self, variant: str, cfg: dict):
+        self.variant = variant
+        self.quote_size_bid = cfg['quote_size_bid']
+        self.quote_size_ask = cfg['quote_size_ask']
+        self.refill_interval_sec = cfg['refill_interval_sec']
+        self.max_position = cfg['max_position']
+        self.max_notional = cfg.get('max_notional')
+        self.threshold = cfg.get('min_local_currency_before_quote', 25000)
+        self.stop_loss_threshold_pct = cfg.get('stop_loss_threshold_pct', 2.0)
+
+        self.position = 0
+        self.entry_price = 0
+        self.pnl = 0.0
+        self.trades = TradeLedger()
+        self.last_refill_bid = None
+        self.last_refill_ask = None
+        self.last_fill_bid = None
+        self.last_fill_ask = None
+        self.quote_bid = None
+        self.quote_ask = None
+        self.bid_order_price = None
+        self.bid_ahead = 0
+        self.bid_remaining = 0
+        self.ask_order_price = None
+        self.ask_ahead = 0
+        self.ask_remaining = 0
+        self.cost_basis = 0.0
+        self.qty_filled = 0
+        self.stop_loss_side = None
+        self.stop_loss_remaining = 0
+        self.pending_flatten = False
+        self.stop_loss_count = 0
+
+    def carry_state(self) -> dict:
+        """Snapshot of the fields that carry over into the next trading day."""
+        return {name: getattr(self, name) for name in CARRY_FIELDS}
+
+    def restore(self, carry: dict):
+        """Resume from a carry_state() snapshot."""
+        for name in CARRY_FIELDS:
+            setattr(self, name, carry[name])
+
+    # ---------------- Fill accounting (BaseMarketMakingStrategy) ----------------
+
+    def record_fill(self, side: str, price: float, qty, ts: int):
+        """Mirror of ``_record_fill`` including the V2/V2.1 overrides."""
+        old_position = self.position
+
+        if qty != 0:
+            original_qty = qty
+            realized_pnl = 0.0
+
+            if side == 'buy':
+                if self.position < 0:
+                    close_qty = min(qty, abs(self.position))
+                    realized_pnl += (self.entry_price - price) * close_qty
+                    self.pnl += realized_pnl
+                    self.position += close_qty
+                    qty -= close_qty
+                if qty > 0:
+                    if self.position == 0:
+                        self.entry_price = price
+                        self.position = qty
+                    else:
+                        total_cost = self.entry_price * self.position + price * qty
+                        self.position += qty
+                        self.entry_price = total_cost / self.position
+            else:
+                if self.position > 0:
+                    close_qty = min(qty, self.position)
+                    realized_pnl += (price - self.entry_price) * close_qty
+                    self.pnl += realized_pnl
+                    self.position -= close_qty
+                    qty -= close_qty
+                if qty > 0:
+                    if self.position == 0:
+                        self.entry_price = price
+                        self.position = -qty
+                    else:
+                        total_cost = self.entry_price * abs(self.position) + price * qty
+                        self.position -= qty
+                        self.entry_price = total_cost / abs(self.position)
+
+            self.trades.add(ts, side, price, original_qty, realized_pnl, self.position, self.pnl)
+
+            if side == 'buy':
+                self.last_refill_bid = ts
+            else:
+                self.last_refill_ask = ts
+
+        if self.variant == 'v1':
+            return
+
+        # V2 family: start quantity cooldown (set even for zero-qty fills)
+        if side == 'buy':
+            self.last_fill_bid = ts
+        else:
+            self.last_fill_ask = ts
+
+        if self.variant == 'v2_1':
+            self._update_cost_basis(old_position, price)
+
+    def _update_cost_basis(self, old_position, price: float):
+        """Mirror of ``V21StopLossStrategy._record_fill`` cost basis tracking."""
+        new_position = self.position
+        old_sign = 1 if old_position > 0 else (-1 if old_position < 0 else 0)
+        new_sign = 1 if new_position > 0 else (-1 if new_position < 0 else 0)
+
+        if old_position == 0:
+            self.cost_basis = price * abs(new_position)
+            self.qty_filled = abs(new_position)
+        elif new_position == 0:
+            self.cost_basis = 0.0
+            self.qty_filled = 0
+        elif old_sign == new_sign and abs(new_position) > abs(old_position):
+            self.cost_basis += price * (abs(new_position) - abs(old_position))
+            self.qty_filled = abs(new_position)
+        elif old_sign == new_sign and abs(new_position) < abs(old_position):
+            self.cost_basis *= abs(new_position) / abs(old_position)
+            self.qty_filled = abs(new_position)
+        else:
+            self.cost_basis = price * abs(new_position)
+            self.qty_filled = abs(new_position)
+
+    def flatten(self, price: float, ts: int):
+        """Mirror of ``flatten_position`` (plus the V2.1 cost basis reset)."""
+        if self.position > 0:
+            self.record_fill('sell', price, self.position, ts)
+        elif self.position < 0:
+            self.record_fill('buy', price, abs(self.position), ts)
+
+        if self.variant == 'v2_1':
+            self.cost_basis = 0.0
+            self.qty_filled = 0
+
+    def process_trade(self, trade_price: float, trade_qty, ts: int):
+        """Mirror of ``BaseMarketMakingStrategy.process_trade``."""
+        ask_price = self.quote_ask
+        bid_price = self.quote_bid
+
+        if ask_price is not None and trade_price >= ask_price:
+            remaining = int(trade_qty)
+            ahead = self.ask_ahead
+            consumed_ahead = min(ahead, remaining)
+            self.ask_ahead = ahead - consumed_ahead
+            remaining -= consumed_ahead
+
+            our_rem = self.ask_remaining
+            if remaining > 0 and our_rem > 0:
+                consumed_ours = min(our_rem, remaining)
+                self.ask_remaining = our_rem - consumed_ours
+                self.record_fill('sell', trade_price, consumed_ours, ts)
+                if self.ask_remaining == 0:
+                    self.quote_ask = None
+
+        if bid_price is not None and trade_price <= bid_price:
+            remaining = int(trade_qty)
+            ahead = self.bid_ahead
+            consumed_ahead = min(ahead, remaining)
+            self.bid_ahead = ahead - consumed_ahead
+            remaining -= consumed_ahead
+
+            our_rem = self.bid_remaining
+            if remaining > 0 and our_rem > 0:
+                consumed_ours = min(our_rem, remaining)
+                self.bid_remaining = our_rem - consumed_ours
+                self.record_fill('buy', trade_price, consumed_ours, ts)
+                if self.bid_remaining == 0:
+                    self.quote_bid = None
+
+    # ---------------- Quoting ----------------
+
+    def quote_v1(self, ts: int, bid_px, bid_qty, ask_px, ask_qty):
+        """V1: time-based refill at best bid/ask with position-aware sizing."""
+        max_pos = self.max_position
+        max_notional = self.max_notional
+        if max_notional is not None:
+            if bid_px is not None and ask_px is not None:
+                mid = (bid_px + ask_px) / 2
+            else:
+                mid = bid_px if bid_px is not None else ask_px
+            if mid > 0:
+                max_pos = min(max_pos, int(max_notional / mid))
+
+        interval = self.refill_interval_sec
+        threshold = self.threshold
+
+        if bid_px is not None:
+            last = self.last_refill_bid
+            if last is None or (ts - last) / NS_PER_SECOND >= interval:
+                bid_size = max(0, min(self.quote_size_bid, int(max_pos - self.position)))
+                if bid_px * bid_qty >= threshold and bid_size > 0:
+                    self.bid_order_price = bid_px
+                    self.bid_ahead = int(bid_qty)
+                    self.bid_remaining = int(bid_size)
+                    self.quote_bid = bid_px
+                    self.last_refill_bid = ts
+                else:
+                    self.bid_order_price = bid_px
+                    self.bid_ahead = int(bid_qty)
+                    self.bid_remaining = 0
+                    self.quote_bid = None
+
+        if ask_px is not None:
+            last = self.last_refill_ask
+            if last is None or (ts - last) / NS_PER_SECOND >= interval:
+                ask_size = max(0, min(self.quote_size_ask, int(max_pos + self.position)))
+                if ask_px * ask_qty >= threshold and ask_size > 0:
+                    self.ask_order_price = ask_px
+                    self.ask_ahead = int(ask_qty)
+                    self.ask_remaining = int(ask_size)
+                    self.quote_ask = ask_px
+                    self.last_refill_ask = ts
+                else:
+                    self.ask_order_price = ask_px
+                    self.ask_ahead = int(ask_qty)
+                    self.ask_remaining = 0
+                    self.quote_ask = None
+
+    def _cooldown_sizes(self, ts: int, bid_px, ask_px):
+        """V2 ``get_quote_size`` for both sides (cooldown + position limits)."""
+        interval = self.refill_interval_sec
+        max_pos = self.max_position
+        bid_size = 0
+        ask_size = 0
+
+        if bid_px is not None:
+            base = self.quote_size_bid
+            last = self.last_fill_bid
+            if last is not None and (ts - last) / NS_PER_SECOND < interval:
+                base = self.bid_remaining
+            bid_size = max(0, int(min(base, max_pos - self.position)))
+
+        if ask_px is not None:
+            base = self.quote_size_ask
+            last = self.last_fill_ask
+            if last is not None and (ts - last) / NS_PER_SECOND < interval:
+                base = self.ask_remaining
+            ask_size = max(0, int(min(base, max_pos + self.position)))
+
+        return bid_size, ask_size
+
+    def quote_v2(self, ts: int, bid_px, bid_qty, ask_px, ask_qty):
+        """V2/V2.1: follow best bid/ask, reset queue only when price changes."""
+        bid_size, ask_size = self._cooldown_sizes(ts, bid_px, ask_px)
+        threshold = self.threshold
+
+        if bid_px is not None:
+            if bid_px * bid_qty >= threshold and bid_size > 0:
+                if self.bid_order_price is None or self.bid_order_price != bid_px:
+                    self.bid_order_price = bid_px
+                    self.bid_ahead = int(bid_qty)
+                self.bid_remaining = int(bid_size)
+                self.quote_bid = bid_px
+            else:
+                self.bid_order_price = bid_px
+                self.bid_ahead = int(bid_qty)
+                self.bid_remaining = 0
+                self.quote_bid = None
+
+        if ask_px is not None:
+            if ask_px * ask_qty >= threshold and ask_size > 0:
+                if self.ask_order_price is None or self.ask_order_price != ask_px:
+                    self.ask_order_price = ask_px
+                    self.ask_ahead = int(ask_qty)
+                self.ask_remaining = int(ask_size)
+                self.quote_ask = ask_px
+            else:
+                self.ask_order_price = ask_px
+                self.ask_ahead = int(ask_qty)
+                self.ask_remaining = 0
+                self.quote_ask = None
+
+    def quote_v3(self, ts: int, tod: int, bid_px, bid_qty, ask_px, ask_qty):
+        """V3: V2 quoting gated by continuous depth checks and the silent period."""
+        bid_size, ask_size = self._cooldown_sizes(ts, bid_px, ask_px)
+        threshold = self.threshold
+        # should_activate_quote: no quoting during the 10:00-10:05 silent period
+        session_ok = tod >= TOD_SILENT_END
+
+        if bid_px is not None:
+            if session_ok and bid_px * bid_qty >= threshold and bid_size > 0:
+                if self.bid_order_price is None or self.bid_order_price != bid_px:
+                    self.bid_order_price = bid_px
+                self.bid_ahead = int(bid_qty)
+                self.bid_remaining = int(bid_size)
+                self.quote_bid = bid_px
+            else:
+                self.bid_order_price = bid_px
+                self.bid_ahead = 0
+                self.bid_remaining = 0
+                self.quote_bid = None
+
+        if ask_px is not None:
+            if session_ok and ask_px * ask_qty >= threshold and ask_size > 0:
+                if self.ask_order_price is None or self.ask_order_price != ask_px:
+                    self.ask_order_price = ask_px
+                self.ask_ahead = int(ask_qty)
+                self.ask_remaining = int(ask_size)
+                self.quote_ask = ask_px
+            else:
+                self.ask_order_price = ask_px
+                self.ask_ahead = 0
+                self.ask_remaining = 0
+                self.quote_ask = None
+
+    # ---------------- Stop loss (V2.1) ----------------
+
+    def check_stop_loss(self, mid_price: float) -> bool:
+        """Mirror of ``should_trigger_stop_loss`` + ``trigger_stop_loss``."""
+        position = self.position
+        if position == 0 or self.stop_loss_side is not None:
+            return False
+
+        if abs(self.cost_basis) < 1e-6:
+            pnl_pct = 0.0
+        else:
+            if self.qty_filled == 0:
+                unrealized_pnl = 0.0
+            else:
+                avg_entry_price = abs(self.cost_basis) / self.qty_filled
+                unrealized_pnl = (mid_price - avg_entry_price) * position
+            pnl_pct = (unrealized_pnl / abs(self.cost_basis)) * 100.0
+
+        if pnl_pct < -self.stop_loss_threshold_pct:
+            self.stop_loss_side = 'sell' if position > 0 else 'buy'
+            self.stop_loss_remaining = abs(position)
+            return True
+        return False
+
+    def execute_stop_loss(self, ts: int, bid_px, bid_qty, ask_px, ask_qty) -> bool:
+        """Mirror of ``execute_stop_loss_liquidation``; True when fully done."""
+        if self.stop_loss_side == 'sell':
+            exec_price = bid_px
+            available_qty = bid_qty if bid_px is not None else 0
+        else:
+            exec_price = ask_px
+            available_qty = ask_qty if ask_px is not None else 0
+
+        if exec_price is None or available_qty <= 0:
+            return False
+
+        fill_qty = min(self.stop_loss_remaining, available_qty)
+        self.record_fill(self.stop_loss_side, exec_price, fill_qty, ts)
+        self.stop_loss_remaining -= fill_qty
+
+        if self.stop_loss_remaining <= 0:
+            self.stop_loss_side = None
+            return True
+        return False
+
+
+_VARIANTS = {
+    'v1_baseline': 'v1',
+    'v2_price_follow_qty_cooldown': 'v2',
+    'v2_1_stop_loss': 'v2_1',
+    'v3_liquidity_monitor': 'v3',
+}
+
+
+def run_event_kernel(strategy_name: str, security: str, events: EventArrays,
+                     config: Optional[dict] = None, state: Optional[dict] = None,
+                     sessions: Optional[SessionIndex] = None) -> dict:
+    """Run a market-making strategy over a security's EventArrays.
+
+    Pre-open and 14:45-14:55 rows can never change strategy state (apart
+    from the set of market dates), so when the session index shows clean
+    session boundaries those ranges are skipped in bulk.
+
+    Args:
+        strategy_name: One of KERNEL_STRATEGIES (e.g. 'v1_baseline')
+        security: Security name used to look up its config (e.g. 'ADNOCGAS')
+        events: EventArrays from build_event_arrays()
+        config: Per-security configuration dict (same as the handlers take)
+        state: Optional state dict to populate (defaults to a new dict)
+        sessions: Optional SessionIndex for exactly these rows (e.g. the
+                  cached one from load_session_index); built if omitted
+
+    Returns:
+        State dict with the same keys and trade records as the chunk handlers
+
+    Raises:
+        ValueError: If the strategy has no kernel implementation
+    """
+    result = run_event_kernel_sweep(strategy_name, security, events, [config], sessions)[0]
+    if state is None:
+        return result
+    state.update(result)
+    return state
+
+
+def run_event_kernel_sweep(strategy_name: str, security: str, events: EventArrays,
+                           configs: List[Optional[dict]],
+                           sessions: Optional[SessionIndex] = None,
+                           start_states: Optional[List[Optional[dict]]] = None) -> List[dict]:
+    """Run one strategy with several configs over a single pass of the events.
+
+    Each config gets its own strategy state; the top of book, day rollover,
+    EOD time and trading-window checks are evaluated once per event and
+    shared. Every returned state equals what ``run_event_kernel`` returns
+    for that config alone.
+
+    Args:
+        strategy_name: One of KERNEL_STRATEGIES (e.g. 'v2_1_stop_loss')
+        security: Security name used to look up its config
+        events: EventArrays from build_event_arrays()
+        configs: Configuration dicts, one per parameter combination
+        sessions: Optional SessionIndex for exactly these rows
+        start_states: Optional ``kernel_state`` snapshots (one per config, or
+                      None) to resume from; events must then start on a new
+                      trading day
+
+    Returns:
+        List of state dicts in the order of configs. Each also holds the
+        end-of-run ``kernel_state`` snapshot (see CARRY_FIELDS).
+
+    Raises:
+        ValueError: If the strategy has no kernel implementation
+    """
+    if strategy_name not in KERNEL_STRATEGIES:
+        raise ValueError(
+            f"No event kernel for strategy '{strategy_name}'. "
+            f"Supported: {sorted(KERNEL_STRATEGIES)}"
+        )
+
+    variant = _VARIANTS[strategy_name]
+    kernels = [_MarketMakingKernel(variant, _load_security_config(strategy_name, security, config))
+               for config in configs]
+    for kernel, carry in zip(kernels, start_states or []):
+        if carry is not None:
+            kernel.restore(carry)
+    is_v1 = variant == 'v1'
+    is_v21 = variant == 'v2_1'
+    is_v3 = variant == 'v3'
+
+    if is_v1:
+        quote = _MarketMakingKernel.quote_v1
+    elif is_v3:
+        quote = _MarketMakingKernel.quote_v3
+    else:
+        quote = _MarketMakingKernel.quote_v2
+    process_trade = _MarketMakingKernel.process_trade
+
+    ts_arr = events.timestamp
+    day_arr = ts_arr // NS_PER_DAY
+    tod_arr = ts_arr - day_arr * NS_PER_DAY
+    ev_arr, px_arr, vol_arr = events.event, events.price, events.volume
+    market_days = set()
+
+    if sessions is None or sessions.rows != len(events):
+        sessions = build_session_index(ts_arr)
+    if sessions.monotonic:
+        # Collect market dates from all rows, then only visit day starts,
+        # the trading window and the EOD range
+        market_days.update(np.unique(day_arr[ev_arr == EVENT_TRADE]).tolist())
+        mask = sessions.window_mask()
+        ts_arr, day_arr, tod_arr = ts_arr[mask], day_arr[mask], tod_arr[mask]
+        ev_arr, px_arr, vol_arr = ev_arr[mask], px_arr[mask], vol_arr[mask]
+
+    bid_px = bid_qty = ask_px = ask_qty = None
+    last_day = None
+    last_flatten_day = None
+    closed_at_eod = False
+    any_pending = False
+    rows = bid_count = ask_count = trade_count = 0
+    last_price = None
+
+    for ts, day, tod, ev, price, volume in zip(
+        ts_arr.tolist(), day_arr.tolist(), tod_arr.tolist(),
+        ev_arr.tolist(), px_arr.tolist(), vol_arr.tolist()
+    ):
+        # Clear orderbook on new trading day
+        if day != last_day:
+            if last_day is not None:
+                bid_px = bid_qty = ask_px = ask_qty = None
+            last_day = day
+
+        is_trade = ev == EVENT_TRADE
+        if is_trade:
+            market_days.add(day)
+
+        if last_flatten_day is not None and last_flatten_day != day:
+            closed_at_eod = False
+            if any_pending:
+                for kernel in kernels:
+                    kernel.pending_flatten = False
+                any_pending = False
+
+        # 1) EOD flatten at/after 14:55 (no state reaches the window checks
+        #    from here on, with or without a position)
+        if tod >= TOD_EOD_CLOSE and not closed_at_eod:
+            closed_at_eod = True
+            last_flatten_day = day
+            for kernel in kernels:
+                if kernel.position != 0:
+                    if is_trade:
+                        kernel.flatten(price, ts)
+                    else:
+                        kernel.pending_flatten = True
+                        any_pending = True
+            continue
+
+        # 2) Execute pending flattens on the next trade
+        if any_pending:
+            if is_trade:
+                for kernel in kernels:
+                    if kernel.pending_flatten:
+                        kernel.flatten(price, ts)
+                        kernel.pending_flatten = False
+                any_pending = False
+            continue
+
+        # 3) Strict trading window 10:00-14:45
+        if tod < TOD_CONTINUOUS_OPEN or tod >= TOD_CLOSING_AUCTION:
+            continue
+
+        # Apply update to the top of book
+        if ev == EVENT_BID:
+            if volume > 0:
+                bid_px, bid_qty = price, volume
+            else:
+                bid_px = bid_qty = None
+            bid_count += 1
+        elif ev == EVENT_ASK:
+            if volume > 0:
+                ask_px, ask_qty = price, volume
+            else:
+                ask_px = ask_qty = None
+            ask_count += 1
+        elif is_trade:
+            trade_count += 1
+            last_price = price
+        rows += 1
+
+        has_quote = bid_px is not None or ask_px is not None
+
+        if is_v21:
+            for kernel in kernels:
+                if bid_px is not None and ask_px is not None and kernel.position != 0:
+                    if kernel.check_stop_loss((bid_px + ask_px) / 2.0):
+                        kernel.stop_loss_count += 1
+                if kernel.stop_loss_side is not None:
+                    if not kernel.execute_stop_loss(ts, bid_px, bid_qty, ask_px, ask_qty):
+                        continue
+                if has_quote:
+                    quote(kernel, ts, bid_px, bid_qty, ask_px, ask_qty)
+                if is_trade:
+                    process_trade(kernel, price, volume, ts)
+        elif is_v3:
+            if has_quote:
+                for kernel in kernels:
+                    quote(kernel, ts, tod, bid_px, bid_qty, ask_px, ask_qty)
+            if is_trade:
+                for kernel in kernels:
+                    process_trade(kernel, price, volume, ts)
+        else:
+            if has_quote:
+                for kernel in kernels:
+                    quote(kernel, ts, bid_px, bid_qty, ask_px, ask_qty)
+            if is_trade:
+                for kernel in kernels:
+                    process_trade(kernel, price, volume, ts)
+
+    market_dates = {_EPOCH_DATE + timedelta(days=d) for d in market_days}
+
+    states = []
+    for kernel in kernels:
+        realized = kernel.pnl
+        if is_v1:
+            pnl = realized
+        else:
+            # get_total_pnl(security, last_price)
+            pnl = realized
+            if last_price is not None and kernel.position != 0:
+                pnl = realized + (last_price - kernel.entry_price) * kernel.position
+
+        state = {
+            'rows': rows,
+            'bid_count': bid_count,
+            'ask_count': ask_count,
+            'trade_count': trade_count,
+            'trades': kernel.trades,
+            'position': kernel.position,
+            'pnl': pnl,
+            'last_price': last_price,
+            'closed_at_eod': closed_at_eod,
+            'market_dates': set(market_dates),
+            'strategy_dates': kernel.trades.dates(),
+            'pending_flatten': None,
+            'kernel_state': kernel.carry_state(),
+        }
+        if is_v21:
+            state['stop_loss_triggered_count'] = kernel.stop_loss_count
+        states.append(state)
+
+    return states
@@ -0,0 +1,109 @@
+"""Optional JIT-compiled fill simulation kernels.
+
+The FIFO queue consumption and weighted-average P&L accounting done in
+BaseMarketMakingStrategy.process_trade/_record_fill are pure arithmetic on
+a handful of integers and floats. This module holds those two steps as
+small numeric functions that Numba compiles to native code when it is
+installed. Without Numba the same functions are plain Python and the
+strategies keep using their original dict-based code path.
+
+Enable per security with ``"use_jit_fills": true`` in the strategy config.
+Both paths perform the same IEEE-754 operations in the same order, so the
+recorded trades are identical.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def consume_queue(ahead_qty, our_remaining, trade_qty):
+    """Consume a trade against the queue ahead of us, then our order.
+
+    Args:
+        ahead_qty: Displayed quantity queued ahead of our order
+        our_remaining: Unfilled quantity of our order
+        trade_qty: Traded quantity (already truncated to int)
+
+    Returns:
+        Tuple of (new_ahead_qty, new_our_remaining, filled_qty)
+    """
+    consumed_ahead = min(ahead_qty, trade_qty)
+    ahead_qty = ahead_qty - consumed_ahead
+    remaining = trade_qty - consumed_ahead
+
+    filled = 0
+    if remaining > 0 and our_remaining > 0:
+        filled = min(our_remaining, remaining)
+        our_remaining = our_remaining - filled
+
+    return ahead_qty, our_remaining, filled
+
+
+@njit(cache=True)
+def apply_fill(position, entry_price, pnl, is_buy, price, qty):
+    """Apply a fill to position, average entry price and realized P&L.
+
+    Opposite inventory is closed first (realizing P&L), any remainder
+    opens or extends the position at a weighted-average entry price.
+
+    Args:
+        position: Current signed position
+        entry_price: Weighted average entry price
+        pnl: Cumulative realized P&L
+        is_buy: True for a buy fill, False for a sell fill
+        price: Fill price
+        qty: Fill quantity (positive)
+
+    Returns:
+        Tuple of (position, entry_price, pnl, realized_pnl)
+    """
+    realized_pnl = 0.0
+
+    if is_buy:
+        # Close shorts first
+        if position < 0:
+            close_qty = min(qty, -position)
+            realized_pnl += (entry_price - price) * close_qty
+            pnl += realized_pnl
+            position += close_qty
+            qty -= close_qty
+
+        # Open/extend longs with remainder
+        if qty > 0:
+            if position == 0:
+                entry_price = price
+                position = qty
+            else:
+                total_cost = entry_price * position + price * qty
+                position += qty
+                entry_price = total_cost / position
+    else:
+        # Close longs first
+        if position > 0:
+            close_qty = min(qty, position)
+            realized_pnl += (price - entry_price) * close_qty
+            pnl += realized_pnl
+            position -= close_qty
+            qty -= close_qty
+
+        # Open/extend shorts with remainder
+        if qty > 0:
+            if position == 0:
+                entry_price = price
+                position = -qty
+            else:
+                total_cost = entry_price * -position + price * qty
+                position -= qty
+                entry_price = total_cost / -position
+
+    return position, entry_price, pnl, realized_pnl
@@ -7,9 +7,9 @@ orderbook, state) allowing incremental strategy execution.
 """
 from typing import Callable, Dict, Any, Optional
 from pathlib import Path
-import pandas as pd
 from src.data_loader import stream_sheets, preprocess_chunk_df
 from src.orderbook import OrderBook
+from src.result_store import ResultStore, trades_csv_frame
 
 
 class MarketMakingBacktest:
@@ -41,9 +41,39 @@ class MarketMakingBacktest:
 
         return state
 
+    def _write_outputs(self, results: Dict[str, dict], write_csv: bool, output_dir: Optional[str],
+                       result_store: Optional[str], strategy_name: str, scenario: str,
+                       params: Optional[dict]):
+        """Write the result store partition and/or the per-security CSVs."""
+        if result_store:
+            try:
+                ResultStore(result_store).write_scenario(strategy_name, scenario, results,
+                                                         params=params)
+            except Exception as e:
+                print(f"Warning: Could not write result store {result_store}: {e}")
+
+        # Optionally write per-security CSVs to avoid stale outputs
+        if write_csv:
+            out_dir = Path(output_dir or 'output')
+            out_dir.mkdir(parents=True, exist_ok=True)
+            for sec, state in results.items():
+                trades = state.get('trades', [])
+                if not trades:
+                    continue
+                try:
+                    df = trades_csv_frame(trades)
+                    # Standard per-security filename; downstream can select needed columns
+                    file_name = f"{sec.lower()}_trades_timeseries.csv"
+                    df.to_csv(out_dir / file_name, index=False)
+                except Exception:
+                    # Fail-safe: never break the backtest due to IO/format issues
+                    pass
+
     def run_streaming_from_generator(self, data_generator, 
                                      handler: Optional[Callable[[str, Any, OrderBook, dict], dict]] = None,
-                                     write_csv: bool = True, output_dir: Optional[str] = 'output') -> Dict[str, dict]:
+                                     write_csv: bool = True, output_dir: Optional[str] = 'output',
+                                     result_store: Optional[str] = None, strategy_name: str = 'backtest',
+                                     scenario: str = 'default', params: Optional[dict] = None) -> Dict[str, dict]:
         """Run streaming backtest from any data generator.
         
         This is a generic version that works with any generator yielding (sheet_name, chunk_df) tuples.
@@ -54,6 +84,11 @@ class MarketMakingBacktest:
             handler: function(security, df, orderbook, state) -> state
             write_csv: Write per-security CSVs
             output_dir: Output directory for CSVs
+            result_store: Root of a partitioned Parquet result store (optional,
+                          see src/result_store.py)
+            strategy_name: Strategy partition in the result store
+            scenario: Scenario partition in the result store
+            params: Scenario configuration recorded in the store manifest
         
         Returns:
             Dict mapping security -> state summary
@@ -83,32 +118,8 @@ class MarketMakingBacktest:
 
         print(f"\nTotal chunks processed: {chunk_count}")
 
-        # Optionally write per-security CSVs to avoid stale outputs
-        if write_csv:
-            out_dir = Path(output_dir or 'output')
-            out_dir.mkdir(parents=True, exist_ok=True)
-            for sec, state in results.items():
-                trades = state.get('trades', [])
-                if not trades:
-                    continue
-                try:
-                    df = pd.DataFrame(trades)
-                    if 'timestamp' in df.columns:
-                        df['timestamp'] = pd.to_datetime(df['timestamp'])
-                        df = df.sort_values('timestamp').reset_index(drop=True)
-                    # Round PNL and position values to integers
-                    if 'realized_pnl' in df.columns:
-                        df['realized_pnl'] = df['realized_pnl'].round(0).astype(int)
-                    if 'pnl' in df.columns:
-                        df['pnl'] = df['pnl'].round(0).astype(int)
-                    if 'position' in df.columns:
-                        df['position'] = df['position'].round(0).astype(int)
-                    # Standard per-security filename; downstream can select needed columns
-                    file_name = f"{sec.lower()}_trades_timeseries.csv"
-                    df.to_csv(out_dir / file_name, index=False)
-                except Exception:
-                    # Fail-safe: never break the backtest due to IO/format issues
-                    pass
+        self._write_outputs(results, write_csv, output_dir, result_store,
+                            strategy_name, scenario, params)
 
         return results
 
@@ -116,7 +127,9 @@ class MarketMakingBacktest:
                       only_trades: bool = False, max_sheets: Optional[int] = None,
                       handler: Optional[Callable[[str, Any, OrderBook, dict], dict]] = None,
                       write_csv: bool = True, output_dir: Optional[str] = 'output',
-                      sheet_names_filter: Optional[list] = None) -> Dict[str, dict]:
+                      sheet_names_filter: Optional[list] = None,
+                      result_store: Optional[str] = None, strategy_name: str = 'backtest',
+                      scenario: str = 'default', params: Optional[dict] = None) -> Dict[str, dict]:
         """Stream the Excel file and process each sheet chunk-by-chunk.
 
         - file_path: path to TickData.xlsx
@@ -124,6 +137,9 @@ class MarketMakingBacktest:
         - max_sheets: limit to first N sheets
         - sheet_names_filter: optional list of specific sheet names to process
         - handler: function(security, df, orderbook, state) -> state
+        - result_store / strategy_name / scenario / params: also write the
+          results to a partitioned Parquet result store (see
+          run_streaming_from_generator)
         Returns a dict mapping security -> state summary
         """
         results: Dict[str, dict] = {}
@@ -153,31 +169,7 @@ class MarketMakingBacktest:
 
         print(f"\nTotal chunks processed: {chunk_count}")
 
-        # Optionally write per-security CSVs to avoid stale outputs
-        if write_csv:
-            out_dir = Path(output_dir or 'output')
-            out_dir.mkdir(parents=True, exist_ok=True)
-            for sec, state in results.items():
-                trades = state.get('trades', [])
-                if not trades:
-                    continue
-                try:
-                    df = pd.DataFrame(trades)
-                    if 'timestamp' in df.columns:
-                        df['timestamp'] = pd.to_datetime(df['timestamp'])
-                        df = df.sort_values('timestamp').reset_index(drop=True)
-                    # Round PNL and position values to integers
-                    if 'realized_pnl' in df.columns:
-                        df['realized_pnl'] = df['realized_pnl'].round(0).astype(int)
-                    if 'pnl' in df.columns:
-                        df['pnl'] = df['pnl'].round(0).astype(int)
-                    if 'position' in df.columns:
-                        df['position'] = df['position'].round(0).astype(int)
-                    # Standard per-security filename; downstream can select needed columns
-                    file_name = f"{sec.lower()}_trades_timeseries.csv"
-                    df.to_csv(out_dir / file_name, index=False)
-                except Exception:
-                    # Fail-safe: never break the backtest due to IO/format issues
-                    pass
+        self._write_outputs(results, write_csv, output_dir, result_store,
+                            strategy_name, scenario, params)
 
         return results
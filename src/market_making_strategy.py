@@ -11,6 +11,8 @@ from datetime import datetime, time
 from typing import Dict, Optional
 import pandas as pd
 
+from src.trade_ledger import TradeLedger
+
 
 class MarketMakingStrategy:
     """Market-making strategy that quotes both sides."""
@@ -36,7 +38,7 @@ class MarketMakingStrategy:
         self.position: Dict[str, float] = {}
         self.entry_price: Dict[str, float] = {}
         self.pnl: Dict[str, float] = {}
-        self.trades: Dict[str, list] = {}
+        self.trades: Dict[str, TradeLedger] = {}
         # Per-security, per-side last refill timestamps
         self.last_refill_time: Dict[str, Dict[str, Optional[datetime]]] = {}
         self.quote_prices: Dict[str, dict] = {}  # {security: {'bid': price, 'ask': price}}
@@ -66,7 +68,7 @@ class MarketMakingStrategy:
             self.position[security] = 0
             self.entry_price[security] = 0
             self.pnl[security] = 0.0
-            self.trades[security] = []
+            self.trades[security] = TradeLedger()
             self.last_refill_time[security] = {'bid': None, 'ask': None}
             self.quote_prices[security] = {'bid': None, 'ask': None}
     
@@ -343,15 +345,8 @@ class MarketMakingStrategy:
                     self.position[security] -= qty
 
         # Record the fill
-        self.trades[security].append({
-            'timestamp': timestamp,
-            'side': side,
-            'fill_price': price,
-            'fill_qty': qty if qty > 0 else 0,
-            'realized_pnl': realized_pnl,
-            'position': self.position[security],
-            'pnl': self.pnl[security],
-        })
+        self.trades[security].add(timestamp, side, price, qty if qty > 0 else 0,
+                                  realized_pnl, self.position[security], self.pnl[security])
         
         # After a fill, reset refill time to start new cooldown period
         # This prevents requoting immediately after being filled
@@ -217,10 +217,8 @@ def create_mm_handler(config: dict = None):
         state['pnl'] = strategy.get_total_pnl(security, state.get('last_price'))
         state['trades'] = strategy.trades[security]
         
-        # Track strategy trading dates
-        for trade in strategy.trades[security]:
-            trade_date = trade['timestamp'].date() if hasattr(trade['timestamp'], 'date') else trade['timestamp']
-            state['strategy_dates'].add(trade_date)
+        # Track strategy trading dates (trades added in this chunk only)
+        state['strategy_dates'].update(strategy.trades[security].new_dates())
         
         return state
     
@@ -1,27 +1,207 @@
-"""Minimal OrderBook for streaming backtest."""
+"""Minimal OrderBook for streaming backtest.
+
+The tick data only carries the best bid and ask, so by default each side
+holds a single level in two scalar fields: ``get_best_bid``/``get_best_ask``
+are O(1) and allocate nothing but the returned tuple.
+
+``OrderBook(multi_level=True)`` keeps every level of a side in sorted price
+arrays instead, for feeds with deeper data (``update_bid_level`` /
+``update_ask_level``). ``set_bid``/``set_ask`` keep their top-of-book
+meaning (replace the whole side) in both modes.
+
+``DepthBook`` reconstructs full depth on the exchange tick grid, with L2
+snapshots, incremental level updates and vectorised depth queries
+(``notional_within``, ``volume_ahead``); ``create_orderbook`` picks a mode.
+
+``bids`` and ``asks`` stay dict-like (``get``, ``clear``, ``[]``, ``in``,
+``len``, ``items``), so handler code such as ``orderbook.bids.get(price, 0)``
+and ``orderbook.bids.clear()`` works unchanged.
+"""
+from bisect import bisect_left, bisect_right
 from typing import Optional, Tuple
 
+import numpy as np
+
+
+class BookSide:
+    """One side of the book: price -> quantity with cheap best-level access.
+
+    In single-level mode the side holds at most one level (``price``,
+    ``qty``); assigning a new price replaces it. In multi-level mode levels
+    are kept in ascending price order.
+    """
+
+    __slots__ = ('multi_level', 'price', 'qty', '_prices', '_qtys')
+
+    def __init__(self, multi_level: bool = False):
+        self.multi_level = multi_level
+        self.price = None
+        self.qty = None
+        self._prices = []
+        self._qtys = []
+
+    # ---------------- dict interface ----------------
+
+    def get(self, price, default=None):
+        if not self.multi_level:
+            if self.price is not None and price == self.price:
+                return self.qty
+            return default
+        i = bisect_left(self._prices, price)
+        if i < len(self._prices) and self._prices[i] == price:
+            return self._qtys[i]
+        return default
+
+    def __getitem__(self, price):
+        qty = self.get(price)
+        if qty is None:
+            raise KeyError(price)
+        return qty
+
+    def __setitem__(self, price, qty):
+        if not self.multi_level:
+            self.price = price
+            self.qty = qty
+            return
+        prices = self._prices
+        i = bisect_left(prices, price)
+        if i < len(prices) and prices[i] == price:
+            self._qtys[i] = qty
+        else:
+            prices.insert(i, price)
+            self._qtys.insert(i, qty)
+
+    def __delitem__(self, price):
+        if not self.multi_level:
+            if self.price is None or price != self.price:
+                raise KeyError(price)
+            self.price = self.qty = None
+            return
+        prices = self._prices
+        i = bisect_left(prices, price)
+        if i == len(prices) or prices[i] != price:
+            raise KeyError(price)
+        del prices[i]
+        del self._qtys[i]
+
+    def __contains__(self, price) -> bool:
+        return self.get(price) is not None
+
+    def __len__(self) -> int:
+        if not self.multi_level:
+            return 0 if self.price is None else 1
+        return len(self._prices)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self) -> list:
+        if not self.multi_level:
+            return [] if self.price is None else [self.price]
+        return list(self._prices)
+
+    def values(self) -> list:
+        if not self.multi_level:
+            return [] if self.price is None else [self.qty]
+        return list(self._qtys)
+
+    def items(self) -> list:
+        return list(zip(self.keys(), self.values()))
+
+    def clear(self):
+        self.price = self.qty = None
+        if self._prices:
+            self._prices.clear()
+            self._qtys.clear()
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, BookSide):
+            return self.items() == other.items()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    # ---------------- book operations ----------------
+
+    def set_top(self, price, qty):
+        """Replace the whole side with one level (empty if qty <= 0)."""
+        self.clear()
+        if qty > 0:
+            if self.multi_level:
+                self._prices.append(price)
+                self._qtys.append(qty)
+            else:
+                self.price = price
+                self.qty = qty
+
+    def highest(self) -> Optional[Tuple[float, float]]:
+        """Best bid: highest positive price level."""
+        if not self.multi_level:
+            price = self.price
+            if price is None or price <= 0:
+                return None
+            return price, self.qty
+        if not self._prices or self._prices[-1] <= 0:
+            return None
+        return self._prices[-1], self._qtys[-1]
+
+    def lowest(self) -> Optional[Tuple[float, float]]:
+        """Best ask: lowest positive price level."""
+        if not self.multi_level:
+            price = self.price
+            if price is None or price <= 0:
+                return None
+            return price, self.qty
+        i = bisect_right(self._prices, 0)
+        if i == len(self._prices):
+            return None
+        return self._prices[i], self._qtys[i]
+
 
 class OrderBook:
-    def __init__(self):
+    __slots__ = ('bids', 'asks', 'last_trade', 'multi_level')
+
+    def __init__(self, multi_level: bool = False):
         # price -> quantity
-        self.bids = {}
-        self.asks = {}
+        self.bids = BookSide(multi_level)
+        self.asks = BookSide(multi_level)
         self.last_trade = None
+        self.multi_level = multi_level
 
     def set_bid(self, price: float, quantity: float):
         # Each update represents the NEW best bid (top of book)
         # Clear all old bids and set only this level
-        self.bids.clear()
-        if quantity > 0:
-            self.bids[price] = quantity
+        self.bids.set_top(price, quantity)
 
     def set_ask(self, price: float, quantity: float):
         # Each update represents the NEW best ask (top of book)
         # Clear all old asks and set only this level
-        self.asks.clear()
+        self.asks.set_top(price, quantity)
+
+    def update_bid_level(self, price: float, quantity: float):
+        """Set one bid level (quantity <= 0 removes it); multi-level mode only."""
+        self._update_level(self.bids, price, quantity)
+
+    def update_ask_level(self, price: float, quantity: float):
+        """Set one ask level (quantity <= 0 removes it); multi-level mode only."""
+        self._update_level(self.asks, price, quantity)
+
+    def _update_level(self, side: BookSide, price: float, quantity: float):
+        if not self.multi_level:
+            raise ValueError("Level updates need OrderBook(multi_level=True)")
         if quantity > 0:
-            self.asks[price] = quantity
+            side[price] = quantity
+        elif price in side:
+            del side[price]
 
     def remove_bid(self, price: float, quantity: float):
         if price in self.bids:
@@ -38,24 +218,10 @@ class OrderBook:
                 self.asks[price] -= quantity
 
     def get_best_bid(self) -> Optional[Tuple[float, float]]:
-        if not self.bids:
-            return None
-        # Filter out any invalid prices that may have slipped through
-        valid_bids = {p: q for p, q in self.bids.items() if p > 0}
-        if not valid_bids:
-            return None
-        price = max(valid_bids.keys())
-        return price, valid_bids[price]
+        return self.bids.highest()
 
     def get_best_ask(self) -> Optional[Tuple[float, float]]:
-        if not self.asks:
-            return None
-        # Filter out any invalid prices that may have slipped through
-        valid_asks = {p: q for p, q in self.asks.items() if p > 0}
-        if not valid_asks:
-            return None
-        price = min(valid_asks.keys())
-        return price, valid_asks[price]
+        return self.asks.lowest()
 
     def apply_update(self, update: dict):
         """Apply a market update: dict with keys 'timestamp','type','price','volume'."""
@@ -64,12 +230,372 @@ class OrderBook:
         vol = update.get('volume', 0)
         if utype is None:
             return
-        
+
         # Skip invalid prices
         if price is None or price <= 0:
             return
 
-        t = str(utype).lower()
+        t = utype if utype in ('bid', 'ask', 'trade') else str(utype).lower()
+        if t == 'bid':
+            self.bids.set_top(price, vol)
+        elif t == 'ask':
+            self.asks.set_top(price, vol)
+        elif t == 'trade':
+            self.last_trade = {'timestamp': update.get('timestamp'), 'price': price, 'volume': vol}
+
+    def __str__(self):
+        return f"Bids: {self.bids}, Asks: {self.asks}, Last trade: {self.last_trade}"
+
+
+# Depth-of-book prices are stored as integers in units of the finest tick
+# in ClosingStrategy.get_tick_size (0.001)
+_PRICE_SCALE = 1000
+
+# Initial grid around the first price seen (the grid grows on demand)
+_GRID_MARGIN = 0.25
+
+
+class DepthSide:
+    """One side of a DepthBook: quantities indexed by tick-grid level.
+
+    Dict-like like BookSide (``get``, ``clear``, ``[]``, ``in``, ``len``,
+    ``items``); keys are prices on the book's tick grid.
+    """
+
+    __slots__ = ('book', 'is_bid', 'qty', 'price', 'best', 'top', 'deep')
+
+    def __init__(self, book: 'DepthBook', is_bid: bool):
+        self.book = book
+        self.is_bid = is_bid
+        self.qty = np.zeros(0, dtype=np.float64)
+        # Price as last given for each level (grid prices are rounded ticks)
+        self.price = np.zeros(0, dtype=np.float64)
+        self.best = -1  # Level index of the best price (-1: empty)
+        self.top = None  # (price, qty) of the best level, as given
+        self.deep = False  # Levels other than the best may be set
+
+    # ---------------- level maintenance ----------------
+
+    def _set(self, i: int, price: float, qty):
+        """Set the quantity of level i (qty <= 0 removes it)."""
+        if qty > 0:
+            self.qty[i] = qty
+            self.price[i] = price
+            best = self.best
+            if best >= 0 and i != best:
+                self.deep = True
+            if best < 0 or i == best or (i > best if self.is_bid else i < best):
+                self.best = i
+                self.top = (price, qty)
+        else:
+            self.qty[i] = 0
+            if i == self.best:
+                self._rescan()
+
+    def _rescan(self):
+        """Find the best level after it was removed."""
+        best = self.best
+        if self.is_bid:
+            nz = np.flatnonzero(self.qty[:best])
+            self.best = int(nz[-1]) if nz.size else -1
+        else:
+            nz = np.flatnonzero(self.qty[best + 1:])
+            self.best = best + 1 + int(nz[0]) if nz.size else -1
+        best = self.best
+        self.top = (float(self.price[best]), float(self.qty[best])) if best >= 0 else None
+
+    def _set_top(self, i: int, price: float, qty):
+        """Top-of-book update: level i becomes the only level on this side."""
+        best = self.best
+        if qty <= 0:
+            self.clear()
+            return
+        if self.deep:
+            self.qty[:] = 0
+            self.deep = False
+        elif best >= 0:
+            self.qty[best] = 0
+        self.qty[i] = qty
+        self.price[i] = price
+        self.best = i
+        self.top = (price, qty)
+
+    def _levels(self, n_ticks: int):
+        """Slices of the n_ticks grid levels from the best price outwards."""
+        best = self.best
+        if self.is_bid:
+            start = max(0, best - n_ticks + 1)
+            return self.price[start:best + 1][::-1], self.qty[start:best + 1][::-1]
+        end = best + n_ticks
+        return self.price[best:end], self.qty[best:end]
+
+    def best_level(self) -> Optional[Tuple[float, float]]:
+        """(price, quantity) of the best level, as last given."""
+        return self.top
+
+    # ---------------- dict interface ----------------
+
+    def get(self, price, default=None):
+        top = self.top
+        if top is not None and price == top[0]:
+            return top[1]
+        i = self.book.index(price, extend=False)
+        if i < 0:
+            return default
+        qty = self.qty[i]
+        return float(qty) if qty > 0 else default
+
+    def __getitem__(self, price):
+        qty = self.get(price)
+        if qty is None:
+            raise KeyError(price)
+        return qty
+
+    def __setitem__(self, price, qty):
+        self._set(self.book.index(price), price, qty)
+
+    def __delitem__(self, price):
+        i = self.book.index(price, extend=False)
+        if i < 0 or self.qty[i] <= 0:
+            raise KeyError(price)
+        self._set(i, price, 0)
+
+    def __contains__(self, price) -> bool:
+        return self.get(price) is not None
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.qty))
+
+    def __bool__(self) -> bool:
+        return self.best >= 0
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self) -> list:
+        return self.price[np.flatnonzero(self.qty)].tolist()
+
+    def values(self) -> list:
+        return self.qty[np.flatnonzero(self.qty)].tolist()
+
+    def items(self) -> list:
+        return list(zip(self.keys(), self.values()))
+
+    def clear(self):
+        if self.best >= 0:
+            self.qty[:] = 0
+            self.best = -1
+            self.top = None
+            self.deep = False
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (DepthSide, BookSide)):
+            return self.items() == other.items()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+class DepthBook:
+    """Full depth-of-book with price-indexed arrays on the exchange tick grid.
+
+    Levels are stored in one float64 quantity array per side, indexed by the
+    security's tick ladder (``ClosingStrategy.get_tick_size``), so a level
+    update is an O(1) array write and depth queries are NumPy slices. The
+    grid starts around the first price seen and grows when a price falls
+    outside it (or off the ladder).
+
+    Updates:
+        set_bid / set_ask              Top-of-book tick (same meaning as
+                                       OrderBook): the side is cleared and
+                                       holds only the new best level
+        update_bid_level / ..._ask_    Incremental L2 level update
+        apply_snapshot                 Replace one or both sides from an
+                                       L2 snapshot
+
+    With top-of-book ticks only, every side holds a single level exactly
+    like OrderBook, so it is a drop-in replacement in the handlers; deeper
+    levels exist only after update_*_level or apply_snapshot.
+
+    Args:
+        security: Security name (selects the exchange tick ladder)
+        exchange_mapping: {security: 'ADX' | 'DFM'} (default: ADX)
+        price_range: Optional (low, high) to size the grid up front
+    """
+
+    __slots__ = ('security', 'tick_size', 'bids', 'asks', 'last_trade', 'prices',
+                 '_ticks', '_lo', '_slot', '_slot_list')
+
+    def __init__(self, security: str, exchange_mapping: Optional[dict] = None,
+                 price_range: Optional[Tuple[float, float]] = None):
+        from src.closing_strategy.strategy import ClosingStrategy
+
+        self.security = security
+        self.tick_size = ClosingStrategy({}, exchange_mapping).get_tick_size
+        self.bids = DepthSide(self, is_bid=True)
+        self.asks = DepthSide(self, is_bid=False)
+        self.last_trade = None
+        self.prices = np.zeros(0, dtype=np.float64)
+        self._ticks = np.zeros(0, dtype=np.int64)
+        self._lo = 0
+        self._slot = np.zeros(0, dtype=np.int32)
+        self._slot_list = []
+        if price_range is not None:
+            self._build_grid(*price_range)
+
+    # ---------------- tick grid ----------------
+
+    def _ladder(self, low: float, high: float) -> np.ndarray:
+        """Integer tick-grid prices covering [low, high]."""
+        p = int(np.floor(low * _PRICE_SCALE))
+        end = int(np.ceil(high * _PRICE_SCALE))
+        p = max(p, 1)
+        ticks = []
+        while True:
+            step = max(1, int(round(self.tick_size(self.security, p / _PRICE_SCALE) * _PRICE_SCALE)))
+            p -= p % step
+            if ticks and p <= ticks[-1]:
+                p = ticks[-1] + step
+            ticks.append(p)
+            if p >= end:
+                break
+            p += step
+        return np.array(ticks, dtype=np.int64)
+
+    def _build_grid(self, low: float, high: float, extra=()):
+        """(Re)build the grid over [low, high] plus any off-ladder prices.
+
+        Existing levels are carried over to their new positions.
+        """
+        ticks = self._ladder(low, high)
+        if len(self._ticks):
+            ticks = np.union1d(ticks, self._ticks)
+        if len(extra):
+            ticks = np.union1d(ticks, np.asarray(extra, dtype=np.int64))
+
+        old_ticks = self._ticks
+        self._ticks = ticks
+        self.prices = ticks / _PRICE_SCALE
+        self._lo = int(ticks[0])
+        self._slot = np.full(int(ticks[-1]) - self._lo + 1, -1, dtype=np.int32)
+        self._slot[ticks - self._lo] = np.arange(len(ticks), dtype=np.int32)
+
+        remap = np.searchsorted(ticks, old_ticks)
+        for side in (self.bids, self.asks):
+            qty = np.zeros(len(ticks), dtype=np.float64)
+            qty[remap] = side.qty
+            side.qty = qty
+            price = self.prices.copy()
+            price[remap] = side.price
+            side.price = price
+            side.best = int(remap[side.best]) if side.best >= 0 else -1
+        self._slot_list = self._slot.tolist()
+
+    def index(self, price: float, extend: bool = True) -> int:
+        """Grid level of a price (-1 if not on the grid and extend is False)."""
+        tick = int(round(price * _PRICE_SCALE))
+        k = tick - self._lo
+        if 0 <= k < len(self._slot_list):
+            i = self._slot_list[k]
+            if i >= 0:
+                return i
+        if not extend:
+            return -1
+
+        if not len(self._ticks):
+            self._build_grid(price * (1 - _GRID_MARGIN), price * (1 + _GRID_MARGIN))
+        else:
+            # Grow geometrically so repeated out-of-range prices stay cheap
+            low, high = self.prices[0], self.prices[-1]
+            if price < low:
+                low = min(price, low - (high - low))
+            elif price > high:
+                high = max(price, high + (high - low))
+            self._build_grid(low, high, extra=[tick])
+        return int(self._slot[tick - self._lo])
+
+    # ---------------- updates ----------------
+
+    def set_bid(self, price: float, quantity: float):
+        if quantity > 0:
+            self.bids._set_top(self.index(price), price, quantity)
+        else:
+            self.bids.clear()
+
+    def set_ask(self, price: float, quantity: float):
+        if quantity > 0:
+            self.asks._set_top(self.index(price), price, quantity)
+        else:
+            self.asks.clear()
+
+    def update_bid_level(self, price: float, quantity: float):
+        """Set one bid level (quantity <= 0 removes it)."""
+        self.bids._set(self.index(price), price, quantity)
+
+    def update_ask_level(self, price: float, quantity: float):
+        """Set one ask level (quantity <= 0 removes it)."""
+        self.asks._set(self.index(price), price, quantity)
+
+    def apply_snapshot(self, bids=None, asks=None):
+        """Replace book sides from an L2 snapshot.
+
+        Args:
+            bids: (prices, quantities) arrays or list of (price, qty) levels;
+                  None leaves the side unchanged
+            asks: Same for the ask side
+        """
+        for side, levels in ((self.bids, bids), (self.asks, asks)):
+            if levels is None:
+                continue
+            if isinstance(levels, tuple) and len(levels) == 2 and np.ndim(levels[0]) == 1:
+                prices, qtys = (np.asarray(a, dtype=np.float64) for a in levels)
+            else:
+                levels = np.asarray(levels, dtype=np.float64).reshape(-1, 2)
+                prices, qtys = levels[:, 0], levels[:, 1]
+            keep = (prices > 0) & (qtys > 0)
+            prices, qtys = prices[keep], qtys[keep]
+
+            side.clear()
+            if not len(prices):
+                continue
+            # Make sure every level is on the grid, then write in one go
+            self.index(float(prices.min()))
+            self.index(float(prices.max()))
+            idx = np.array([self.index(p) for p in prices.tolist()], dtype=np.int64)
+            side.qty[idx] = qtys
+            side.price[idx] = prices
+            best = int(idx.max() if side.is_bid else idx.min())
+            side.best = best
+            side.top = (float(side.price[best]), float(side.qty[best]))
+            side.deep = len(idx) > 1
+
+    def remove_bid(self, price: float, quantity: float):
+        if price in self.bids:
+            self.update_bid_level(price, self.bids[price] - quantity)
+
+    def remove_ask(self, price: float, quantity: float):
+        if price in self.asks:
+            self.update_ask_level(price, self.asks[price] - quantity)
+
+    def apply_update(self, update: dict):
+        """Apply a market update: dict with keys 'timestamp','type','price','volume'."""
+        utype = update.get('type')
+        price = update.get('price')
+        vol = update.get('volume', 0)
+        if utype is None:
+            return
+
+        # Skip invalid prices
+        if price is None or price <= 0:
+            return
+
+        t = utype if utype in ('bid', 'ask', 'trade') else str(utype).lower()
         if t == 'bid':
             self.set_bid(price, vol)
         elif t == 'ask':
@@ -77,7 +603,83 @@ class OrderBook:
         elif t == 'trade':
             self.last_trade = {'timestamp': update.get('timestamp'), 'price': price, 'volume': vol}
 
+    # ---------------- queries ----------------
+
+    def get_best_bid(self) -> Optional[Tuple[float, float]]:
+        return self.bids.best_level()
+
+    def get_best_ask(self) -> Optional[Tuple[float, float]]:
+        return self.asks.best_level()
+
+    def _side(self, side: str) -> DepthSide:
+        if side not in ('bid', 'ask'):
+            raise ValueError(f"side must be 'bid' or 'ask', got {side!r}")
+        return self.bids if side == 'bid' else self.asks
+
+    def depth(self, side: str, n_ticks: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Prices and quantities of the n_ticks grid levels from the best price.
+
+        Returns:
+            (prices, quantities) arrays, best level first (empty if no quote)
+        """
+        book_side = self._side(side)
+        if book_side.best < 0:
+            return np.zeros(0), np.zeros(0)
+        return book_side._levels(n_ticks)
+
+    def cumulative_notional(self, side: str, n_ticks: int) -> np.ndarray:
+        """Running price * quantity over the n_ticks levels from the best price."""
+        prices, qtys = self.depth(side, n_ticks)
+        return np.cumsum(prices * qtys)
+
+    def notional_within(self, side: str, n_ticks: int) -> float:
+        """Total price * quantity resting within n_ticks of the best price."""
+        prices, qtys = self.depth(side, n_ticks)
+        return float(np.dot(prices, qtys))
+
+    def volume_ahead(self, side: str, price: float, include_level: bool = True) -> float:
+        """Quantity queued at better prices (and at the price itself).
+
+        A new order at ``price`` sits behind all of it.
+        """
+        book_side = self._side(side)
+        i = self.index(price, extend=False)
+        if book_side.best < 0:
+            return 0.0
+        if i < 0:
+            # Off-grid price: count the levels strictly better than it
+            tick = int(round(price * _PRICE_SCALE))
+            pos = int(np.searchsorted(self._ticks, tick))
+            if book_side.is_bid:
+                return float(book_side.qty[pos:].sum())
+            return float(book_side.qty[:pos].sum())
+        if book_side.is_bid:
+            start = i if include_level else i + 1
+            return float(book_side.qty[start:].sum())
+        end = i + 1 if include_level else i
+        return float(book_side.qty[:end].sum())
+
     def __str__(self):
-        return f"Bids: {len(self.bids)} levels, Asks: {len(self.asks)} levels, Last trade: {self.last_trade}"
-    def __str__(self):
-        return f"Bids: {self.bids}, Asks: {self.asks}, Last trade: {self.last_trade}"
\ No newline at end of file
+        return f"Bids: {self.bids}, Asks: {self.asks}, Last trade: {self.last_trade}"
+
+
+def create_orderbook(depth: str = 'top', security: Optional[str] = None,
+                     exchange_mapping: Optional[dict] = None):
+    """Create the order book for a handler run.
+
+    Args:
+        depth: 'top' (single level, default), 'sorted' (multi-level sorted
+               arrays) or 'full' (tick-grid DepthBook)
+        security: Security name (needed for 'full')
+        exchange_mapping: Exchange per security for the tick ladder ('full')
+
+    Returns:
+        OrderBook or DepthBook
+    """
+    if depth == 'top':
+        return OrderBook()
+    if depth == 'sorted':
+        return OrderBook(multi_level=True)
+    if depth == 'full':
+        return DepthBook(security, exchange_mapping)
+    raise ValueError(f"Unknown book depth: {depth} (expected 'top', 'sorted' or 'full')")
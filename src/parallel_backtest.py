@@ -11,6 +11,11 @@ from concurrent.futures import ProcessPoolExecutor, as_completed
 from multiprocessing import cpu_count
 import pandas as pd
 
+from src.work_scheduler import (
+    RuntimeStats, UtilisationReport, estimate_costs, parquet_row_count, predicted_makespan,
+    schedule_lpt, split_large_tasks
+)
+
 
 def get_handler_for_worker(strategy_name: str):
     """Get handler factory function for a strategy.
@@ -53,7 +58,13 @@ def process_single_security_parquet(
     handler_module: str,
     handler_function: str,
     config: dict,
-    chunk_size: int = 100000
+    chunk_size: int = 100000,
+    engine: str = 'handler',
+    max_memory_mb: Optional[float] = None,
+    prefetch: bool = False,
+    tick_cache: bool = False,
+    result_dir: Optional[str] = None,
+    book_depth: str = 'top'
 ) -> tuple:
     """Process a single security from Parquet file in isolation.
     
@@ -63,14 +74,24 @@ def process_single_security_parquet(
         handler_module: Module path for handler
         handler_function: Handler factory function name
         config: Configuration dict
-        chunk_size: Rows per chunk
+        chunk_size: Rows per chunk (handler engine only)
+        engine: 'handler' (chunked itertuples handlers) or 'kernel'
+                (columnar event kernel, see src/event_kernel.py)
+        max_memory_mb: Stream record batches under this memory ceiling instead
+                       of loading the whole file (handler engine only)
+        prefetch: Read the next batch on a background thread (handler engine only)
+        tick_cache: Read preprocessed data from the memory-mapped Arrow cache
+                    (src/tick_cache.py), building it on first use
+        result_dir: If set, write the trades to an Arrow IPC file in this
+                    directory and return a TradeLog handle instead of the list
+        book_depth: Order book for the handler engine: 'top' (default),
+                    'sorted' or 'full' (tick-grid depth book)
     
     Returns:
         Tuple of (security_name, results_dict, timing_info)
     """
     import sys
     import os
-    import pandas as pd
     from pathlib import Path as PathLib
     
     # Ensure src is in path
@@ -85,58 +106,71 @@ def process_single_security_parquet(
         security = PathLib(security_file).stem.upper()
         print(f"[Worker] Processing {security}...", flush=True)
         
-        # Dynamically import handler factory
-        print(f"[Worker] Importing handler...", flush=True)
-        handler_module_obj = __import__(handler_module, fromlist=[''])
-        handler_factory = getattr(handler_module_obj, handler_function)
-        
-        # Create handler in this process
-        print(f"[Worker] Creating handler...", flush=True)
-        handler = handler_factory(config)
-        print(f"[Worker] Handler created", flush=True)
-        
-        # Read Parquet file
-        print(f"[Worker] Reading Parquet file: {security_file}...", flush=True)
         parquet_file_path = PathLib(parquet_dir) / security_file
-        df = pd.read_parquet(parquet_file_path)
-        print(f"[Worker] Read {len(df):,} rows", flush=True)
+        streaming = engine != 'kernel' and (max_memory_mb is not None or prefetch)
         
-        # Initialize results for this security
-        from src.orderbook import OrderBook
-        from src.data_loader import preprocess_chunk_df
-        orderbook = OrderBook()
-        state = {}  # Empty state - let handler initialize all fields
+        if streaming:
+            # Bounded memory: read one record batch at a time
+            from src.parquet_loader import iter_parquet_batches
+            print(f"[Worker] Streaming Parquet file: {security_file}...", flush=True)
+            chunks = iter_parquet_batches(parquet_file_path, batch_size=chunk_size,
+                                          max_memory_mb=max_memory_mb, prefetch=prefetch)
+        elif tick_cache:
+            # Memory-map the preprocessed Arrow cache (shared page cache)
+            from src.tick_cache import load_cached_ticks
+            print(f"[Worker] Mapping tick cache: {security_file}...", flush=True)
+            df = load_cached_ticks(parquet_file_path)
+            print(f"[Worker] Mapped {len(df):,} rows", flush=True)
+            chunks = (df.iloc[start_idx:start_idx + chunk_size].copy()
+                      for start_idx in range(0, len(df), chunk_size))
+        else:
+            # Read Parquet file
+            from src.parquet_loader import read_parquet_file
+            print(f"[Worker] Reading Parquet file: {security_file}...", flush=True)
+            df = read_parquet_file(parquet_file_path)
+            print(f"[Worker] Read {len(df):,} rows", flush=True)
+            chunks = (df.iloc[start_idx:start_idx + chunk_size].copy()
+                      for start_idx in range(0, len(df), chunk_size))
         
-        # Process in chunks
-        total_rows = len(df)
-        chunk_num = 0
-        for start_idx in range(0, total_rows, chunk_size):
-            chunk_num += 1
-            end_idx = min(start_idx + chunk_size, total_rows)
-            chunk = df.iloc[start_idx:end_idx].copy()
+        if engine == 'kernel':
+            # Convert once to typed arrays and run the columnar strategy kernel
+            from src.event_kernel import (
+                build_event_arrays, run_event_kernel, get_kernel_strategy_name
+            )
+            from src.session_index import load_session_index
+            strategy_name = get_kernel_strategy_name(handler_module)
+            if strategy_name is None:
+                raise ValueError(f"No event kernel available for {handler_module}")
             
-            # Use preprocess_chunk_df to handle timestamp normalization
-            chunk = preprocess_chunk_df(chunk)
+            events = build_event_arrays(df)
+            del df
+            # Per-day session offsets of the event rows (cached next to the parquet file)
+            sessions = load_session_index(parquet_file_path, timestamps=events.timestamp)
+            state = run_event_kernel(strategy_name, security, events, config,
+                                     sessions=sessions)
+            state['rows'] = state.get('rows', 0) + len(events)
+            print(f"[Worker] Kernel: {len(state.get('trades', []))} trades", flush=True)
+        else:
+            # Dynamically import handler factory
+            print("[Worker] Importing handler...", flush=True)
+            handler_module_obj = __import__(handler_module, fromlist=[''])
+            handler_factory = getattr(handler_module_obj, handler_function)
             
-            # Call handler - it updates state with trades, pnl, position
-            state = handler(security, chunk, orderbook, state)
-            if state is None:
-                state = {'error': 'Handler returned None'}
-                break
+            # Create handler in this process
+            print("[Worker] Creating handler...", flush=True)
+            handler = handler_factory(config)
+            print("[Worker] Handler created", flush=True)
             
-            state['rows'] = state.get('rows', 0) + len(chunk)
-            print(f"[Worker] Chunk {chunk_num}: {len(state.get('trades', []))} trades", flush=True)
+            state = run_handler_chunks(security, chunks, handler, book_depth)
         
-        # Extract results from state (handler populates these)
-        results = {
-            'trades': state.get('trades', []),
-            'pnl': state.get('pnl', 0.0),
-            'position': state.get('position', 0),
-            'entry_price': state.get('entry_price', 0),
-            'rows': state.get('rows', 0),
-            'market_dates': state.get('market_dates', set()),
-            'strategy_dates': state.get('strategy_dates', set())
-        }
+        results = results_from_state(state)
+        
+        if result_dir is not None:
+            # Ship a file handle instead of pickling every trade dict
+            from src.result_transport import write_trade_log
+            results['trades'] = write_trade_log(
+                results['trades'], PathLib(result_dir) / f"{security.lower()}.arrow"
+            )
         
         elapsed = time.time() - start_time
         
@@ -161,6 +195,208 @@ def process_single_security_parquet(
         return (security, {'error': str(e)}, error_info)
 
 
+def run_handler_chunks(security: str, chunks, handler, book_depth: str = 'top') -> dict:
+    """Feed a security's chunks through a handler with a fresh order book.
+    
+    Args:
+        security: Security name
+        chunks: Iterable of raw or canonical tick DataFrames
+        handler: Handler created by a strategy's handler factory
+        book_depth: Order book mode ('top', 'sorted' or 'full', see
+                    src.orderbook.create_orderbook)
+    
+    Returns:
+        Handler state dict (with 'error' if the handler returned None)
+    """
+    from src.orderbook import create_orderbook
+    from src.data_loader import preprocess_chunk_df
+    
+    orderbook = create_orderbook(book_depth, security)
+    state = {}  # Empty state - let handler initialize all fields
+    
+    # Process in chunks
+    chunk_num = 0
+    for chunk in chunks:
+        chunk_num += 1
+        
+        # Use preprocess_chunk_df to handle timestamp normalization
+        chunk = preprocess_chunk_df(chunk)
+        
+        # Call handler - it updates state with trades, pnl, position
+        state = handler(security, chunk, orderbook, state)
+        if state is None:
+            state = {'error': 'Handler returned None'}
+            break
+        
+        state['rows'] = state.get('rows', 0) + len(chunk)
+        print(f"[Worker] Chunk {chunk_num}: {len(state.get('trades', []))} trades", flush=True)
+    
+    return state
+
+
+def results_from_state(state: dict) -> dict:
+    """Extract the per-security results dict from a handler/kernel state."""
+    return {
+        'trades': state.get('trades', []),
+        'pnl': state.get('pnl', 0.0),
+        'position': state.get('position', 0),
+        'entry_price': state.get('entry_price', 0),
+        'rows': state.get('rows', 0),
+        'market_dates': state.get('market_dates', set()),
+        'strategy_dates': state.get('strategy_dates', set())
+    }
+
+
+def _read_kernel_events(parquet_file_path, tick_cache: bool = False):
+    """Read a security and convert it to EventArrays (plus their SessionIndex)."""
+    from src.event_kernel import build_event_arrays
+    from src.session_index import build_session_index
+    
+    if tick_cache:
+        from src.tick_cache import load_cached_ticks
+        df = load_cached_ticks(parquet_file_path)
+    else:
+        from src.parquet_loader import read_parquet_file
+        df = read_parquet_file(parquet_file_path)
+    events = build_event_arrays(df)
+    return events, build_session_index(events.timestamp)
+
+
+def process_security_day_shard(
+    security_file: str,
+    parquet_dir: str,
+    handler_module: str,
+    config: dict,
+    n_shards: int,
+    shard_index: int,
+    tick_cache: bool = False
+) -> tuple:
+    """Run one day shard of a security on the event kernel.
+    
+    Every shard worker plans the same shards from the security's session
+    index and runs only its own (see src/day_sharding.py).
+    
+    Args:
+        security_file: Parquet filename (e.g., 'emaar.parquet')
+        parquet_dir: Directory containing Parquet files
+        handler_module: Module path for handler (selects the kernel strategy)
+        config: Configuration dict
+        n_shards: Requested number of shards for this security
+        shard_index: Shard to run (0-based)
+        tick_cache: Read preprocessed data from the memory-mapped Arrow cache
+    
+    Returns:
+        Tuple of (security_name, shard_index, shard_result, timing_info).
+        shard_result is None if the security has fewer shards than requested.
+    """
+    import sys
+    import os
+    from pathlib import Path as PathLib
+    
+    # Ensure src is in path
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    
+    start_time = time.time()
+    security = PathLib(security_file).stem.upper()
+    
+    try:
+        from src.day_sharding import plan_day_shards, run_day_shard
+        from src.event_kernel import get_kernel_strategy_name
+        
+        strategy_name = get_kernel_strategy_name(handler_module)
+        if strategy_name is None:
+            raise ValueError(f"No event kernel available for {handler_module}")
+        
+        events, sessions = _read_kernel_events(PathLib(parquet_dir) / security_file, tick_cache)
+        shards = plan_day_shards(sessions, n_shards)
+        shard_result = None
+        if shard_index < len(shards):
+            shard_result = run_day_shard(strategy_name, security, events, config,
+                                         shards[shard_index])
+        
+        elapsed = time.time() - start_time
+        timing_info = {'elapsed': elapsed, 'rows': len(events), 'shards': len(shards)}
+        print(f"[Worker] {security} shard {shard_index + 1}/{len(shards)} complete in {elapsed:.1f}s",
+              flush=True)
+        return (security, shard_index, shard_result, timing_info)
+        
+    except Exception as e:
+        import traceback
+        error_info = {
+            'error': str(e),
+            'traceback': traceback.format_exc(),
+            'elapsed': time.time() - start_time
+        }
+        print(f"[Worker] ERROR {security} shard {shard_index + 1}: {e}", flush=True)
+        return (security, shard_index, None, error_info)
+
+
+def _merge_day_shards(
+    parquet_file: Path,
+    handler_module: str,
+    config: dict,
+    n_shards: int,
+    shard_results: list,
+    event_rows: int,
+    tick_cache: bool = False,
+    result_dir: Optional[str] = None
+) -> dict:
+    """Reconcile a security's day shards into one results dict.
+    
+    Shards whose warm-up state does not match the true handoff state are
+    re-run here, after reading the security once more.
+    """
+    from src.day_sharding import plan_day_shards, reconcile_day_shards
+    from src.event_kernel import get_kernel_strategy_name, run_event_kernel_sweep
+    
+    security = parquet_file.stem.upper()
+    strategy_name = get_kernel_strategy_name(handler_module)
+    loaded = {}
+    
+    def rerun(i, start_state):
+        if not loaded:
+            events, sessions = _read_kernel_events(parquet_file, tick_cache)
+            loaded['events'] = events
+            loaded['shards'] = plan_day_shards(sessions, n_shards)
+        _, start, end = loaded['shards'][i]
+        return run_event_kernel_sweep(strategy_name, security, loaded['events'].slice(start, end),
+                                      [config], start_states=[start_state])[0]
+    
+    state = reconcile_day_shards(strategy_name, security, config, shard_results, rerun)
+    if state['shard_reruns']:
+        print(f"  {security}: re-ran {state['shard_reruns']} of {len(shard_results)} day shards "
+              f"from the true handoff state")
+    
+    results = {
+        'trades': state['trades'],
+        'pnl': state['pnl'],
+        'position': state['position'],
+        'entry_price': state.get('entry_price', 0),
+        'rows': state['rows'] + event_rows,
+        'market_dates': state['market_dates'],
+        'strategy_dates': state['strategy_dates']
+    }
+    if result_dir is not None:
+        from src.result_transport import write_trade_log
+        results['trades'] = write_trade_log(
+            results['trades'], Path(result_dir) / f"{security.lower()}.arrow"
+        )
+    return results
+
+
+def _result_dir_for(result_transport: str) -> Optional[str]:
+    """Temporary result directory for the 'arrow' transport (None for 'pickle')."""
+    from src.result_transport import RESULT_TRANSPORTS, create_result_dir
+    
+    if result_transport not in RESULT_TRANSPORTS:
+        raise ValueError(f"Unknown result transport: {result_transport} (expected one of {RESULT_TRANSPORTS})")
+    if result_transport == 'pickle':
+        return None
+    return str(create_result_dir())
+
+
 def run_parallel_backtest_parquet(
     parquet_dir: str,
     handler_module: str,
@@ -170,7 +406,18 @@ def run_parallel_backtest_parquet(
     max_files: Optional[int] = None,
     chunk_size: int = 100000,
     output_dir: Optional[str] = 'output',
-    write_csv: bool = True
+    write_csv: bool = True,
+    engine: str = 'handler',
+    max_memory_mb: Optional[float] = None,
+    prefetch: bool = False,
+    tick_cache: bool = False,
+    result_transport: str = 'pickle',
+    schedule: str = 'lpt',
+    day_shards: bool = False,
+    book_depth: str = 'top',
+    result_store: Optional[str] = None,
+    scenario: str = 'default',
+    trade_sink_dir: Optional[str] = None
 ) -> Dict:
     """Run backtest with per-security parallelization using Parquet files.
     
@@ -184,10 +431,38 @@ def run_parallel_backtest_parquet(
         chunk_size: Rows per processing chunk
         output_dir: Output directory for results
         write_csv: Whether to write CSV output files
+        engine: 'handler' (default) or 'kernel' for the columnar event kernel
+                (V1, V2, V2.1 and V3 only; produces identical trades)
+        max_memory_mb: Per-worker memory ceiling for streaming record batches
+                       (handler engine; default loads each file whole)
+        prefetch: Prefetch the next record batch on a background thread
+        tick_cache: Read each security through the memory-mapped Arrow cache
+                    (built on first use, reused by later runs and sweeps)
+        result_transport: 'pickle' (trade lists through the executor pipe) or
+                          'arrow' (workers write Arrow IPC files and return
+                          lazily loaded TradeLog handles, see src/result_transport.py)
+        schedule: 'lpt' submits the most expensive securities first, using
+                  runtimes recorded in <parquet_dir>/.runtime_stats.json and
+                  parquet row counts (see src/work_scheduler.py); 'name'
+                  keeps alphabetical order
+        day_shards: Split securities that cost more than the average worker
+                    load into day shards run in parallel and reconciled to
+                    the exact sequential result (kernel engine only, see
+                    src/day_sharding.py)
+        book_depth: Handler engine order book: 'top' (default), 'sorted' or
+                    'full' (tick-grid depth book, see src/orderbook.py)
+        result_store: Root of a partitioned Parquet result store to write the
+                      trades and summary to (see src/result_store.py); the
+                      strategy partition is derived from handler_module
+        scenario: Scenario partition in the result store
+        trade_sink_dir: Spill each security's fills to Parquet part files in
+                        <trade_sink_dir>/<run_id>/<SECURITY> instead of keeping them
+                        all in memory (handler engine, see src/trade_sink.py)
     
     Returns:
         Dictionary mapping security names to results
     """
+    result_dir = _result_dir_for(result_transport)
     if max_workers is None:
         max_workers = cpu_count()
     
@@ -196,7 +471,16 @@ def run_parallel_backtest_parquet(
     print("="*80)
     print(f"Data source: {parquet_dir}")
     print(f"Workers: {max_workers}")
+    print(f"Engine: {engine}")
     print(f"Chunk size: {chunk_size:,} rows")
+    if max_memory_mb is not None or prefetch:
+        print(f"Streaming: max {max_memory_mb} MB per worker, prefetch={prefetch}")
+    if tick_cache:
+        print("Tick cache: enabled")
+    if day_shards:
+        print("Day shards: enabled")
+    if result_dir is not None:
+        print(f"Result transport: Arrow IPC ({result_dir})")
     if max_files:
         print(f"Max securities: {max_files}")
     print("="*80)
@@ -215,37 +499,122 @@ def run_parallel_backtest_parquet(
     
     print(f"Found {len(parquet_files)} securities to process")
     
+    if trade_sink_dir:
+        from src.trade_sink import new_run_id, with_trade_sink
+        run_id = new_run_id()
+        config = with_trade_sink(config, [f.stem.upper() for f in parquet_files], trade_sink_dir,
+                                 run_id=run_id)
+        print(f"Trade sink: {Path(trade_sink_dir) / run_id}")
+    
+    # Longest tasks first, so no large security starts last
+    stats = RuntimeStats.load(parquet_dir)
+    workload = f"{engine}:{handler_module.split('.')[-2]}"
+    if schedule not in ('lpt', 'name'):
+        raise ValueError(f"Unknown schedule: {schedule} (expected 'lpt' or 'name')")
+    if day_shards and engine != 'kernel':
+        raise ValueError("day_shards requires engine='kernel'")
+    
+    # Securities above the average worker load run as parallel day shards
+    shard_counts = {}
+    if day_shards:
+        shard_counts = split_large_tasks(estimate_costs(parquet_files, stats, workload),
+                                         max_workers)
+        for parquet_file, n_shards in sorted(shard_counts.items()):
+            print(f"Day shards: {parquet_file.stem.upper()} -> {n_shards}")
+    
+    # (parquet file, shard index or None for the whole security)
+    tasks = [(f, None) for f in parquet_files if f not in shard_counts]
+    tasks += [(f, i) for f, n in shard_counts.items() for i in range(n)]
+    if schedule == 'lpt':
+        _, costs = schedule_lpt(parquet_files, stats, workload)
+        task_cost = {t: costs[t[0]] / shard_counts.get(t[0], 1) for t in tasks}
+        tasks.sort(key=lambda t: (-task_cost[t], t[0].name, t[1] or 0))
+        print(f"Schedule: LPT (predicted makespan "
+              f"{predicted_makespan([task_cost[t] for t in tasks], max_workers):.1f}s)")
+    else:
+        tasks.sort(key=lambda t: (t[0].name, t[1] or 0))
+    
     # Process in parallel
     results = {}
     timings = {}
+    task_times = {}
+    shard_results = {f: {} for f in shard_counts}
     completed_count = 0
     start_time = time.time()
     
     with ProcessPoolExecutor(max_workers=max_workers) as executor:
         # Submit all tasks
-        future_to_file = {
-            executor.submit(
-                process_single_security_parquet,
-                parquet_file.name,
-                parquet_dir,
-                handler_module,
-                handler_function,
-                config,
-                chunk_size
-            ): parquet_file
-            for parquet_file in parquet_files
-        }
+        future_to_task = {}
+        for parquet_file, shard_index in tasks:
+            if shard_index is None:
+                future = executor.submit(
+                    process_single_security_parquet,
+                    parquet_file.name,
+                    parquet_dir,
+                    handler_module,
+                    handler_function,
+                    config,
+                    chunk_size,
+                    engine,
+                    max_memory_mb,
+                    prefetch,
+                    tick_cache,
+                    result_dir,
+                    book_depth
+                )
+            else:
+                future = executor.submit(
+                    process_security_day_shard,
+                    parquet_file.name,
+                    parquet_dir,
+                    handler_module,
+                    config,
+                    shard_counts[parquet_file],
+                    shard_index,
+                    tick_cache
+                )
+            future_to_task[future] = (parquet_file, shard_index)
         
-        print(f"Submitted {len(future_to_file)} tasks to process pool")
+        print(f"Submitted {len(future_to_task)} tasks to process pool")
         print()
         
         # Collect results as they complete
-        for future in as_completed(future_to_file):
-            parquet_file = future_to_file[future]
-            completed_count += 1
+        for future in as_completed(future_to_task):
+            parquet_file, shard_index = future_to_task[future]
+            security = parquet_file.stem.upper()
             
             try:
-                security, result, timing_info = future.result()
+                if shard_index is None:
+                    security, result, timing_info = future.result()
+                    task_times[security] = timing_info.get('elapsed', 0)
+                else:
+                    security, shard_index, shard_result, shard_timing = future.result()
+                    task_times[f"{security}[{shard_index}]"] = shard_timing.get('elapsed', 0)
+                    shards_done = shard_results[parquet_file]
+                    shards_done[shard_index] = (shard_result, shard_timing)
+                    if len(shards_done) < shard_counts[parquet_file]:
+                        continue
+                    
+                    # All shards of this security are in: reconcile them
+                    shard_timings = [shards_done[i][1] for i in range(len(shards_done))]
+                    failed_shard = next((t for t in shard_timings if 'error' in t), None)
+                    timing_info = {
+                        'elapsed': sum(t.get('elapsed', 0) for t in shard_timings),
+                        'shards': len(shard_timings)
+                    }
+                    if failed_shard is not None:
+                        result = {'error': failed_shard['error']}
+                        timing_info['error'] = failed_shard['error']
+                    else:
+                        result = _merge_day_shards(
+                            parquet_file, handler_module, config, shard_counts[parquet_file],
+                            [shards_done[i][0] for i in range(shard_timings[0]['shards'])],
+                            shard_timings[0]['rows'], tick_cache, result_dir
+                        )
+                        timing_info['rows'] = result['rows']
+                        timing_info['trades'] = len(result['trades'])
+                
+                completed_count += 1
                 results[security] = result
                 timings[security] = timing_info
                 
@@ -258,11 +627,20 @@ def run_parallel_backtest_parquet(
                 else:
                     print(f"[{completed_count}/{len(parquet_files)}] [OK] {security}: {trades_count:,} trades, {rows_count:,} rows in {elapsed:.1f}s")
             except Exception as e:
+                completed_count += 1
                 print(f"[{completed_count}/{len(parquet_files)}] [X] {security}: EXCEPTION - {e}")
-                results[parquet_file.stem.upper()] = {'error': str(e)}
+                results[security] = {'error': str(e)}
     
     total_time = time.time() - start_time
     
+    # Remember runtimes (and source row counts) for the next schedule
+    files_by_security = {f.stem.upper(): f for f in parquet_files}
+    for security, timing_info in timings.items():
+        if 'error' not in timing_info and security in files_by_security:
+            stats.record(workload, security, timing_info['elapsed'],
+                         parquet_row_count(files_by_security[security]))
+    stats.save()
+    
     # Summary
     print()
     print("="*80)
@@ -284,22 +662,213 @@ def run_parallel_backtest_parquet(
     print(f"\nTotal trades: {total_trades:,}")
     print(f"Total rows processed: {total_rows:,}")
     print(f"Throughput: {int(total_rows / total_time):,} rows/second")
+    UtilisationReport(
+        workers=max_workers,
+        wall_time=total_time,
+        task_times=task_times
+    ).print_report()
     print("="*80)
     
     # Write results
+    if result_store:
+        write_result_store(results, result_store, strategy_name_for(handler_module),
+                           scenario, params=config)
     if write_csv and output_dir:
         write_results(results, output_dir)
     
     return results
 
 
+def process_single_security_sweep(
+    security_file: str,
+    parquet_dir: str,
+    strategy_name: str,
+    configs: list,
+    tick_cache: bool = False,
+    result_dir: Optional[str] = None
+) -> tuple:
+    """Run every config of a sweep over one security in a single data pass.
+    
+    Args:
+        security_file: Parquet filename (e.g., 'adnocgas.parquet')
+        parquet_dir: Directory containing Parquet files
+        strategy_name: Kernel strategy name (e.g., 'v2_1_stop_loss')
+        configs: Configuration dicts, one per sweep scenario
+        tick_cache: Read preprocessed data from the memory-mapped Arrow cache
+        result_dir: If set, return TradeLog handles to Arrow IPC files here
+    
+    Returns:
+        Tuple of (security_name, list of results_dicts (one per config), timing_info)
+    """
+    import sys
+    import os
+    from pathlib import Path as PathLib
+    
+    # Ensure src is in path
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    
+    start_time = time.time()
+    security = PathLib(security_file).stem.upper()
+    
+    try:
+        from src.event_kernel import build_event_arrays, run_event_kernel_sweep
+        from src.session_index import load_session_index
+        
+        parquet_file_path = PathLib(parquet_dir) / security_file
+        if tick_cache:
+            from src.tick_cache import load_cached_ticks
+            df = load_cached_ticks(parquet_file_path)
+        else:
+            from src.parquet_loader import read_parquet_file
+            df = read_parquet_file(parquet_file_path)
+        
+        events = build_event_arrays(df)
+        del df
+        sessions = load_session_index(parquet_file_path, timestamps=events.timestamp)
+        
+        states = run_event_kernel_sweep(strategy_name, security, events, configs,
+                                        sessions=sessions)
+        results = [{
+            'trades': state.get('trades', []),
+            'pnl': state.get('pnl', 0.0),
+            'position': state.get('position', 0),
+            'entry_price': state.get('entry_price', 0),
+            'rows': state.get('rows', 0) + len(events),
+            'market_dates': state.get('market_dates', set()),
+            'strategy_dates': state.get('strategy_dates', set())
+        } for state in states]
+        
+        if result_dir is not None:
+            from src.result_transport import write_trade_log
+            for i, result in enumerate(results):
+                result['trades'] = write_trade_log(
+                    result['trades'], PathLib(result_dir) / f"{security.lower()}_{i}.arrow"
+                )
+        
+        elapsed = time.time() - start_time
+        timing_info = {
+            'elapsed': elapsed,
+            'rows': len(events),
+            'trades': sum(len(r['trades']) for r in results)
+        }
+        print(f"[Worker] {security} sweep complete: {len(configs)} configs in {elapsed:.1f}s", flush=True)
+        return (security, results, timing_info)
+        
+    except Exception as e:
+        import traceback
+        error_info = {
+            'error': str(e),
+            'traceback': traceback.format_exc(),
+            'elapsed': time.time() - start_time
+        }
+        print(f"[Worker] ERROR {security}: {e}", flush=True)
+        return (security, [{'error': str(e)} for _ in configs], error_info)
+
+
+def run_parallel_sweep_parquet(
+    parquet_dir: str,
+    strategy_name: str,
+    configs: list,
+    max_workers: Optional[int] = None,
+    max_files: Optional[int] = None,
+    tick_cache: bool = False,
+    result_transport: str = 'pickle'
+) -> list:
+    """Run a parameter sweep with one data pass per security.
+    
+    Instead of one full backtest per scenario, each worker reads a security
+    once and advances one strategy state per config through the shared
+    event stream (see run_event_kernel_sweep).
+    
+    Args:
+        parquet_dir: Directory containing Parquet files
+        strategy_name: Kernel strategy name (e.g., 'v1_baseline')
+        configs: Configuration dicts, one per sweep scenario
+        max_workers: Number of parallel workers (default: CPU count)
+        max_files: Limit to first N securities (for testing)
+        tick_cache: Read each security through the memory-mapped Arrow cache
+        result_transport: 'pickle' or 'arrow' (see run_parallel_backtest_parquet)
+    
+    Returns:
+        List (one entry per config) of dicts mapping security names to
+        results, in the same format as run_parallel_backtest_parquet
+    """
+    if max_workers is None:
+        max_workers = cpu_count()
+    result_dir = _result_dir_for(result_transport)
+    
+    print("="*80)
+    print("SINGLE-PASS PARAMETER SWEEP (PARQUET)")
+    print("="*80)
+    print(f"Data source: {parquet_dir}")
+    print(f"Strategy: {strategy_name}")
+    print(f"Scenarios per pass: {len(configs)}")
+    print(f"Workers: {max_workers}")
+    print("="*80)
+    print()
+    
+    parquet_files = sorted(Path(parquet_dir).glob("*.parquet"))
+    if not parquet_files:
+        raise FileNotFoundError(f"No Parquet files found in {parquet_dir}")
+    if max_files:
+        parquet_files = parquet_files[:max_files]
+    parquet_files, _ = schedule_lpt(parquet_files, RuntimeStats.load(parquet_dir),
+                                    f"kernel:{strategy_name}")
+    
+    scenario_results = [{} for _ in configs]
+    start_time = time.time()
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        future_to_file = {
+            executor.submit(
+                process_single_security_sweep,
+                parquet_file.name,
+                parquet_dir,
+                strategy_name,
+                configs,
+                tick_cache,
+                result_dir
+            ): parquet_file
+            for parquet_file in parquet_files
+        }
+        
+        for completed_count, future in enumerate(as_completed(future_to_file), 1):
+            parquet_file = future_to_file[future]
+            security = parquet_file.stem.upper()
+            try:
+                security, results, timing_info = future.result()
+                for scenario, result in zip(scenario_results, results):
+                    scenario[security] = result
+                
+                if 'error' in timing_info:
+                    print(f"[{completed_count}/{len(parquet_files)}] [X] {security}: ERROR - {timing_info['error']}")
+                else:
+                    print(f"[{completed_count}/{len(parquet_files)}] [OK] {security}: "
+                          f"{len(configs)} scenarios, {timing_info['rows']:,} rows in {timing_info['elapsed']:.1f}s")
+            except Exception as e:
+                print(f"[{completed_count}/{len(parquet_files)}] [X] {security}: EXCEPTION - {e}")
+                for scenario in scenario_results:
+                    scenario[security] = {'error': str(e)}
+    
+    total_time = time.time() - start_time
+    print()
+    print(f"Sweep pass complete: {len(configs)} scenarios x {len(parquet_files)} securities "
+          f"in {total_time:.1f}s")
+    
+    return scenario_results
+
+
 def write_results(results: Dict, output_dir: str):
-    """Write aggregated results to disk.
+    """Write aggregated results to disk as CSV.
     
     Args:
         results: Results dict from parallel backtest
         output_dir: Output directory path
     """
+    from src.result_store import SUMMARY_COLUMNS, summarize_results, trades_csv_frame
+    
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
@@ -313,21 +882,7 @@ def write_results(results: Dict, output_dir: str):
             
         trades = data.get('trades', [])
         if trades:
-            df = pd.DataFrame(trades)
-            
-            # Sort by timestamp
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df = df.sort_values('timestamp').reset_index(drop=True)
-            
-            # Round numeric columns
-            if 'realized_pnl' in df.columns:
-                df['realized_pnl'] = df['realized_pnl'].round(0).astype(int)
-            if 'pnl' in df.columns:
-                df['pnl'] = df['pnl'].round(0).astype(int)
-            if 'position' in df.columns:
-                df['position'] = df['position'].round(0).astype(int)
-            
+            df = trades_csv_frame(trades)
             csv_path = output_path / f"{security.lower()}_trades_timeseries.csv"
             df.to_csv(csv_path, index=False)
             trades_written += 1
@@ -335,46 +890,38 @@ def write_results(results: Dict, output_dir: str):
     print(f"  [OK] Wrote {trades_written} trade timeseries files")
     
     # Write summary
-    summary_rows = []
-    for security, data in results.items():
-        if 'error' in data:
-            summary_rows.append({
-                'security': security,
-                'trades': 0,
-                'realized_pnl': 0,
-                'position': 0,
-                'market_dates': 0,
-                'strategy_dates': 0,
-                'error': data['error']
-            })
-        else:
-            trades = data.get('trades', [])
-            final_pnl = data.get('pnl', 0)
-            final_position = data.get('position', 0)
-            
-            # Calculate from trades if pnl not in state
-            if trades and 'realized_pnl' in trades[-1]:
-                final_pnl = trades[-1]['realized_pnl']
-            
-            market_dates = data.get('market_dates', set())
-            strategy_dates = data.get('strategy_dates', set())
-            
-            summary_rows.append({
-                'security': security,
-                'trades': len(trades),
-                'realized_pnl': final_pnl,
-                'position': final_position,
-                'market_dates': len(market_dates) if isinstance(market_dates, set) else market_dates,
-                'strategy_dates': len(strategy_dates) if isinstance(strategy_dates, set) else strategy_dates,
-                'error': ''
-            })
-    
-    summary_df = pd.DataFrame(summary_rows)
+    summary_df = pd.DataFrame(summarize_results(results), columns=SUMMARY_COLUMNS)
     summary_path = output_path / 'backtest_summary.csv'
     summary_df.to_csv(summary_path, index=False)
     print(f"  [OK] Wrote summary: {summary_path}")
 
 
+def write_result_store(results: Dict, result_store: str, strategy: str,
+                       scenario: str = 'default', params: Optional[dict] = None):
+    """Write results to a partitioned Parquet result store.
+    
+    Args:
+        results: Results dict from parallel backtest
+        result_store: Result store root directory (see src/result_store.py)
+        strategy: Strategy partition (e.g., 'v1_baseline')
+        scenario: Scenario partition
+        params: Scenario configuration recorded in the manifest
+    """
+    from src.result_store import ResultStore
+    
+    store = ResultStore(result_store)
+    scenario_dir = store.write_scenario(strategy, scenario, results, params=params)
+    print(f"  [OK] Wrote result store partition: {scenario_dir}")
+
+
+def strategy_name_for(handler_module: str) -> str:
+    """Strategy name of a handler module (e.g., 'src.strategies.v1_baseline.handler' -> 'v1_baseline')."""
+    parts = handler_module.split('.')
+    if len(parts) >= 2 and parts[-1] == 'handler':
+        return parts[-2]
+    return parts[-1]
+
+
 def run_parallel_backtest(
     file_path: str,
     handler_module: str,
@@ -386,7 +933,9 @@ def run_parallel_backtest(
     header_row: int = 3,
     only_trades: bool = False,
     output_dir: Optional[str] = 'output',
-    write_csv: bool = True
+    write_csv: bool = True,
+    result_store: Optional[str] = None,
+    scenario: str = 'default'
 ) -> Dict:
     """Run backtest with per-security parallelization using Excel file.
     
@@ -405,6 +954,8 @@ def run_parallel_backtest(
         only_trades: Filter to trade events only
         output_dir: Output directory for results
         write_csv: Whether to write CSV output files
+        result_store: Root of a partitioned Parquet result store (optional)
+        scenario: Scenario partition in the result store
     
     Returns:
         Dictionary mapping security names to results
@@ -433,7 +984,11 @@ def run_parallel_backtest(
         max_sheets=max_sheets,
         chunk_size=chunk_size,
         write_csv=write_csv,
-        output_dir=output_dir
+        output_dir=output_dir,
+        result_store=result_store,
+        strategy_name=strategy_name_for(handler_module),
+        scenario=scenario,
+        params=config
     )
     
     return results
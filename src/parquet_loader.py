@@ -9,18 +9,260 @@ Usage:
     for security, chunk in stream_parquet_files('data/parquet/', chunk_size=100000):
         # Process chunk
         pass
+
+    # Only one week of closing-window trades, two columns
+    df = read_single_parquet('data/parquet/', 'emaar',
+                             start_date='2025-05-05', end_date='2025-05-09',
+                             time_window=('14:00', '15:00'),
+                             event_types=['trade'],
+                             columns=['timestamp', 'price'])
+
+Date, time-of-day and event-type filters are pushed down to the Parquet reader
+(pyarrow filter expressions), so row groups outside the date range are skipped
+using their statistics and only the requested columns are decoded.
+
+For files larger than memory, pass streaming=True (or max_memory_mb) to
+stream_parquet_files, or use iter_parquet_batches directly. Record batches are
+then read one at a time instead of loading the whole file first.
 """
-from typing import Generator, Tuple, Optional, List
+from typing import Generator, Iterator, Tuple, Optional, List, Union, Sequence
 from pathlib import Path
+from datetime import date, datetime, time, timedelta
+import queue
+import threading
 import pandas as pd
 
+from src.tick_schema import is_canonical_frame, schema_version_from_metadata, table_to_frame
+
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+TimeLike = Union[str, time]
+
+
+def _to_time(value: TimeLike) -> time:
+    """Convert 'HH:MM[:SS]' strings or time objects to datetime.time."""
+    if isinstance(value, time):
+        return value
+    return time.fromisoformat(str(value))
+
+
+def build_parquet_filter(
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    time_window: Optional[Tuple[TimeLike, TimeLike]] = None,
+    event_types: Optional[Sequence[str]] = None
+):
+    """Build a pyarrow filter expression for tick Parquet files.
+    
+    Args:
+        start_date: First date to include (inclusive)
+        end_date: Last date to include (inclusive, whole day)
+        time_window: (start, end) time of day, start inclusive / end exclusive,
+                     e.g. ('14:00', '15:00')
+        event_types: Event types to keep (case-insensitive), e.g. ['trade']
+    
+    Returns:
+        pyarrow.dataset.Expression, or None if no filter was requested
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    
+    ts = ds.field('timestamp')
+    conditions = []
+    
+    # Date range: plain comparisons so row-group statistics can prune
+    if start_date is not None:
+        start = pd.Timestamp(start_date).normalize()
+        conditions.append(ts >= pa.scalar(start.to_pydatetime(), pa.timestamp('ns')))
+    if end_date is not None:
+        end = pd.Timestamp(end_date).normalize() + timedelta(days=1)
+        conditions.append(ts < pa.scalar(end.to_pydatetime(), pa.timestamp('ns')))
+    
+    # Time of day: compare the time part of the timestamp
+    if time_window is not None:
+        window_start, window_end = (_to_time(t) for t in time_window)
+        tod = ts.cast(pa.time64('ns'))
+        conditions.append(tod >= pa.scalar(window_start, pa.time64('ns')))
+        conditions.append(tod < pa.scalar(window_end, pa.time64('ns')))
+    
+    # Event types: raw files store 'BID'/'ASK'/'TRADE', canonical files a
+    # dictionary column, so compare lower-cased plain strings
+    if event_types:
+        wanted = [str(t).lower() for t in event_types]
+        event_type = ds.field('type').cast(pa.string())
+        conditions.append(pc.utf8_lower(event_type).isin(wanted))
+    
+    if not conditions:
+        return None
+    
+    expr = conditions[0]
+    for cond in conditions[1:]:
+        expr = expr & cond
+    return expr
+
+
+def read_parquet_file(
+    parquet_file,
+    columns: Optional[List[str]] = None,
+    filters=None
+) -> pd.DataFrame:
+    """Read a Parquet file with optional column selection and filter pushdown.
+    
+    Canonical tick files (see src/tick_schema.py) are decoded and tagged with
+    their schema version so preprocessing can be skipped downstream.
+    
+    Args:
+        parquet_file: Path to the Parquet file
+        columns: Columns to read (default: all)
+        filters: Optional pyarrow filter expression (see build_parquet_filter)
+    
+    Returns:
+        DataFrame
+    """
+    import pyarrow.parquet as pq
+    
+    metadata = pq.read_schema(parquet_file).metadata
+    if filters is None and schema_version_from_metadata(metadata) is None:
+        return pd.read_parquet(parquet_file, columns=columns)
+    
+    table = pq.read_table(parquet_file, columns=columns, filters=filters)
+    return table_to_frame(table, metadata)
+
+
+def _estimate_row_bytes(parquet_file: Path, columns: Optional[List[str]] = None,
+                        sample_rows: int = 4096) -> float:
+    """Estimate memory per row (Arrow batch + pandas DataFrame) from a sample."""
+    import pyarrow.parquet as pq
+    
+    pf = pq.ParquetFile(parquet_file)
+    for batch in pf.iter_batches(batch_size=sample_rows, columns=columns):
+        if batch.num_rows == 0:
+            continue
+        df = batch.to_pandas()
+        total = batch.nbytes + int(df.memory_usage(deep=True).sum())
+        return total / batch.num_rows
+    return 1.0
+
+
+def _prefetch_iterator(iterator: Iterator, depth: int = 1) -> Generator:
+    """Run an iterator on a background thread, keeping up to `depth` items ready.
+    
+    Exceptions raised by the producer are re-raised in the consumer. Closing
+    the generator early stops the producer thread.
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+    
+    def producer():
+        try:
+            for item in iterator:
+                while not stop.is_set():
+                    try:
+                        items.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            item = done
+        except BaseException as e:  # forwarded to the consumer
+            item = e
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    thread = threading.Thread(target=producer, name='parquet-prefetch', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+
+
+def iter_parquet_batches(
+    parquet_file,
+    batch_size: int = 100000,
+    columns: Optional[List[str]] = None,
+    filters=None,
+    max_memory_mb: Optional[float] = None,
+    prefetch: bool = False
+) -> Generator[pd.DataFrame, None, None]:
+    """Stream a Parquet file as DataFrames, one record batch at a time.
+    
+    Unlike pd.read_parquet, only the current batch (plus the prefetched one,
+    if enabled) is held in memory, so files larger than RAM can be processed.
+    Rows are yielded in file order.
+    
+    Args:
+        parquet_file: Path to the Parquet file
+        batch_size: Maximum rows per batch
+        columns: Columns to read (default: all)
+        filters: Optional pyarrow filter expression (see build_parquet_filter)
+        max_memory_mb: Approximate ceiling for the batches held by the reader.
+                       batch_size is reduced so that batch memory stays under it.
+        prefetch: Read the next batch on a background thread while the current
+                  one is being processed
+    
+    Yields:
+        DataFrame per record batch (filtered batches may be smaller or skipped)
+    """
+    import pyarrow.parquet as pq
+    import pyarrow.dataset as ds
+    
+    parquet_file = Path(parquet_file)
+    metadata = pq.read_schema(parquet_file).metadata
+    
+    if max_memory_mb is not None:
+        # Batches alive at once: current one, plus queued + in-flight with prefetch
+        buffers = 3 if prefetch else 1
+        row_bytes = _estimate_row_bytes(parquet_file, columns)
+        max_rows = int(max_memory_mb * 1024 * 1024 / (row_bytes * buffers))
+        batch_size = max(1, min(batch_size, max_rows))
+    
+    if filters is None:
+        batches = pq.ParquetFile(parquet_file).iter_batches(
+            batch_size=batch_size, columns=columns
+        )
+    else:
+        # No readahead so the memory ceiling holds
+        batches = ds.dataset(parquet_file, format='parquet').to_batches(
+            columns=columns, filter=filters, batch_size=batch_size,
+            batch_readahead=0, fragment_readahead=0
+        )
+    
+    frames = (table_to_frame(batch, metadata) for batch in batches if batch.num_rows > 0)
+    if prefetch:
+        frames = _prefetch_iterator(frames, depth=1)
+    
+    yield from frames
+
 
 def stream_parquet_files(
     parquet_dir: str,
     chunk_size: int = 100000,
     max_files: Optional[int] = None,
     only_trades: bool = False,
-    file_filter: Optional[List[str]] = None
+    file_filter: Optional[List[str]] = None,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    time_window: Optional[Tuple[TimeLike, TimeLike]] = None,
+    event_types: Optional[Sequence[str]] = None,
+    columns: Optional[List[str]] = None,
+    streaming: bool = False,
+    max_memory_mb: Optional[float] = None,
+    prefetch: bool = False
 ) -> Generator[Tuple[str, pd.DataFrame], None, None]:
     """Stream Parquet files as chunks.
     
@@ -31,8 +273,16 @@ def stream_parquet_files(
         parquet_dir: Directory containing Parquet files
         chunk_size: Rows per chunk
         max_files: Limit to first N files (for testing)
-        only_trades: Filter to trade events only
+        only_trades: Filter to trade events only (same as event_types=['trade'])
         file_filter: Optional list of security names to process (e.g., ['adnocgas', 'emaar'])
+        start_date: First date to include (inclusive)
+        end_date: Last date to include (inclusive)
+        time_window: (start, end) time of day to keep, e.g. ('14:00', '15:00')
+        event_types: Event types to keep, e.g. ['bid', 'ask', 'trade']
+        columns: Columns to read (default: all)
+        streaming: Read one record batch at a time instead of whole files
+        max_memory_mb: Approximate memory ceiling per file (implies streaming)
+        prefetch: Prefetch the next batch on a background thread (implies streaming)
     
     Yields:
         Tuple of (security_name, chunk_df)
@@ -57,42 +307,69 @@ def stream_parquet_files(
     if max_files:
         parquet_files = parquet_files[:max_files]
     
+    # Filter to trades if requested
+    if only_trades and not event_types:
+        event_types = ['trade']
+    filters = build_parquet_filter(start_date, end_date, time_window, event_types)
+    streaming = streaming or max_memory_mb is not None or prefetch
+    
     # Stream each file
     for parquet_file in parquet_files:
         security = parquet_file.stem.upper()  # Convert filename to security name
         
-        # Read Parquet file
+        # Add sheet_name format for compatibility with existing code
+        sheet_name = f"{security} UH Equity"
+        
+        if streaming:
+            # Bounded-memory mode: one record batch at a time
+            try:
+                for chunk in iter_parquet_batches(parquet_file, batch_size=chunk_size,
+                                                  columns=columns, filters=filters,
+                                                  max_memory_mb=max_memory_mb,
+                                                  prefetch=prefetch):
+                    yield sheet_name, chunk
+            except Exception as e:
+                print(f"Warning: Failed to read {parquet_file.name}: {e}")
+            continue
+        
+        # Read Parquet file (filters and column selection pushed down)
         try:
-            df = pd.read_parquet(parquet_file)
+            df = read_parquet_file(parquet_file, columns=columns, filters=filters)
         except Exception as e:
             print(f"Warning: Failed to read {parquet_file.name}: {e}")
             continue
         
-        # Filter to trades if requested
-        if only_trades and 'type' in df.columns:
-            df = df[df['type'].astype(str).str.lower() == 'trade']
-        
         # Yield in chunks
         total_rows = len(df)
         for start_idx in range(0, total_rows, chunk_size):
             end_idx = min(start_idx + chunk_size, total_rows)
             chunk = df.iloc[start_idx:end_idx].copy()
             
-            # Add sheet_name format for compatibility with existing code
-            sheet_name = f"{security} UH Equity"
-            
             yield sheet_name, chunk
 
 
-def read_single_parquet(parquet_dir: str, security: str) -> pd.DataFrame:
+def read_single_parquet(
+    parquet_dir: str,
+    security: str,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    time_window: Optional[Tuple[TimeLike, TimeLike]] = None,
+    event_types: Optional[Sequence[str]] = None,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
     """Read a single security's Parquet file.
     
     Args:
         parquet_dir: Directory containing Parquet files
         security: Security name (e.g., 'ADNOCGAS' or 'adnocgas')
+        start_date: First date to include (inclusive)
+        end_date: Last date to include (inclusive)
+        time_window: (start, end) time of day to keep, e.g. ('14:00', '15:00')
+        event_types: Event types to keep, e.g. ['trade']
+        columns: Columns to read (default: all)
     
     Returns:
-        DataFrame with all data for the security
+        DataFrame with the (filtered) data for the security
     """
     parquet_path = Path(parquet_dir)
     parquet_file = parquet_path / f"{security.lower()}.parquet"
@@ -100,7 +377,8 @@ def read_single_parquet(parquet_dir: str, security: str) -> pd.DataFrame:
     if not parquet_file.exists():
         raise FileNotFoundError(f"Parquet file not found: {parquet_file}")
     
-    return pd.read_parquet(parquet_file)
+    filters = build_parquet_filter(start_date, end_date, time_window, event_types)
+    return read_parquet_file(parquet_file, columns=columns, filters=filters)
 
 
 def list_available_securities(parquet_dir: str) -> List[str]:
@@ -189,6 +467,10 @@ def preprocess_parquet_chunk(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         Preprocessed DataFrame
     """
+    # Canonical tick files are already normalised
+    if is_canonical_frame(df):
+        return df
+    
     # Ensure timestamp is datetime
     if 'timestamp' in df.columns:
         df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
@@ -6,10 +6,20 @@ and ensure all backtests use Parquet format by default.
 
 import os
 import sys
+import json
+import time
 from pathlib import Path
 import warnings
 import pandas as pd
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import cpu_count
+
+from src.tick_schema import TICK_SCHEMA_VERSION, canonical_schema, to_canonical_table
+
+
+# Records converted sheets so interrupted conversions can resume
+CONVERSION_MANIFEST = '_conversion_manifest.json'
 
 
 def validate_parquet_against_excel(excel_path, parquet_dir, max_sheets=None):
@@ -165,13 +175,148 @@ To reconvert from Excel, delete the parquet/ directory or use --force-reconvert
     return str(parquet_path)
 
 
-def convert_excel_to_parquet(excel_path, parquet_dir, max_sheets=None):
+def _source_signature(path):
+    """Identify a source file by path, size and modification time."""
+    st = Path(path).stat()
+    return {'path': str(Path(path).resolve()), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def _load_conversion_manifest(parquet_path, signature, price_scale):
+    """Load the conversion manifest, discarding it if the source changed.
+    
+    Returns:
+        Manifest dict (fresh if missing, unreadable or stale)
+    """
+    fresh = {
+        'version': 1,
+        'source': signature,
+        'schema_version': TICK_SCHEMA_VERSION,
+        'price_scale': price_scale,
+        'sheets': {}
+    }
+    manifest_file = parquet_path / CONVERSION_MANIFEST
+    if not manifest_file.exists():
+        return fresh
+    
+    try:
+        with manifest_file.open('r', encoding='utf-8') as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return fresh
+    
+    if (manifest.get('source') != signature
+            or manifest.get('schema_version') != TICK_SCHEMA_VERSION
+            or manifest.get('price_scale') != price_scale):
+        return fresh
+    
+    manifest.setdefault('sheets', {})
+    return manifest
+
+
+def _write_conversion_manifest(parquet_path, manifest):
+    """Atomically write the conversion manifest."""
+    manifest_file = parquet_path / CONVERSION_MANIFEST
+    tmp_file = manifest_file.with_name(manifest_file.name + '.tmp')
+    with tmp_file.open('w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp_file, manifest_file)
+
+
+def _combine_date_time(df):
+    """Merge separate Date and Time columns into a single timestamp column."""
+    lower = {str(c).strip().lower(): c for c in df.columns}
+    if 'date' in lower and 'time' in lower:
+        date_col, time_col = lower['date'], lower['time']
+        df = df.copy()
+        df['timestamp'] = pd.to_datetime(
+            df[date_col].astype(str) + ' ' + df[time_col].astype(str), errors='coerce'
+        )
+        df = df.drop(columns=[date_col, time_col])
+    return df
+
+
+def convert_sheet_to_parquet(excel_path, sheet_name, output_file, header_row=3,
+                             chunk_size=100000, compression='snappy', price_scale=None):
+    """Convert one Excel sheet to a canonical Parquet file.
+    
+    Rows are streamed with openpyxl in read-only mode (via stream_sheets) and
+    written chunk by chunk, so memory stays bounded by chunk_size. The file
+    is written under a temporary name and renamed when complete.
+    
+    Args:
+        excel_path: Path to source Excel file
+        sheet_name: Sheet to convert (e.g. 'ADNOCGAS UH Equity')
+        output_file: Destination .parquet path
+        header_row: Excel header row (1-based)
+        chunk_size: Rows per streamed chunk
+        compression: Parquet compression
+        price_scale: Optional int64 price scaling (see src/tick_schema.py)
+    
+    Returns:
+        Tuple of (sheet_name, rows_read, rows_written, elapsed_seconds)
+    """
+    import pyarrow.parquet as pq
+    from src.data_loader import stream_sheets
+    
+    start_time = time.time()
+    output_file = Path(output_file)
+    tmp_file = output_file.with_name(output_file.name + '.tmp')
+    
+    rows_read = 0
+    rows_written = 0
+    writer = None
+    try:
+        for _, chunk in stream_sheets(excel_path, header_row=header_row, chunk_size=chunk_size,
+                                      sheet_names_filter=[sheet_name]):
+            rows_read += len(chunk)
+            table = to_canonical_table(_combine_date_time(chunk), price_scale=price_scale)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_file, table.schema, compression=compression)
+            writer.write_table(table)
+            rows_written += table.num_rows
+        
+        if writer is None:
+            # Empty sheet: still write a valid (empty) canonical file
+            writer = pq.ParquetWriter(tmp_file, canonical_schema(price_scale),
+                                      compression=compression)
+        writer.close()
+        writer = None
+        os.replace(tmp_file, output_file)
+    finally:
+        if writer is not None:
+            writer.close()
+        if tmp_file.exists():
+            tmp_file.unlink()
+    
+    return sheet_name, rows_read, rows_written, time.time() - start_time
+
+
+def convert_excel_to_parquet(excel_path, parquet_dir, max_sheets=None, max_workers=None,
+                             header_row=3, compression='snappy', price_scale=None,
+                             resume=True, chunk_size=100000):
     """Convert Excel file to Parquet format.
     
+    Files are written with the canonical tick schema (src/tick_schema.py),
+    so readers can skip per-chunk normalisation. Sheets are converted in
+    parallel worker processes, each streaming its sheet with openpyxl
+    read-only mode. Completed sheets are recorded in a manifest
+    (_conversion_manifest.json) in parquet_dir, so an interrupted conversion
+    resumes with the remaining sheets.
+    
     Args:
         excel_path: Path to source Excel file
         parquet_dir: Output directory for Parquet files
         max_sheets: Limit to first N sheets (for testing)
+        max_workers: Parallel worker processes (default: CPU count)
+        header_row: Excel header row (1-based)
+        compression: Parquet compression
+        price_scale: Optional int64 price scaling
+        resume: Skip sheets the manifest records as converted
+        chunk_size: Rows per streamed chunk in each worker
+    
+    Returns:
+        Dict with 'converted', 'skipped', 'failed' (lists of sheet names)
+        and 'rows', 'dropped' totals
     """
     import openpyxl
     
@@ -191,30 +336,75 @@ def convert_excel_to_parquet(excel_path, parquet_dir, max_sheets=None):
     if max_sheets:
         sheet_names = sheet_names[:max_sheets]
     
-    print(f"  Converting {len(sheet_names)} sheets...")
+    # Resume from manifest
+    signature = _source_signature(excel_path)
+    manifest = _load_conversion_manifest(parquet_path, signature, price_scale)
+    if not resume:
+        manifest['sheets'] = {}
     
-    for i, sheet_name in enumerate(sheet_names, 1):
+    summary = {'converted': [], 'skipped': [], 'failed': [], 'rows': 0, 'dropped': 0}
+    pending = []
+    for sheet_name in sheet_names:
         # Extract security name
         security = sheet_name.replace(' UH Equity', '').replace(' DH Equity', '')
+        output_file = parquet_path / f"{security.lower()}.parquet"
+        entry = manifest['sheets'].get(sheet_name)
+        if entry and output_file.exists():
+            summary['skipped'].append(sheet_name)
+            summary['rows'] += entry.get('rows', 0)
+        else:
+            pending.append((sheet_name, output_file))
+    
+    if summary['skipped']:
+        print(f"  Resuming: {len(summary['skipped'])} sheets already converted")
+    if not pending:
+        print(f"\n[OK] Nothing to convert: {parquet_dir}")
+        return summary
+    
+    if max_workers is None:
+        max_workers = cpu_count()
+    max_workers = max(1, min(max_workers, len(pending)))
+    print(f"  Converting {len(pending)} sheets with {max_workers} workers...")
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        future_to_sheet = {
+            executor.submit(
+                convert_sheet_to_parquet,
+                excel_path,
+                sheet_name,
+                str(output_file),
+                header_row,
+                chunk_size,
+                compression,
+                price_scale
+            ): (sheet_name, output_file)
+            for sheet_name, output_file in pending
+        }
         
-        print(f"  [{i}/{len(sheet_names)}] {sheet_name}...", end=" ", flush=True)
-        
-        try:
-            # Read Excel sheet
-            df = pd.read_excel(excel_path, sheet_name=sheet_name, header=2)
-            
-            # Combine Date and Time into timestamp if separate
-            if 'Date' in df.columns and 'Time' in df.columns:
-                df['timestamp'] = pd.to_datetime(
-                    df['Date'].astype(str) + ' ' + df['Time'].astype(str)
-                )
+        for i, future in enumerate(as_completed(future_to_sheet), 1):
+            sheet_name, output_file = future_to_sheet[future]
+            try:
+                _, rows_read, rows_written, elapsed = future.result()
+            except Exception as e:
+                print(f"  [{i}/{len(pending)}] {sheet_name}... ERROR: {e}")
+                summary['failed'].append(sheet_name)
+                continue
             
-            # Write Parquet
-            output_file = parquet_path / f"{security.lower()}.parquet"
-            df.to_parquet(output_file, compression='snappy')
+            print(f"  [{i}/{len(pending)}] {sheet_name}... {rows_written:,} rows in {elapsed:.1f}s")
+            summary['converted'].append(sheet_name)
+            summary['rows'] += rows_written
+            summary['dropped'] += rows_read - rows_written
             
-            print(f"{len(df):,} rows")
-        except Exception as e:
-            print(f"ERROR: {e}")
+            # Record completion immediately so an interruption keeps it
+            manifest['sheets'][sheet_name] = {
+                'file': output_file.name,
+                'rows': rows_written,
+                'elapsed': round(elapsed, 2),
+                'completed_at': datetime.now().isoformat(timespec='seconds')
+            }
+            _write_conversion_manifest(parquet_path, manifest)
     
+    if summary['failed']:
+        print(f"\n[X] {len(summary['failed'])} sheets failed; rerun to retry them")
     print(f"\n[OK] Conversion complete: {parquet_dir}")
+    return summary
@@ -0,0 +1,373 @@
+"""Partitioned Parquet store for backtest results.
+
+``write_results`` and ``MarketMakingBacktest.run_streaming`` write one CSV
+per security plus ``backtest_summary.csv`` for every run. CSV loses the
+column types (timestamps and integers come back as text or floats), each
+reader has to parse whole files to use a few columns, and a parameter sweep
+leaves thousands of loose files that can only be found by globbing.
+
+``ResultStore`` keeps results in a Hive-partitioned directory tree with
+typed Parquet columns:
+
+    <root>/
+        _manifest.parquet                       one row per strategy/scenario/security
+        strategy=<strategy>/
+            scenario=<scenario>/
+                security=<SECURITY>/trades.parquet
+
+The manifest carries the per-security summary (the columns of
+``backtest_summary.csv`` plus final P&L, scenario parameters and the trade
+file path), so comparisons read one small file. Trade readers open only
+the partitions and columns they ask for. The legacy CSV layout can still be
+derived from the store with ``export_csv``.
+
+Usage:
+    from src.result_store import ResultStore
+
+    store = ResultStore('output/results')
+    store.write_scenario('v1_baseline', 'default', results, params=config)
+
+    summary = store.manifest(strategy='v1_baseline')
+    trades = store.load_trades('v1_baseline', 'default', securities=['EMAAR'],
+                               columns=['timestamp', 'pnl'])
+"""
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+from src.trade_ledger import TradeLedger
+
+
+MANIFEST_FILE = '_manifest.parquet'
+TRADES_FILE = 'trades.parquet'
+
+# Columns of the manifest (backtest_summary.csv columns first)
+MANIFEST_COLUMNS = [
+    'strategy', 'scenario', 'security', 'trades', 'realized_pnl', 'position',
+    'market_dates', 'strategy_dates', 'error', 'pnl', 'params', 'path',
+]
+
+SUMMARY_COLUMNS = ['security', 'trades', 'realized_pnl', 'position',
+                   'market_dates', 'strategy_dates', 'error']
+
+
+def summarize_results(results: Dict) -> List[dict]:
+    """Per-security summary rows (the rows of ``backtest_summary.csv``).
+
+    Args:
+        results: Dictionary mapping security names to results
+
+    Returns:
+        List of dicts with SUMMARY_COLUMNS plus the final state P&L ('pnl')
+    """
+    rows = []
+    for security, data in results.items():
+        if 'error' in data:
+            rows.append({
+                'security': security,
+                'trades': 0,
+                'realized_pnl': 0,
+                'position': 0,
+                'market_dates': 0,
+                'strategy_dates': 0,
+                'error': data['error'],
+                'pnl': 0.0,
+            })
+            continue
+
+        trades = data.get('trades', [])
+        final_pnl = data.get('pnl', 0)
+        final_position = data.get('position', 0)
+
+        # Calculate from trades if pnl not in state
+        if isinstance(trades, TradeLedger):
+            if len(trades) and any(name == 'realized_pnl' for name, _ in trades.fields):
+                final_pnl = trades.column('realized_pnl')[-1].item()
+        elif trades and 'realized_pnl' in trades[-1]:
+            final_pnl = trades[-1]['realized_pnl']
+
+        market_dates = data.get('market_dates', set())
+        strategy_dates = data.get('strategy_dates', set())
+
+        rows.append({
+            'security': security,
+            'trades': len(trades),
+            'realized_pnl': final_pnl,
+            'position': final_position,
+            'market_dates': len(market_dates) if isinstance(market_dates, set) else market_dates,
+            'strategy_dates': len(strategy_dates) if isinstance(strategy_dates, set) else strategy_dates,
+            'error': '',
+            'pnl': float(data.get('pnl', 0) or 0),
+        })
+    return rows
+
+
+def trades_csv_frame(trades) -> pd.DataFrame:
+    """Trades formatted as in ``<security>_trades_timeseries.csv``.
+
+    Sorted by timestamp, with realized_pnl, pnl and position rounded to
+    integers.
+    """
+    from src.result_transport import trades_to_frame
+
+    df = trades if isinstance(trades, pd.DataFrame) else trades_to_frame(trades)
+
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df = df.sort_values('timestamp').reset_index(drop=True)
+
+    # Round PNL and position values to integers
+    for column in ('realized_pnl', 'pnl', 'position'):
+        if column in df.columns:
+            df[column] = df[column].round(0).astype(int)
+    return df
+
+
+def trades_to_table(trades):
+    """pyarrow Table of a trade list, TradeLedger or TradeLog (typed columns)."""
+    import pyarrow as pa
+
+    from src.result_transport import TradeLog
+
+    if isinstance(trades, TradeLedger):
+        return trades.to_arrow()
+    if isinstance(trades, TradeLog):
+        with pa.memory_map(trades.path, 'r') as source:
+            return pa.ipc.open_file(source).read_all()
+    return pa.Table.from_pandas(pd.DataFrame(trades), preserve_index=False)
+
+
+def is_result_store(path) -> bool:
+    """True if path is the root of a result store."""
+    return (Path(path) / MANIFEST_FILE).exists()
+
+
+def _partition(key: str, value: str) -> str:
+    # Hive partition segment; URI-encoded like pyarrow's hive partitioning
+    return f"{key}={quote(str(value), safe='')}"
+
+
+class ResultStore:
+    """Hive-partitioned Parquet store of backtest results.
+
+    Args:
+        root: Store directory (created on first write)
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def __repr__(self) -> str:
+        return f"ResultStore({str(self.root)!r})"
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def scenario_dir(self, strategy: str, scenario: str) -> Path:
+        return self.root / _partition('strategy', strategy) / _partition('scenario', scenario)
+
+    def trades_path(self, strategy: str, scenario: str, security: str) -> Path:
+        return (self.scenario_dir(strategy, scenario)
+                / _partition('security', security.upper()) / TRADES_FILE)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_FILE
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def write_scenario(self, strategy: str, scenario: str, results: Dict,
+                       params: Optional[dict] = None) -> Path:
+        """Write one scenario's results, replacing any previous version.
+
+        The trade partitions are written to a temporary directory that
+        replaces the scenario directory when complete, then the scenario's
+        manifest rows are replaced.
+
+        Args:
+            strategy: Strategy name (e.g. 'v1_baseline')
+            scenario: Scenario name (e.g. 'default' or a sweep scenario)
+            results: Dictionary mapping security names to results
+            params: Scenario parameters, stored as JSON in the manifest
+
+        Returns:
+            Scenario directory
+        """
+        import pyarrow.parquet as pq
+
+        scenario_dir = self.scenario_dir(strategy, scenario)
+        tmp_dir = scenario_dir.with_name(scenario_dir.name + '.tmp')
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        params_json = json.dumps(params, sort_keys=True, default=str) if params is not None else ''
+        rows = []
+        for row in summarize_results(results):
+            security = row['security'].upper()
+            trades = results[row['security']].get('trades', [])
+            path = ''
+            if not row['error'] and len(trades):
+                relative = Path(_partition('security', security)) / TRADES_FILE
+                (tmp_dir / relative.parent).mkdir()
+                pq.write_table(trades_to_table(trades), tmp_dir / relative)
+                path = (scenario_dir / relative).relative_to(self.root).as_posix()
+            rows.append({**row, 'strategy': strategy, 'scenario': scenario,
+                         'security': security, 'params': params_json, 'path': path})
+
+        if scenario_dir.exists():
+            shutil.rmtree(scenario_dir)
+        os.replace(tmp_dir, scenario_dir)
+
+        self._update_manifest(strategy, scenario, rows)
+        return scenario_dir
+
+    def _update_manifest(self, strategy: str, scenario: str, rows: List[dict]):
+        new_rows = pd.DataFrame(rows, columns=MANIFEST_COLUMNS)
+        manifest = self.manifest()
+        if len(manifest):
+            keep = ~((manifest['strategy'] == strategy) & (manifest['scenario'] == scenario))
+            manifest = pd.concat([manifest[keep], new_rows], ignore_index=True)
+        else:
+            manifest = new_rows
+        manifest = manifest.astype({
+            'trades': 'int64', 'realized_pnl': 'float64',
+            'market_dates': 'int64', 'strategy_dates': 'int64', 'pnl': 'float64',
+        })
+
+        tmp_file = self.manifest_path.with_name(MANIFEST_FILE + '.tmp')
+        manifest.to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, self.manifest_path)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def manifest(self, strategy: Optional[str] = None, scenario: Optional[str] = None,
+                 columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Manifest rows, optionally filtered by strategy and scenario.
+
+        Args:
+            strategy: Only rows of this strategy
+            scenario: Only rows of this scenario
+            columns: Columns to read (default: all)
+
+        Returns:
+            DataFrame with MANIFEST_COLUMNS (or the requested columns)
+        """
+        if not self.manifest_path.exists():
+            return pd.DataFrame(columns=columns or MANIFEST_COLUMNS)
+
+        filters = []
+        if strategy is not None:
+            filters.append(('strategy', '==', strategy))
+        if scenario is not None:
+            filters.append(('scenario', '==', scenario))
+        return pd.read_parquet(self.manifest_path, columns=columns,
+                               filters=filters or None).reset_index(drop=True)
+
+    def strategies(self) -> List[str]:
+        """Strategy names in the store."""
+        return sorted(self.manifest(columns=['strategy'])['strategy'].unique())
+
+    def scenarios(self, strategy: str) -> List[str]:
+        """Scenario names of a strategy."""
+        manifest = self.manifest(strategy=strategy, columns=['scenario'])
+        return sorted(manifest['scenario'].unique())
+
+    def summary(self, strategy: str, scenario: str) -> pd.DataFrame:
+        """Per-security summary in the layout of ``backtest_summary.csv``."""
+        return self.manifest(strategy, scenario, columns=SUMMARY_COLUMNS)
+
+    def load_trades(self, strategy: str, scenario: str,
+                    securities: Optional[List[str]] = None,
+                    columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Trades of a scenario, reading only the requested partitions and columns.
+
+        Args:
+            strategy: Strategy name
+            scenario: Scenario name
+            securities: Securities to load (default: all with trades)
+            columns: Trade columns to read (default: all)
+
+        Returns:
+            DataFrame of the trades with a leading 'security' column
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        manifest = self.manifest(strategy, scenario, columns=['security', 'path'])
+        manifest = manifest[manifest['path'] != '']
+        if securities is not None:
+            wanted = {s.upper() for s in securities}
+            manifest = manifest[manifest['security'].isin(wanted)]
+
+        tables = []
+        for security, path in zip(manifest['security'], manifest['path']):
+            table = pq.read_table(self.root / path, columns=columns)
+            tables.append(table.add_column(
+                0, 'security', pa.array([security] * table.num_rows, type=pa.string())
+            ))
+        if not tables:
+            return pd.DataFrame(columns=['security'] + list(columns or []))
+        return pa.concat_tables(tables, promote_options='default').to_pandas()
+
+    def read_security(self, strategy: str, scenario: str, security: str,
+                      columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Trades of one security (empty DataFrame if it has none)."""
+        path = self.trades_path(strategy, scenario, security)
+        if not path.exists():
+            return pd.DataFrame(columns=columns)
+        return pd.read_parquet(path, columns=columns)
+
+    # ------------------------------------------------------------------
+    # Derived artifacts
+    # ------------------------------------------------------------------
+
+    def export_csv(self, strategy: str, scenario: str, output_dir) -> Path:
+        """Write a scenario in the legacy CSV layout of ``write_results``.
+
+        Args:
+            strategy: Strategy name
+            scenario: Scenario name
+            output_dir: Directory for ``<security>_trades_timeseries.csv``
+                        and ``backtest_summary.csv``
+
+        Returns:
+            Output directory
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        manifest = self.manifest(strategy, scenario)
+        for security, path in zip(manifest['security'], manifest['path']):
+            if path:
+                df = trades_csv_frame(pd.read_parquet(self.root / path))
+                df.to_csv(output_path / f"{security.lower()}_trades_timeseries.csv", index=False)
+
+        manifest[SUMMARY_COLUMNS].to_csv(output_path / 'backtest_summary.csv', index=False)
+        return output_path
+
+
+def scenario_partitions(path) -> Dict[str, Path]:
+    """Trade files of a scenario directory, keyed by security.
+
+    Args:
+        path: A ``strategy=<s>/scenario=<sc>`` directory of a result store
+
+    Returns:
+        Dict mapping security -> trades.parquet path
+    """
+    files = {}
+    for trades_file in sorted(Path(path).glob(f"security=*/{TRADES_FILE}")):
+        security = unquote(trades_file.parent.name.split('=', 1)[1])
+        files[security] = trades_file
+    return files
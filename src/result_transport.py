@@ -0,0 +1,138 @@
+"""Columnar transport of worker trade lists through Arrow IPC files.
+
+Returning a security's trades from a ProcessPoolExecutor worker pickles
+them in the worker and unpickles them again in the parent, one security at
+a time. With ``result_transport='arrow'`` the worker writes
+its trades as one Arrow IPC file instead and returns a ``TradeLog`` handle:
+a small picklable object holding the file path and row count.
+
+``TradeLog`` is a read-only sequence of trade dicts, so existing code
+(``len(trades)``, iteration, ``pd.DataFrame(trades)``) keeps working. The
+file is only read when the trades are actually used, and ``to_pandas()``
+reads it straight into a DataFrame without building the dicts.
+
+Usage:
+    from src.result_transport import write_trade_log
+
+    # in the worker
+    results['trades'] = write_trade_log(trades, result_dir / 'emaar.arrow')
+
+    # in the parent
+    df = results['trades'].to_pandas()
+"""
+import atexit
+import shutil
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+
+import pandas as pd
+
+from src.trade_ledger import TradeLedger
+
+
+RESULT_TRANSPORTS = ('pickle', 'arrow')
+
+
+class TradeLog(Sequence):
+    """Lazily loaded trade list backed by an Arrow IPC file.
+
+    Attributes:
+        path: Arrow IPC file with one row per trade
+        num_rows: Number of trades (available without reading the file)
+    """
+
+    __slots__ = ('path', 'num_rows', '_records')
+
+    def __init__(self, path, num_rows: int):
+        self.path = str(path)
+        self.num_rows = int(num_rows)
+        self._records = None
+
+    def __getstate__(self):
+        # Only the handle travels between processes
+        return {'path': self.path, 'num_rows': self.num_rows}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self.num_rows = state['num_rows']
+        self._records = None
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __getitem__(self, index):
+        return self.to_list()[index]
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __eq__(self, other):
+        if isinstance(other, (TradeLog, TradeLedger, list)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TradeLog({self.path!r}, num_rows={self.num_rows})"
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Read the trades as a DataFrame (one column per trade field)."""
+        import pyarrow as pa
+
+        if self.num_rows == 0:
+            return pd.DataFrame()
+        with pa.memory_map(self.path, 'r') as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
+    def to_list(self) -> list:
+        """Materialise (and cache) the trades as a list of dicts."""
+        if self._records is None:
+            self._records = self.to_pandas().to_dict('records') if self.num_rows else []
+        return self._records
+
+
+def write_trade_log(trades, path) -> TradeLog:
+    """Write trades to an Arrow IPC file.
+
+    Args:
+        trades: TradeLedger (written column-wise) or list of trade dicts
+        path: Destination .arrow file
+
+    Returns:
+        TradeLog handle for the written file
+    """
+    import pyarrow as pa
+
+    path = Path(path)
+    if len(trades):
+        if isinstance(trades, TradeLedger):
+            table = trades.to_arrow()
+        else:
+            table = pa.Table.from_pandas(pd.DataFrame(trades), preserve_index=False)
+        with pa.OSFile(str(path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    return TradeLog(path, len(trades))
+
+
+def trades_to_frame(trades) -> pd.DataFrame:
+    """DataFrame of a trade list, TradeLedger or TradeLog (the last two skip the dicts).
+
+    The frame never shares memory with a ledger, so callers may modify it.
+    """
+    if isinstance(trades, TradeLedger):
+        return trades.to_pandas(copy=True)
+    if isinstance(trades, TradeLog):
+        return trades.to_pandas()
+    return pd.DataFrame(trades)
+
+
+def create_result_dir() -> Path:
+    """Create a temporary directory for worker result files.
+
+    The directory is removed when the parent process exits, so TradeLog
+    handles stay readable for the rest of the run.
+    """
+    result_dir = Path(tempfile.mkdtemp(prefix='backtest_results_'))
+    atexit.register(shutil.rmtree, result_dir, ignore_errors=True)
+    return result_dir
@@ -0,0 +1,236 @@
+"""Per-day session index for parquet tick files.
+
+The handlers call ``timestamp.date()`` and ``timestamp.time()`` on every row
+to detect day rollovers, the 10:00-14:45 trading window and the 14:55 EOD
+flatten time. The session index computes those boundaries once per file:
+for every trading day it stores the row offsets where each session starts.
+Offsets refer to the rows after ``preprocess_chunk_df`` (rows without
+timestamp/price and non-positive prices dropped), i.e. to the kernel's
+EventArrays, not to the raw rows of the file.
+
+    pre_open  first row of the day
+    open      first row at/after 10:00 (continuous trading)
+    auction   first row at/after 14:45 (closing auction)
+    eod       first row at/after 14:55 (EOD flatten time)
+    end       one past the last row of the day
+
+The index is cached next to the parquet file as ``<name>.sessions.json`` and
+rebuilt automatically when the parquet file changes.
+
+Usage:
+    from src.session_index import load_session_index
+
+    index = load_session_index('data/parquet/emaar.parquet')
+    for day, pre_open, open_, auction, eod, end in index.iter_days():
+        ...
+"""
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+SESSION_INDEX_VERSION = 2
+SESSION_INDEX_SUFFIX = '.sessions.json'
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+# Session boundaries as nanoseconds since midnight
+TOD_CONTINUOUS_OPEN = 10 * 3600 * NS_PER_SECOND            # 10:00
+TOD_SILENT_END = (10 * 3600 + 5 * 60) * NS_PER_SECOND      # 10:05
+TOD_CLOSING_AUCTION = (14 * 3600 + 45 * 60) * NS_PER_SECOND  # 14:45
+TOD_EOD_CLOSE = (14 * 3600 + 55 * 60) * NS_PER_SECOND      # 14:55
+
+SESSION_COLUMNS = ['pre_open', 'open', 'auction', 'eod', 'end']
+
+_EPOCH_DATE = date(1970, 1, 1)
+
+
+@dataclass
+class SessionIndex:
+    """Row offsets of the sessions of every trading day in a file.
+
+    Attributes:
+        days: int64 days since epoch, one per trading day (file order)
+        offsets: int64 array of shape (n_days, 5), columns SESSION_COLUMNS
+        rows: Total number of rows indexed
+        monotonic: True if every day's rows move through the sessions in
+            order (pre-open -> open -> auction -> eod). Offsets are only
+            exact session boundaries when this holds.
+    """
+    days: np.ndarray
+    offsets: np.ndarray
+    rows: int
+    monotonic: bool
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def dates(self) -> List[date]:
+        """Return the trading dates as datetime.date objects."""
+        return [_EPOCH_DATE + timedelta(days=int(d)) for d in self.days]
+
+    def iter_days(self) -> Iterator[Tuple[date, int, int, int, int, int]]:
+        """Yield (date, pre_open, open, auction, eod, end) per trading day."""
+        for d, row in zip(self.dates(), self.offsets.tolist()):
+            yield (d, *row)
+
+    def window_mask(self) -> np.ndarray:
+        """Boolean row mask of the rows a market-making handler can act on.
+
+        Selects the first row of each day (day rollover), the 10:00-14:45
+        trading window and everything from 14:55 on (EOD flatten). Rows in
+        the pre-open and 14:45-14:55 ranges are left out.
+
+        Returns:
+            Boolean array of length ``rows``
+        """
+        mask = np.zeros(self.rows, dtype=bool)
+        for pre_open, open_, auction, eod, end in self.offsets.tolist():
+            mask[pre_open] = True
+            mask[open_:auction] = True
+            mask[eod:end] = True
+        return mask
+
+    def to_dict(self) -> dict:
+        return {
+            'version': SESSION_INDEX_VERSION,
+            'rows': self.rows,
+            'monotonic': self.monotonic,
+            'columns': ['date'] + SESSION_COLUMNS,
+            'days': [[d.isoformat(), *row] for d, row in zip(self.dates(), self.offsets.tolist())],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SessionIndex':
+        days = [row[0] for row in data['days']]
+        offsets = np.array([row[1:] for row in data['days']], dtype=np.int64).reshape(-1, 5)
+        day_numbers = np.array(
+            [(date.fromisoformat(d) - _EPOCH_DATE).days for d in days], dtype=np.int64
+        )
+        return cls(days=day_numbers, offsets=offsets, rows=int(data['rows']),
+                   monotonic=bool(data['monotonic']))
+
+
+def build_session_index(timestamps) -> SessionIndex:
+    """Build a session index from a timestamp column.
+
+    Day boundaries follow file order (a new day starts whenever the date
+    changes from the previous row), matching how the handlers detect
+    rollovers.
+
+    Args:
+        timestamps: datetime64[ns] Series/array or int64 ns since epoch
+
+    Returns:
+        SessionIndex for the rows in the given order
+    """
+    if isinstance(timestamps, pd.Series):
+        timestamps = timestamps.to_numpy()
+    ts = np.asarray(timestamps)
+    if ts.dtype.kind not in 'Mi':
+        ts = pd.to_datetime(ts, errors='coerce').to_numpy()
+    if ts.dtype.kind == 'M':
+        ts = ts.astype('datetime64[ns]').view(np.int64)
+    ts = ts.astype(np.int64, copy=False)
+
+    n = len(ts)
+    if n == 0:
+        return SessionIndex(days=np.empty(0, dtype=np.int64),
+                            offsets=np.empty((0, 5), dtype=np.int64),
+                            rows=0, monotonic=True)
+
+    day = ts // NS_PER_DAY
+    tod = ts - day * NS_PER_DAY
+
+    # 0 = pre-open, 1 = continuous, 2 = closing auction, 3 = after EOD time
+    session = ((tod >= TOD_CONTINUOUS_OPEN).astype(np.int8)
+               + (tod >= TOD_CLOSING_AUCTION)
+               + (tod >= TOD_EOD_CLOSE))
+
+    new_day = np.empty(n, dtype=bool)
+    new_day[0] = True
+    np.not_equal(day[1:], day[:-1], out=new_day[1:])
+    starts = np.flatnonzero(new_day)
+    ends = np.append(starts[1:], n)
+
+    offsets = np.empty((len(starts), 5), dtype=np.int64)
+    offsets[:, 0] = starts
+    offsets[:, 4] = ends
+    for k in (1, 2, 3):
+        offsets[:, k] = starts + np.add.reduceat((session < k).astype(np.int64), starts)
+
+    same_day = ~new_day[1:]
+    monotonic = bool(np.all(np.diff(session)[same_day] >= 0))
+
+    return SessionIndex(days=day[starts], offsets=offsets, rows=n, monotonic=monotonic)
+
+
+def session_index_path(parquet_file) -> Path:
+    """Path of the cached session index for a parquet file."""
+    parquet_file = Path(parquet_file)
+    return parquet_file.with_name(parquet_file.stem + SESSION_INDEX_SUFFIX)
+
+
+def _source_signature(parquet_file: Path) -> dict:
+    st = parquet_file.stat()
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def load_session_index(parquet_file, timestamps=None, rebuild: bool = False,
+                       write_cache: bool = True) -> SessionIndex:
+    """Load the cached session index for a parquet file, building it if needed.
+
+    The cache is reused when its version and the recorded source size and
+    mtime match the parquet file (and its row count matches ``timestamps``
+    when given); otherwise it is rebuilt and rewritten.
+
+    Args:
+        parquet_file: Path to the security's parquet file
+        timestamps: Optional timestamps of the preprocessed rows, e.g.
+                    ``EventArrays.timestamp`` (avoids re-reading the file)
+        rebuild: Ignore any existing cache
+        write_cache: Write the rebuilt index next to the parquet file
+
+    Returns:
+        SessionIndex for the file's rows
+    """
+    parquet_file = Path(parquet_file)
+    cache_file = session_index_path(parquet_file)
+    signature = _source_signature(parquet_file)
+
+    if not rebuild and cache_file.exists():
+        try:
+            with cache_file.open('r', encoding='utf-8') as fh:
+                data = json.load(fh)
+            if (data.get('version') == SESSION_INDEX_VERSION
+                    and data.get('source') == signature
+                    and (timestamps is None or data.get('rows') == len(timestamps))):
+                return SessionIndex.from_dict(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # Corrupt or unreadable cache - rebuild below
+
+    if timestamps is None:
+        from src.data_loader import preprocess_chunk_df
+        from src.parquet_loader import read_parquet_file
+        timestamps = preprocess_chunk_df(read_parquet_file(parquet_file))['timestamp']
+    index = build_session_index(timestamps)
+
+    if write_cache:
+        data = index.to_dict()
+        data['source'] = signature
+        tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+        try:
+            with tmp_file.open('w', encoding='utf-8') as fh:
+                json.dump(data, fh)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"Warning: Could not write session index {cache_file.name}: {e}")
+
+    return index
@@ -9,6 +9,10 @@ from datetime import datetime, time
 from typing import Dict, Optional, Tuple
 import pandas as pd
 
+from src.fill_kernel import NUMBA_AVAILABLE, apply_fill, consume_queue
+from src.strategies.strategy_state import OrderSide, SecurityState, StateField
+from src.trade_sink import DEFAULT_FLUSH_ROWS, TradeSink
+
 
 class BaseMarketMakingStrategy(ABC):
     """Abstract base class for all market-making strategies.
@@ -17,15 +21,20 @@ class BaseMarketMakingStrategy(ABC):
     that all strategy variations must implement. Each concrete strategy
     should inherit from this class and implement the abstract methods.
     
+    State lives in one SecurityState record per security (see
+    src/strategies/strategy_state.py); the attributes below are dict-like
+    views of those records.
+    
     Attributes:
         config: Per-security configuration dictionary
         position: Current inventory position per security
         entry_price: Weighted average entry price per security
         pnl: Realized profit and loss per security
-        trades: List of executed trades per security
+        trades: Executed trades per security (TradeLedger)
         last_refill_time: Per-side last quote time per security
         quote_prices: Current quoted prices per security
         active_orders: Active order state per security
+        jit_fills: Whether fills use the compiled kernel per security
     """
     
     def __init__(self, config: Optional[Dict] = None):
@@ -40,17 +49,25 @@ class BaseMarketMakingStrategy(ABC):
                    - max_position: Maximum inventory limit
                    - max_notional: Optional dollar cap
                    - min_local_currency_before_quote: Liquidity threshold
+                   - use_jit_fills: Use the Numba fill kernel (optional)
+                   - trade_sink_dir: Spill fills to Parquet part files in
+                     this directory (optional, see src/trade_sink.py)
+                   - trade_sink_flush_rows: Fills kept in memory per flush
         """
         self.config = config or {}
         
-        # Per-security state dictionaries
-        self.position: Dict[str, float] = {}
-        self.entry_price: Dict[str, float] = {}
-        self.pnl: Dict[str, float] = {}
-        self.trades: Dict[str, list] = {}
-        self.last_refill_time: Dict[str, Dict[str, Optional[datetime]]] = {}
-        self.quote_prices: Dict[str, dict] = {}
-        self.active_orders: Dict[str, dict] = {}
+        # Per-security state records
+        self.states: Dict[str, SecurityState] = {}
+        
+        # Dict-like views of the records (compatibility accessors)
+        self.position = StateField(self.states, 'position')
+        self.entry_price = StateField(self.states, 'entry_price')
+        self.pnl = StateField(self.states, 'pnl')
+        self.trades = StateField(self.states, 'trades')
+        self.last_refill_time = StateField(self.states, 'refill')
+        self.quote_prices = StateField(self.states, 'quotes')
+        self.active_orders = StateField(self.states, 'orders')
+        self.jit_fills = StateField(self.states, 'jit')
     
     def get_config(self, security: str) -> dict:
         """Get configuration for security with defaults.
@@ -70,6 +87,9 @@ class BaseMarketMakingStrategy(ABC):
             'max_position': cfg.get('max_position', 2000000),
             'min_local_currency_before_quote': cfg.get('min_local_currency_before_quote', 25000),
             'max_notional': cfg.get('max_notional'),
+            'use_jit_fills': cfg.get('use_jit_fills', False),
+            'trade_sink_dir': cfg.get('trade_sink_dir'),
+            'trade_sink_flush_rows': cfg.get('trade_sink_flush_rows', DEFAULT_FLUSH_ROWS),
         }
     
     def initialize_security(self, security: str):
@@ -78,14 +98,28 @@ class BaseMarketMakingStrategy(ABC):
         Args:
             security: Security identifier
         """
-        if security not in self.position:
-            self.position[security] = 0
-            self.entry_price[security] = 0
-            self.pnl[security] = 0.0
-            self.trades[security] = []
-            self.last_refill_time[security] = {'bid': None, 'ask': None}
-            self.quote_prices[security] = {'bid': None, 'ask': None}
-            self.active_orders[security] = {'bid': {}, 'ask': {}}
+        if security not in self.states:
+            cfg = self.get_config(security)
+            use_jit = bool(cfg.get('use_jit_fills', False))
+            if use_jit and not NUMBA_AVAILABLE:
+                print(f"[{security}] use_jit_fills requested but numba is not installed; "
+                      f"using pure-Python fills")
+            trades = None
+            if cfg.get('trade_sink_dir'):
+                trades = TradeSink(cfg['trade_sink_dir'],
+                                   flush_rows=cfg.get('trade_sink_flush_rows') or DEFAULT_FLUSH_ROWS)
+            self.states[security] = SecurityState(jit=use_jit and NUMBA_AVAILABLE, trades=trades)
+    
+    def get_state(self, security: str) -> SecurityState:
+        """Get the state record of an initialized security.
+        
+        Args:
+            security: Security identifier
+            
+        Returns:
+            SecurityState record (updated in place for the whole run)
+        """
+        return self.states[security]
     
     # ==================== Abstract Methods ====================
     # These must be implemented by each concrete strategy
@@ -144,9 +178,8 @@ class BaseMarketMakingStrategy(ABC):
             side: 'bid' or 'ask'
             timestamp: Time quote was placed
         """
-        if security not in self.last_refill_time:
-            self.last_refill_time[security] = {'bid': None, 'ask': None}
-        self.last_refill_time[security][side] = timestamp
+        self.initialize_security(security)
+        self.states[security].refill[side] = timestamp
     
     def is_in_opening_auction(self, timestamp: datetime) -> bool:
         """Check if timestamp is during opening auction (9:30-10:00).
@@ -211,59 +244,73 @@ class BaseMarketMakingStrategy(ABC):
             trade_qty: Trade quantity
             orderbook: OrderBook instance (optional, for future use)
         """
-        quotes = self.quote_prices.get(security, {})
-        ask_price = quotes.get('ask')
-        bid_price = quotes.get('bid')
-        
-        ao = self.active_orders.get(security, {})
+        st = self.states.get(security)
+        if st is None:
+            return
+        quotes = st.quotes
+        ask_price = quotes.ask
+        bid_price = quotes.bid
         
         # Check ASK side: trade at/above our ask means we sold
         if ask_price is not None and trade_price >= ask_price:
-            remaining = int(trade_qty)
-            ask_side = ao.get('ask', {'ahead_qty': 0, 'our_remaining': 0})
-            
-            # Consume ahead quantity first (FIFO simulation)
-            ahead = ask_side.get('ahead_qty', 0)
-            consumed_ahead = min(ahead, remaining)
-            ask_side['ahead_qty'] = ahead - consumed_ahead
-            remaining -= consumed_ahead
-            
-            # Then consume our order
-            our_rem = ask_side.get('our_remaining', 0)
-            if remaining > 0 and our_rem > 0:
-                consumed_ours = min(our_rem, remaining)
-                ask_side['our_remaining'] = our_rem - consumed_ours
-                
+            ask_side = st.orders.ask
+            consumed_ours = self._consume_queue(security, ask_side, trade_qty)
+            if consumed_ours > 0:
                 # Record the fill
                 self._record_fill(security, 'sell', trade_price, consumed_ours, timestamp)
                 
                 # If fully filled, clear the quote
-                if ask_side['our_remaining'] == 0:
-                    self.quote_prices[security]['ask'] = None
+                if ask_side.our_remaining == 0:
+                    quotes.ask = None
         
         # Check BID side: trade at/below our bid means we bought
         if bid_price is not None and trade_price <= bid_price:
-            remaining = int(trade_qty)
-            bid_side = ao.get('bid', {'ahead_qty': 0, 'our_remaining': 0})
-            
-            # Consume ahead quantity first
-            ahead = bid_side.get('ahead_qty', 0)
-            consumed_ahead = min(ahead, remaining)
-            bid_side['ahead_qty'] = ahead - consumed_ahead
-            remaining -= consumed_ahead
-            
-            # Then consume our order
-            our_rem = bid_side.get('our_remaining', 0)
-            if remaining > 0 and our_rem > 0:
-                consumed_ours = min(our_rem, remaining)
-                bid_side['our_remaining'] = our_rem - consumed_ours
-                
+            bid_side = st.orders.bid
+            consumed_ours = self._consume_queue(security, bid_side, trade_qty)
+            if consumed_ours > 0:
                 # Record the fill
                 self._record_fill(security, 'buy', trade_price, consumed_ours, timestamp)
                 
                 # If fully filled, clear the quote
-                if bid_side['our_remaining'] == 0:
-                    self.quote_prices[security]['bid'] = None
+                if bid_side.our_remaining == 0:
+                    quotes.bid = None
+    
+    def _consume_queue(self, security: str, side_state: OrderSide, trade_qty: float) -> int:
+        """Consume a trade against one side's simulated FIFO queue.
+        
+        Quantity ahead of us is consumed first, then our own order.
+        Updates ahead_qty/our_remaining in side_state in place.
+        
+        Args:
+            security: Security identifier
+            side_state: Active order record for the side
+            trade_qty: Trade quantity
+            
+        Returns:
+            Quantity of our order filled (0 if none)
+        """
+        remaining = int(trade_qty)
+        ahead = side_state.ahead_qty
+        our_rem = side_state.our_remaining
+        
+        if self.states[security].jit:
+            ahead_left, our_left, consumed_ours = consume_queue(ahead, our_rem, remaining)
+            side_state.ahead_qty = ahead_left
+            if consumed_ours > 0:
+                side_state.our_remaining = our_left
+            return consumed_ours
+        
+        # Consume ahead quantity first (FIFO simulation)
+        consumed_ahead = min(ahead, remaining)
+        side_state.ahead_qty = ahead - consumed_ahead
+        remaining -= consumed_ahead
+        
+        # Then consume our order
+        if remaining > 0 and our_rem > 0:
+            consumed_ours = min(our_rem, remaining)
+            side_state.our_remaining = our_rem - consumed_ours
+            return consumed_ours
+        return 0
     
     def _record_fill(self, security: str, side: str, price: float, qty: float, timestamp: datetime):
         """Record an executed fill with P&L calculation.
@@ -287,57 +334,55 @@ class BaseMarketMakingStrategy(ABC):
         
         original_qty = qty  # Save original qty for trade record
         realized_pnl = 0.0
+        st = self.states[security]
+        
+        if st.jit and type(qty) is int and type(st.position) is int:
+            # Compiled kernel (integer quantities keep position types identical)
+            st.position, st.entry_price, st.pnl, realized_pnl = apply_fill(
+                st.position, st.entry_price, st.pnl, side == 'buy', price, qty)
         
-        if side == 'buy':
+        elif side == 'buy':
             # Close shorts first
-            if self.position[security] < 0:
-                close_qty = min(qty, abs(self.position[security]))
-                realized_pnl += (self.entry_price[security] - price) * close_qty
-                self.pnl[security] += realized_pnl
-                self.position[security] += close_qty
+            if st.position < 0:
+                close_qty = min(qty, abs(st.position))
+                realized_pnl += (st.entry_price - price) * close_qty
+                st.pnl += realized_pnl
+                st.position += close_qty
                 qty -= close_qty
             
             # Open/extend longs with remainder
             if qty > 0:
-                if self.position[security] == 0:
-                    self.entry_price[security] = price
-                    self.position[security] = qty
+                if st.position == 0:
+                    st.entry_price = price
+                    st.position = qty
                 else:
                     # Weighted average entry
-                    total_cost = self.entry_price[security] * self.position[security] + price * qty
-                    self.position[security] += qty
-                    self.entry_price[security] = total_cost / self.position[security]
+                    total_cost = st.entry_price * st.position + price * qty
+                    st.position += qty
+                    st.entry_price = total_cost / st.position
         
         elif side == 'sell':
             # Close longs first
-            if self.position[security] > 0:
-                close_qty = min(qty, self.position[security])
-                realized_pnl += (price - self.entry_price[security]) * close_qty
-                self.pnl[security] += realized_pnl
-                self.position[security] -= close_qty
+            if st.position > 0:
+                close_qty = min(qty, st.position)
+                realized_pnl += (price - st.entry_price) * close_qty
+                st.pnl += realized_pnl
+                st.position -= close_qty
                 qty -= close_qty
             
             # Open/extend shorts with remainder
             if qty > 0:
-                if self.position[security] == 0:
-                    self.entry_price[security] = price
-                    self.position[security] = -qty
+                if st.position == 0:
+                    st.entry_price = price
+                    st.position = -qty
                 else:
                     # Weighted average entry
-                    total_cost = self.entry_price[security] * abs(self.position[security]) + price * qty
-                    self.position[security] -= qty
-                    self.entry_price[security] = total_cost / abs(self.position[security])
+                    total_cost = st.entry_price * abs(st.position) + price * qty
+                    st.position -= qty
+                    st.entry_price = total_cost / abs(st.position)
         
         # Record trade (use original qty, not the reduced qty)
-        self.trades[security].append({
-            'timestamp': timestamp,
-            'side': side,
-            'fill_price': price,
-            'fill_qty': original_qty,
-            'realized_pnl': realized_pnl,
-            'position': self.position[security],
-            'pnl': self.pnl[security]
-        })
+        st.trades.add(timestamp, side, price, original_qty, realized_pnl, st.position, st.pnl)
         
         # Reset refill timer after fill
         # Map 'buy'/'sell' to 'bid'/'ask' for refill timer
@@ -352,15 +397,16 @@ class BaseMarketMakingStrategy(ABC):
             close_price: Price to close at
             timestamp: Close time
         """
-        if self.position[security] == 0:
+        position = self.states[security].position
+        if position == 0:
             return
         
-        if self.position[security] > 0:
+        if position > 0:
             # Close long
-            self._record_fill(security, 'sell', close_price, self.position[security], timestamp)
+            self._record_fill(security, 'sell', close_price, position, timestamp)
         else:
             # Close short
-            self._record_fill(security, 'buy', close_price, abs(self.position[security]), timestamp)
+            self._record_fill(security, 'buy', close_price, abs(position), timestamp)
     
     def get_total_pnl(self, security: str, mark_price: Optional[float] = None) -> float:
         """Get total P&L (realized + unrealized).
@@ -372,11 +418,12 @@ class BaseMarketMakingStrategy(ABC):
         Returns:
             Total P&L (realized + unrealized)
         """
-        realized = self.pnl[security]
+        st = self.states[security]
+        realized = st.pnl
         unrealized = 0.0
         
-        if mark_price is not None and self.position[security] != 0:
-            unrealized = (mark_price - self.entry_price[security]) * self.position[security]
+        if mark_price is not None and st.position != 0:
+            unrealized = (mark_price - st.entry_price) * st.position
         
         return realized + unrealized
     
@@ -0,0 +1,255 @@
+"""Compact per-security state records for market-making strategies.
+
+``BaseMarketMakingStrategy`` used to keep every piece of state in its own
+dict keyed by security, with nested ``{'bid': ..., 'ask': ...}`` dicts for
+timers and quotes, and the handlers built a new
+``{'price', 'ahead_qty', 'our_remaining'}`` dict on every quote update.
+Each event therefore paid several hash lookups and dict allocations.
+
+The state is now one fixed-layout record per security:
+
+    SecurityState   position, entry_price, pnl, trades (TradeLedger), jit,
+                    refill (SidePair), quotes (SidePair), orders (OrderPair)
+    SidePair        bid / ask slots (timers, quoted prices)
+    OrderSide       price / ahead_qty / our_remaining of one resting order
+
+Records are created once in ``initialize_security`` and updated in place;
+hot paths fetch the record once (``strategy.get_state(security)``) and use
+attribute access. For existing code the strategy still exposes
+``position``, ``active_orders``, ``quote_prices`` etc. as ``StateField``
+mapping views, and the records support the dict protocol, so
+``strategy.active_orders[sec]['bid'] = {'price': p, ...}`` and
+``strategy.quote_prices[sec].get('ask')`` keep working (assigning a dict
+copies its values into the existing record).
+
+Usage:
+    st = strategy.get_state(security)
+    st.orders.bid.set(bid_price, int(bid_ahead), int(bid_size))
+    st.quotes.bid = bid_price
+"""
+from typing import Dict, Iterator, Optional
+
+from src.trade_ledger import TradeLedger
+
+
+class OrderSide:
+    """Simulated resting order on one side (queue position and remaining size)."""
+
+    __slots__ = ('price', 'ahead_qty', 'our_remaining')
+
+    _KEYS = ('price', 'ahead_qty', 'our_remaining')
+
+    def __init__(self, price=None, ahead_qty=0, our_remaining=0):
+        self.price = price
+        self.ahead_qty = ahead_qty
+        self.our_remaining = our_remaining
+
+    def set(self, price, ahead_qty, our_remaining):
+        """Replace the order in place."""
+        self.price = price
+        self.ahead_qty = ahead_qty
+        self.our_remaining = our_remaining
+
+    def update(self, values: dict):
+        """Copy an order dict into the record (missing keys reset to empty)."""
+        self.price = values.get('price')
+        self.ahead_qty = values.get('ahead_qty', 0)
+        self.our_remaining = values.get('our_remaining', 0)
+
+    def to_dict(self) -> dict:
+        return {'price': self.price, 'ahead_qty': self.ahead_qty,
+                'our_remaining': self.our_remaining}
+
+    # Dict protocol (compatibility with the former order dicts)
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._KEYS else default
+
+    def __contains__(self, key):
+        return key in self._KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def keys(self):
+        return self._KEYS
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __eq__(self, other):
+        if isinstance(other, OrderSide):
+            return (self.price, self.ahead_qty, self.our_remaining) == \
+                (other.price, other.ahead_qty, other.our_remaining)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"OrderSide({self.to_dict()})"
+
+
+class SidePair:
+    """A bid and an ask value (quote timer, quoted price, ...)."""
+
+    __slots__ = ('bid', 'ask')
+
+    def __init__(self, bid=None, ask=None):
+        self.bid = bid
+        self.ask = ask
+
+    def __getitem__(self, side: str):
+        if side == 'bid':
+            return self.bid
+        if side == 'ask':
+            return self.ask
+        raise KeyError(side)
+
+    def __setitem__(self, side: str, value):
+        if side == 'bid':
+            self.bid = value
+        elif side == 'ask':
+            self.ask = value
+        else:
+            raise KeyError(side)
+
+    def get(self, side: str, default=None):
+        if side == 'bid':
+            return self.bid
+        if side == 'ask':
+            return self.ask
+        return default
+
+    def update(self, values: dict):
+        for side, value in values.items():
+            self[side] = value
+
+    def __contains__(self, side):
+        return side in ('bid', 'ask')
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(('bid', 'ask'))
+
+    def __len__(self):
+        return 2
+
+    def keys(self):
+        return ('bid', 'ask')
+
+    def items(self):
+        return (('bid', self.bid), ('ask', self.ask))
+
+    def to_dict(self) -> dict:
+        return {'bid': self.bid, 'ask': self.ask}
+
+    def __eq__(self, other):
+        if isinstance(other, SidePair):
+            return (self.bid, self.ask) == (other.bid, other.ask)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+class OrderPair(SidePair):
+    """Bid and ask OrderSide records; assigning a dict updates the record in place."""
+
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(OrderSide(), OrderSide())
+
+    def __setitem__(self, side: str, value):
+        target = self[side]
+        if isinstance(value, OrderSide):
+            target.set(value.price, value.ahead_qty, value.our_remaining)
+        else:
+            target.update(value)
+
+
+class SecurityState:
+    """All per-security strategy state in one fixed-layout record."""
+
+    __slots__ = ('position', 'entry_price', 'pnl', 'trades', 'jit',
+                 'refill', 'quotes', 'orders')
+
+    def __init__(self, jit: bool = False, trades: Optional[TradeLedger] = None):
+        self.position = 0
+        self.entry_price = 0
+        self.pnl = 0.0
+        # A TradeSink (src/trade_sink.py) spills fills to disk in long runs
+        self.trades = trades if trades is not None else TradeLedger()
+        self.jit = jit
+        self.refill = SidePair()
+        self.quotes = SidePair()
+        self.orders = OrderPair()
+
+
+class StateField:
+    """Dict-like view of one SecurityState field across securities.
+
+    ``strategy.position[sec]`` reads ``states[sec].position``; assignments
+    write through. For SidePair fields, assigning a dict copies it into the
+    existing record so references held elsewhere stay valid.
+    """
+
+    __slots__ = ('_states', '_name')
+
+    def __init__(self, states: Dict[str, SecurityState], name: str):
+        self._states = states
+        self._name = name
+
+    def __getitem__(self, security: str):
+        return getattr(self._states[security], self._name)
+
+    def __setitem__(self, security: str, value):
+        current = getattr(self._states[security], self._name)
+        if isinstance(current, SidePair):
+            current.update(value)
+        else:
+            setattr(self._states[security], self._name, value)
+
+    def get(self, security: str, default=None):
+        state = self._states.get(security)
+        return default if state is None else getattr(state, self._name)
+
+    def setdefault(self, security: str, default=None):
+        # Records always exist after initialize_security
+        return getattr(self._states[security], self._name)
+
+    def __contains__(self, security):
+        return security in self._states
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._states)
+
+    def __len__(self):
+        return len(self._states)
+
+    def keys(self):
+        return self._states.keys()
+
+    def values(self):
+        return [getattr(state, self._name) for state in self._states.values()]
+
+    def items(self):
+        return [(security, getattr(state, self._name))
+                for security, state in self._states.items()]
+
+    def __repr__(self):
+        return f"StateField({self._name!r}, {dict(self.items())!r})"
@@ -49,6 +49,7 @@ def create_v1_handler(config: dict = None):
         """
         # Initialize strategy state for this security
         strategy.initialize_security(security)
+        st = strategy.get_state(security)  # per-security state record
         
         # Initialize state dict if first time
         if 'rows' not in state:
@@ -94,19 +95,19 @@ def create_v1_handler(config: dict = None):
 
             # 1) EOD flatten at/after 14:55 - use trade price if available
             if strategy.is_eod_close_time(timestamp) and not state['closed_at_eod']:
-                if strategy.position[security] != 0:
+                if st.position != 0:
                     # If current event is a trade, use it immediately
                     if event_type == 'trade':
                         strategy.flatten_position(security, price, timestamp)
-                        state['trades'] = strategy.trades[security]
+                        state['trades'] = st.trades
                         state['closed_at_eod'] = True
                         state['last_flatten_date'] = current_date
                         continue
                     else:
                         # Not a trade, mark as pending flatten and wait
                         state['pending_flatten'] = {
-                            'position': strategy.position[security],
-                            'entry_price': strategy.entry_price[security],
+                            'position': st.position,
+                            'entry_price': st.entry_price,
                             'timestamp': timestamp
                         }
                         state['closed_at_eod'] = True
@@ -121,7 +122,7 @@ def create_v1_handler(config: dict = None):
             if state['pending_flatten'] is not None:
                 if event_type == 'trade':
                     strategy.flatten_position(security, price, timestamp)
-                    state['trades'] = strategy.trades[security]
+                    state['trades'] = st.trades
                     state['pending_flatten'] = None
                 continue  # Skip all events until we find the trade
 
@@ -165,13 +166,6 @@ def create_v1_handler(config: dict = None):
             # Check per-side refill and place quotes independently
             quotes = strategy.generate_quotes(security, best_bid, best_ask)
             if quotes:
-                # Ensure containers exist
-                strategy.active_orders.setdefault(security, {
-                    'bid': {'price': None, 'ahead_qty': 0, 'our_remaining': 0},
-                    'ask': {'price': None, 'ahead_qty': 0, 'our_remaining': 0}
-                })
-                strategy.quote_prices.setdefault(security, {'bid': None, 'ask': None})
-
                 cfg = strategy.get_config(security)
                 threshold = cfg.get('min_local_currency_before_quote', 25000)
 
@@ -185,21 +179,13 @@ def create_v1_handler(config: dict = None):
 
                     if bid_ok:
                         # Place bid and set timer
-                        strategy.active_orders[security]['bid'] = {
-                            'price': bid_price,
-                            'ahead_qty': int(bid_ahead),
-                            'our_remaining': int(bid_size)
-                        }
-                        strategy.quote_prices[security]['bid'] = bid_price
+                        st.orders.bid.set(bid_price, int(bid_ahead), int(bid_size))
+                        st.quotes.bid = bid_price
                         strategy.set_refill_time(security, 'bid', timestamp)
                     else:
                         # Suppress bid
-                        strategy.active_orders[security]['bid'] = {
-                            'price': bid_price,
-                            'ahead_qty': int(bid_ahead),
-                            'our_remaining': 0
-                        }
-                        strategy.quote_prices[security]['bid'] = None
+                        st.orders.bid.set(bid_price, int(bid_ahead), 0)
+                        st.quotes.bid = None
 
                 # --- ASK side (independent check) ---
                 if best_ask is not None and strategy.should_refill_side(security, timestamp, 'ask'):
@@ -211,35 +197,25 @@ def create_v1_handler(config: dict = None):
 
                     if ask_ok:
                         # Place ask and set timer
-                        strategy.active_orders[security]['ask'] = {
-                            'price': ask_price,
-                            'ahead_qty': int(ask_ahead),
-                            'our_remaining': int(ask_size)
-                        }
-                        strategy.quote_prices[security]['ask'] = ask_price
+                        st.orders.ask.set(ask_price, int(ask_ahead), int(ask_size))
+                        st.quotes.ask = ask_price
                         strategy.set_refill_time(security, 'ask', timestamp)
                     else:
                         # Suppress ask
-                        strategy.active_orders[security]['ask'] = {
-                            'price': ask_price,
-                            'ahead_qty': int(ask_ahead),
-                            'our_remaining': 0
-                        }
-                        strategy.quote_prices[security]['ask'] = None
+                        st.orders.ask.set(ask_price, int(ask_ahead), 0)
+                        st.quotes.ask = None
             
             # Check for fills (already in valid trading window 10:00-14:45)
             if event_type == 'trade':
                 strategy.process_trade(security, timestamp, price, volume, orderbook=orderbook)
         
         # Update final state
-        state['position'] = strategy.position[security]
-        state['pnl'] = strategy.pnl[security]
-        state['trades'] = strategy.trades[security]
+        state['position'] = st.position
+        state['pnl'] = st.pnl
+        state['trades'] = st.trades
         
-        # Track strategy trading dates
-        for trade in strategy.trades[security]:
-            trade_date = trade['timestamp'].date() if hasattr(trade['timestamp'], 'date') else trade['timestamp']
-            state['strategy_dates'].add(trade_date)
+        # Track strategy trading dates (trades added in this chunk only)
+        state['strategy_dates'].update(st.trades.new_dates())
         
         return state
     
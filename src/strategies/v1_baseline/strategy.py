@@ -79,7 +79,7 @@ class V1BaselineStrategy(BaseMarketMakingStrategy):
                 pass
         
         # Position-aware sizing
-        current_pos = self.position[security]
+        current_pos = self.states[security].position
         
         # Bid size: limited by headroom to +max_pos
         bid_size = 0 if bid_price is None else min(bid_quote_size, int(max_pos - current_pos))
@@ -118,7 +118,7 @@ class V1BaselineStrategy(BaseMarketMakingStrategy):
         cfg = self.get_config(security)
         interval_sec = cfg['refill_interval_sec']
 
-        last = self.last_refill_time.get(security, {}).get(side)
+        last = self.states[security].refill.get(side)
         if last is None:
             return True  # First quote ever
 
@@ -38,6 +38,7 @@ def create_v2_1_stop_loss_handler(config: dict = None):
         """
         # Initialize strategy state for this security
         strategy.initialize_security(security)
+        st = strategy.get_state(security)  # per-security state record
         
         # Initialize state dict if first time
         if 'rows' not in state:
@@ -84,17 +85,17 @@ def create_v2_1_stop_loss_handler(config: dict = None):
 
             # 1) EOD flatten at/after 14:55
             if strategy.is_eod_close_time(timestamp) and not state['closed_at_eod']:
-                if strategy.position[security] != 0:
+                if st.position != 0:
                     if event_type == 'trade':
                         strategy.flatten_position(security, price, timestamp)
-                        state['trades'] = strategy.trades[security]
+                        state['trades'] = st.trades
                         state['closed_at_eod'] = True
                         state['last_flatten_date'] = current_date
                         continue
                     else:
                         state['pending_flatten'] = {
-                            'position': strategy.position[security],
-                            'entry_price': strategy.entry_price[security],
+                            'position': st.position,
+                            'entry_price': st.entry_price,
                             'timestamp': timestamp
                         }
                         state['closed_at_eod'] = True
@@ -108,7 +109,7 @@ def create_v2_1_stop_loss_handler(config: dict = None):
             if state['pending_flatten'] is not None:
                 if event_type == 'trade':
                     strategy.flatten_position(security, price, timestamp)
-                    state['trades'] = strategy.trades[security]
+                    state['trades'] = st.trades
                     state['pending_flatten'] = None
                 continue
 
@@ -151,7 +152,7 @@ def create_v2_1_stop_loss_handler(config: dict = None):
             
             # A) Check if we need to trigger stop-loss
             # Use mid price for unrealized P&L calculation
-            if best_bid is not None and best_ask is not None and strategy.position[security] != 0:
+            if best_bid is not None and best_ask is not None and st.position != 0:
                 mid_price = (best_bid[0] + best_ask[0]) / 2.0
                 
                 if strategy.should_trigger_stop_loss(security, mid_price):
@@ -170,7 +171,7 @@ def create_v2_1_stop_loss_handler(config: dict = None):
                 )
                 
                 if fully_liquidated:
-                    state['trades'] = strategy.trades[security]
+                    state['trades'] = st.trades
                     # Continue to normal quote generation below
                 else:
                     # Partial fill or no liquidity yet - skip normal quoting this update
@@ -181,13 +182,6 @@ def create_v2_1_stop_loss_handler(config: dict = None):
             # Generate quotes on EVERY update (V2 behavior)
             quotes = strategy.generate_quotes(security, best_bid, best_ask, timestamp)
             if quotes:
-                # Ensure containers exist
-                strategy.active_orders.setdefault(security, {
-                    'bid': {'price': None, 'ahead_qty': 0, 'our_remaining': 0},
-                    'ask': {'price': None, 'ahead_qty': 0, 'our_remaining': 0}
-                })
-                strategy.quote_prices.setdefault(security, {'bid': None, 'ask': None})
-
                 cfg = strategy.get_config(security)
                 threshold = cfg.get('min_local_currency_before_quote', 25000)
 
@@ -200,26 +194,18 @@ def create_v2_1_stop_loss_handler(config: dict = None):
                     bid_ok = bid_local >= threshold and bid_size > 0
 
                     if bid_ok:
-                        current_bid_price = strategy.active_orders[security]['bid'].get('price')
+                        current_bid_price = st.orders.bid.price
                         price_changed = (current_bid_price is None or current_bid_price != bid_price)
                         
                         if price_changed:
-                            strategy.active_orders[security]['bid'] = {
-                                'price': bid_price,
-                                'ahead_qty': int(bid_ahead),
-                                'our_remaining': int(bid_size)
-                            }
+                            st.orders.bid.set(bid_price, int(bid_ahead), int(bid_size))
                         else:
-                            strategy.active_orders[security]['bid']['our_remaining'] = int(bid_size)
+                            st.orders.bid.our_remaining = int(bid_size)
                         
-                        strategy.quote_prices[security]['bid'] = bid_price
+                        st.quotes.bid = bid_price
                     else:
-                        strategy.active_orders[security]['bid'] = {
-                            'price': bid_price,
-                            'ahead_qty': int(bid_ahead),
-                            'our_remaining': 0
-                        }
-                        strategy.quote_prices[security]['bid'] = None
+                        st.orders.bid.set(bid_price, int(bid_ahead), 0)
+                        st.quotes.bid = None
 
                 # --- ASK side ---
                 if best_ask is not None:
@@ -230,40 +216,30 @@ def create_v2_1_stop_loss_handler(config: dict = None):
                     ask_ok = ask_local >= threshold and ask_size > 0
 
                     if ask_ok:
-                        current_ask_price = strategy.active_orders[security]['ask'].get('price')
+                        current_ask_price = st.orders.ask.price
                         price_changed = (current_ask_price is None or current_ask_price != ask_price)
                         
                         if price_changed:
-                            strategy.active_orders[security]['ask'] = {
-                                'price': ask_price,
-                                'ahead_qty': int(ask_ahead),
-                                'our_remaining': int(ask_size)
-                            }
+                            st.orders.ask.set(ask_price, int(ask_ahead), int(ask_size))
                         else:
-                            strategy.active_orders[security]['ask']['our_remaining'] = int(ask_size)
+                            st.orders.ask.our_remaining = int(ask_size)
                         
-                        strategy.quote_prices[security]['ask'] = ask_price
+                        st.quotes.ask = ask_price
                     else:
-                        strategy.active_orders[security]['ask'] = {
-                            'price': ask_price,
-                            'ahead_qty': int(ask_ahead),
-                            'our_remaining': 0
-                        }
-                        strategy.quote_prices[security]['ask'] = None
+                        st.orders.ask.set(ask_price, int(ask_ahead), 0)
+                        st.quotes.ask = None
             
             # Process market trades (already in valid trading window 10:00-14:45)
             if event_type == 'trade':
                 strategy.process_trade(security, timestamp, price, volume, orderbook=orderbook)
         
         # Update state with final position/P&L
-        state['position'] = strategy.position[security]
+        state['position'] = st.position
         state['pnl'] = strategy.get_total_pnl(security, state.get('last_price'))
-        state['trades'] = strategy.trades[security]
+        state['trades'] = st.trades
         
-        # Track strategy trading dates
-        for trade in strategy.trades[security]:
-            trade_date = trade['timestamp'].date() if hasattr(trade['timestamp'], 'date') else trade['timestamp']
-            state['strategy_dates'].add(trade_date)
+        # Track strategy trading dates (trades added in this chunk only)
+        state['strategy_dates'].update(st.trades.new_dates())
         
         return state
     
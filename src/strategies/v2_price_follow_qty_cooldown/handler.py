@@ -37,6 +37,7 @@ def create_v2_price_follow_qty_cooldown_handler(config: dict = None):
         """
         # Initialize strategy state for this security
         strategy.initialize_security(security)
+        st = strategy.get_state(security)  # per-security state record
         
         # Initialize state dict if first time
         if 'rows' not in state:
@@ -82,19 +83,19 @@ def create_v2_price_follow_qty_cooldown_handler(config: dict = None):
 
             # 1) EOD flatten at/after 14:55 - use trade price if available
             if strategy.is_eod_close_time(timestamp) and not state['closed_at_eod']:
-                if strategy.position[security] != 0:
+                if st.position != 0:
                     # If current event is a trade, use it immediately
                     if event_type == 'trade':
                         strategy.flatten_position(security, price, timestamp)
-                        state['trades'] = strategy.trades[security]
+                        state['trades'] = st.trades
                         state['closed_at_eod'] = True
                         state['last_flatten_date'] = current_date
                         continue
                     else:
                         # Not a trade, mark as pending flatten and wait
                         state['pending_flatten'] = {
-                            'position': strategy.position[security],
-                            'entry_price': strategy.entry_price[security],
+                            'position': st.position,
+                            'entry_price': st.entry_price,
                             'timestamp': timestamp
                         }
                         state['closed_at_eod'] = True
@@ -109,7 +110,7 @@ def create_v2_price_follow_qty_cooldown_handler(config: dict = None):
             if state['pending_flatten'] is not None:
                 if event_type == 'trade':
                     strategy.flatten_position(security, price, timestamp)
-                    state['trades'] = strategy.trades[security]
+                    state['trades'] = st.trades
                     state['pending_flatten'] = None
                 continue  # Skip all events until we find the trade
 
@@ -153,13 +154,6 @@ def create_v2_price_follow_qty_cooldown_handler(config: dict = None):
             # 6. V2 KEY DIFFERENCE: Generate quotes on EVERY update (no timer check)
             quotes = strategy.generate_quotes(security, best_bid, best_ask, timestamp)
             if quotes:
-                # Ensure containers exist
-                strategy.active_orders.setdefault(security, {
-                    'bid': {'price': None, 'ahead_qty': 0, 'our_remaining': 0},
-                    'ask': {'price': None, 'ahead_qty': 0, 'our_remaining': 0}
-                })
-                strategy.quote_prices.setdefault(security, {'bid': None, 'ask': None})
-
                 cfg = strategy.get_config(security)
                 threshold = cfg.get('min_local_currency_before_quote', 25000)
 
@@ -174,29 +168,21 @@ def create_v2_price_follow_qty_cooldown_handler(config: dict = None):
 
                     if bid_ok:
                         # Check if price changed
-                        current_bid_price = strategy.active_orders[security]['bid'].get('price')
+                        current_bid_price = st.orders.bid.price
                         price_changed = (current_bid_price is None or current_bid_price != bid_price)
                         
                         if price_changed:
                             # Reset queue position at new price
-                            strategy.active_orders[security]['bid'] = {
-                                'price': bid_price,
-                                'ahead_qty': int(bid_ahead),
-                                'our_remaining': int(bid_size)
-                            }
+                            st.orders.bid.set(bid_price, int(bid_ahead), int(bid_size))
                         else:
                             # Price same, update remaining (cooldown may have changed)
-                            strategy.active_orders[security]['bid']['our_remaining'] = int(bid_size)
+                            st.orders.bid.our_remaining = int(bid_size)
                         
-                        strategy.quote_prices[security]['bid'] = bid_price
+                        st.quotes.bid = bid_price
                     else:
                         # Suppress bid quote - insufficient liquidity
-                        strategy.active_orders[security]['bid'] = {
-                            'price': bid_price,
-                            'ahead_qty': int(bid_ahead),
-                            'our_remaining': 0
-                        }
-                        strategy.quote_prices[security]['bid'] = None
+                        st.orders.bid.set(bid_price, int(bid_ahead), 0)
+                        st.quotes.bid = None
 
                 # --- ASK side ---
                 # V2: Always update (no should_refill_side check)
@@ -209,43 +195,33 @@ def create_v2_price_follow_qty_cooldown_handler(config: dict = None):
 
                     if ask_ok:
                         # Check if price changed
-                        current_ask_price = strategy.active_orders[security]['ask'].get('price')
+                        current_ask_price = st.orders.ask.price
                         price_changed = (current_ask_price is None or current_ask_price != ask_price)
                         
                         if price_changed:
                             # Reset queue position at new price
-                            strategy.active_orders[security]['ask'] = {
-                                'price': ask_price,
-                                'ahead_qty': int(ask_ahead),
-                                'our_remaining': int(ask_size)
-                            }
+                            st.orders.ask.set(ask_price, int(ask_ahead), int(ask_size))
                         else:
                             # Price same, update remaining (cooldown may have changed)
-                            strategy.active_orders[security]['ask']['our_remaining'] = int(ask_size)
+                            st.orders.ask.our_remaining = int(ask_size)
                         
-                        strategy.quote_prices[security]['ask'] = ask_price
+                        st.quotes.ask = ask_price
                     else:
                         # Suppress ask quote - insufficient liquidity
-                        strategy.active_orders[security]['ask'] = {
-                            'price': ask_price,
-                            'ahead_qty': int(ask_ahead),
-                            'our_remaining': 0
-                        }
-                        strategy.quote_prices[security]['ask'] = None
+                        st.orders.ask.set(ask_price, int(ask_ahead), 0)
+                        st.quotes.ask = None
             
             # 7. Process market trades (already in valid trading window 10:00-14:45)
             if event_type == 'trade':
                 strategy.process_trade(security, timestamp, price, volume, orderbook=orderbook)
         
         # Update state with final position/P&L
-        state['position'] = strategy.position[security]
+        state['position'] = st.position
         state['pnl'] = strategy.get_total_pnl(security, state.get('last_price'))
-        state['trades'] = strategy.trades[security]
+        state['trades'] = st.trades
         
-        # Track strategy trading dates
-        for trade in strategy.trades[security]:
-            trade_date = trade['timestamp'].date() if hasattr(trade['timestamp'], 'date') else trade['timestamp']
-            state['strategy_dates'].add(trade_date)
+        # Track strategy trading dates (trades added in this chunk only)
+        state['strategy_dates'].update(st.trades.new_dates())
         
         return state
     
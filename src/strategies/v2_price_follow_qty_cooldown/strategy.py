@@ -8,6 +8,7 @@ but implements a cooldown period for quantity refills after executions.
 from datetime import datetime
 from typing import Dict, Optional, Tuple
 from ..base_strategy import BaseMarketMakingStrategy
+from ..strategy_state import SidePair
 
 
 class V2PriceFollowQtyCooldownStrategy(BaseMarketMakingStrategy):
@@ -26,13 +27,13 @@ class V2PriceFollowQtyCooldownStrategy(BaseMarketMakingStrategy):
     def __init__(self, config: dict):
         super().__init__(config)
         # Track last fill time for cooldown logic (replaces last_refill_time)
-        self.last_fill_time: Dict[str, Dict[str, Optional[datetime]]] = {}
+        self.last_fill_time: Dict[str, SidePair] = {}
     
     def initialize_security(self, security: str):
         """Initialize state for a new security."""
         super().initialize_security(security)
         if security not in self.last_fill_time:
-            self.last_fill_time[security] = {'bid': None, 'ask': None}
+            self.last_fill_time[security] = SidePair()
     
     def is_in_cooldown(self, security: str, timestamp: datetime, side: str) -> bool:
         """
@@ -45,7 +46,10 @@ class V2PriceFollowQtyCooldownStrategy(BaseMarketMakingStrategy):
         - No previous fills (first quote)
         - Cooldown period has expired
         """
-        last_fill = self.last_fill_time.get(security, {}).get(side)
+        pair = self.last_fill_time.get(security)
+        if pair is None:
+            return False  # Security not initialized yet
+        last_fill = pair.get(side)
         
         if last_fill is None:
             return False  # No previous fill
@@ -69,7 +73,8 @@ class V2PriceFollowQtyCooldownStrategy(BaseMarketMakingStrategy):
             int: Quantity to quote (0 if no room or fully filled in cooldown)
         """
         cfg = self.get_config(security)
-        current_pos = self.position[security]
+        st = self.states[security]
+        current_pos = st.position
         max_pos = cfg['max_position']
         
         # Determine base size
@@ -81,9 +86,7 @@ class V2PriceFollowQtyCooldownStrategy(BaseMarketMakingStrategy):
         # Check if in cooldown
         if self.is_in_cooldown(security, timestamp, side):
             # In cooldown: use remaining unfilled quantity
-            ao = self.active_orders.get(security, {})
-            side_order = ao.get(side, {})
-            base_size = side_order.get('our_remaining', 0)
+            base_size = st.orders[side].our_remaining
         
         # Apply position limits
         if side == 'bid':
@@ -155,7 +158,7 @@ class V2PriceFollowQtyCooldownStrategy(BaseMarketMakingStrategy):
         cooldown_side = 'bid' if side == 'buy' else 'ask'
         
         if security not in self.last_fill_time:
-            self.last_fill_time[security] = {'bid': None, 'ask': None}
+            self.last_fill_time[security] = SidePair()
         
         self.last_fill_time[security][cooldown_side] = timestamp
     
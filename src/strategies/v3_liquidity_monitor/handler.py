@@ -34,6 +34,7 @@ def create_v3_liquidity_monitor_handler(config: dict = None):
         """
         # Initialize strategy state for this security
         strategy.initialize_security(security)
+        st = strategy.get_state(security)  # per-security state record
         
         # Initialize state dict if first time
         if 'rows' not in state:
@@ -79,17 +80,17 @@ def create_v3_liquidity_monitor_handler(config: dict = None):
 
             # 1) EOD flatten at/after 14:55
             if strategy.is_eod_close_time(timestamp) and not state['closed_at_eod']:
-                if strategy.position[security] != 0:
+                if st.position != 0:
                     if event_type == 'trade':
                         strategy.flatten_position(security, price, timestamp)
-                        state['trades'] = strategy.trades[security]
+                        state['trades'] = st.trades
                         state['closed_at_eod'] = True
                         state['last_flatten_date'] = current_date
                         continue
                     else:
                         state['pending_flatten'] = {
-                            'position': strategy.position[security],
-                            'entry_price': strategy.entry_price[security],
+                            'position': st.position,
+                            'entry_price': st.entry_price,
                             'timestamp': timestamp
                         }
                         state['closed_at_eod'] = True
@@ -103,7 +104,7 @@ def create_v3_liquidity_monitor_handler(config: dict = None):
             if state['pending_flatten'] is not None:
                 if event_type == 'trade':
                     strategy.flatten_position(security, price, timestamp)
-                    state['trades'] = strategy.trades[security]
+                    state['trades'] = st.trades
                     state['pending_flatten'] = None
                 continue
 
@@ -147,13 +148,6 @@ def create_v3_liquidity_monitor_handler(config: dict = None):
             # Generate quotes (same as V2)
             quotes = strategy.generate_quotes(security, best_bid, best_ask, timestamp)
             if quotes:
-                # Ensure containers exist
-                strategy.active_orders.setdefault(security, {
-                    'bid': {'price': None, 'ahead_qty': 0, 'our_remaining': 0},
-                    'ask': {'price': None, 'ahead_qty': 0, 'our_remaining': 0}
-                })
-                strategy.quote_prices.setdefault(security, {'bid': None, 'ask': None})
-
                 # --- BID side ---
                 if best_bid is not None:
                     bid_price = quotes['bid_price']
@@ -166,34 +160,26 @@ def create_v3_liquidity_monitor_handler(config: dict = None):
                     
                     if bid_liquidity_ok and bid_size > 0:
                         # Check if price changed
-                        current_bid_price = strategy.active_orders[security]['bid'].get('price')
+                        current_bid_price = st.orders.bid.price
                         price_changed = (current_bid_price is None or current_bid_price != bid_price)
                         
                         if price_changed:
                             # Reset queue position at new price
                             bid_ahead = orderbook.bids.get(bid_price, 0) if bid_price is not None else 0
-                            strategy.active_orders[security]['bid'] = {
-                                'price': bid_price,
-                                'ahead_qty': int(bid_ahead),
-                                'our_remaining': int(bid_size)
-                            }
+                            st.orders.bid.set(bid_price, int(bid_ahead), int(bid_size))
                         else:
                             # Price same, just update remaining quantity
-                            strategy.active_orders[security]['bid']['our_remaining'] = int(bid_size)
+                            st.orders.bid.our_remaining = int(bid_size)
                             # Update ahead_qty based on current orderbook
                             bid_ahead = orderbook.bids.get(bid_price, 0) if bid_price is not None else 0
-                            strategy.active_orders[security]['bid']['ahead_qty'] = int(bid_ahead)
+                            st.orders.bid.ahead_qty = int(bid_ahead)
                         
-                        strategy.quote_prices[security]['bid'] = bid_price
+                        st.quotes.bid = bid_price
                         strategy.quotes_active[security]['bid'] = True
                     else:
                         # V3: Withdraw bid quote due to insufficient liquidity or size
-                        strategy.active_orders[security]['bid'] = {
-                            'price': bid_price,
-                            'ahead_qty': 0,
-                            'our_remaining': 0
-                        }
-                        strategy.quote_prices[security]['bid'] = None
+                        st.orders.bid.set(bid_price, 0, 0)
+                        st.quotes.bid = None
                         strategy.quotes_active[security]['bid'] = False
 
                 # --- ASK side ---
@@ -208,34 +194,26 @@ def create_v3_liquidity_monitor_handler(config: dict = None):
                     
                     if ask_liquidity_ok and ask_size > 0:
                         # Check if price changed
-                        current_ask_price = strategy.active_orders[security]['ask'].get('price')
+                        current_ask_price = st.orders.ask.price
                         price_changed = (current_ask_price is None or current_ask_price != ask_price)
                         
                         if price_changed:
                             # Reset queue position at new price
                             ask_ahead = orderbook.asks.get(ask_price, 0) if ask_price is not None else 0
-                            strategy.active_orders[security]['ask'] = {
-                                'price': ask_price,
-                                'ahead_qty': int(ask_ahead),
-                                'our_remaining': int(ask_size)
-                            }
+                            st.orders.ask.set(ask_price, int(ask_ahead), int(ask_size))
                         else:
                             # Price same, just update remaining quantity
-                            strategy.active_orders[security]['ask']['our_remaining'] = int(ask_size)
+                            st.orders.ask.our_remaining = int(ask_size)
                             # Update ahead_qty based on current orderbook
                             ask_ahead = orderbook.asks.get(ask_price, 0) if ask_price is not None else 0
-                            strategy.active_orders[security]['ask']['ahead_qty'] = int(ask_ahead)
+                            st.orders.ask.ahead_qty = int(ask_ahead)
                         
-                        strategy.quote_prices[security]['ask'] = ask_price
+                        st.quotes.ask = ask_price
                         strategy.quotes_active[security]['ask'] = True
                     else:
                         # V3: Withdraw ask quote due to insufficient liquidity or size
-                        strategy.active_orders[security]['ask'] = {
-                            'price': ask_price,
-                            'ahead_qty': 0,
-                            'our_remaining': 0
-                        }
-                        strategy.quote_prices[security]['ask'] = None
+                        st.orders.ask.set(ask_price, 0, 0)
+                        st.quotes.ask = None
                         strategy.quotes_active[security]['ask'] = False
             
             # Process market trades (already in valid trading window 10:00-14:45)
@@ -243,14 +221,12 @@ def create_v3_liquidity_monitor_handler(config: dict = None):
                 strategy.process_trade(security, timestamp, price, volume, orderbook=orderbook)
         
         # Update state with final position/P&L
-        state['position'] = strategy.position[security]
+        state['position'] = st.position
         state['pnl'] = strategy.get_total_pnl(security, state.get('last_price'))
-        state['trades'] = strategy.trades[security]
+        state['trades'] = st.trades
         
-        # Track strategy trading dates
-        for trade in strategy.trades[security]:
-            trade_date = trade['timestamp'].date() if hasattr(trade['timestamp'], 'date') else trade['timestamp']
-            state['strategy_dates'].add(trade_date)
+        # Track strategy trading dates (trades added in this chunk only)
+        state['strategy_dates'].update(st.trades.new_dates())
         
         return state
     
@@ -0,0 +1,184 @@
+"""Memory-mapped Arrow IPC cache of prepared per-security tick data.
+
+Every sweep scenario re-reads the same parquet files, decompresses them and
+(for the closing strategy) re-sorts them. This module prepares each file once
+and stores the result as an uncompressed Arrow IPC (Feather v2) file. Readers
+memory-map the file read-only, so numeric columns are used in place and all
+worker processes on a machine share the same page-cache pages.
+
+Two layouts are cached:
+    canonical  Preprocessed rows in file order (src/tick_schema.py schema),
+               as the market-making workers consume them
+    sorted     Column names normalised and rows sorted by timestamp with the
+               same ``sort_values('timestamp')`` call the closing-strategy
+               loaders use; rows are not filtered, so results are unchanged
+
+Cache files live in ``<parquet dir>/.tick_cache/`` and are named
+``<stem>.<layout>.<key>.arrow``. The key hashes the parquet file's contents
+together with the tick schema and cache versions, so a changed source or
+schema simply selects a new file; stale files for the same security are
+removed when the new one is written.
+
+Usage:
+    from src.tick_cache import load_cached_ticks
+
+    df = load_cached_ticks('data/parquet/emaar.parquet', layout='sorted')
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from src.tick_schema import TICK_SCHEMA_VERSION
+
+
+TICK_CACHE_VERSION = 1
+TICK_CACHE_DIR = '.tick_cache'
+TICK_CACHE_LAYOUTS = ('canonical', 'sorted')
+
+# Column spellings normalised by the closing-strategy loaders
+_COLUMN_MAP = {'Timestamp': 'timestamp', 'Type': 'type', 'Price': 'price', 'Volume': 'volume'}
+
+# Content hashes already computed in this process: (path, size, mtime_ns) -> hex
+_hash_memo = {}
+
+
+def source_hash(parquet_file) -> str:
+    """Content hash of a parquet file (memoised per size/mtime in-process)."""
+    parquet_file = Path(parquet_file).resolve()
+    st = parquet_file.stat()
+    memo_key = (str(parquet_file), st.st_size, st.st_mtime_ns)
+    if memo_key not in _hash_memo:
+        digest = hashlib.sha1()
+        with parquet_file.open('rb') as fh:
+            for block in iter(lambda: fh.read(1 << 20), b''):
+                digest.update(block)
+        _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+
+def tick_cache_path(parquet_file, layout: str = 'canonical',
+                    cache_dir: Optional[str] = None) -> Path:
+    """Path of the cache file for a parquet file and layout.
+
+    Args:
+        parquet_file: Source parquet file
+        layout: 'canonical' or 'sorted'
+        cache_dir: Cache directory (default: .tick_cache next to the file)
+
+    Returns:
+        Path of the (possibly not yet built) cache file
+    """
+    if layout not in TICK_CACHE_LAYOUTS:
+        raise ValueError(f"Unknown tick cache layout: {layout} (expected one of {TICK_CACHE_LAYOUTS})")
+
+    parquet_file = Path(parquet_file)
+    if cache_dir is None:
+        cache_dir = parquet_file.parent / TICK_CACHE_DIR
+
+    key_source = f"{source_hash(parquet_file)}:{TICK_SCHEMA_VERSION}:{TICK_CACHE_VERSION}:{layout}"
+    key = hashlib.sha1(key_source.encode()).hexdigest()[:16]
+    return Path(cache_dir) / f"{parquet_file.stem}.{layout}.{key}.arrow"
+
+
+def read_sorted_ticks(parquet_file) -> pd.DataFrame:
+    """Read a parquet file in the 'sorted' layout (lower-case columns, by timestamp)."""
+    from src.parquet_loader import read_parquet_file
+
+    df = read_parquet_file(parquet_file)
+    df = df.rename(columns={k: v for k, v in _COLUMN_MAP.items()
+                            if k in df.columns and v not in df.columns})
+    return df.sort_values('timestamp').reset_index(drop=True)
+
+
+def _prepare_table(parquet_file: Path, layout: str):
+    """Read a parquet file and build the Arrow table for a cache layout."""
+    import pyarrow as pa
+    from src.parquet_loader import read_parquet_file
+    from src.tick_schema import to_canonical_table
+
+    if layout == 'canonical':
+        return to_canonical_table(read_parquet_file(parquet_file))
+
+    return pa.Table.from_pandas(read_sorted_ticks(parquet_file), preserve_index=False)
+
+
+def build_tick_cache(parquet_file, layout: str = 'canonical', cache_dir: Optional[str] = None,
+                     rebuild: bool = False) -> Path:
+    """Build the cache file for a parquet file if it does not exist yet.
+
+    The file is written under a temporary name and renamed, so concurrent
+    workers either see the complete file or build their own copy.
+
+    Args:
+        parquet_file: Source parquet file
+        layout: 'canonical' or 'sorted'
+        cache_dir: Cache directory (default: .tick_cache next to the file)
+        rebuild: Rewrite the cache even if it exists
+
+    Returns:
+        Path of the cache file
+    """
+    import pyarrow as pa
+
+    parquet_file = Path(parquet_file)
+    cache_file = tick_cache_path(parquet_file, layout, cache_dir)
+    if cache_file.exists() and not rebuild:
+        return cache_file
+
+    table = _prepare_table(parquet_file, layout)
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        with pa.OSFile(str(tmp_file), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_file, cache_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+
+    # Drop caches of older versions of this file
+    for stale in cache_file.parent.glob(f"{parquet_file.stem}.{layout}.*.arrow"):
+        if stale != cache_file:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+    return cache_file
+
+
+def open_tick_cache(cache_file) -> pd.DataFrame:
+    """Memory-map a cache file read-only and return it as a DataFrame.
+
+    Null-free numeric and timestamp columns reference the mapped pages
+    directly (read-only arrays); canonical files are tagged so that
+    ``preprocess_chunk_df`` skips their normalisation.
+    """
+    import pyarrow as pa
+    from src.tick_schema import table_to_frame
+
+    source = pa.memory_map(str(cache_file), 'r')
+    table = pa.ipc.open_file(source).read_all()
+    return table_to_frame(table, zero_copy=True)
+
+
+def load_cached_ticks(parquet_file, layout: str = 'canonical', cache_dir: Optional[str] = None,
+                      rebuild: bool = False) -> pd.DataFrame:
+    """Load prepared tick data for a parquet file through the mmap cache.
+
+    Args:
+        parquet_file: Source parquet file
+        layout: 'canonical' (preprocessed, file order) or 'sorted'
+                (closing-strategy loader view)
+        cache_dir: Cache directory (default: .tick_cache next to the file)
+        rebuild: Rewrite the cache even if it exists
+
+    Returns:
+        DataFrame backed by the memory-mapped cache file
+    """
+    return open_tick_cache(build_tick_cache(parquet_file, layout, cache_dir, rebuild))
@@ -0,0 +1,204 @@
+"""Canonical typed tick schema for per-security Parquet files.
+
+Raw conversions keep whatever the Excel sheet held (``'TRADE'``, ``'bid'``,
+object columns, ...), so every reader re-runs ``pd.to_datetime``,
+``pd.to_numeric`` and ``.str.lower()`` on every chunk. Files written with the
+canonical schema are already normalised and tagged with a schema version in
+the Parquet metadata, so readers can skip that work entirely.
+
+Canonical schema (version 1):
+    timestamp  timestamp[ns]                int64 ns since epoch (naive local time)
+    type       dictionary<int8, string>     'other', 'bid', 'ask', 'trade'
+    price      float64, or int64 ticks      int64 when written with a price_scale
+    volume     int64
+
+Rows without timestamp/price are dropped at write time. Rows with
+non-positive prices are kept: the closing strategy feeds zero-price bid/ask
+rows to its order book, and the market-making readers drop them in
+``preprocess_chunk_df`` as they do for raw files.
+
+Usage:
+    from src.tick_schema import write_canonical_parquet, read_tick_schema_version
+
+    write_canonical_parquet(df, 'data/parquet/emaar.parquet')
+    read_tick_schema_version('data/parquet/emaar.parquet')  # -> 1
+"""
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+TICK_SCHEMA_VERSION = 1
+
+SCHEMA_VERSION_KEY = b'tick_schema_version'
+PRICE_SCALE_KEY = b'tick_price_scale'
+
+TICK_COLUMNS = ['timestamp', 'type', 'price', 'volume']
+
+# Dictionary values; the position is the event code (matches src.event_kernel)
+EVENT_TYPES = ['other', 'bid', 'ask', 'trade']
+
+
+def canonical_schema(price_scale: Optional[int] = None):
+    """Arrow schema (with version metadata) for canonical tick files."""
+    import pyarrow as pa
+
+    metadata = {SCHEMA_VERSION_KEY: str(TICK_SCHEMA_VERSION).encode()}
+    if price_scale is not None:
+        metadata[PRICE_SCALE_KEY] = str(int(price_scale)).encode()
+
+    return pa.schema([
+        pa.field('timestamp', pa.timestamp('ns')),
+        pa.field('type', pa.dictionary(pa.int8(), pa.string())),
+        pa.field('price', pa.int64() if price_scale is not None else pa.float64()),
+        pa.field('volume', pa.int64()),
+    ], metadata=metadata)
+
+
+def to_canonical_table(df: pd.DataFrame, price_scale: Optional[int] = None):
+    """Normalise a tick DataFrame and convert it to a canonical Arrow table.
+
+    Args:
+        df: Tick DataFrame with any of the column spellings that
+            ``normalize_tick_df`` understands
+        price_scale: Store prices as int64 ticks of 1/price_scale
+                     (e.g. 1000 for 0.001 precision); default float64
+
+    Returns:
+        pyarrow.Table with the canonical schema
+
+    Raises:
+        ValueError: If a price is not an exact multiple of 1/price_scale
+    """
+    import pyarrow as pa
+    from src.data_loader import normalize_tick_df
+
+    df = normalize_tick_df(df)
+
+    # Event type codes (unknown types -> 'other')
+    types = df['type'].to_numpy(dtype=object)
+    codes = np.zeros(len(df), dtype=np.int8)
+    for code, name in enumerate(EVENT_TYPES[1:], 1):
+        codes[types == name] = code
+    type_array = pa.DictionaryArray.from_arrays(
+        pa.array(codes, type=pa.int8()), pa.array(EVENT_TYPES, type=pa.string())
+    )
+
+    timestamp = pa.array(df['timestamp'].to_numpy(dtype='datetime64[ns]'),
+                         type=pa.timestamp('ns'))
+
+    price = df['price'].to_numpy(dtype=np.float64)
+    if price_scale is not None:
+        ticks = np.rint(price * price_scale).astype(np.int64)
+        if not np.array_equal(ticks / price_scale, price):
+            raise ValueError(
+                f"Prices are not exact multiples of 1/{price_scale}; "
+                f"use a larger price_scale or float64 prices"
+            )
+        price = ticks
+
+    volume = df['volume'].fillna(0).to_numpy(dtype=np.int64)
+
+    return pa.Table.from_arrays(
+        [timestamp, type_array, pa.array(price), pa.array(volume, type=pa.int64())],
+        schema=canonical_schema(price_scale)
+    )
+
+
+def write_canonical_parquet(df: pd.DataFrame, output_file, compression: str = 'snappy',
+                            price_scale: Optional[int] = None) -> int:
+    """Write a tick DataFrame as a canonical Parquet file.
+
+    The file is written to a temporary name first and then renamed, so a
+    reader never sees a partially written file.
+
+    Args:
+        df: Tick DataFrame (raw or preprocessed)
+        output_file: Destination .parquet path
+        compression: Parquet compression ('snappy', 'gzip', 'zstd' or 'none')
+        price_scale: Optional int64 price scaling (see to_canonical_table)
+
+    Returns:
+        Number of rows written
+    """
+    import os
+    import pyarrow.parquet as pq
+
+    table = to_canonical_table(df, price_scale=price_scale)
+
+    output_file = Path(output_file)
+    tmp_file = output_file.with_name(output_file.name + '.tmp')
+    pq.write_table(table, tmp_file, compression=compression)
+    os.replace(tmp_file, output_file)
+
+    return table.num_rows
+
+
+def schema_version_from_metadata(metadata) -> Optional[int]:
+    """Return the canonical schema version stored in Arrow schema metadata."""
+    if not metadata or SCHEMA_VERSION_KEY not in metadata:
+        return None
+    try:
+        return int(metadata[SCHEMA_VERSION_KEY])
+    except ValueError:
+        return None
+
+
+def read_tick_schema_version(parquet_file) -> Optional[int]:
+    """Return the canonical schema version of a Parquet file (None if raw)."""
+    import pyarrow.parquet as pq
+
+    return schema_version_from_metadata(pq.read_schema(parquet_file).metadata)
+
+
+def table_to_frame(table, metadata=None, zero_copy: bool = False) -> pd.DataFrame:
+    """Convert an Arrow table/record batch to pandas, decoding canonical files.
+
+    For canonical data, int64 tick prices are scaled back to float64 and the
+    schema version is recorded in ``df.attrs['tick_schema_version']`` so
+    ``preprocess_chunk_df`` can skip normalisation. Other tables are
+    converted unchanged.
+
+    Args:
+        table: pyarrow Table or RecordBatch
+        metadata: Schema metadata to use (defaults to the table's own; pass
+                  the file schema's metadata when the batch lost it)
+        zero_copy: Keep one pandas block per column so null-free numeric
+                   columns share the Arrow buffers (e.g. a memory-mapped
+                   file) instead of being copied; such arrays are read-only
+
+    Returns:
+        DataFrame
+    """
+    if metadata is None:
+        metadata = table.schema.metadata
+    version = schema_version_from_metadata(metadata)
+
+    df = table.to_pandas(split_blocks=True) if zero_copy else table.to_pandas()
+    if version is None:
+        return df
+
+    if PRICE_SCALE_KEY in metadata and 'price' in df.columns:
+        df['price'] = df['price'].to_numpy(dtype=np.int64) / int(metadata[PRICE_SCALE_KEY])
+    df.attrs['tick_schema_version'] = version
+    return df
+
+
+def is_canonical_frame(df: pd.DataFrame) -> bool:
+    """Check whether a DataFrame was read from a canonical tick file.
+
+    Requires the schema version tag set by table_to_frame and the canonical
+    column layout and dtypes, so tagged frames that were modified into a
+    different shape are still normalised.
+    """
+    if df.attrs.get('tick_schema_version') != TICK_SCHEMA_VERSION:
+        return False
+    if list(df.columns) != TICK_COLUMNS:
+        return False
+    if not isinstance(df['type'].dtype, pd.CategoricalDtype):
+        return False
+    return (df['timestamp'].dtype == 'datetime64[ns]'
+            and df['price'].dtype == np.float64
+            and df['volume'].dtype == np.int64)
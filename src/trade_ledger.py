@@ -0,0 +1,381 @@
+"""Columnar trade ledger: the native trade container of the strategies.
+
+Strategies used to append one dict (or ``Trade`` dataclass) per fill to a
+list, and every consumer (``write_results``, the metrics of the sweep
+scripts, the result transport) rebuilt a DataFrame from that list, often
+several times. A fill-heavy run held millions of small dicts with a boxed
+Python object per field.
+
+``TradeLedger`` stores each field in a typed NumPy column:
+
+    timestamp   int64 nanoseconds (pd.Timestamp on the way out)
+    category    int16 codes into a small list of strings (side, trade type)
+    float       float64
+    int         int64, promoted to float64 if a non-integer value arrives
+
+Columns are preallocated and doubled when full (amortised O(1) appends), so
+a fill costs one small write per field instead of a dict. ``to_pandas()``
+and ``to_arrow()`` return views of the columns without copying the numeric
+data.
+
+For existing code the ledger still behaves like a list of trade records:
+``len()``, iteration, indexing, ``append`` and ``==`` against a list work,
+with each row materialised on access as a dict (or as ``row_type``, e.g.
+the closing strategy's ``Trade`` dataclass).
+
+Usage:
+    from src.trade_ledger import TradeLedger
+
+    trades = TradeLedger()
+    trades.add(timestamp, 'buy', 3.52, 1000, 0.0, 1000, 0.0)
+    df = trades.to_pandas()
+"""
+from datetime import date, timedelta
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Fields of a market-making fill (BaseMarketMakingStrategy, event kernel)
+MM_TRADE_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('timestamp', 'timestamp'),
+    ('side', 'category'),
+    ('fill_price', 'float'),
+    ('fill_qty', 'int'),
+    ('realized_pnl', 'float'),
+    ('position', 'int'),
+    ('pnl', 'float'),
+)
+
+_NS_PER_DAY = 86_400_000_000_000
+_EPOCH = date(1970, 1, 1)
+
+_DTYPES = {
+    'timestamp': np.int64,
+    'category': np.int16,
+    'float': np.float64,
+    'int': np.int64,
+}
+
+
+class TradeLedger:
+    """Growable columnar store of trade records.
+
+    Args:
+        fields: Sequence of (name, kind) with kind in 'timestamp', 'category',
+                'float' or 'int' (default: MM_TRADE_FIELDS)
+        row_type: Type of materialised rows: dict (default) or a class
+                  taking the fields as keyword arguments (e.g. a dataclass)
+        capacity: Initial number of preallocated rows
+    """
+
+    __slots__ = ('fields', 'row_type', '_names', '_kinds', '_cols', '_n',
+                 '_categories', '_codes', '_tz', '_dates_cursor')
+
+    def __init__(self, fields: Sequence[Tuple[str, str]] = MM_TRADE_FIELDS,
+                 row_type: type = dict, capacity: int = 64):
+        self.fields = tuple(fields)
+        self.row_type = row_type
+        self._names = tuple(name for name, _ in self.fields)
+        self._kinds = tuple(kind for _, kind in self.fields)
+        capacity = max(1, int(capacity))
+        self._cols = [np.empty(capacity, dtype=_DTYPES[kind]) for kind in self._kinds]
+        self._n = 0
+        # Per category column: list of strings and string -> code
+        self._categories = {i: [] for i, kind in enumerate(self._kinds) if kind == 'category'}
+        self._codes = {i: {} for i in self._categories}
+        self._tz = None
+        self._dates_cursor = 0
+
+    @classmethod
+    def from_arrow(cls, table, fields: Sequence[Tuple[str, str]] = MM_TRADE_FIELDS,
+                   row_type: type = dict) -> 'TradeLedger':
+        """Ledger holding the rows of a pyarrow Table (as written by to_arrow)."""
+        import pyarrow as pa
+
+        n = table.num_rows
+        ledger = cls(fields, row_type, capacity=n)
+        for i, (name, kind) in enumerate(ledger.fields):
+            col = table.column(name)
+            if kind == 'timestamp':
+                tz = getattr(col.type, 'tz', None)
+                if tz is not None:
+                    ledger._tz = pd.Timestamp(0, tz=tz).tz
+                values = col.cast(pa.timestamp('ns', tz=tz)).to_numpy().view(np.int64)
+            elif kind == 'category':
+                codes, uniques = pd.factorize(col.to_numpy(zero_copy_only=False))
+                lookup = np.array([ledger._encode(i, kind, value) for value in uniques] or [0],
+                                  dtype=np.int16)
+                values = lookup[codes]
+            else:
+                values = col.to_numpy()
+                if kind == 'int' and values.dtype.kind == 'f':
+                    ledger._cols[i] = ledger._cols[i].astype(np.float64)
+            ledger._cols[i][:n] = values
+        ledger._n = n
+        return ledger
+
+    # ------------------------------------------------------------------
+    # Appending
+    # ------------------------------------------------------------------
+
+    def _grow(self, needed: int):
+        capacity = len(self._cols[0])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for i, col in enumerate(self._cols):
+            grown = np.empty(capacity, dtype=col.dtype)
+            grown[:self._n] = col[:self._n]
+            self._cols[i] = grown
+
+    def _encode(self, i: int, kind: str, value):
+        """Convert one field value to its column representation."""
+        if kind == 'float':
+            return value
+        if kind == 'int':
+            if type(value) is not int and not isinstance(value, np.integer):
+                if self._cols[i].dtype != np.float64:
+                    self._cols[i] = self._cols[i].astype(np.float64)
+            return value
+        if kind == 'category':
+            code = self._codes[i].get(value)
+            if code is None:
+                code = len(self._categories[i])
+                self._categories[i].append(value)
+                self._codes[i][value] = code
+            return code
+        # timestamp
+        if type(value) is not pd.Timestamp:
+            if isinstance(value, (int, np.integer)):
+                return value
+            value = pd.Timestamp(value)
+        if value.tzinfo is not None and self._tz is None:
+            self._tz = value.tz
+        return value.value
+
+    def add(self, *values):
+        """Append one trade given as field values in column order."""
+        n = self._n
+        if n == len(self._cols[0]):
+            self._grow(n + 1)
+            n = self._n
+        kinds = self._kinds
+        cols = self._cols
+        for i, value in enumerate(values):
+            kind = kinds[i]
+            if kind != 'float':
+                value = self._encode(i, kind, value)
+            cols[i][n] = value
+        self._n = n + 1
+
+    def append(self, record):
+        """Append one trade given as a dict or an object with the field attributes."""
+        if isinstance(record, dict):
+            self.add(*[record[name] for name in self._names])
+        else:
+            self.add(*[getattr(record, name) for name in self._names])
+
+    def extend(self, records: Iterable):
+        """Append trades from another ledger (column-wise) or an iterable of records."""
+        if not isinstance(records, TradeLedger):
+            for record in records:
+                self.append(record)
+            return
+        if records._names != self._names:
+            raise ValueError("Cannot extend a ledger with a different schema")
+        m = len(records)
+        if m == 0:
+            return
+        self._grow(self._n + m)
+        n = self._n
+        for i, kind in enumerate(self._kinds):
+            src = records._cols[i][:m]
+            if kind == 'category':
+                lookup = np.array([self._encode(i, kind, value)
+                                   for value in records._categories[i]] or [0], dtype=np.int16)
+                src = lookup[src]
+            elif kind == 'int' and src.dtype == np.float64 and self._cols[i].dtype != np.float64:
+                self._cols[i] = self._cols[i].astype(np.float64)
+            self._cols[i][n:n + m] = src
+        if self._tz is None:
+            self._tz = records._tz
+        self._n = n + m
+
+    # ------------------------------------------------------------------
+    # Sequence protocol (rows materialised on access)
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _timestamps(self, start: int = 0, stop: Optional[int] = None) -> list:
+        ns = self._cols[self._kinds.index('timestamp')][start:stop if stop is not None else self._n]
+        index = pd.DatetimeIndex(ns.view('datetime64[ns]'))
+        if self._tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self._tz)
+        return list(index)
+
+    def _column_values(self, i: int, start: int, stop: int) -> list:
+        kind = self._kinds[i]
+        if kind == 'timestamp':
+            return self._timestamps(start, stop)
+        values = self._cols[i][start:stop].tolist()
+        if kind == 'category':
+            categories = self._categories[i]
+            return [categories[code] for code in values]
+        return values
+
+    def _rows(self, start: int, stop: int) -> list:
+        columns = [self._column_values(i, start, stop) for i in range(len(self._names))]
+        names = self._names
+        if self.row_type is dict:
+            return [dict(zip(names, values)) for values in zip(*columns)]
+        row_type = self.row_type
+        return [row_type(**dict(zip(names, values))) for values in zip(*columns)]
+
+    def __iter__(self):
+        # Materialise in blocks so iteration stays cheap without a full copy
+        block = 4096
+        for start in range(0, self._n, block):
+            yield from self._rows(start, min(start + block, self._n))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._rows(i, i + 1)[0] for i in range(*index.indices(self._n))]
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("trade index out of range")
+        return self._rows(index, index + 1)[0]
+
+    def to_list(self) -> list:
+        """All trades as a list of rows (dicts or row_type objects)."""
+        return self._rows(0, self._n)
+
+    def __eq__(self, other):
+        if isinstance(other, TradeLedger):
+            return len(self) == len(other) and self.to_list() == other.to_list()
+        if isinstance(other, (list, tuple)) or hasattr(other, 'to_list'):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TradeLedger({self._n} trades, fields={list(self._names)})"
+
+    def __getstate__(self):
+        # Only the filled rows travel between processes
+        return {
+            'fields': self.fields,
+            'row_type': self.row_type,
+            'cols': [col[:self._n].copy() for col in self._cols],
+            'categories': self._categories,
+            'tz': self._tz,
+        }
+
+    def __setstate__(self, state):
+        self.fields = state['fields']
+        self.row_type = state['row_type']
+        self._names = tuple(name for name, _ in self.fields)
+        self._kinds = tuple(kind for _, kind in self.fields)
+        self._cols = [col if len(col) else np.empty(1, dtype=col.dtype) for col in state['cols']]
+        self._n = len(state['cols'][0])
+        self._categories = state['categories']
+        self._codes = {i: {value: code for code, value in enumerate(values)}
+                       for i, values in self._categories.items()}
+        self._tz = state['tz']
+        self._dates_cursor = 0
+
+    # ------------------------------------------------------------------
+    # Columnar access
+    # ------------------------------------------------------------------
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column buffers (including spare capacity)."""
+        return sum(col.nbytes for col in self._cols)
+
+    def column(self, name: str) -> np.ndarray:
+        """View of one column's filled rows (timestamps as datetime64[ns] UTC/naive)."""
+        return self._column(name)
+
+    def _column(self, name: str) -> np.ndarray:
+        # In-memory rows only (subclasses may hold further rows elsewhere)
+        i = self._names.index(name)
+        col = self._cols[i][:self._n]
+        kind = self._kinds[i]
+        if kind == 'timestamp':
+            return col.view('datetime64[ns]')
+        if kind == 'category':
+            return np.asarray(self._categories[i] or [''], dtype=object)[col]
+        return col
+
+    def set_column(self, name: str, values):
+        """Overwrite a numeric column's filled rows (e.g. a rebuilt running P&L)."""
+        i = self._names.index(name)
+        if self._kinds[i] not in ('float', 'int'):
+            raise ValueError(f"set_column only supports numeric columns, not {name!r}")
+        values = np.asarray(values)
+        if self._kinds[i] == 'int' and values.dtype.kind == 'f':
+            self._cols[i] = self._cols[i].astype(np.float64)
+        self._cols[i][:self._n] = values
+
+    def _dates_between(self, start: int, stop: int) -> set:
+        if stop <= start:
+            return set()
+        ns = self._cols[self._kinds.index('timestamp')][start:stop]
+        if self._tz is not None:
+            local = pd.DatetimeIndex(ns.view('datetime64[ns]')).tz_localize('UTC').tz_convert(self._tz)
+            ns = local.tz_localize(None).asi8
+        return {_EPOCH + timedelta(days=int(day)) for day in np.unique(ns // _NS_PER_DAY)}
+
+    def dates(self) -> set:
+        """Set of calendar dates (datetime.date) with at least one trade."""
+        return self._dates_between(0, self._n)
+
+    def new_dates(self) -> set:
+        """Dates of the trades added since the previous call.
+
+        Handlers call this once per chunk to extend their running set of
+        strategy dates, so the work is proportional to the new trades only.
+        """
+        dates = self._dates_between(self._dates_cursor, self._n)
+        self._dates_cursor = self._n
+        return dates
+
+    def to_pandas(self, copy: bool = False) -> pd.DataFrame:
+        """DataFrame of the trades.
+
+        Args:
+            copy: Copy the columns. By default numeric columns are views of
+                  the ledger, so writing into the frame in place writes into
+                  the ledger too.
+
+        Returns:
+            DataFrame with one column per field
+        """
+        data = {}
+        for name in self._names:
+            values = self._column(name)
+            if name == 'timestamp' and self._tz is not None:
+                values = pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(self._tz)
+            data[name] = values
+        return pd.DataFrame(data, copy=copy)
+
+    def to_arrow(self):
+        """pyarrow Table of the trades (numeric buffers shared, not copied)."""
+        import pyarrow as pa
+
+        arrays = []
+        for i, (name, kind) in enumerate(self.fields):
+            col = self._cols[i][:self._n]
+            if kind == 'timestamp':
+                tz = str(self._tz) if self._tz is not None else None
+                arrays.append(pa.array(col, type=pa.timestamp('ns', tz=tz)))
+            elif kind == 'category':
+                arrays.append(pa.array(self._column(name), type=pa.string()))
+            else:
+                arrays.append(pa.array(col))
+        return pa.Table.from_arrays(arrays, names=list(self._names))
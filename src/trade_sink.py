@@ -0,0 +1,272 @@
+"""Spilling trade sink: bounded in-memory trade buffer for long runs.
+
+A strategy keeps every fill of a security in memory for the whole run
+(``SecurityState.trades``), and the handlers alias that ledger into
+``state['trades']``. For multi-year runs the ledger grows without bound.
+
+``TradeSink`` is a ``TradeLedger`` whose buffer holds at most
+``flush_rows`` trades. When the buffer is full it is written to disk as one
+Parquet part file and emptied, and only running aggregates stay in memory:
+
+    trade count         len(sink)
+    realized P&L        sink.realized_pnl_total()
+    dates with fills    sink.dates() (no file is read)
+
+Flushing happens where the ledger would otherwise grow its buffer, so
+appending a fill costs the same as before. Reading the trades back
+(``to_pandas``, ``to_arrow``, iteration) concatenates the part files and
+the buffer; pickling a sink (worker -> parent) flushes it and ships only
+the directory and the aggregates.
+
+Sinks are enabled per security through the strategy configuration, like
+``use_jit_fills``:
+
+    {'EMAAR': {..., 'trade_sink_dir': 'output/sink/EMAAR',
+               'trade_sink_flush_rows': 65536}}
+
+``with_trade_sink`` adds these keys for a set of securities, under a new
+run directory (``<directory>/<run_id>/<SECURITY>``) so that results of an
+earlier run or sweep scenario are never overwritten. A sink refuses a
+directory that already holds part files.
+
+Usage:
+    from src.trade_sink import TradeSink
+
+    trades = TradeSink('output/sink/EMAAR', flush_rows=65536)
+    trades.add(timestamp, 'buy', 3.52, 1000, 0.0, 1000, 0.0)
+    df = trades.to_pandas()
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.trade_ledger import MM_TRADE_FIELDS, TradeLedger
+
+
+DEFAULT_FLUSH_ROWS = 65536
+
+PART_PATTERN = 'part-{:05d}.parquet'
+PART_GLOB = 'part-*.parquet'
+
+
+class TradeSink(TradeLedger):
+    """TradeLedger that spills full buffers to Parquet part files.
+
+    Args:
+        directory: Directory for the part files (created if needed; must
+                   not hold part files already)
+        fields: Sequence of (name, kind), as for TradeLedger
+        row_type: Type of materialised rows, as for TradeLedger
+        flush_rows: Trades kept in memory before a flush
+
+    Raises:
+        FileExistsError: If the directory already holds part files
+    """
+
+    __slots__ = ('directory', 'flush_rows', '_parts', '_flushed_rows',
+                 '_flushed_dates', '_flushed_realized', '_pending_dates')
+
+    def __init__(self, directory, fields: Sequence[Tuple[str, str]] = MM_TRADE_FIELDS,
+                 row_type: type = dict, flush_rows: int = DEFAULT_FLUSH_ROWS):
+        self.flush_rows = max(1, int(flush_rows))
+        super().__init__(fields, row_type, capacity=self.flush_rows)
+        self.directory = Path(directory)
+        if next(self.directory.glob(PART_GLOB), None) is not None:
+            raise FileExistsError(
+                f"Trade sink directory {str(self.directory)!r} already holds part files; "
+                f"use a new directory per run (see with_trade_sink)"
+            )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._parts = 0
+        self._flushed_rows = 0
+        self._flushed_dates = set()
+        self._flushed_realized = 0.0
+        # Dates of flushed trades not yet returned by new_dates()
+        self._pending_dates = set()
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _grow(self, needed: int):
+        # A full buffer is flushed instead of grown
+        if needed <= len(self._cols[0]):
+            return
+        extra = needed - self._n
+        self.flush()
+        super()._grow(self._n + extra)
+
+    def flush(self):
+        """Write the buffered trades as a new part file and empty the buffer."""
+        import pyarrow.parquet as pq
+
+        n = self._n
+        if n == 0:
+            return
+        self._pending_dates |= self._dates_between(self._dates_cursor, n)
+        self._flushed_dates |= self._dates_between(0, n)
+        if 'realized_pnl' in self._names:
+            self._flushed_realized += float(self._column('realized_pnl').sum())
+
+        pq.write_table(super().to_arrow(), self.directory / PART_PATTERN.format(self._parts))
+        self._parts += 1
+        self._flushed_rows += n
+        self._n = 0
+        self._dates_cursor = 0
+
+    # ------------------------------------------------------------------
+    # Running aggregates
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._flushed_rows + self._n
+
+    @property
+    def flushed_rows(self) -> int:
+        """Trades written to part files."""
+        return self._flushed_rows
+
+    def dates(self) -> set:
+        return self._flushed_dates | self._dates_between(0, self._n)
+
+    def new_dates(self) -> set:
+        dates = self._pending_dates | super().new_dates()
+        self._pending_dates = set()
+        return dates
+
+    def realized_pnl_total(self) -> float:
+        """Sum of realized_pnl over all trades (flushed and buffered)."""
+        buffered = float(self._column('realized_pnl').sum()) if self._n else 0.0
+        return self._flushed_realized + buffered
+
+    # ------------------------------------------------------------------
+    # Reading back (part files + buffer)
+    # ------------------------------------------------------------------
+
+    def _flushed_table(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        tables = [pq.read_table(self.directory / PART_PATTERN.format(i))
+                  for i in range(self._parts)]
+        return pa.concat_tables(tables, promote_options='permissive')
+
+    def _flushed_ledger(self) -> TradeLedger:
+        return TradeLedger.from_arrow(self._flushed_table(), self.fields, self.row_type)
+
+    def _all(self) -> TradeLedger:
+        """Plain in-memory ledger of all trades."""
+        ledger = self._flushed_ledger() if self._flushed_rows else \
+            TradeLedger(self.fields, self.row_type)
+        if self._n:
+            ledger.extend(TradeLedger.from_arrow(super().to_arrow(), self.fields, self.row_type))
+        return ledger
+
+    def to_arrow(self):
+        if not self._flushed_rows:
+            return super().to_arrow()
+        import pyarrow as pa
+
+        tables = [self._flushed_table()]
+        if self._n:
+            tables.append(super().to_arrow())
+        return pa.concat_tables(tables, promote_options='permissive')
+
+    def to_pandas(self, copy: bool = False) -> pd.DataFrame:
+        if not self._flushed_rows:
+            return super().to_pandas(copy=copy)
+        return self._all().to_pandas(copy=False)
+
+    def column(self, name: str) -> np.ndarray:
+        if not self._flushed_rows:
+            return super().column(name)
+        return self._all().column(name)
+
+    def to_list(self) -> list:
+        if not self._flushed_rows:
+            return super().to_list()
+        return self._all().to_list()
+
+    def __iter__(self):
+        if self._flushed_rows:
+            yield from self._flushed_ledger()
+        yield from super().__iter__()
+
+    def __getitem__(self, index):
+        if not self._flushed_rows:
+            return super().__getitem__(index)
+        return self._all()[index]
+
+    def set_column(self, name: str, values):
+        raise TypeError("TradeSink columns are partly on disk and cannot be overwritten")
+
+    def extend(self, records: Iterable):
+        for record in records:
+            self.append(record)
+
+    def __repr__(self) -> str:
+        return (f"TradeSink({len(self)} trades, {self._flushed_rows} flushed to "
+                f"{str(self.directory)!r})")
+
+    def __getstate__(self):
+        # Only the part files' location and the aggregates travel
+        self.flush()
+        state = super().__getstate__()
+        state.update({
+            'directory': str(self.directory),
+            'flush_rows': self.flush_rows,
+            'parts': self._parts,
+            'flushed_rows': self._flushed_rows,
+            'flushed_dates': self._flushed_dates,
+            'flushed_realized': self._flushed_realized,
+        })
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.directory = Path(state['directory'])
+        self.flush_rows = state['flush_rows']
+        # The buffer was flushed before pickling: restore its capacity
+        self._cols = [np.empty(self.flush_rows, dtype=col.dtype) for col in self._cols]
+        self._parts = state['parts']
+        self._flushed_rows = state['flushed_rows']
+        self._flushed_dates = state['flushed_dates']
+        self._flushed_realized = state['flushed_realized']
+        self._pending_dates = set()
+
+
+def new_run_id() -> str:
+    """Unique name for a run's sink directory (e.g. 'run-20240131-153000-123456')."""
+    return datetime.now().strftime('run-%Y%m%d-%H%M%S-%f')
+
+
+def with_trade_sink(config: dict, securities: Iterable[str], directory,
+                    flush_rows: Optional[int] = None, run_id: Optional[str] = None) -> dict:
+    """Copy of a strategy config with a trade sink enabled for each security.
+
+    Args:
+        config: Per-security strategy configuration
+        securities: Securities to enable the sink for
+        directory: Base directory; each security spills to
+                   <directory>/<run_id>/<SECURITY>
+        flush_rows: Trades kept in memory per security (default: the
+                    configured trade_sink_flush_rows or DEFAULT_FLUSH_ROWS)
+        run_id: Run (or sweep scenario) subdirectory (default: new_run_id())
+
+    Returns:
+        New config dict (the input is not modified)
+    """
+    run_dir = Path(directory) / (run_id or new_run_id())
+    config = dict(config or {})
+    for security in securities:
+        cfg = dict(config.get(security, {}))
+        cfg['trade_sink_dir'] = str(run_dir / security.upper())
+        if flush_rows is not None:
+            cfg['trade_sink_flush_rows'] = flush_rows
+        else:
+            cfg.setdefault('trade_sink_flush_rows', DEFAULT_FLUSH_ROWS)
+        config[security] = cfg
+    return config
@@ -0,0 +1,316 @@
+"""Persistent warm worker pool for parameter sweeps.
+
+``run_parallel_backtest_parquet`` creates a new ProcessPoolExecutor for every
+scenario: each worker re-imports pandas and the handler modules and every
+parquet file is read and decompressed again. A sweep of S scenarios over N
+securities therefore pays S x N file reads for the same data.
+
+``WarmWorkerPool`` keeps one executor alive for the whole sweep:
+
+    - Every security's ticks are loaded once, as canonical frames (and as
+      EventArrays for the kernel engine), and stay resident.
+    - Handler factories are imported once per worker and cached.
+    - A scenario is dispatched as one small message per security (handler
+      name + config dict); only results travel back.
+
+On Linux the parent preloads all data before the workers are forked, so the
+workers inherit it and share the pages copy-on-write. Elsewhere (spawn) each
+worker loads a security on first use and keeps it; with ``tick_cache=True``
+those loads are memory-mapped and share the OS page cache instead.
+
+Usage:
+    from src.warm_pool import WarmWorkerPool
+
+    with WarmWorkerPool('data/parquet', max_workers=8) as pool:
+        for config in configs:
+            results = pool.run_scenario('src.strategies.v1_baseline.handler',
+                                        'create_v1_handler', config)
+"""
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import cpu_count
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.work_scheduler import schedule_lpt
+
+
+# Resident data of this process: parquet file name -> ResidentSecurity.
+# Filled in the parent before forking (inherited) or lazily in spawned workers.
+_RESIDENT = {}
+
+# Where spawned workers load data from: {'parquet_dir': ..., 'tick_cache': ...}
+_SOURCE = {}
+
+# Imported handler factories: (module, function) -> factory
+_FACTORIES = {}
+
+
+class ResidentSecurity:
+    """One security's preloaded tick data."""
+
+    __slots__ = ('security', 'df', 'events', 'sessions')
+
+    def __init__(self, security: str, df, events=None, sessions=None):
+        self.security = security
+        self.df = df
+        self.events = events
+        self.sessions = sessions
+
+    def ensure_events(self):
+        """Build the EventArrays and SessionIndex (kernel engine) once."""
+        if self.events is None:
+            from src.event_kernel import build_event_arrays
+            from src.session_index import build_session_index
+
+            self.events = build_event_arrays(self.df)
+            self.sessions = build_session_index(self.events.timestamp)
+        return self.events, self.sessions
+
+
+def load_resident(parquet_file, tick_cache: bool = False, engine: str = 'handler') -> ResidentSecurity:
+    """Load a security's ticks as a canonical frame (plus events for 'kernel').
+
+    Args:
+        parquet_file: Per-security parquet file
+        tick_cache: Memory-map the preprocessed Arrow cache instead of
+                    reading and normalising the parquet file
+        engine: 'handler' or 'kernel' (also builds the EventArrays)
+
+    Returns:
+        ResidentSecurity
+    """
+    parquet_file = Path(parquet_file)
+    if tick_cache:
+        from src.tick_cache import load_cached_ticks
+        df = load_cached_ticks(parquet_file)
+    else:
+        from src.parquet_loader import read_parquet_file
+        from src.tick_schema import table_to_frame, to_canonical_table
+        df = table_to_frame(to_canonical_table(read_parquet_file(parquet_file)))
+
+    resident = ResidentSecurity(parquet_file.stem.upper(), df)
+    if engine == 'kernel':
+        resident.ensure_events()
+    return resident
+
+
+def _init_worker(parquet_dir: str, tick_cache: bool):
+    """Worker initializer: remember where to load securities from."""
+    _SOURCE['parquet_dir'] = parquet_dir
+    _SOURCE['tick_cache'] = tick_cache
+
+
+def _get_resident(security_file: str, engine: str) -> ResidentSecurity:
+    resident = _RESIDENT.get(security_file)
+    if resident is None:
+        resident = load_resident(Path(_SOURCE['parquet_dir']) / security_file,
+                                 _SOURCE.get('tick_cache', False), engine)
+        _RESIDENT[security_file] = resident
+    return resident
+
+
+def _get_handler_factory(handler_module: str, handler_function: str):
+    key = (handler_module, handler_function)
+    if key not in _FACTORIES:
+        module = __import__(handler_module, fromlist=[''])
+        _FACTORIES[key] = getattr(module, handler_function)
+    return _FACTORIES[key]
+
+
+def run_resident_security(
+    security_file: str,
+    handler_module: str,
+    handler_function: str,
+    config: dict,
+    engine: str = 'handler',
+    chunk_size: int = 100000,
+    result_dir: Optional[str] = None
+) -> tuple:
+    """Run one scenario for one resident security (executed in a pool worker).
+
+    Args:
+        security_file: Parquet filename (e.g., 'emaar.parquet')
+        handler_module: Module path for handler
+        handler_function: Handler factory function name
+        config: Scenario configuration dict
+        engine: 'handler' or 'kernel'
+        chunk_size: Rows per chunk (handler engine)
+        result_dir: If set, return a TradeLog handle instead of the trade list
+
+    Returns:
+        Tuple of (security_name, results_dict, timing_info), as
+        process_single_security_parquet returns
+    """
+    from src.parallel_backtest import results_from_state, run_handler_chunks
+
+    start_time = time.time()
+    security = Path(security_file).stem.upper()
+
+    try:
+        resident = _get_resident(security_file, engine)
+
+        if engine == 'kernel':
+            from src.event_kernel import get_kernel_strategy_name, run_event_kernel
+            strategy_name = get_kernel_strategy_name(handler_module)
+            if strategy_name is None:
+                raise ValueError(f"No event kernel available for {handler_module}")
+            events, sessions = resident.ensure_events()
+            state = run_event_kernel(strategy_name, security, events, config, sessions=sessions)
+            state['rows'] = state.get('rows', 0) + len(events)
+        else:
+            handler = _get_handler_factory(handler_module, handler_function)(config)
+            df = resident.df
+            chunks = (df.iloc[start_idx:start_idx + chunk_size].copy()
+                      for start_idx in range(0, len(df), chunk_size))
+            state = run_handler_chunks(security, chunks, handler)
+
+        results = results_from_state(state)
+        if result_dir is not None:
+            from src.result_transport import write_trade_log
+            results['trades'] = write_trade_log(
+                results['trades'], Path(result_dir) / f"{security.lower()}.arrow"
+            )
+
+        elapsed = time.time() - start_time
+        timing_info = {
+            'elapsed': elapsed,
+            'rows': results.get('rows', 0),
+            'trades': len(results.get('trades', []))
+        }
+        return (security, results, timing_info)
+
+    except Exception as e:
+        import traceback
+        error_info = {
+            'error': str(e),
+            'traceback': traceback.format_exc(),
+            'elapsed': time.time() - start_time
+        }
+        print(f"[Worker] ERROR {security}: {e}", flush=True)
+        return (security, {'error': str(e)}, error_info)
+
+
+def fork_available() -> bool:
+    """True where workers can be forked after preloading (Linux)."""
+    return sys.platform.startswith('linux') and 'fork' in multiprocessing.get_all_start_methods()
+
+
+class WarmWorkerPool:
+    """Long-lived worker pool with every security's data resident.
+
+    Args:
+        parquet_dir: Directory containing per-security Parquet files
+        max_workers: Number of worker processes (default: CPU count)
+        max_files: Limit to the first N securities
+        engine: 'handler' or 'kernel' (what the data is prepared for)
+        tick_cache: Load through the memory-mapped Arrow cache
+        preload: Load all data in the parent and fork (Linux only); otherwise
+                 workers load securities on first use
+    """
+
+    def __init__(self, parquet_dir: str, max_workers: Optional[int] = None,
+                 max_files: Optional[int] = None, engine: str = 'handler',
+                 tick_cache: bool = False, preload: bool = True):
+        self.parquet_dir = str(parquet_dir)
+        self.max_workers = max_workers or cpu_count()
+        self.engine = engine
+        self.tick_cache = tick_cache
+        self.preload = preload and fork_available()
+        self.executor = None
+
+        parquet_files = sorted(Path(parquet_dir).glob("*.parquet"))
+        if not parquet_files:
+            raise FileNotFoundError(f"No Parquet files found in {parquet_dir}")
+        if max_files:
+            parquet_files = parquet_files[:max_files]
+        # Largest securities first (row counts, see src/work_scheduler.py)
+        self.parquet_files, _ = schedule_lpt(parquet_files)
+
+    def start(self):
+        """Load the data (when preloading) and start the workers."""
+        if self.executor is not None:
+            return self
+
+        start_time = time.time()
+        if self.preload:
+            for parquet_file in self.parquet_files:
+                if parquet_file.name not in _RESIDENT:
+                    _RESIDENT[parquet_file.name] = load_resident(
+                        parquet_file, self.tick_cache, self.engine
+                    )
+            context = multiprocessing.get_context('fork')
+            print(f"Warm pool: preloaded {len(self.parquet_files)} securities in "
+                  f"{time.time() - start_time:.1f}s (forked workers share the pages)")
+        else:
+            context = None
+            print("Warm pool: workers load securities on first use")
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.parquet_dir, self.tick_cache)
+        )
+        return self
+
+    def run_scenario(self, handler_module: str, handler_function: str, config: dict,
+                     chunk_size: int = 100000, result_transport: str = 'pickle') -> Dict:
+        """Run one scenario over all securities on the warm workers.
+
+        Args:
+            handler_module: Module path for handler
+            handler_function: Handler factory function name
+            config: Scenario configuration dict
+            chunk_size: Rows per chunk (handler engine)
+            result_transport: 'pickle' or 'arrow' (see run_parallel_backtest_parquet)
+
+        Returns:
+            Dictionary mapping security names to results, in the format of
+            run_parallel_backtest_parquet
+        """
+        from src.parallel_backtest import _result_dir_for
+
+        self.start()
+        result_dir = _result_dir_for(result_transport)
+
+        future_to_file = {
+            self.executor.submit(
+                run_resident_security,
+                parquet_file.name,
+                handler_module,
+                handler_function,
+                config,
+                self.engine,
+                chunk_size,
+                result_dir
+            ): parquet_file
+            for parquet_file in self.parquet_files
+        }
+
+        results = {}
+        for future in as_completed(future_to_file):
+            security = future_to_file[future].stem.upper()
+            try:
+                security, result, _ = future.result()
+                results[security] = result
+            except Exception as e:
+                print(f"  [X] {security}: EXCEPTION - {e}")
+                results[security] = {'error': str(e)}
+        return results
+
+    def close(self):
+        """Shut the workers down and drop the resident data."""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+        for parquet_file in self.parquet_files:
+            _RESIDENT.pop(parquet_file.name, None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
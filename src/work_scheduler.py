@@ -0,0 +1,212 @@
+"""Cost-aware scheduling of per-security backtest tasks.
+
+Submitting securities in glob order lets a large, liquid name start last and
+leaves one worker grinding on it while the others sit idle. This module
+estimates each security's cost and orders tasks longest-processing-time
+first (LPT), which keeps the makespan within 4/3 of optimal.
+
+Cost estimates come from, in order of preference:
+    1. Historical runtimes of the same security and workload, stored in a
+       small stats file (``<parquet dir>/.runtime_stats.json``)
+    2. Row count from the parquet footer, scaled by the workload's observed
+       seconds-per-row (or 1 second per million rows when unknown)
+
+A security that costs more than the average worker load can be split into
+day shards (``split_large_tasks``, see src/day_sharding.py) so it no longer
+bounds the makespan on its own.
+
+After a run, ``UtilisationReport`` compares the time workers were busy with
+the wall-clock time available to them.
+
+Usage:
+    from src.work_scheduler import RuntimeStats, schedule_lpt
+
+    stats = RuntimeStats.load(parquet_dir)
+    ordered = schedule_lpt(parquet_files, stats, workload='kernel:v1_baseline')
+    ...
+    stats.record('kernel:v1_baseline', 'EMAAR', elapsed, rows)
+    stats.save()
+"""
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+RUNTIME_STATS_FILE = '.runtime_stats.json'
+RUNTIME_STATS_VERSION = 1
+
+# Fallback cost when a workload has no history at all
+DEFAULT_SECONDS_PER_ROW = 1e-6
+
+# Weight of the newest runtime in the smoothed estimate
+STATS_SMOOTHING = 0.5
+
+
+def parquet_row_count(parquet_file) -> int:
+    """Row count from the parquet footer (no data pages are read)."""
+    import pyarrow.parquet as pq
+
+    try:
+        return pq.ParquetFile(parquet_file).metadata.num_rows
+    except Exception:
+        # Unreadable footer: fall back to file size as a proxy
+        return Path(parquet_file).stat().st_size // 16
+
+
+class RuntimeStats:
+    """Smoothed historical runtimes per workload and security."""
+
+    def __init__(self, path, data: Optional[dict] = None):
+        self.path = Path(path)
+        self.data = data or {'version': RUNTIME_STATS_VERSION, 'workloads': {}}
+
+    @classmethod
+    def load(cls, parquet_dir) -> 'RuntimeStats':
+        """Load the stats file of a parquet directory (empty if missing/corrupt)."""
+        path = Path(parquet_dir) / RUNTIME_STATS_FILE
+        try:
+            with path.open('r', encoding='utf-8') as fh:
+                data = json.load(fh)
+            if data.get('version') == RUNTIME_STATS_VERSION:
+                return cls(path, data)
+        except (OSError, ValueError):
+            pass
+        return cls(path)
+
+    def save(self):
+        """Atomically write the stats file (failures only warn)."""
+        tmp_file = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with tmp_file.open('w', encoding='utf-8') as fh:
+                json.dump(self.data, fh, indent=2, sort_keys=True)
+            os.replace(tmp_file, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write runtime stats {self.path}: {e}")
+
+    def record(self, workload: str, security: str, elapsed: float, rows: int):
+        """Fold a measured runtime into the smoothed estimate."""
+        entries = self.data['workloads'].setdefault(workload, {})
+        entry = entries.get(security)
+        if entry is None:
+            entries[security] = {'elapsed': round(elapsed, 3), 'rows': int(rows), 'runs': 1}
+        else:
+            smoothed = STATS_SMOOTHING * elapsed + (1 - STATS_SMOOTHING) * entry['elapsed']
+            entries[security] = {'elapsed': round(smoothed, 3), 'rows': int(rows),
+                                 'runs': entry['runs'] + 1}
+
+    def elapsed(self, workload: str, security: str) -> Optional[float]:
+        entry = self.data['workloads'].get(workload, {}).get(security)
+        return entry['elapsed'] if entry else None
+
+    def seconds_per_row(self, workload: str) -> float:
+        """Observed cost per row of a workload (aggregate over securities)."""
+        entries = self.data['workloads'].get(workload, {}).values()
+        total_rows = sum(e['rows'] for e in entries)
+        if total_rows <= 0:
+            return DEFAULT_SECONDS_PER_ROW
+        return sum(e['elapsed'] for e in entries) / total_rows
+
+
+def estimate_costs(parquet_files: List[Path], stats: Optional[RuntimeStats] = None,
+                   workload: str = '') -> Dict[Path, float]:
+    """Estimated runtime in seconds of each security's task.
+
+    Args:
+        parquet_files: Per-security parquet files
+        stats: Historical runtimes (optional)
+        workload: Stats key of the workload (e.g. 'kernel:v1_baseline')
+
+    Returns:
+        Dict mapping parquet file -> estimated seconds
+    """
+    rate = stats.seconds_per_row(workload) if stats else DEFAULT_SECONDS_PER_ROW
+    costs = {}
+    for parquet_file in parquet_files:
+        history = stats.elapsed(workload, Path(parquet_file).stem.upper()) if stats else None
+        costs[parquet_file] = history if history is not None else parquet_row_count(parquet_file) * rate
+    return costs
+
+
+def schedule_lpt(parquet_files: List[Path], stats: Optional[RuntimeStats] = None,
+                 workload: str = '') -> Tuple[List[Path], Dict[Path, float]]:
+    """Order tasks longest-processing-time first.
+
+    Args:
+        parquet_files: Per-security parquet files
+        stats: Historical runtimes (optional)
+        workload: Stats key of the workload
+
+    Returns:
+        Tuple of (files in submission order, estimated cost per file)
+    """
+    costs = estimate_costs(parquet_files, stats, workload)
+    ordered = sorted(parquet_files, key=lambda f: (-costs[f], Path(f).name))
+    return ordered, costs
+
+
+def split_large_tasks(costs: Dict[Path, float], workers: int) -> Dict[Path, int]:
+    """Number of day shards for tasks that would dominate the makespan.
+
+    A task costing more than the average worker load (total / workers) is
+    split into ceil(cost / average) shards, at most one per worker.
+
+    Args:
+        costs: Estimated cost per task
+        workers: Number of workers
+
+    Returns:
+        Dict mapping task -> shard count (only tasks with more than one shard)
+    """
+    if workers <= 1 or not costs:
+        return {}
+    target = sum(costs.values()) / workers
+    if target <= 0:
+        return {}
+    return {task: min(workers, math.ceil(cost / target))
+            for task, cost in costs.items() if cost > target}
+
+
+def predicted_makespan(costs: List[float], workers: int) -> float:
+    """Makespan of greedy list scheduling of costs in the given order."""
+    loads = [0.0] * max(1, workers)
+    for cost in costs:
+        i = loads.index(min(loads))
+        loads[i] += cost
+    return max(loads) if costs else 0.0
+
+
+@dataclass
+class UtilisationReport:
+    """Worker utilisation of a completed parallel run."""
+    workers: int
+    wall_time: float
+    task_times: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def busy_time(self) -> float:
+        return sum(self.task_times.values())
+
+    @property
+    def utilisation(self) -> float:
+        """Fraction of worker time spent on tasks (0-1)."""
+        capacity = self.wall_time * min(self.workers, max(1, len(self.task_times)))
+        return self.busy_time / capacity if capacity > 0 else 0.0
+
+    @property
+    def lower_bound(self) -> float:
+        """No schedule can finish before the longest task or the average load."""
+        if not self.task_times:
+            return 0.0
+        return max(max(self.task_times.values()), self.busy_time / self.workers)
+
+    def print_report(self):
+        print(f"Worker utilisation: {self.utilisation * 100:.1f}% "
+              f"(busy {self.busy_time:.1f}s of {self.wall_time:.1f}s x "
+              f"{min(self.workers, max(1, len(self.task_times)))} workers)")
+        if self.task_times:
+            longest = max(self.task_times, key=self.task_times.get)
+            print(f"  Longest task: {longest} ({self.task_times[longest]:.1f}s), "
+                  f"makespan lower bound: {self.lower_bound:.1f}s")